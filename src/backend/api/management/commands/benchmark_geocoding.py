@@ -0,0 +1,99 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from geo_lib.geolocation.geocode_cache import MemoryGeocodeCache
+from geo_lib.geolocation.geocoding_client import AsyncGeocodingClient
+from geo_lib.geolocation.mock_geocoding_server import MockGeocodingServer, load_fixtures
+from geo_lib.geolocation.reverse_geocode import ReverseGeocodingService, override_reverse_geocoding_service
+from geo_lib.processing.processors import get_processor
+
+DEFAULT_FILES = ['Geocoding Test.kml', 'Blue Ridge Parkway.kml']
+
+
+class Command(BaseCommand):
+    help = ('Benchmark geocoding: process sample files with the real upload processing (and tag generation) '
+            'against the local mock Overpass/Nominatim server. Reports requests per feature, wall time and '
+            'cache hit rate. Nothing is sent to the public servers and the geocoding cache table is not touched.')
+
+    def add_arguments(self, parser):
+        tests_dir = os.path.join(settings.BASE_DIR, 'tests')
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help=f'Files to process (default: {", ".join(DEFAULT_FILES)} from tests/)',
+        )
+        parser.add_argument(
+            '--fixtures',
+            default=os.path.join(tests_dir, 'geocoding_fixtures.json'),
+            help='Fixture file for the mock server',
+        )
+        parser.add_argument('--latency-ms', type=float, default=50.0, help='Latency added to every mock response')
+        parser.add_argument('--overpass-limit', type=float, default=0.0,
+                            help='Mock Overpass rate limit in requests per second, 0 for none')
+        parser.add_argument('--nominatim-limit', type=float, default=0.0,
+                            help='Mock Nominatim rate limit in requests per second, 0 for none')
+        parser.add_argument('--no-client-rate-limit', action='store_true',
+                            help='Disable the client side rate limits (OVERPASS/NOMINATIM_REQUESTS_PER_SECOND)')
+        parser.add_argument('--runs', type=int, default=1,
+                            help='Times to process each file. The cache is kept between runs, so later runs show warm cache performance')
+
+    def handle(self, *args, **options):
+        tests_dir = os.path.join(settings.BASE_DIR, 'tests')
+        files = options['files'] or [os.path.join(tests_dir, name) for name in DEFAULT_FILES]
+        for path in files:
+            if not os.path.isfile(path):
+                raise CommandError(f'File not found: {path}')
+        if not os.path.isfile(options['fixtures']):
+            raise CommandError(f'Fixture file not found: {options["fixtures"]}')
+
+        client_settings = {}
+        if options['no_client_rate_limit']:
+            client_settings = {'OVERPASS_REQUESTS_PER_SECOND': 0, 'NOMINATIM_REQUESTS_PER_SECOND': 0}
+        with override_settings(**client_settings):
+            client = AsyncGeocodingClient()
+
+        server = MockGeocodingServer(
+            load_fixtures(options['fixtures']),
+            latency_ms=options['latency_ms'],
+            overpass_requests_per_second=options['overpass_limit'],
+            nominatim_requests_per_second=options['nominatim_limit'],
+        )
+        with server:
+            service = ReverseGeocodingService(server.overpass_url, server.nominatim_url, client=client, cache=MemoryGeocodeCache())
+            self.stdout.write(f'Mock server: {server.base_url}, latency {options["latency_ms"]:g} ms, '
+                              f'client rates: overpass {client.rates["overpass"]:g}/s, nominatim {client.rates["nominatim"]:g}/s')
+            self.stdout.write(f'{"File":<32} {"Run":>3} {"Features":>8} {"Overpass":>8} {"Nominatim":>9} '
+                              f'{"429s":>5} {"Req/feat":>8} {"Hit rate":>8} {"Seconds":>8}')
+
+            with override_settings(REVERSE_GEOCODING_ENABLED=True), \
+                    override_reverse_geocoding_service(service):
+                for run in range(1, max(1, options['runs']) + 1):
+                    for path in files:
+                        self._benchmark_file(path, run, server)
+
+    def _benchmark_file(self, path: str, run: int, server: MockGeocodingServer):
+        filename = os.path.basename(path)
+        with open(path, 'rb') as f:
+            file_data = f.read()
+
+        server.reset_counts()
+        processor = get_processor(file_data, filename)
+        start = time.monotonic()
+        geojson_data, import_log = processor.process()
+        elapsed = time.monotonic() - start
+
+        features = len(geojson_data.get('features', []))
+        counts = dict(server.request_counts)
+        requests = counts['overpass'] + counts['nominatim']
+        stats = processor._geocode_cache_stats
+        hit_rate = f'{stats.hits / stats.lookups * 100:.0f}%' if stats and stats.lookups else '-'
+        per_feature = f'{requests / features:.2f}' if features else '-'
+
+        self.stdout.write(f'{filename[:32]:<32} {run:>3} {features:>8} {counts["overpass"]:>8} {counts["nominatim"]:>9} '
+                          f'{counts["rate_limited"]:>5} {per_feature:>8} {hit_rate:>8} {elapsed:>8.2f}')
+        if processor._location_tag_grid and processor._location_tag_grid.points:
+            self.stdout.write(f'    {processor._location_tag_grid.summary()}')
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from api.models import ImportQueue, FeatureStore, DatabaseLogging, TagShare, CollectionShare, Collection
+from api.models import ImportQueue, FeatureStore, DatabaseLogging, TagShare, CollectionShare, Collection, UploadBlob
 
 
 class Command(BaseCommand):
@@ -157,6 +157,7 @@ class Command(BaseCommand):
 
             if clear_import_queue and import_queue_count > 0:
                 deleted_count, _ = ImportQueue.objects.all().delete()
+                UploadBlob.objects.all().delete()
                 deleted_counts['import_queue'] = deleted_count
                 self.stdout.write(
                     self.style.SUCCESS(f'Deleted {deleted_count} items from import queue')
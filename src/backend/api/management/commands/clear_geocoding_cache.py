@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.models import GeocodeCache
+from geo_lib.geolocation.geocode_cache import get_geocode_cache
+
+
+class Command(BaseCommand):
+    help = 'Clear the reverse geocoding cache. With --expired, only entries older than geocoding.cache_ttl_days are removed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expired',
+            action='store_true',
+            help='Only delete expired entries',
+        )
+
+    def handle(self, *args, **options):
+        cache = get_geocode_cache()
+        for kind, count in sorted(cache.stats().items()):
+            self.stdout.write(f'{kind}: {count} cached result(s)')
+
+        if options['expired']:
+            deleted = cache.purge_expired()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired geocoding cache entries'))
+        else:
+            deleted, _ = GeocodeCache.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} geocoding cache entries'))
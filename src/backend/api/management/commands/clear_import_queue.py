@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from api.models import ImportQueue, FeatureStore, DatabaseLogging
+from geo_lib.processing.upload_blob_store import delete_unreferenced_upload_blobs
 
 
 class Command(BaseCommand):
@@ -77,6 +78,7 @@ class Command(BaseCommand):
 
             # Delete the items
             deleted_count, _ = items_to_delete.delete()
+            delete_unreferenced_upload_blobs()
             
             self.stdout.write(
                 self.style.SUCCESS(
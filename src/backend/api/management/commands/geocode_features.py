@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import BackgroundJob, FeatureStore, ImportQueue
+from geo_lib.processing.jobs import geocode_job
+from geo_lib.processing.status_tracker import JobType
+from geo_lib.processing.tagging import has_location_tags
+
+
+class Command(BaseCommand):
+    help = ('Queue background geocode jobs. With --pending, resume import queue items whose deferred geocoding '
+            'never finished. With --user, add location tags to that user\'s feature store features that have none.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending',
+            action='store_true',
+            help='Queue jobs for import queue items still marked as waiting for geocoding',
+        )
+        parser.add_argument('--user', help='Username or ID of the user whose features should be geocoded')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of features per geocode job (with --user)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['pending'] and not options['user']:
+            raise CommandError('Use --pending and/or --user')
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            raise CommandError('Reverse geocoding is disabled (geocoding.enabled)')
+
+        if options['pending']:
+            self._queue_pending()
+        if options['user']:
+            self._queue_user_features(self._get_user(options['user']), max(1, options['batch_size']))
+
+        # Without the database queue, jobs run as threads of this process
+        if getattr(settings, 'JOB_QUEUE_BACKEND', 'database') != 'database':
+            self.stdout.write('Waiting for the geocode jobs to finish...')
+            for thread in list(geocode_job._active_threads.values()):
+                thread.join()
+
+    def _queue_pending(self):
+        # Items whose geocode job is still queued or running don't need a new one
+        active = set(BackgroundJob.objects.filter(
+            job_type=JobType.GEOCODE.value,
+            queue_state__in=['new', 'pending', 'running'],
+            import_queue_id__isnull=False
+        ).values_list('import_queue_id', flat=True))
+
+        queued = 0
+        for item_id, user_id in ImportQueue.objects.filter(geocoding_pending=True).values_list('id', 'user_id'):
+            if item_id in active:
+                continue
+            if geocode_job.start_geocode_job(user_id, import_queue_id=item_id):
+                queued += 1
+            else:
+                self.stdout.write(self.style.WARNING(f'Failed to queue geocoding for import queue item {item_id}'))
+        self.stdout.write(self.style.SUCCESS(f'Queued geocoding for {queued} import queue item(s)'))
+
+    def _queue_user_features(self, user, batch_size):
+        feature_ids = []
+        rows = FeatureStore.objects.filter(user=user).order_by('id').values_list('id', 'geojson')
+        for feature_id, geojson in rows.iterator(chunk_size=2000):
+            if isinstance(geojson, dict) and geojson.get('geometry') and not has_location_tags(geojson):
+                feature_ids.append(feature_id)
+
+        jobs = 0
+        for start in range(0, len(feature_ids), batch_size):
+            if geocode_job.start_geocode_job(user.id, feature_ids=feature_ids[start:start + batch_size]):
+                jobs += 1
+        self.stdout.write(self.style.SUCCESS(f'Queued {jobs} geocode job(s) for {len(feature_ids)} feature(s) of {user}'))
+
+    @staticmethod
+    def _get_user(value):
+        users = get_user_model().objects
+        user = users.filter(id=int(value)).first() if value.isdigit() else None
+        user = user or users.filter(username=value).first()
+        if user is None:
+            raise CommandError(f'User not found: {value}')
+        return user
@@ -0,0 +1,213 @@
+import os
+import re
+
+from django.conf import settings
+from django.contrib.gis.gdal import DataSource, GDALException, SpatialReference, CoordTransform
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import GeocodingBoundary
+from geo_lib.geolocation.local_geocode import BOUNDARY_KINDS
+
+# Field mappings for common datasets. Field names are matched case-insensitively.
+PRESETS = {
+    # Natural Earth ne_10m_admin_0_countries
+    'natural-earth-countries': {'kind': 'country', 'name_field': 'NAME', 'code_field': 'ISO_A2_EH'},
+    # Natural Earth ne_10m_admin_1_states_provinces
+    'natural-earth-states': {'kind': 'state', 'name_field': 'name', 'code_field': 'iso_a2', 'subtype_field': 'type_en'},
+    # Natural Earth ne_10m_populated_places (points, used for city proximity)
+    'natural-earth-places': {'kind': 'city', 'name_field': 'NAME', 'code_field': 'ISO_A2', 'subtype_field': 'FEATURECLA'},
+    # Natural Earth ne_10m_lakes
+    'natural-earth-lakes': {'kind': 'water', 'name_field': 'name', 'subtype_field': 'featurecla'},
+    # US Census TIGER/Line counties
+    'census-counties': {'kind': 'county', 'name_field': 'NAMELSAD', 'code_value': 'US'},
+    # US Census TIGER/Line places (incorporated cities and towns)
+    'census-places': {'kind': 'city', 'name_field': 'NAME', 'code_value': 'US', 'subtype_field': 'LSAD'},
+    # USGS PAD-US (Fee or Combined layer)
+    'padus': {'kind': 'protected_area', 'name_field': 'Unit_Nm', 'code_value': 'US', 'subtype_field': 'Des_Tp'},
+    # OpenStreetMap extract (.osm.pbf) read with GDAL's OSM driver, kinds are taken from the tags
+    'osm': {'kind': None, 'layer': 'multipolygons'},
+}
+
+OSM_ADMIN_LEVELS = {'2': 'country', '4': 'state', '6': 'county', '8': 'city'}
+OSM_PLACE_TYPES = {'city', 'town', 'village'}
+OSM_OTHER_TAGS_RE = re.compile(r'"((?:[^"\\]|\\.)*)"=>"((?:[^"\\]|\\.)*)"')
+
+
+def _osm_other_tags(value):
+    """Parse the hstore formatted other_tags field written by GDAL's OSM driver."""
+    return dict(OSM_OTHER_TAGS_RE.findall(value or ''))
+
+
+def _classify_osm(tags):
+    """
+    Get (kind, code, subtype) for an OSM feature, or None if it isn't used for geocoding.
+    """
+    if tags.get('boundary') == 'administrative' and tags.get('admin_level') in OSM_ADMIN_LEVELS:
+        kind = OSM_ADMIN_LEVELS[tags['admin_level']]
+        code = tags.get('ISO3166-1:alpha2', '') if kind == 'country' else ''
+        return kind, code, ''
+    if tags.get('boundary') in ('protected_area', 'national_park') or tags.get('leisure') in ('nature_reserve', 'national_park'):
+        return 'protected_area', '', tags.get('protect_class', '') or tags.get('protection_title', '') or tags.get('leisure', '')
+    if tags.get('natural') == 'water':
+        return 'water', '', tags.get('water', '')
+    if tags.get('place') in OSM_PLACE_TYPES:
+        return 'city', '', tags['place']
+    return None
+
+
+class Command(BaseCommand):
+    help = ('Load boundaries for the local reverse geocoding backend (geocoding.backend: local) from a file GDAL can read '
+            '(Shapefile, GeoPackage, GeoJSON, OSM PBF, ...). Use --preset for known datasets or map the fields yourself.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Dataset file to load')
+        parser.add_argument(
+            '--preset',
+            choices=sorted(PRESETS),
+            help='Field mapping for a known dataset',
+        )
+        parser.add_argument(
+            '--kind',
+            choices=BOUNDARY_KINDS,
+            help='Kind of boundary in the file (overrides the preset)',
+        )
+        parser.add_argument('--name-field', help='Field holding the boundary name')
+        parser.add_argument('--code-field', help='Field holding the ISO country code')
+        parser.add_argument('--code', dest='code_value', help='Country code to use for every boundary in the file')
+        parser.add_argument('--subtype-field', help='Field holding the protected area designation, water type or place type')
+        parser.add_argument('--layer', help='Layer name or index to read (default: first layer)')
+        parser.add_argument('--source', help='Dataset label stored with each boundary (default: file name)')
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Delete boundaries previously loaded with the same --source first',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'BULK_CREATE_BATCH_SIZE', 1000),
+            help='Number of boundaries inserted per query',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        mapping = dict(PRESETS.get(options['preset'], {}))
+        for key in ('kind', 'name_field', 'code_field', 'code_value', 'subtype_field', 'layer'):
+            if options[key]:
+                mapping[key] = options[key]
+        is_osm = options['preset'] == 'osm'
+
+        if not is_osm:
+            if not mapping.get('kind'):
+                raise CommandError('--kind is required without a --preset')
+            if not mapping.get('name_field'):
+                raise CommandError('--name-field is required without a --preset')
+
+        try:
+            data_source = DataSource(path)
+        except GDALException as e:
+            raise CommandError(f'Could not open {path}: {e}')
+
+        layer_key = mapping.get('layer', 0)
+        if isinstance(layer_key, str) and layer_key.isdigit():
+            layer_key = int(layer_key)
+        try:
+            layer = data_source[layer_key]
+        except (IndexError, KeyError, GDALException):
+            raise CommandError(f'Layer {layer_key} not found, available layers: {", ".join(l.name for l in data_source)}')
+
+        fields = {field.lower(): field for field in layer.fields}
+
+        def resolve(field_key, required=False):
+            field = mapping.get(field_key)
+            if not field:
+                return None
+            if field.lower() not in fields:
+                if required:
+                    raise CommandError(f'Field "{field}" not found in layer {layer.name}, available fields: {", ".join(layer.fields)}')
+                self.stdout.write(self.style.WARNING(f'Field "{field}" not found in layer {layer.name}, ignoring it'))
+                return None
+            return fields[field.lower()]
+
+        name_field = 'name' if is_osm else resolve('name_field', required=True)
+        code_field = resolve('code_field')
+        subtype_field = resolve('subtype_field')
+        osm_tag_fields = [field for field in layer.fields if field != 'other_tags'] if is_osm else []
+
+        transform = None
+        if layer.srs is not None and layer.srs.srid != 4326:
+            transform = CoordTransform(layer.srs, SpatialReference(4326))
+
+        source = (options['source'] or os.path.basename(path))[:64]
+        batch_size = max(1, options['batch_size'])
+        loaded = skipped = 0
+
+        with transaction.atomic():
+            if options['replace']:
+                deleted, _ = GeocodingBoundary.objects.filter(source=source).delete()
+                self.stdout.write(f'Deleted {deleted} boundaries previously loaded from {source}')
+
+            batch = []
+            for feature in layer:
+                name = (feature.get(name_field) or '') if name_field in layer.fields else ''
+                if is_osm:
+                    tags = {field: feature.get(field) for field in osm_tag_fields}
+                    if 'other_tags' in layer.fields:
+                        tags.update(_osm_other_tags(feature.get('other_tags')))
+                    classified = _classify_osm({key: str(value) for key, value in tags.items() if value})
+                    if classified is None:
+                        skipped += 1
+                        continue
+                    kind, code, subtype = classified
+                else:
+                    kind = mapping['kind']
+                    code = feature.get(code_field) if code_field else mapping.get('code_value', '')
+                    subtype = feature.get(subtype_field) if subtype_field else ''
+
+                geometry = self._to_geos(feature.geom, transform)
+                if geometry is None or (not name and kind != 'water'):
+                    skipped += 1
+                    continue
+
+                code = str(code or '').strip()
+                batch.append(GeocodingBoundary(
+                    kind=kind,
+                    name=str(name).strip(),
+                    # Natural Earth uses -99 for missing codes
+                    code='' if code == '-99' else code[:16],
+                    subtype=str(subtype or '').strip()[:64],
+                    source=source,
+                    geometry=geometry,
+                ))
+                if len(batch) >= batch_size:
+                    GeocodingBoundary.objects.bulk_create(batch)
+                    loaded += len(batch)
+                    batch = []
+                    self.stdout.write(f'Loaded {loaded} boundaries...')
+
+            if batch:
+                GeocodingBoundary.objects.bulk_create(batch)
+                loaded += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Loaded {loaded} boundaries from {path} as "{source}" ({skipped} skipped)'))
+
+    @staticmethod
+    def _to_geos(ogr_geometry, transform):
+        """Convert a feature geometry to a valid 2D GEOS geometry in EPSG:4326, or None if it can't be used."""
+        if ogr_geometry is None:
+            return None
+        geometry = ogr_geometry.clone()
+        if transform is not None:
+            geometry.transform(transform)
+        geometry.coord_dim = 2
+        geometry = geometry.geos
+        if geometry.empty:
+            return None
+        if not geometry.valid:
+            geometry = geometry.make_valid()
+        geometry.srid = 4326
+        return geometry
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from api.models import ImportQueue, FeatureStore, DatabaseLogging
+from api.models import ImportQueue, FeatureStore, DatabaseLogging, UploadBlob
 
 
 class Command(BaseCommand):
@@ -54,6 +54,7 @@ class Command(BaseCommand):
                         self.stdout.write(f'Would delete {import_count} items from import queue')
                     else:
                         deleted_count, _ = ImportQueue.objects.all().delete()
+                        UploadBlob.objects.all().delete()
                         self.stdout.write(
                             self.style.SUCCESS(
                                 f'Successfully deleted {deleted_count} items from import queue'
@@ -0,0 +1,79 @@
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _worker_main():
+    """Entry point of a forked worker process."""
+    from geo_lib.processing.jobs.worker import JobWorker
+
+    worker = JobWorker()
+
+    def handle_signal(signum, frame):
+        # Finish the current job, then exit
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    worker.run()
+
+
+class Command(BaseCommand):
+    help = 'Start worker processes that run queued background jobs (uploads, deletes, bulk imports). Requires processing.job_queue_backend to be "database".'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', '-n',
+            type=int,
+            default=getattr(settings, 'JOB_WORKER_PROCESSES', 2),
+            help='Number of worker processes to start',
+        )
+
+    def handle(self, *args, **options):
+        if getattr(settings, 'JOB_QUEUE_BACKEND', 'database') != 'database':
+            raise CommandError('Job workers are only used when processing.job_queue_backend is "database"')
+
+        num_processes = options['processes']
+        if num_processes < 1:
+            raise CommandError('--processes must be at least 1')
+
+        # Forked children must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+
+        stopping = False
+
+        def handle_signal(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
+
+        def start_worker():
+            process = context.Process(target=_worker_main, daemon=False)
+            process.start()
+            return process
+
+        workers = [start_worker() for _ in range(num_processes)]
+        self.stdout.write(self.style.SUCCESS(f'Started {num_processes} job worker process(es)'))
+
+        # Restart workers that die until asked to stop
+        while not stopping:
+            for i, process in enumerate(workers):
+                if not process.is_alive() and not stopping:
+                    self.stdout.write(self.style.WARNING(f'Job worker process {process.pid} exited with code {process.exitcode}, restarting'))
+                    workers[i] = start_worker()
+            time.sleep(1)
+
+        self.stdout.write('Stopping job workers, waiting for running jobs to finish...')
+        for process in workers:
+            if process.is_alive():
+                process.terminate()  # SIGTERM, workers exit after their current job
+        for process in workers:
+            process.join()
+        self.stdout.write(self.style.SUCCESS('Job workers stopped'))
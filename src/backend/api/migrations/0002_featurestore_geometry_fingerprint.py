@@ -0,0 +1,57 @@
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+# Frozen copy of geo_lib.feature_id.get_geometry_fingerprint() as it was when this migration
+# was written, so later changes to it don't change what the migration does.
+
+def _round_coordinates(coords):
+    if coords and isinstance(coords[0], (int, float)):
+        return [round(float(coord), 6) + 0.0 for coord in coords]
+    return [_round_coordinates(coord) for coord in coords]
+
+
+def _get_geometry_fingerprint(feature):
+    geometry = feature.get('geometry') or {}
+    geom_type = geometry.get('type', '')
+    coordinates = geometry.get('coordinates')
+    if not geom_type or not coordinates:
+        return None
+    fingerprint_data = json.dumps([geom_type.lower(), _round_coordinates(coordinates)], separators=(',', ':'))
+    return hashlib.sha256(fingerprint_data.encode('utf-8')).hexdigest()
+
+
+def backfill_geometry_fingerprints(apps, schema_editor):
+    FeatureStore = apps.get_model('api', 'FeatureStore')
+    batch_size = 1000
+    batch = []
+    for feature in FeatureStore.objects.only('id', 'geojson').iterator(chunk_size=batch_size):
+        feature.geometry_fingerprint = _get_geometry_fingerprint(feature.geojson or {})
+        batch.append(feature)
+        if len(batch) >= batch_size:
+            FeatureStore.objects.bulk_update(batch, ['geometry_fingerprint'])
+            batch = []
+    if batch:
+        FeatureStore.objects.bulk_update(batch, ['geometry_fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featurestore',
+            name='geometry_fingerprint',
+            field=models.CharField(blank=True, help_text='SHA-256 hash of the geometry type and coordinates rounded to 6 decimal places', max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_geometry_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='featurestore',
+            index=models.Index(fields=['user', 'geometry_fingerprint'], name='fs_user_geom_fp'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_featurestore_geometry_fingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('job_id', models.CharField(max_length=36, primary_key=True, serialize=False)),
+                ('job_type', models.CharField(help_text='JobType value (upload, delete, bulk_import, bulk_delete)', max_length=32)),
+                ('filename', models.TextField(blank=True, default='')),
+                ('status', models.CharField(default='uploaded', help_text='ProcessingStatus value', max_length=16)),
+                ('progress', models.FloatField(default=0.0)),
+                ('message', models.TextField(blank=True, default='')),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('result_data', models.JSONField(blank=True, null=True)),
+                ('import_queue_id', models.IntegerField(blank=True, null=True)),
+                ('queue_state', models.CharField(default='new', help_text='new (not started), pending (waiting for a worker), running or done', max_length=16)),
+                ('job_kwargs', models.JSONField(default=dict, help_text='JSON serializable job parameters')),
+                ('payload', models.BinaryField(blank=True, help_text='Binary job parameters (e.g. uploaded file data), cleared when the job finishes', null=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('worker_id', models.CharField(blank=True, max_length=128, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queue_state', 'created_at'], name='bgjob_state_created'), models.Index(fields=['user', 'created_at'], name='bgjob_user_created')],
+            },
+        ),
+    ]
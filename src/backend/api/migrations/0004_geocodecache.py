@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(help_text='Grid cell key, see geo_lib.geolocation.geocode_cache.cell_key()', max_length=64)),
+                ('kind', models.CharField(help_text='Lookup kind (admin, city, water, protected_areas, lakes:<miles>)', max_length=32)),
+                ('result', models.JSONField(blank=True, help_text='Parsed lookup result, null if nothing was found', null=True)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='geocache_updated')],
+                'constraints': [models.UniqueConstraint(fields=('cell', 'kind'), name='geocache_cell_kind')],
+            },
+        ),
+    ]
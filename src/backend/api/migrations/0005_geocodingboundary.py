@@ -0,0 +1,30 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_geocodecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodingBoundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='country, state, county, city, protected_area or water', max_length=16)),
+                ('name', models.TextField()),
+                ('code', models.CharField(blank=True, default='', help_text='ISO country code (countries, and the country of states/counties if known)', max_length=16)),
+                ('subtype', models.CharField(blank=True, default='', help_text='Protected area class/designation, water type or place type', max_length=64)),
+                ('source', models.CharField(help_text='Dataset the boundary was loaded from', max_length=64)),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(srid=4326)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['kind'], name='geobound_kind'),
+                    models.Index(fields=['source'], name='geobound_source'),
+                ],
+            },
+        ),
+    ]
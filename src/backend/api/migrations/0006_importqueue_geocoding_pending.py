@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_geocodingboundary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importqueue',
+            name='geocoding_pending',
+            field=models.BooleanField(default=False, help_text='True while a background geocode job is adding location tags to the features'),
+        ),
+    ]
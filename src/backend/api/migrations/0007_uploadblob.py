@@ -0,0 +1,62 @@
+import base64
+import binascii
+import hashlib
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_raw_files_to_blobs(apps, schema_editor):
+    """Move the raw_file text of existing items into UploadBlob rows."""
+    ImportQueue = apps.get_model('api', 'ImportQueue')
+    UploadBlob = apps.get_model('api', 'UploadBlob')
+
+    items = ImportQueue.objects.filter(raw_blob__isnull=True).exclude(raw_file='').only('id', 'original_filename', 'raw_file')
+    for item in items.iterator(chunk_size=50):
+        data = item.raw_file.encode('utf-8')
+        if item.original_filename.lower().endswith('.kmz'):
+            # Binary uploads were stored base64 encoded
+            try:
+                data = base64.b64decode(item.raw_file, validate=True)
+            except (binascii.Error, ValueError):
+                pass
+        sha256 = hashlib.sha256(data).hexdigest()
+        if not UploadBlob.objects.filter(sha256=sha256).exists():
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                UploadBlob.objects.create(sha256=sha256, data=compressed, compression='zlib', size=len(data))
+            else:
+                UploadBlob.objects.create(sha256=sha256, data=data, compression='none', size=len(data))
+        ImportQueue.objects.filter(id=item.id).update(raw_blob_id=sha256, raw_file='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_importqueue_geocoding_pending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadBlob',
+            fields=[
+                ('sha256', models.CharField(help_text='SHA-256 hash of the uncompressed file content', max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField(help_text='File content, compressed with `compression`')),
+                ('compression', models.CharField(default='zlib', help_text='zlib or none', max_length=8)),
+                ('size', models.BigIntegerField(help_text='Uncompressed size in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='importqueue',
+            name='raw_file',
+            field=models.TextField(blank=True, default='', help_text='Legacy raw file content, new uploads are stored in raw_blob'),
+        ),
+        migrations.AddField(
+            model_name='importqueue',
+            name='raw_blob',
+            field=models.ForeignKey(blank=True, help_text='Raw file content (KML, KMZ, GPX, etc.)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='import_queue_items', to='api.uploadblob'),
+        ),
+        migrations.RunPython(move_raw_files_to_blobs, migrations.RunPython.noop),
+    ]
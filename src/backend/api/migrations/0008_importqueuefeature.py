@@ -0,0 +1,145 @@
+import hashlib
+import json
+import math
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of geo_lib.feature_id.get_geometry_fingerprint() and
+# geo_lib.processing.import_staging.review_sort_key() as they were when this migration was written,
+# so later changes to those functions don't change what the migration does.
+
+_COORDINATE_DEPTHS = {
+    'point': 0,
+    'multipoint': 1,
+    'linestring': 1,
+    'multilinestring': 2,
+    'polygon': 2,
+    'multipolygon': 3,
+}
+
+
+def _round_coordinates(coords):
+    if coords and isinstance(coords[0], (int, float)):
+        return [round(float(coord), 6) + 0.0 for coord in coords]
+    return [_round_coordinates(coord) for coord in coords]
+
+
+def _get_geometry_fingerprint(feature):
+    geometry = feature.get('geometry') or {}
+    geom_type = geometry.get('type', '')
+    coordinates = geometry.get('coordinates')
+    if not geom_type or not coordinates:
+        return None
+    fingerprint_data = json.dumps([geom_type.lower(), _round_coordinates(coordinates)], separators=(',', ':'))
+    return hashlib.sha256(fingerprint_data.encode('utf-8')).hexdigest()
+
+
+def _iter_points(coordinates, depth):
+    if not isinstance(coordinates, list):
+        return
+    if depth == 0:
+        if len(coordinates) >= 2:
+            yield coordinates
+        return
+    for item in coordinates:
+        yield from _iter_points(item, depth - 1)
+
+
+def _review_sort_key(feature):
+    """(-lat, lon) of the bounding box center, (inf, inf) without a usable geometry."""
+    geometry = feature.get('geometry') or {}
+    depth = _COORDINATE_DEPTHS.get((geometry.get('type') or '').lower())
+    coordinates = geometry.get('coordinates')
+    if depth is None or not coordinates:
+        return math.inf, math.inf
+    try:
+        points = list(_iter_points(coordinates, depth))
+        lons = [point[0] for point in points if isinstance(point[0], (int, float))]
+        lats = [point[1] for point in points if isinstance(point[1], (int, float))]
+    except (TypeError, IndexError, ValueError):
+        return math.inf, math.inf
+    if not lons or not lats:
+        return math.inf, math.inf
+    return -(min(lats) + max(lats)) / 2.0, (min(lons) + max(lons)) / 2.0
+
+
+def move_geofeatures_to_rows(apps, schema_editor):
+    """Move the geofeatures arrays of queued items into ImportQueueFeature rows."""
+    ImportQueue = apps.get_model('api', 'ImportQueue')
+    ImportQueueFeature = apps.get_model('api', 'ImportQueueFeature')
+
+    items = ImportQueue.objects.filter(imported=False).only('id', 'geofeatures', 'duplicate_features')
+    for item in items.iterator(chunk_size=10):
+        duplicates_by_fingerprint = {}
+        for duplicate_info in item.duplicate_features or []:
+            fingerprint = _get_geometry_fingerprint(duplicate_info.get('feature') or {})
+            if fingerprint and fingerprint not in duplicates_by_fingerprint:
+                duplicates_by_fingerprint[fingerprint] = [{
+                    'id': existing.get('id'),
+                    'name': existing.get('name'),
+                    'type': existing.get('type'),
+                    'timestamp': existing.get('timestamp')
+                } for existing in duplicate_info.get('existing_features', [])]
+
+        rows = []
+        # Error markers of unparsable files aren't features, the unparsable flag is kept
+        features = [feature for feature in item.geofeatures or [] if isinstance(feature, dict) and 'error' not in feature]
+        for index, feature in enumerate(features):
+            sort_lat, sort_lon = _review_sort_key(feature)
+            fingerprint = _get_geometry_fingerprint(feature)
+            existing_features = duplicates_by_fingerprint.get(fingerprint) if fingerprint else None
+            feature_id = (feature.get('properties') or {}).get('id')
+            rows.append(ImportQueueFeature(
+                import_queue_id=item.id,
+                feature_index=index,
+                feature_id=str(feature_id) if feature_id is not None else None,
+                feature=feature,
+                sort_lat=sort_lat,
+                sort_lon=sort_lon,
+                fingerprint=fingerprint,
+                is_duplicate=existing_features is not None,
+                existing_features=existing_features or [],
+            ))
+        ImportQueueFeature.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_uploadblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportQueueFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature_index', models.IntegerField(help_text='Position of the feature in the processed file')),
+                ('feature_id', models.TextField(blank=True, help_text='properties.id of the feature', null=True)),
+                ('feature', models.JSONField()),
+                ('sort_lat', models.FloatField(help_text='Negated latitude of the bounding box center (review order), Infinity without geometry')),
+                ('sort_lon', models.FloatField(help_text='Longitude of the bounding box center, Infinity without geometry')),
+                ('fingerprint', models.CharField(blank=True, help_text='Geometry fingerprint, see geo_lib.feature_id.generate_geometry_fingerprint()', max_length=64, null=True)),
+                ('is_duplicate', models.BooleanField(default=False, help_text='True if the geometry matches features already in the feature store')),
+                ('existing_features', models.JSONField(default=list, help_text='The feature store features this one duplicates')),
+                ('import_queue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staged_features', to='api.importqueue')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['import_queue', 'sort_lat', 'sort_lon', 'feature_index'], name='iqfeature_review_order'),
+                    models.Index(fields=['import_queue', 'feature_id'], name='iqfeature_feature_id'),
+                ],
+                'constraints': [models.UniqueConstraint(fields=('import_queue', 'feature_index'), name='iqfeature_queue_index')],
+            },
+        ),
+        migrations.RunPython(move_geofeatures_to_rows, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='importqueue',
+            name='geofeatures',
+        ),
+        migrations.RemoveField(
+            model_name='importqueue',
+            name='duplicate_features',
+        ),
+    ]
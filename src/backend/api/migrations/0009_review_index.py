@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_importqueuefeature'),
+    ]
+
+    # Existing items keep a null review index, it's built when their first page is read
+    operations = [
+        migrations.AddField(
+            model_name='importqueue',
+            name='review_index',
+            field=models.JSONField(blank=True, help_text='Number of staged features and review positions of the duplicates, null when it has to be rebuilt. See geo_lib.processing.import_staging', null=True),
+        ),
+        migrations.AddField(
+            model_name='importqueuefeature',
+            name='review_position',
+            field=models.IntegerField(blank=True, help_text='Position of the feature in review order (by sort key)', null=True),
+        ),
+        migrations.RemoveIndex(
+            model_name='importqueuefeature',
+            name='iqfeature_review_order',
+        ),
+        migrations.AddIndex(
+            model_name='importqueuefeature',
+            index=models.Index(fields=['import_queue', 'review_position'], name='iqfeature_review_position'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def count_staged_features(apps, schema_editor):
+    ImportQueue = apps.get_model('api', 'ImportQueue')
+    ImportQueueFeature = apps.get_model('api', 'ImportQueueFeature')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"""
+            UPDATE {ImportQueue._meta.db_table} q
+            SET feature_count = counts.feature_count
+            FROM (
+                SELECT import_queue_id, COUNT(*) AS feature_count
+                FROM {ImportQueueFeature._meta.db_table}
+                GROUP BY import_queue_id
+            ) counts
+            WHERE q.id = counts.import_queue_id
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_review_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importqueue',
+            name='feature_count',
+            field=models.IntegerField(default=0, help_text="Number of staged features, kept when the features are staged so the queue listing doesn't count them"),
+        ),
+        migrations.RunPython(count_staged_features, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_importqueue_feature_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='job_type',
+            field=models.CharField(help_text='JobType value (upload, delete, import, bulk_import, bulk_delete, geocode, bulk_retag)', max_length=32),
+        ),
+    ]
@@ -6,20 +6,43 @@ from django.contrib.postgres.indexes import GistIndex
 from django.db import models as django_models
 
 
+class UploadBlob(django_models.Model):
+    """
+    Raw uploaded file, stored once per content hash and shared by every ImportQueue item with the same content.
+    See geo_lib.processing.upload_blob_store.
+    """
+    sha256 = django_models.CharField(max_length=64, primary_key=True, help_text="SHA-256 hash of the uncompressed file content")
+    data = django_models.BinaryField(help_text="File content, compressed with `compression`")
+    compression = django_models.CharField(max_length=8, default='zlib', help_text="zlib or none")
+    size = django_models.BigIntegerField(help_text="Uncompressed size in bytes")
+    created_at = django_models.DateTimeField(auto_now_add=True)
+
+
+class ImportQueueManager(django_models.Manager):
+    def get_queryset(self):
+        # Raw file content of items from before UploadBlob, only loaded when it's accessed
+        return super().get_queryset().defer('raw_file')
+
+
 class ImportQueue(django_models.Model):
     id = django_models.AutoField(primary_key=True)
     user = django_models.ForeignKey(get_user_model(), on_delete=django_models.CASCADE)
     imported = django_models.BooleanField(default=False)
     unparsable = django_models.BooleanField(default=False, help_text="True if the file failed to parse and should not be retried")
-    geofeatures = django_models.JSONField(default=list)
-    duplicate_features = django_models.JSONField(default=list, help_text="Features that are duplicates of existing features in the feature store")
     original_filename = django_models.TextField()
-    raw_file = django_models.TextField(help_text="Raw file content (KML, KMZ, GPX, etc.)")
+    raw_file = django_models.TextField(blank=True, default='', help_text="Legacy raw file content, new uploads are stored in raw_blob")
+    raw_blob = django_models.ForeignKey(UploadBlob, null=True, blank=True, on_delete=django_models.PROTECT, related_name='import_queue_items',
+                                        help_text="Raw file content (KML, KMZ, GPX, etc.)")
     geojson_hash = django_models.CharField(max_length=64, null=True, blank=True, help_text="SHA-256 hash of the raw file content for duplicate detection")
     log_id = django_models.UUIDField(default=uuid.uuid4, unique=True, help_text="UUID to group related log entries", null=True)
     replacement = django_models.IntegerField(null=True, blank=True, help_text="ID of the existing feature being updated with this replacement upload")
+    geocoding_pending = django_models.BooleanField(default=False, help_text="True while a background geocode job is adding location tags to the features")
+    feature_count = django_models.IntegerField(default=0, help_text="Number of staged features, kept when the features are staged so the queue listing doesn't count them")
+    review_index = django_models.JSONField(null=True, blank=True, help_text="Number of staged features and review positions of the duplicates, null when it has to be rebuilt. See geo_lib.processing.import_staging")
     timestamp = django_models.DateTimeField(auto_now_add=True)
 
+    objects = ImportQueueManager()
+
     class Meta:
         indexes = [
             # Compound index for user-specific import queue queries
@@ -31,6 +54,34 @@ class ImportQueue(django_models.Model):
         ]
 
 
+class ImportQueueFeature(django_models.Model):
+    """
+    Processed feature of an import queue item, one row per feature. See geo_lib.processing.import_staging.
+    Deleted once the item is imported.
+    """
+    import_queue = django_models.ForeignKey(ImportQueue, on_delete=django_models.CASCADE, related_name='staged_features')
+    feature_index = django_models.IntegerField(help_text="Position of the feature in the processed file")
+    feature_id = django_models.TextField(null=True, blank=True, help_text="properties.id of the feature")
+    feature = django_models.JSONField()
+    sort_lat = django_models.FloatField(help_text="Negated latitude of the bounding box center (review order), Infinity without geometry")
+    sort_lon = django_models.FloatField(help_text="Longitude of the bounding box center, Infinity without geometry")
+    fingerprint = django_models.CharField(max_length=64, null=True, blank=True, help_text="Geometry fingerprint, see geo_lib.feature_id.generate_geometry_fingerprint()")
+    is_duplicate = django_models.BooleanField(default=False, help_text="True if the geometry matches features already in the feature store")
+    existing_features = django_models.JSONField(default=list, help_text="The feature store features this one duplicates")
+    review_position = django_models.IntegerField(null=True, blank=True, help_text="Position of the feature in review order (by sort key)")
+
+    class Meta:
+        constraints = [
+            django_models.UniqueConstraint(fields=['import_queue', 'feature_index'], name='iqfeature_queue_index'),
+        ]
+        indexes = [
+            # Review pages, ranges of positions in spatial order
+            django_models.Index(fields=['import_queue', 'review_position'], name='iqfeature_review_position'),
+            # Edits by feature ID
+            django_models.Index(fields=['import_queue', 'feature_id'], name='iqfeature_feature_id'),
+        ]
+
+
 class FeatureStore(models.Model):
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
@@ -38,6 +89,7 @@ class FeatureStore(models.Model):
     geojson = models.JSONField(null=False)
     file_hash = models.CharField(max_length=64, unique=True, null=True, blank=True, help_text="SHA-256 hash of the feature's GeoJSON content")
     geometry = models.GeometryField(null=True, blank=True, dim=3)  # Spatial field for efficient queries, supports 3D
+    geometry_fingerprint = models.CharField(max_length=64, null=True, blank=True, help_text="SHA-256 hash of the geometry type and coordinates rounded to 6 decimal places")
     timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -66,6 +118,10 @@ class FeatureStore(models.Model):
             # 4. Hash + Timestamp for hash-based chronological queries
             # Optimizes duplicate detection with temporal ordering
             models.Index(fields=['file_hash', 'timestamp'], name='fs_hash_time'),
+
+            # 5. User + Geometry fingerprint for coordinate duplicate detection
+            # Optimizes queries like: user_id=user_id, geometry_fingerprint__in=fingerprints
+            models.Index(fields=['user', 'geometry_fingerprint'], name='fs_user_geom_fp'),
         ]
 
 
@@ -153,3 +209,75 @@ class Collection(django_models.Model):
         indexes = [
             django_models.Index(fields=['user', 'created_at'], name='collection_user_created'),
         ]
+
+
+class BackgroundJob(django_models.Model):
+    """
+    Durable job record shared by the web and worker processes.
+    Holds the job's status/progress (see ProcessingStatusTracker) and its queued parameters.
+    """
+    job_id = django_models.CharField(max_length=36, primary_key=True)
+    job_type = django_models.CharField(max_length=32, help_text="JobType value (upload, delete, import, bulk_import, bulk_delete, geocode, bulk_retag)")
+    user = django_models.ForeignKey(get_user_model(), on_delete=django_models.CASCADE)
+    filename = django_models.TextField(blank=True, default='')
+    status = django_models.CharField(max_length=16, default='uploaded', help_text="ProcessingStatus value")
+    progress = django_models.FloatField(default=0.0)
+    message = django_models.TextField(blank=True, default='')
+    error_message = django_models.TextField(null=True, blank=True)
+    result_data = django_models.JSONField(null=True, blank=True)
+    import_queue_id = django_models.IntegerField(null=True, blank=True)
+    queue_state = django_models.CharField(max_length=16, default='new', help_text="new (not started), pending (waiting for a worker), running or done")
+    job_kwargs = django_models.JSONField(default=dict, help_text="JSON serializable job parameters")
+    payload = django_models.BinaryField(null=True, blank=True, help_text="Binary job parameters (e.g. uploaded file data), cleared when the job finishes")
+    attempts = django_models.IntegerField(default=0)
+    worker_id = django_models.CharField(max_length=128, null=True, blank=True)
+    heartbeat_at = django_models.DateTimeField(null=True, blank=True)
+    created_at = django_models.DateTimeField(auto_now_add=True)
+    started_at = django_models.DateTimeField(null=True, blank=True)
+    completed_at = django_models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest pending job
+            django_models.Index(fields=['queue_state', 'created_at'], name='bgjob_state_created'),
+            django_models.Index(fields=['user', 'created_at'], name='bgjob_user_created'),
+        ]
+
+
+class GeocodeCache(django_models.Model):
+    """
+    Cached reverse geocoding result for a grid cell.
+    Each lookup kind (admin boundaries, city, protected areas, lakes, ...) is stored in its own row.
+    """
+    cell = django_models.CharField(max_length=64, help_text="Grid cell key, see geo_lib.geolocation.geocode_cache.cell_key()")
+    kind = django_models.CharField(max_length=32, help_text="Lookup kind (admin, city, water, protected_areas, lakes:<miles>)")
+    result = django_models.JSONField(null=True, blank=True, help_text="Parsed lookup result, null if nothing was found")
+    updated_at = django_models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            django_models.UniqueConstraint(fields=['cell', 'kind'], name='geocache_cell_kind'),
+        ]
+        indexes = [
+            # Optimizes expiring old entries
+            django_models.Index(fields=['updated_at'], name='geocache_updated'),
+        ]
+
+
+class GeocodingBoundary(models.Model):
+    """
+    Boundary polygon (or place point) used by the local reverse geocoding backend.
+    Loaded from local datasets with `manage.py load_geocoding_boundaries`.
+    """
+    kind = models.CharField(max_length=16, help_text="country, state, county, city, protected_area or water")
+    name = models.TextField()
+    code = models.CharField(max_length=16, blank=True, default='', help_text="ISO country code (countries, and the country of states/counties if known)")
+    subtype = models.CharField(max_length=64, blank=True, default='', help_text="Protected area class/designation, water type or place type")
+    source = models.CharField(max_length=64, help_text="Dataset the boundary was loaded from")
+    geometry = models.GeometryField(srid=4326)  # spatial_index=True creates the GiST index
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind'], name='geobound_kind'),
+            models.Index(fields=['source'], name='geobound_source'),
+        ]
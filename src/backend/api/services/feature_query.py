@@ -0,0 +1,89 @@
+"""
+Feature store queries shared by the map views and the background jobs.
+"""
+
+import uuid
+
+from django.db.models import QuerySet, Q
+
+from api.models import FeatureStore, Collection
+
+
+def _build_collection_query(user_id: int, collection_id: uuid.UUID) -> QuerySet:
+    """
+    Build query for features in a collection.
+    Returns features matching ANY of the collection's tags (OR logic) OR in feature_ids.
+    
+    Args:
+        user_id: User ID to filter features by
+        collection_id: Collection ID to filter features by
+    
+    Returns:
+        QuerySet ready for further filtering
+    """
+    try:
+        collection = Collection.objects.get(id=collection_id, user_id=user_id)
+    except Collection.DoesNotExist:
+        # Return empty queryset if collection doesn't exist
+        return FeatureStore.objects.none()
+    
+    # Start with base user filter
+    base_query = FeatureStore.objects.filter(user_id=user_id).exclude(geometry__isnull=True)
+    
+    # Build query for features matching collection criteria
+    # Union of: features matching ANY collection tag OR features in feature_ids
+    feature_ids_set = set()
+    
+    # 1. Get features matching ANY of the collection's tags (OR logic)
+    if collection.tags:
+        tag_query = Q()
+        for tag in collection.tags:
+            if tag:  # Only process non-empty tags
+                tag_query |= Q(geojson__properties__tags__contains=[tag])
+        
+        if tag_query:
+            tag_features = base_query.filter(tag_query).values_list('id', flat=True)
+            feature_ids_set.update(tag_features)
+    
+    # 2. Add individually selected features
+    if collection.feature_ids:
+        # Verify these features belong to the user
+        user_feature_ids = set(
+            FeatureStore.objects.filter(user_id=user_id, id__in=collection.feature_ids)
+            .values_list('id', flat=True)
+        )
+        feature_ids_set.update(user_feature_ids)
+    
+    # Filter by the combined set of feature IDs
+    if feature_ids_set:
+        return base_query.filter(id__in=feature_ids_set).order_by('id')
+    else:
+        # No features match the collection criteria
+        return FeatureStore.objects.none()
+
+
+def build_feature_query(user_id: int, tag: str | None = None, collection_id: uuid.UUID | None = None) -> QuerySet:
+    """
+    Build base query for features with user filter, geometry exclusion, optional tag filter, 
+    optional collection filter, and ordering.
+    
+    Args:
+        user_id: User ID to filter features by
+        tag: Optional tag to filter features by (if None, no tag filter is applied)
+        collection_id: Optional collection ID to filter features by (if None, no collection filter is applied)
+    
+    Returns:
+        QuerySet ready for further filtering
+    """
+    # Collection filter takes precedence if provided
+    if collection_id is not None:
+        return _build_collection_query(user_id, collection_id)
+    
+    base_query = FeatureStore.objects.filter(user_id=user_id).exclude(geometry__isnull=True)
+    
+    # Add tag filter if provided
+    if tag:
+        base_query = base_query.filter(geojson__properties__tags__contains=[tag])
+    
+    # Order by id to ensure consistent results when slicing
+    return base_query.order_by('id')
@@ -10,6 +10,7 @@ from django.db import connections
 from django.utils import timezone
 
 from api.models import ImportQueue
+from geo_lib.processing.upload_blob_store import delete_unreferenced_upload_blobs
 from geo_lib.logging.console import get_job_logger
 
 logger = get_job_logger()
@@ -74,6 +75,7 @@ class ReplacementCleanupService:
             rows_to_delete = list(orphaned_rows)
 
             deleted_count, _ = orphaned_rows.delete()
+            delete_unreferenced_upload_blobs(row.raw_blob_id for row in rows_to_delete)
 
             # Only log if something was actually deleted
             if deleted_count > 0:
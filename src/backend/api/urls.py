@@ -1,6 +1,6 @@
 from django.urls import path
 
-from api.views.bbox_query import get_geojson_data
+from api.views.bbox_query import get_geojson_data, get_feature_tile
 from api.views.config import get_config
 from api.views.feature_delete import delete_feature
 from api.views.feature_retrieval import get_feature
@@ -10,7 +10,8 @@ from api.views.geolocation_api import get_user_location, get_location_by_ip
 from api.views.icon_management import serve_user_icon, serve_system_icon, upload_icon, recolor_icon, serve_icon_registry
 from api.views.import_item import upload_item, get_processing_status, get_user_processing_jobs, delete_import_item, update_import_item, fetch_import_history_item, \
     import_to_featurestore, get_import_queue_item_features
-from api.views.sharing import create_share, list_shares, delete_share, get_public_share_info, get_public_share, create_collection_share, get_public_collection_share
+from api.views.sharing import create_share, list_shares, delete_share, get_public_share_info, get_public_share, create_collection_share, get_public_collection_share, \
+    get_public_share_tile, get_public_collection_share_tile
 from api.views.collections import list_collections, create_collection, get_collection, update_collection, delete_collection, get_collection_features
 
 urlpatterns = [
@@ -24,6 +25,8 @@ urlpatterns = [
     path('item/import/perform/<int:item_id>', import_to_featurestore),
     # GeoJSON API endpoints
     path('geojson/', get_geojson_data),
+    # Vector tile endpoints
+    path('tiles/features/<int:z>/<int:x>/<int:y>.mvt', get_feature_tile),
     path('features/by-tag/', get_features_by_tag),
     path('features/search/', search_features),
     path('features/filter-by-tags/', filter_features_by_tags),
@@ -53,9 +56,11 @@ urlpatterns = [
     path('sharing/<str:share_id>/', delete_share),
     path('sharing/public/info/<str:share_id>/', get_public_share_info),
     path('sharing/public/<str:share_id>/', get_public_share),
+    path('sharing/public/<str:share_id>/tiles/<int:z>/<int:x>/<int:y>.mvt', get_public_share_tile),
     # Collection sharing API endpoints
     path('sharing/collections/create/', create_collection_share),
     path('sharing/public/collection/<str:share_id>/', get_public_collection_share),
+    path('sharing/public/collection/<str:share_id>/tiles/<int:z>/<int:x>/<int:y>.mvt', get_public_collection_share_tile),
     # Collections API endpoints
     path('collections/', list_collections),
     path('collections/create/', create_collection),
@@ -1,16 +1,23 @@
+import json
+import math
 import time
 import traceback
 import uuid
-from typing import List, Tuple, Dict, NamedTuple, Union
+from typing import Awaitable, Callable, Tuple, Dict, NamedTuple, Union, List
 
 from django.conf import settings
 from django.contrib.gis.geos import Polygon
-from django.http import JsonResponse
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 
-from django.db.models import QuerySet, Q
+from django.db.models import QuerySet, TextField
 
 from api.models import FeatureStore, Collection
+from api.services.feature_query import build_feature_query
+from geo_lib.const_strings import CONST_INTERNAL_TAGS
 from geo_lib.logging.console import get_access_logger
 from geo_lib.website.auth import login_required_401
 
@@ -19,9 +26,10 @@ logger = get_access_logger()
 
 class BboxQueryResult(NamedTuple):
     """Result of a bounding box query containing features and total count"""
-    features: List[Dict]
+    features: QuerySet  # Feature JSON strings built by the database (see _select_feature_json)
     total_count: int
     fallback_used: bool = False  # Indicates if fallback mechanism was triggered
+    feature_count: int = 0  # Number of features that will be returned (total_count capped by MAX_FEATURES_PER_REQUEST)
 
 
 def _parse_bbox(bbox_str: str) -> tuple[float, ...] | None:
@@ -118,33 +126,27 @@ def _validate_bbox_params(request) -> Union[Tuple[Tuple[float, ...], int], JsonR
     return (bbox, zoom_level)
 
 
-def _build_bbox_response(features: List[Dict], total_count: int, zoom_level: int, fallback_used: bool, **extra_fields) -> Dict:
+def _build_bbox_response(feature_count: int, total_count: int, zoom_level: int, fallback_used: bool, **extra_fields) -> Dict:
     """
-    Build standardized bbox query response dictionary.
+    Build standardized bbox query response dictionary (everything except the GeoJSON data,
+    which is streamed by _stream_feature_collection()).
     
     Args:
-        features: List of GeoJSON feature dictionaries
+        feature_count: Number of features returned
         total_count: Total number of features in bbox
         zoom_level: Zoom level used for query
         fallback_used: Whether fallback mechanism was used
         **extra_fields: Additional fields to include in response (e.g., 'tag' for public shares)
     
     Returns:
-        Dictionary ready to be converted to JsonResponse
+        Dictionary of response fields
     """
     # Get the configured limit for comparison
     max_features = getattr(settings, 'MAX_FEATURES_PER_REQUEST', -1)
 
-    # Create GeoJSON FeatureCollection
-    geojson_data = {
-        "type": "FeatureCollection",
-        "features": features
-    }
-
     response_data = {
         'success': True,
-        'data': geojson_data,
-        'feature_count': len(features),
+        'feature_count': feature_count,
         'total_features_in_bbox': total_count,
         'max_features_limit': max_features,
         'zoom_level': zoom_level,
@@ -157,128 +159,166 @@ def _build_bbox_response(features: List[Dict], total_count: int, zoom_level: int
 
     # Add warning if features were limited by configuration
     if 0 < max_features < total_count:
-        response_data['warning'] = f'Displaying {len(features)} of {total_count} features due to MAX_FEATURES_PER_REQUEST limit ({max_features})'
+        response_data['warning'] = f'Displaying {feature_count} of {total_count} features due to MAX_FEATURES_PER_REQUEST limit ({max_features})'
 
     return response_data
 
 
-def _build_collection_query(user_id: int, collection_id: uuid.UUID) -> QuerySet:
+def _get_simplification_params(zoom_level: int) -> Tuple[float, int] | None:
     """
-    Build query for features in a collection.
-    Returns features matching ANY of the collection's tags (OR logic) OR in feature_ids.
+    Derive the simplification tolerance and coordinate precision for a zoom level.
+    The tolerance is a fraction of a pixel at the given zoom, so removed vertices
+    are never visible on the map.
     
     Args:
-        user_id: User ID to filter features by
-        collection_id: Collection ID to filter features by
+        zoom_level: Map zoom level
     
     Returns:
-        QuerySet ready for further filtering
+        Tuple of (tolerance in degrees, decimal places), or None if no simplification should be applied
     """
-    try:
-        collection = Collection.objects.get(id=collection_id, user_id=user_id)
-    except Collection.DoesNotExist:
-        # Return empty queryset if collection doesn't exist
-        return FeatureStore.objects.none()
-    
-    # Start with base user filter
-    base_query = FeatureStore.objects.filter(user_id=user_id).exclude(geometry__isnull=True)
-    
-    # Build query for features matching collection criteria
-    # Union of: features matching ANY collection tag OR features in feature_ids
-    feature_ids_set = set()
-    
-    # 1. Get features matching ANY of the collection's tags (OR logic)
-    if collection.tags:
-        tag_query = Q()
-        for tag in collection.tags:
-            if tag:  # Only process non-empty tags
-                tag_query |= Q(geojson__properties__tags__contains=[tag])
-        
-        if tag_query:
-            tag_features = base_query.filter(tag_query).values_list('id', flat=True)
-            feature_ids_set.update(tag_features)
-    
-    # 2. Add individually selected features
-    if collection.feature_ids:
-        # Verify these features belong to the user
-        user_feature_ids = set(
-            FeatureStore.objects.filter(user_id=user_id, id__in=collection.feature_ids)
-            .values_list('id', flat=True)
-        )
-        feature_ids_set.update(user_feature_ids)
-    
-    # Filter by the combined set of feature IDs
-    if feature_ids_set:
-        return base_query.filter(id__in=feature_ids_set).order_by('id')
-    else:
-        # No features match the collection criteria
-        return FeatureStore.objects.none()
+    if not getattr(settings, 'GEOMETRY_SIMPLIFY_ENABLED', True):
+        return None
+    if zoom_level > getattr(settings, 'GEOMETRY_SIMPLIFY_MAX_ZOOM', 16):
+        return None
 
+    # Degrees per pixel for 256px web mercator tiles (measured at the equator, which is the
+    # worst case since pixels cover less longitude everywhere else)
+    degrees_per_pixel = 360.0 / (256 * 2 ** zoom_level)
+    tolerance = degrees_per_pixel * getattr(settings, 'GEOMETRY_SIMPLIFY_TOLERANCE_PIXELS', 0.5)
 
-def _build_base_query(user_id: int, tag: str | None = None, collection_id: uuid.UUID | None = None) -> QuerySet:
-    """
-    Build base query for features with user filter, geometry exclusion, optional tag filter, 
-    optional collection filter, and ordering.
-    
-    Args:
-        user_id: User ID to filter features by
-        tag: Optional tag to filter features by (if None, no tag filter is applied)
-        collection_id: Optional collection ID to filter features by (if None, no collection filter is applied)
-    
-    Returns:
-        QuerySet ready for further filtering
-    """
-    # Collection filter takes precedence if provided
-    if collection_id is not None:
-        return _build_collection_query(user_id, collection_id)
-    
-    base_query = FeatureStore.objects.filter(user_id=user_id).exclude(geometry__isnull=True)
-    
-    # Add tag filter if provided
-    if tag:
-        base_query = base_query.filter(geojson__properties__tags__contains=[tag])
-    
-    # Order by id to ensure consistent results when slicing
-    return base_query.order_by('id')
+    # Smallest number of decimal places where rounding stays under half a pixel.
+    # Never exceed the 6 decimal places used for coordinates elsewhere.
+    precision = max(0, min(6, math.ceil(-math.log10(degrees_per_pixel))))
 
+    return tolerance, precision
 
-def _convert_feature_to_geojson(feature: FeatureStore, public_safe: bool = False, include_tags: bool = False) -> Dict:
+
+def _feature_json_sql(public_safe: bool = False, include_tags: bool = False, filter_internal_tags: bool = False, zoom_level: int | None = None) -> Tuple[str, List]:
     """
-    Convert FeatureStore instance to GeoJSON Feature dictionary.
+    Build the SQL expression that assembles a GeoJSON Feature for a FeatureStore row inside Postgres,
+    so feature JSON never has to be decoded and re-encoded in Python.
     
     Args:
-        feature: FeatureStore instance
         public_safe: If True, excludes _id from properties (for public shares)
         include_tags: If True and public_safe=True, includes tags in properties (otherwise tags are excluded for public shares)
+        filter_internal_tags: If True, removes internal tags (CONST_INTERNAL_TAGS) from the tags list
+        zoom_level: If set, lines and polygons are simplified for this zoom level (see _get_simplification_params())
     
     Returns:
-        GeoJSON Feature dictionary
+        Tuple of (SQL expression returning the feature as text, query params)
     """
-    geojson_data = feature.geojson
-    if not geojson_data or 'geometry' not in geojson_data:
-        return None
+    table = FeatureStore._meta.db_table
+    geojson = f'"{table}"."geojson"'
+
+    # Geometry, optionally simplified for the zoom level.
+    # Points gain nothing from simplification, so keep their exact coordinates.
+    geometry_sql = f"({geojson} -> 'geometry')"
+    geometry_params = []
+    marker_sql = "'{}'::jsonb"
+    marker_params = []
+    simplification = _get_simplification_params(zoom_level) if zoom_level is not None else None
+    if simplification:
+        tolerance, precision = simplification
+        is_simplified = f"({geojson} -> 'geometry' ->> 'type') IS DISTINCT FROM 'Point'"
+        geometry_sql = f'CASE WHEN {is_simplified} THEN ST_AsGeoJSON(ST_SimplifyPreserveTopology("{table}"."geometry", %s), %s)::jsonb ELSE {geometry_sql} END'
+        geometry_params = [tolerance, precision]
+        # Let the frontend know this geometry is not full resolution so it can
+        # fetch the original before editing or when zooming in
+        marker_sql = f"CASE WHEN {is_simplified} THEN jsonb_build_object('simplified_zoom', %s) ELSE '{{}}'::jsonb END"
+        marker_params = [zoom_level]
+
+    properties_sql = f"COALESCE({geojson} -> 'properties', '{{}}'::jsonb)"
+    properties_params = []
+    if filter_internal_tags:
+        # Same rules as filter_protected_tags(): drop tags that equal a protected prefix or start with "<prefix>:"
+        tags = f"({geojson} -> 'properties' -> 'tags')"
+        properties_sql = f"""({properties_sql} || jsonb_build_object('tags', CASE
+            WHEN jsonb_typeof({tags}) = 'array' THEN COALESCE((
+                SELECT jsonb_agg(t.tag ORDER BY t.position)
+                FROM jsonb_array_elements({tags}) WITH ORDINALITY AS t(tag, position)
+                WHERE NOT (jsonb_typeof(t.tag) = 'string' AND split_part(t.tag #>> '{{}}', ':', 1) = ANY(%s))
+            ), '[]'::jsonb)
+            WHEN {tags} IS NULL THEN '[]'::jsonb
+            ELSE {tags}
+        END))"""
+        properties_params = [list(CONST_INTERNAL_TAGS)]
 
-    # Create feature properties
-    properties = geojson_data.get('properties', {}).copy()
-    
     if public_safe:
-        # Don't include database ID in public view
-        if '_id' in properties:
-            del properties['_id']
-        # Don't include tags in public view unless explicitly requested
-        # (they can contain private information)
-        if not include_tags and 'tags' in properties:
-            del properties['tags']
+        # Don't include database ID in public view, and don't include tags unless explicitly
+        # requested (they can contain private information)
+        properties_sql = f"({properties_sql} - '_id')" if include_tags else f"({properties_sql} - '_id' - 'tags')"
     else:
         # Include database ID in properties for frontend editing
-        properties['_id'] = feature.id
+        properties_sql = f"""({properties_sql} || jsonb_build_object('_id', "{table}"."id"))"""
 
-    return {
-        "type": "Feature",
-        "geometry": geojson_data.get('geometry'),
-        "properties": properties,
-        "geojson_hash": feature.file_hash
-    }
+    sql = f"""(jsonb_build_object(
+        'type', 'Feature',
+        'geometry', {geometry_sql},
+        'properties', {properties_sql},
+        'geojson_hash', "{table}"."file_hash"
+    ) || {marker_sql})::text"""
+
+    return sql, geometry_params + properties_params + marker_params
+
+
+def _select_feature_json(query: QuerySet, public_safe: bool = False, include_tags: bool = False, filter_internal_tags: bool = False, zoom_level: int | None = None) -> QuerySet:
+    """
+    Turn a FeatureStore queryset into a queryset of GeoJSON Feature strings built by the database.
+    Features without a geometry in their stored GeoJSON are skipped.
+    See _feature_json_sql() for the arguments.
+    """
+    sql, params = _feature_json_sql(public_safe, include_tags, filter_internal_tags, zoom_level)
+    return (
+        query.filter(geojson__has_key='geometry')
+        .annotate(feature_json=RawSQL(sql, params, output_field=TextField()))
+        .values_list('feature_json', flat=True)
+    )
+
+
+def _stream_feature_collection(features: QuerySet, response_data: Dict, count_field: str | None = None,
+                               on_complete: Callable[[], Awaitable] | None = None) -> StreamingHttpResponse:
+    """
+    Stream a JSON response containing a GeoJSON FeatureCollection under the 'data' key.
+    
+    Args:
+        features: Queryset of feature JSON strings (see _select_feature_json())
+        response_data: Other response fields, written before the data
+        count_field: If set, the number of streamed features is written under this key after the data
+        on_complete: Awaited once the whole body was sent, not when the client disconnects or streaming fails
+    
+    Returns:
+        StreamingHttpResponse with the JSON body
+    """
+    chunk_size = getattr(settings, 'FEATURE_STREAM_CHUNK_SIZE', 500)
+
+    async def _generate():
+        # Response fields go first since the feature count is only known at the end
+        prefix = json.dumps(response_data)[:-1]
+        yield prefix + (', ' if response_data else '') + '"data": {"type": "FeatureCollection", "features": ['
+        feature_count = 0
+        chunk = []
+        try:
+            async for feature_json in features.aiterator(chunk_size=chunk_size):
+                chunk.append(feature_json)
+                if len(chunk) >= chunk_size:
+                    yield (',' if feature_count else '') + ','.join(chunk)
+                    feature_count += len(chunk)
+                    chunk = []
+            if chunk:
+                yield (',' if feature_count else '') + ','.join(chunk)
+                feature_count += len(chunk)
+        except Exception:
+            # Headers are already sent so the client will see a truncated body
+            logger.error(f"Error streaming feature collection: {traceback.format_exc()}")
+            raise
+        if count_field:
+            yield f']}}, {json.dumps(count_field)}: {feature_count}}}'
+        else:
+            yield ']}}'
+        if on_complete is not None:
+            await on_complete()
+
+    return StreamingHttpResponse(_generate(), content_type='application/json')
 
 
 def _get_features_in_bbox(bbox: Tuple[float, float, float, float], user_id: int, zoom_level: int, tag: str | None = None, collection_id: uuid.UUID | None = None, public_safe: bool = False, include_tags: bool = False) -> BboxQueryResult:
@@ -289,14 +329,14 @@ def _get_features_in_bbox(bbox: Tuple[float, float, float, float], user_id: int,
     Args:
         bbox: Bounding box tuple (min_lon, min_lat, max_lon, max_lat)
         user_id: User ID to filter features by
-        zoom_level: Zoom level (used for logging/optimization)
+        zoom_level: Zoom level, used to simplify geometries to what is visible at that zoom
         tag: Optional tag to filter features by
         collection_id: Optional collection ID to filter features by
         public_safe: If True, excludes _id from properties (for public shares)
         include_tags: If True and public_safe=True, includes tags in properties (otherwise tags are excluded for public shares)
     
     Returns:
-        BboxQueryResult with features, total_count, and fallback_used flag
+        BboxQueryResult with features (a lazy queryset of feature JSON strings), total_count, fallback_used flag and feature_count
     """
     # Detect world-wide extent
     crosses_dateline, world_wide_extent, lon_span, lat_span = _detect_world_wide_extent(bbox)
@@ -304,8 +344,9 @@ def _get_features_in_bbox(bbox: Tuple[float, float, float, float], user_id: int,
     # Get the maximum features limit from settings
     max_features = getattr(settings, 'MAX_FEATURES_PER_REQUEST', -1)
 
-    # Build base query with user filter, optional tag/collection filter, and ordering
-    base_query_filter = _build_base_query(user_id, tag, collection_id)
+    # Build base query with user filter, optional tag/collection filter, and ordering.
+    # Feature JSON (including zoom-aware simplification) is assembled by the database.
+    base_query_filter = _select_feature_json(build_feature_query(user_id, tag, collection_id), public_safe, include_tags, zoom_level=zoom_level)
 
     if crosses_dateline or world_wide_extent:
         # Handle world-wide bbox that crosses the International Date Line or spans most of the globe
@@ -330,12 +371,6 @@ def _get_features_in_bbox(bbox: Tuple[float, float, float, float], user_id: int,
     else:
         features_query = base_query
 
-    # Convert to GeoJSON format
-    geojson_features = []
-    for feature in features_query:
-        geojson_feature = _convert_feature_to_geojson(feature, public_safe, include_tags)
-        if geojson_feature:
-            geojson_features.append(geojson_feature)
 
     # Fallback mechanism: if spatial query returned suspiciously few results for a large extent,
     # fall back to world-wide query
@@ -366,14 +401,108 @@ def _get_features_in_bbox(bbox: Tuple[float, float, float, float], user_id: int,
             else:
                 features_query = base_query
 
-            # Re-convert to GeoJSON format
-            geojson_features = []
-            for feature in features_query:
-                geojson_feature = _convert_feature_to_geojson(feature, public_safe, include_tags)
-                if geojson_feature:
-                    geojson_features.append(geojson_feature)
+    feature_count = min(total_count, max_features) if max_features > 0 else total_count
+
+    return BboxQueryResult(features=features_query, total_count=total_count, fallback_used=fallback_used, feature_count=feature_count)
+
+
+def _validate_tile_coordinates(z: int, x: int, y: int) -> JsonResponse | None:
+    """
+    Validate XYZ tile coordinates.
+
+    Returns:
+        None if the coordinates are valid, or JsonResponse with error on failure
+    """
+    max_zoom = getattr(settings, 'MVT_MAX_ZOOM', 22)
+    if z < 0 or z > max_zoom:
+        return JsonResponse({
+            'success': False,
+            'error': f'Invalid zoom level. Expected integer between 0 and {max_zoom}',
+            'code': 400
+        }, status=400)
 
-    return BboxQueryResult(features=geojson_features, total_count=total_count, fallback_used=fallback_used)
+    tile_count = 2 ** z
+    if x < 0 or x >= tile_count or y < 0 or y >= tile_count:
+        return JsonResponse({
+            'success': False,
+            'error': 'Tile coordinates out of range for zoom level',
+            'code': 400
+        }, status=400)
+
+    return None
+
+
+def _get_features_tile(z: int, x: int, y: int, user_id: int, tag: str | None = None, collection_id: uuid.UUID | None = None, public_safe: bool = False, include_tags: bool = False) -> bytes:
+    """
+    Build a Mapbox Vector Tile for the given XYZ tile inside PostGIS.
+    Uses the same user/tag/collection filters as build_feature_query(), so tiles and the GeoJSON
+    endpoint always agree on which features are visible.
+
+    Args:
+        z: Tile zoom level
+        x: Tile column
+        y: Tile row
+        user_id: User ID to filter features by
+        tag: Optional tag to filter features by
+        collection_id: Optional collection ID to filter features by
+        public_safe: If True, excludes _id from properties (for public shares)
+        include_tags: If True and public_safe=True, includes tags in properties (otherwise tags are excluded for public shares)
+
+    Returns:
+        Encoded MVT bytes (empty if no features intersect the tile)
+    """
+    base_query = build_feature_query(user_id, tag, collection_id)
+
+    # Reuse the ORM filters as a subquery so the filter logic lives in one place
+    try:
+        filter_sql, filter_params = base_query.order_by().values('id').query.sql_with_params()
+    except EmptyResultSet:
+        # e.g. a collection that doesn't exist or has no matching features
+        return b''
+
+    properties_sql = "COALESCE(fs.geojson -> 'properties', '{}'::jsonb)"
+    if public_safe:
+        # Don't include database ID in public view, and only include tags when explicitly requested
+        properties_sql = f"{properties_sql} - '_id'" if include_tags else f"{properties_sql} - '_id' - 'tags'"
+    else:
+        # Include database ID in properties for frontend editing
+        properties_sql = f"{properties_sql} || jsonb_build_object('_id', fs.id)"
+
+    extent = getattr(settings, 'MVT_TILE_EXTENT', 4096)
+    buffer = getattr(settings, 'MVT_TILE_BUFFER', 64)
+    layer_name = getattr(settings, 'MVT_LAYER_NAME', 'features')
+
+    sql = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS geom_3857,
+                   ST_Transform(ST_TileEnvelope(%s, %s, %s), 4326) AS geom_4326
+        ),
+        mvtgeom AS (
+            SELECT ST_AsMVTGeom(ST_Transform(ST_Force2D(fs.geometry), 3857), bounds.geom_3857, %s, %s, true) AS geom,
+                   fs.file_hash AS geojson_hash,
+                   {properties_sql} AS properties
+            FROM {FeatureStore._meta.db_table} fs, bounds
+            WHERE fs.id IN ({filter_sql})
+              AND fs.geometry && bounds.geom_4326
+        )
+        SELECT ST_AsMVT(mvtgeom.*, %s, %s, 'geom')
+        FROM mvtgeom
+        WHERE geom IS NOT NULL
+    """
+    params = [z, x, y, z, x, y, extent, buffer, *filter_params, layer_name, extent]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    return bytes(row[0]) if row and row[0] else b''
+
+
+def _build_tile_response(tile: bytes, cache_control: str) -> HttpResponse:
+    """Wrap encoded MVT bytes in an HttpResponse with the vector tile content type."""
+    response = HttpResponse(tile, content_type='application/vnd.mapbox-vector-tile')
+    response['Cache-Control'] = cache_control
+    return response
 
 
 @login_required_401
@@ -418,14 +547,11 @@ def get_geojson_data(request):
     # Fetch data from database with optimized single query
     try:
         query_result = _get_features_in_bbox(bbox, request.user.id, zoom_level, collection_id=collection_id)
-        features = query_result.features
-        total_features_in_bbox = query_result.total_count
-        fallback_used = query_result.fallback_used
 
         # Build response using helper function
-        response_data = _build_bbox_response(features, total_features_in_bbox, zoom_level, fallback_used)
+        response_data = _build_bbox_response(query_result.feature_count, query_result.total_count, zoom_level, query_result.fallback_used)
 
-        return JsonResponse(response_data)
+        return _stream_feature_collection(query_result.features, response_data)
 
     except Exception:
         logger.error(f"Error in get_geojson_data API: {traceback.format_exc()}")
@@ -434,3 +560,56 @@ def get_geojson_data(request):
             'error': 'Failed to get features in bounding box',
             'code': 500
         }, status=500)
+
+
+@login_required_401
+@require_http_methods(["GET"])
+def get_feature_tile(request, z, x, y):
+    """
+    API endpoint to fetch a Mapbox Vector Tile of the user's features.
+
+    Path parameters:
+    - z, x, y: XYZ tile coordinates
+
+    Query parameters:
+    - tag: optional tag to filter features by
+    - collection: optional collection ID to filter features by
+    """
+    validation_error = _validate_tile_coordinates(z, x, y)
+    if validation_error:
+        return validation_error
+
+    tag = request.GET.get('tag', '').strip() or None
+
+    # Get optional collection parameter
+    collection_id = None
+    collection_str = request.GET.get('collection')
+    if collection_str:
+        try:
+            collection_id = uuid.UUID(collection_str)
+            # Verify collection belongs to user
+            if not Collection.objects.filter(id=collection_id, user=request.user).exists():
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Collection not found',
+                    'code': 404
+                }, status=404)
+        except (ValueError, TypeError):
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid collection ID. Expected UUID',
+                'code': 400
+            }, status=400)
+
+    try:
+        tile = _get_features_tile(z, x, y, request.user.id, tag=tag, collection_id=collection_id)
+        # Features can be edited at any time, so only let the browser hold on to tiles briefly
+        return _build_tile_response(tile, 'private, max-age=60')
+
+    except Exception:
+        logger.error(f"Error in get_feature_tile API: {traceback.format_exc()}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to build feature tile',
+            'code': 500
+        }, status=500)
@@ -5,7 +5,7 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
 from api.models import FeatureStore
-from geo_lib.const_strings import CONST_INTERNAL_TAGS, filter_protected_tags
+from api.views.bbox_query import _select_feature_json, _stream_feature_collection
 from geo_lib.logging.console import get_access_logger
 from geo_lib.website.auth import login_required_401
 
@@ -116,36 +116,8 @@ def search_features(request):
         # Apply search filter
         features_query = base_query.filter(search_q).order_by('id')
 
-        # Convert to GeoJSON format
-        geojson_features = []
-        for feature in features_query:
-            geojson_data = feature.geojson
-            if geojson_data and 'geometry' in geojson_data:
-                # Include database ID in properties for frontend editing
-                properties = geojson_data.get('properties', {}).copy()
-                properties['_id'] = feature.id
-                geojson_feature = {
-                    "type": "Feature",
-                    "geometry": geojson_data.get('geometry'),
-                    "properties": properties,
-                    "geojson_hash": feature.file_hash
-                }
-                geojson_features.append(geojson_feature)
-
-        # Create GeoJSON FeatureCollection
-        geojson_data = {
-            "type": "FeatureCollection",
-            "features": geojson_features
-        }
-
-        response_data = {
-            'success': True,
-            'data': geojson_data,
-            'feature_count': len(geojson_features),
-            'query': query
-        }
-
-        return JsonResponse(response_data)
+        # Feature JSON is built by the database and streamed to the client
+        return _stream_feature_collection(_select_feature_json(features_query), {'success': True, 'query': query}, count_field='feature_count')
 
     except Exception:
         logger.error(f"Error searching features: {traceback.format_exc()}")
@@ -191,44 +163,9 @@ def filter_features_by_tags(request):
             # This uses PostgreSQL's JSON containment operator
             features_query = features_query.filter(geojson__properties__tags__contains=[tag])
         
-        # Convert to GeoJSON format
-        geojson_features = []
-        for feature in features_query.order_by('id'):
-            geojson_data = feature.geojson
-            if geojson_data and 'geometry' in geojson_data:
-                properties = geojson_data.get('properties', {}).copy()
-                
-                # Filter out protected tags from the tags list for display
-                tags_list = properties.get('tags', [])
-                if isinstance(tags_list, list):
-                    filtered_tags = filter_protected_tags(tags_list, CONST_INTERNAL_TAGS)
-                    properties['tags'] = filtered_tags
-                
-                # Include database ID in properties for frontend editing
-                properties['_id'] = feature.id
-                
-                geojson_feature = {
-                    "type": "Feature",
-                    "geometry": geojson_data.get('geometry'),
-                    "properties": properties,
-                    "geojson_hash": feature.file_hash
-                }
-                geojson_features.append(geojson_feature)
-        
-        # Create GeoJSON FeatureCollection
-        geojson_data = {
-            "type": "FeatureCollection",
-            "features": geojson_features
-        }
-        
-        response_data = {
-            'success': True,
-            'data': geojson_data,
-            'feature_count': len(geojson_features),
-            'tags': tags
-        }
-        
-        return JsonResponse(response_data)
+        # Feature JSON is built by the database (with internal tags filtered out for display) and streamed to the client
+        features_json = _select_feature_json(features_query.order_by('id'), filter_internal_tags=True)
+        return _stream_feature_collection(features_json, {'success': True, 'tags': tags}, count_field='feature_count')
     
     except Exception:
         logger.error(f"Error filtering features by tags: {traceback.format_exc()}")
@@ -250,43 +187,8 @@ def get_all_features(request):
         # Get all features for the user
         features = FeatureStore.objects.filter(user=request.user).exclude(geometry__isnull=True).order_by('id')
         
-        # Convert to GeoJSON format
-        geojson_features = []
-        for feature in features:
-            geojson_data = feature.geojson
-            if geojson_data and 'geometry' in geojson_data:
-                properties = geojson_data.get('properties', {}).copy()
-                
-                # Filter out protected tags from the tags list for display
-                tags_list = properties.get('tags', [])
-                if isinstance(tags_list, list):
-                    filtered_tags = filter_protected_tags(tags_list, CONST_INTERNAL_TAGS)
-                    properties['tags'] = filtered_tags
-                
-                # Include database ID in properties
-                properties['_id'] = feature.id
-                
-                geojson_feature = {
-                    "type": "Feature",
-                    "geometry": geojson_data.get('geometry'),
-                    "properties": properties,
-                    "geojson_hash": feature.file_hash
-                }
-                geojson_features.append(geojson_feature)
-        
-        # Create GeoJSON FeatureCollection
-        geojson_data = {
-            "type": "FeatureCollection",
-            "features": geojson_features
-        }
-        
-        response_data = {
-            'success': True,
-            'data': geojson_data,
-            'feature_count': len(geojson_features)
-        }
-        
-        return JsonResponse(response_data)
+        # Feature JSON is built by the database (with internal tags filtered out for display) and streamed to the client
+        return _stream_feature_collection(_select_feature_json(features, filter_internal_tags=True), {'success': True}, count_field='feature_count')
     
     except Exception:
         logger.error(f"Error getting all features: {traceback.format_exc()}")
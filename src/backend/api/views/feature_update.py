@@ -9,8 +9,10 @@ from django.views.decorators.http import require_http_methods
 
 from api.models import FeatureStore, ImportQueue
 from geo_lib.const_strings import CONST_INTERNAL_TAGS, filter_protected_tags, is_protected_tag
-from geo_lib.feature_id import generate_feature_hash
+from geo_lib.feature_id import generate_feature_hash, get_geometry_fingerprint
 from geo_lib.logging.console import get_access_logger
+from geo_lib.processing.import_staging import count_staged_features, get_staged_feature
+from geo_lib.processing.upload_blob_store import delete_unreferenced_upload_blobs
 from geo_lib.types.feature import PointFeature, LineStringFeature, MultiLineStringFeature, PolygonFeature, GeoFeatureSupported
 from geo_lib.validation.geometry_validation import (
     normalize_and_validate_feature_update,
@@ -449,6 +451,9 @@ def update_feature(request, feature_id):
             logger.warning(f"Error updating geometry for feature {feature_id}: {e}")
             # Continue without updating geometry if there's an error
 
+        # Update the geometry fingerprint used for coordinate duplicate detection
+        feature.geometry_fingerprint = get_geometry_fingerprint(feature.geojson)
+
         # Save the updated feature
         feature.save()
 
@@ -486,7 +491,7 @@ def apply_replacement_geometry(request, feature_id):
 
     Request body: JSON object with:
     - import_queue_id: ID of the ImportQueue entry containing the replacement features
-    - feature_index: Index of the feature in the ImportQueue.geofeatures array to use
+    - feature_index: Index of the feature in the ImportQueue item's processed features to use
     """
     try:
         # Get the feature from database
@@ -542,8 +547,8 @@ def apply_replacement_geometry(request, feature_id):
             }, status=400)
 
         # Get the features from the ImportQueue
-        geofeatures = import_queue.geofeatures
-        if not isinstance(geofeatures, list) or len(geofeatures) == 0:
+        feature_count = count_staged_features(import_queue.id)
+        if feature_count == 0:
             return JsonResponse({
                 'success': False,
                 'error': 'ImportQueue entry has no features',
@@ -551,15 +556,15 @@ def apply_replacement_geometry(request, feature_id):
             }, status=400)
 
         # Validate feature_index is within bounds
-        if feature_index < 0 or feature_index >= len(geofeatures):
+        if feature_index < 0 or feature_index >= feature_count:
             return JsonResponse({
                 'success': False,
-                'error': f'feature_index {feature_index} is out of bounds (0-{len(geofeatures)-1})',
+                'error': f'feature_index {feature_index} is out of bounds (0-{feature_count-1})',
                 'code': 400
             }, status=400)
 
         # Get the selected replacement feature
-        replacement_feature = geofeatures[feature_index]
+        replacement_feature = get_staged_feature(import_queue.id, feature_index)
         if not isinstance(replacement_feature, dict) or 'geometry' not in replacement_feature:
             return JsonResponse({
                 'success': False,
@@ -686,11 +691,15 @@ def apply_replacement_geometry(request, feature_id):
             logger.warning(f"Error updating geometry for feature {feature_id}: {e}")
             # Continue without updating geometry if there's an error
 
+        # Update the geometry fingerprint used for coordinate duplicate detection
+        feature.geometry_fingerprint = get_geometry_fingerprint(feature.geojson)
+
         # Save the updated feature
         feature.save()
 
         # Delete the ImportQueue row after successful application
         import_queue.delete()
+        delete_unreferenced_upload_blobs([import_queue.raw_blob_id])
 
         return JsonResponse({
             'success': True,
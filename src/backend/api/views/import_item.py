@@ -1,80 +1,32 @@
 import hashlib
 import json
-import threading
 import traceback
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Tuple, Any, Optional
+from typing import List, Dict, Tuple, Any
 
 from django import forms
-from django.conf import settings
-from django.contrib.gis.geos import GEOSGeometry
+from django.db import connection, transaction
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 
-from api.models import ImportQueue, FeatureStore, DatabaseLogging
+from api.models import ImportQueue, ImportQueueFeature, FeatureStore, DatabaseLogging
 from geo_lib.const_strings import CONST_INTERNAL_TAGS, filter_protected_tags, is_protected_tag
-from geo_lib.feature_id import generate_feature_hash
+from geo_lib.feature_id import generate_feature_hash, generate_geometry_fingerprint
 from geo_lib.logging.console import get_access_logger
-from geo_lib.processing.jobs import upload_job, delete_job
+from geo_lib.processing.import_staging import (
+    get_staged_features, invalidate_review_index, update_staged_feature, STAGED_FEATURE_UPDATE_FIELDS
+)
+from geo_lib.processing.jobs import upload_job, delete_job, import_job
 from geo_lib.processing.logging import ImportLog, DatabaseLogLevel
-from geo_lib.processing.status_tracker import status_tracker
+from geo_lib.processing.status_tracker import JobType, TERMINAL_STATUSES, status_tracker
+from geo_lib.processing.upload_blob_store import get_raw_file
 from geo_lib.security.file_validation import SecureFileValidator
-from geo_lib.types.feature import PointFeature, PolygonFeature, LineStringFeature, MultiLineStringFeature
+from geo_lib.types.feature import PointFeature, PolygonFeature, LineStringFeature
 from geo_lib.website.auth import login_required_401
 
 logger = get_access_logger()
 
 
-def strip_icon_properties(feature: dict) -> dict:
-    """
-    Remove icon-related properties from a feature.
-    
-    Args:
-        feature: Feature dictionary with properties
-        
-    Returns:
-        Feature dictionary with icon properties removed
-    """
-    if not isinstance(feature, dict) or 'properties' not in feature:
-        return feature
-
-    # Common property names that might contain icon hrefs
-    icon_property_names = [
-        'marker-symbol',
-        'icon',
-        'icon-href',
-        'iconUrl',
-        'icon_url',
-        'marker-icon',
-        'symbol',
-        'styleUrl',  # KML style URLs might reference icons
-    ]
-
-    # Remove icon properties
-    for prop_name in icon_property_names:
-        if prop_name in feature['properties']:
-            del feature['properties'][prop_name]
-
-    # Also check nested structures (e.g., style objects)
-    def remove_icons_from_dict(d):
-        if not isinstance(d, dict):
-            return
-        for key, value in list(d.items()):
-            if key in icon_property_names:
-                del d[key]
-            elif isinstance(value, dict):
-                remove_icons_from_dict(value)
-            elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict):
-                        remove_icons_from_dict(item)
-
-    remove_icons_from_dict(feature['properties'])
-
-    return feature
-
-
 def strip_duplicate_features(features) -> Tuple[List[Any], int, ImportLog]:
     """Remove 100% duplicate features and log the process."""
     import_log = ImportLog()
@@ -112,26 +64,43 @@ def strip_duplicate_features(features) -> Tuple[List[Any], int, ImportLog]:
     return unique_features, duplicate_feature_count, import_log
 
 
-def _normalize_coordinates(coords: List, tolerance: float = 1e-6) -> List:
-    """Normalize coordinates by rounding to specified tolerance."""
-    if isinstance(coords[0], (int, float)):
-        # Single coordinate pair
-        return [round(coord, 6) for coord in coords]
-    else:
-        # Nested coordinates (LineString or Polygon)
-        return [_normalize_coordinates(coord, tolerance) for coord in coords]
+# Geometry types that can be matched by coordinate fingerprint
+FINGERPRINT_GEOMETRY_TYPES = {'point', 'linestring', 'polygon', 'multilinestring', 'multipolygon', 'multipoint'}
 
 
-def _coordinates_match(coord1: List, coord2: List, tolerance: float = 1e-6) -> bool:
-    """Check if two coordinate sets match within tolerance."""
-    norm1 = _normalize_coordinates(coord1, tolerance)
-    norm2 = _normalize_coordinates(coord2, tolerance)
-    return norm1 == norm2
+def _get_feature_fingerprints(feature: Dict) -> List[str]:
+    """
+    Get the geometry fingerprints to check for a feature, in order of precedence.
+    A GeometryCollection yields one fingerprint per member geometry, since the collection
+    is a duplicate if any of its members matches an existing feature.
+    """
+    geometry = feature.get('geometry') or {}
+    geom_type = geometry.get('type', '').lower()
+    coordinates = geometry.get('coordinates', [])
+
+    if not coordinates:
+        # Features without coordinates are never duplicates
+        return []
+
+    if geom_type == 'geometrycollection':
+        member_geometries = [member for member in coordinates if isinstance(member, dict)]
+    else:
+        member_geometries = [geometry]
+
+    fingerprints = []
+    for member in member_geometries:
+        member_type = member.get('type', '').lower()
+        if member_type in FINGERPRINT_GEOMETRY_TYPES:
+            fingerprint = generate_geometry_fingerprint(member_type, member.get('coordinates', []))
+            if fingerprint:
+                fingerprints.append(fingerprint)
+    return fingerprints
 
 
 def find_coordinate_duplicates(features: List[Dict], user_id: int) -> Tuple[List[Dict], List[Dict], ImportLog]:
     """
     Find features that have duplicate coordinates in the existing featurestore.
+    All fingerprints of the upload are matched against the library in a single set-based query.
     Returns (unique_features, duplicate_features_with_originals, log_messages)
     """
     import_log = ImportLog()
@@ -141,28 +110,24 @@ def find_coordinate_duplicates(features: List[Dict], user_id: int) -> Tuple[List
 
     import_log.add(f"Checking {len(features)} features against existing features in your library", "Duplicate Detection", DatabaseLogLevel.INFO)
 
-    # For large files, use batched approach to reduce database queries
-    batch_threshold = getattr(settings, 'DUPLICATE_DETECTION_BATCH_THRESHOLD', 1000)
-    if len(features) > batch_threshold:
-        import_log.add("Using optimized batch processing for large file", "Duplicate Detection", DatabaseLogLevel.INFO)
-        return _find_coordinate_duplicates_batched(features, user_id, import_log)
+    feature_fingerprints = [_get_feature_fingerprints(feature) for feature in features]
+    all_fingerprints = {fingerprint for fingerprints in feature_fingerprints for fingerprint in fingerprints}
+
+    try:
+        existing_lookup = _find_existing_features_by_fingerprints(list(all_fingerprints), user_id) if all_fingerprints else {}
+    except Exception as e:
+        import_log.add("Duplicate detection encountered an issue, skipping check against your library", 'Duplicate Detection', DatabaseLogLevel.WARNING)
+        # Log internal error details for debugging
+        logger.warning(f"Bulk fingerprint query failed: {str(e)}")
+        logger.error(f"Bulk fingerprint query error traceback: {traceback.format_exc()}")
+        return features, [], import_log
 
-    # For smaller files, use the original approach
     unique_features = []
     duplicate_features = []
 
-    for feature in features:
-        geometry = feature.get('geometry', {})
-        geom_type = geometry.get('type', '').lower()
-        coordinates = geometry.get('coordinates', [])
-
-        if not coordinates:
-            # Skip features without coordinates
-            unique_features.append(feature)
-            continue
-
-        # Check for existing features with matching coordinates
-        existing_features = _find_existing_features_by_coordinates(coordinates, geom_type, user_id)
+    for feature, fingerprints in zip(features, feature_fingerprints):
+        # Use the first fingerprint with matches (for GeometryCollections, the first matching member)
+        existing_features = next((existing_lookup[fingerprint] for fingerprint in fingerprints if fingerprint in existing_lookup), None)
 
         if existing_features:
             # This is a duplicate - add original feature info
@@ -189,332 +154,41 @@ def find_coordinate_duplicates(features: List[Dict], user_id: int) -> Tuple[List
     return unique_features, duplicate_features, import_log
 
 
-def _find_coordinate_duplicates_batched(features: List[Dict], user_id: int, import_log: ImportLog) -> Tuple[List[Dict], List[Dict], ImportLog]:
-    """
-    Optimized duplicate detection for large files using batched database queries.
-    """
-    from django.contrib.gis.geos import GEOSGeometry
-    from api.models import FeatureStore
-    import json
-
-    unique_features = []
-    duplicate_features = []
-
-    # Group features by geometry type for more efficient queries
-    features_by_type = {'point': [], 'linestring': [], 'polygon': [], 'multilinestring': [], 'multipolygon': [], 'multipoint': [], 'geometrycollection': []}
-
-    for i, feature in enumerate(features):
-        geometry = feature.get('geometry', {})
-        geom_type = geometry.get('type', '').lower()
-        coordinates = geometry.get('coordinates', [])
-
-        if not coordinates or geom_type not in features_by_type:
-            unique_features.append(feature)
-            continue
-
-        features_by_type[geom_type].append((i, feature, coordinates))
-
-    # Process each geometry type in batches
-    for geom_type, type_features in features_by_type.items():
-        if not type_features:
-            continue
-
-        import_log.add(f"Processing {len(type_features)} {geom_type} features for duplicates", 'Find Coordinate Duplicates')
-
-        # Process in batches to avoid memory issues
-        batch_size = getattr(settings, 'DUPLICATE_DETECTION_BATCH_SIZE', 100)
-        for batch_start in range(0, len(type_features), batch_size):
-            batch_end = min(batch_start + batch_size, len(type_features))
-            batch_features = type_features[batch_start:batch_end]
-
-            # Create geometries for this batch
-            # Normalize coordinates first to handle floating point precision differences
-            batch_geometries = []
-            for idx, feature, coordinates in batch_features:
-                try:
-                    # Normalize coordinates before creating geometry to ensure consistent WKT representation
-                    normalized_coords = _normalize_coordinates(coordinates)
-                    
-                    # Handle different geometry type naming conventions
-                    if geom_type == 'multilinestring':
-                        geom_type_name = 'MultiLineString'
-                    elif geom_type == 'multipolygon':
-                        geom_type_name = 'MultiPolygon'
-                    elif geom_type == 'multipoint':
-                        geom_type_name = 'MultiPoint'
-                    elif geom_type == 'geometrycollection':
-                        # GeometryCollection needs special handling - skip batching for now
-                        # and use the regular duplicate detection logic
-                        existing_features = _find_geometry_collection_duplicates(coordinates, user_id)
-                        if existing_features:
-                            duplicate_info = {
-                                'feature': feature,
-                                'existing_features': existing_features
-                            }
-                            duplicate_features.append(duplicate_info)
-                            feature_name = feature.get('properties', {}).get('name', 'Unnamed')
-                            existing_count = len(existing_features)
-                            import_log.add(f"Coordinate duplicate found: '{feature_name}' (GeometryCollection) matches {existing_count} existing feature(s)", 'Duplicate Detection', DatabaseLogLevel.INFO)
-                        else:
-                            unique_features.append(feature)
-                        continue
-                    else:
-                        geom_type_name = geom_type.title()
-
-                    geom_data = {
-                        'type': geom_type_name,
-                        'coordinates': normalized_coords
-                    }
-                    geometry = GEOSGeometry(json.dumps(geom_data))
-                    batch_geometries.append((idx, feature, geometry))
-                except Exception as e:
-                    import_log.add(f"Failed to create geometry for feature {idx}: {str(e)}", 'Find Coordinate Duplicates')
-                    logger.error(f"Failed to create geometry for feature {idx}: {traceback.format_exc()}")
-                    unique_features.append(feature)
-
-            if not batch_geometries:
-                continue
-
-            # Single database query for the entire batch
-            try:
-                geometries = [geom for _, _, geom in batch_geometries]
-                existing_features = FeatureStore.objects.filter(
-                    user_id=user_id,
-                    geometry__in=geometries
-                ).values('id', 'geojson', 'timestamp', 'geometry')
-
-                # Create a lookup map for existing features using normalized coordinates
-                # This handles floating point precision differences better than WKT comparison
-                existing_lookup = {}
-                for existing in existing_features:
-                    # Get coordinates from geojson and normalize them
-                    existing_geojson = existing['geojson'] if isinstance(existing['geojson'], dict) else json.loads(existing['geojson'])
-                    existing_coords = existing_geojson.get('geometry', {}).get('coordinates', [])
-                    if existing_coords:
-                        normalized_existing_coords = _normalize_coordinates(existing_coords)
-                        # Use normalized coordinates as key for lookup
-                        coords_key = json.dumps(normalized_existing_coords, sort_keys=True)
-                        if coords_key not in existing_lookup:
-                            existing_lookup[coords_key] = []
-                        existing_lookup[coords_key].append(existing)
-
-                # Check each feature in the batch using normalized coordinate comparison
-                for idx, feature, geometry in batch_geometries:
-                    # Get normalized coordinates from the feature (already normalized when creating geometry)
-                    feature_coords = feature.get('geometry', {}).get('coordinates', [])
-                    normalized_feature_coords = _normalize_coordinates(feature_coords)
-                    coords_key = json.dumps(normalized_feature_coords, sort_keys=True)
-                    
-                    if coords_key in existing_lookup:
-                        # This is a duplicate
-                        duplicate_info = {
-                            'feature': feature,
-                            'existing_features': existing_lookup[coords_key]
-                        }
-                        duplicate_features.append(duplicate_info)
-
-                        feature_name = feature.get('properties', {}).get('name', 'Unnamed')
-                        existing_count = len(existing_lookup[coords_key])
-                        import_log.add(f"Coordinate duplicate found: '{feature_name}' ({geom_type}) matches {existing_count} existing feature(s)", 'Duplicate Detection', DatabaseLogLevel.INFO)
-                    else:
-                        unique_features.append(feature)
-
-            except Exception as e:
-                import_log.add(f"Batch query encountered an issue, processing individually", 'Duplicate Detection', DatabaseLogLevel.WARNING)
-                # Log internal error details for debugging
-                logger.warning(f"Batch query failed for {geom_type} features: {str(e)}")
-                logger.error(f"Batch query error traceback: {traceback.format_exc()}")
-                # Fall back to individual processing for this batch
-                for idx, feature, coordinates in batch_features:
-                    unique_features.append(feature)
-
-    # Log summary
-    if duplicate_features:
-        import_log.add(f"Found {len(duplicate_features)} features that already exist in your library", "Duplicate Detection", DatabaseLogLevel.INFO)
-    else:
-        import_log.add("No duplicate features found in your existing library", "Duplicate Detection", DatabaseLogLevel.INFO)
-
-    return unique_features, duplicate_features, import_log
-
-
-def _find_existing_features_by_coordinates(coordinates: List, geom_type: str, user_id: int) -> List[Dict]:
-    """Find existing features in the database with matching coordinates."""
-    try:
-        # Normalize coordinates to handle floating point precision differences
-        normalized_coords = _normalize_coordinates(coordinates)
-        
-        # Create a GEOSGeometry object for spatial queries
-        if geom_type == 'point':
-            # For points, we need to handle floating point precision differences.
-            # Query all features for this user and filter by geometry type and compare normalized coordinates in Python
-            # This is more reliable than database-level exact matching which can fail due to precision differences
-            all_features = FeatureStore.objects.filter(
-                user_id=user_id,
-                geometry__isnull=False
-            ).values('id', 'geojson', 'timestamp')
-            
-            # Filter to only points and compare normalized coordinates
-            existing_features = []
-            for feat in all_features:
-                feat_geojson = feat['geojson'] if isinstance(feat['geojson'], dict) else json.loads(feat['geojson'])
-                feat_geom_type = feat_geojson.get('geometry', {}).get('type', '').lower()
-                if feat_geom_type == 'point':
-                    feature_coords = feat_geojson.get('geometry', {}).get('coordinates', [])
-                    if feature_coords:
-                        normalized_feature_coords = _normalize_coordinates(feature_coords)
-                        if normalized_coords == normalized_feature_coords:
-                            existing_features.append(feat)
-
-        elif geom_type == 'linestring':
-            # For linestrings, normalize coordinates and compare in Python to handle floating point precision differences
-            all_features = FeatureStore.objects.filter(
-                user_id=user_id,
-                geometry__isnull=False
-            ).values('id', 'geojson', 'timestamp')
-            
-            # Filter to only linestrings and compare normalized coordinates
-            existing_features = []
-            for feat in all_features:
-                feat_geojson = feat['geojson'] if isinstance(feat['geojson'], dict) else json.loads(feat['geojson'])
-                feat_geom_type = feat_geojson.get('geometry', {}).get('type', '').lower()
-                if feat_geom_type == 'linestring':
-                    feature_coords = feat_geojson.get('geometry', {}).get('coordinates', [])
-                    if feature_coords:
-                        normalized_feature_coords = _normalize_coordinates(feature_coords)
-                        if normalized_coords == normalized_feature_coords:
-                            existing_features.append(feat)
-
-        elif geom_type == 'polygon':
-            # For polygons, normalize coordinates and compare in Python to handle floating point precision differences
-            all_features = FeatureStore.objects.filter(
-                user_id=user_id,
-                geometry__isnull=False
-            ).values('id', 'geojson', 'timestamp')
-            
-            # Filter to only polygons and compare normalized coordinates
-            existing_features = []
-            for feat in all_features:
-                feat_geojson = feat['geojson'] if isinstance(feat['geojson'], dict) else json.loads(feat['geojson'])
-                feat_geom_type = feat_geojson.get('geometry', {}).get('type', '').lower()
-                if feat_geom_type == 'polygon':
-                    feature_coords = feat_geojson.get('geometry', {}).get('coordinates', [])
-                    if feature_coords:
-                        normalized_feature_coords = _normalize_coordinates(feature_coords)
-                        if normalized_coords == normalized_feature_coords:
-                            existing_features.append(feat)
-
-        elif geom_type == 'multilinestring':
-            # For multilinestrings, normalize coordinates and compare in Python to handle floating point precision differences
-            all_features = FeatureStore.objects.filter(
-                user_id=user_id,
-                geometry__isnull=False
-            ).values('id', 'geojson', 'timestamp')
-            
-            # Filter to only multilinestrings and compare normalized coordinates
-            existing_features = []
-            for feat in all_features:
-                feat_geojson = feat['geojson'] if isinstance(feat['geojson'], dict) else json.loads(feat['geojson'])
-                feat_geom_type = feat_geojson.get('geometry', {}).get('type', '').lower()
-                if feat_geom_type == 'multilinestring':
-                    feature_coords = feat_geojson.get('geometry', {}).get('coordinates', [])
-                    if feature_coords:
-                        normalized_feature_coords = _normalize_coordinates(feature_coords)
-                        if normalized_coords == normalized_feature_coords:
-                            existing_features.append(feat)
-
-        elif geom_type == 'multipolygon':
-            # For multipolygons, normalize coordinates and compare in Python to handle floating point precision differences
-            all_features = FeatureStore.objects.filter(
-                user_id=user_id,
-                geometry__isnull=False
-            ).values('id', 'geojson', 'timestamp')
-            
-            # Filter to only multipolygons and compare normalized coordinates
-            existing_features = []
-            for feat in all_features:
-                feat_geojson = feat['geojson'] if isinstance(feat['geojson'], dict) else json.loads(feat['geojson'])
-                feat_geom_type = feat_geojson.get('geometry', {}).get('type', '').lower()
-                if feat_geom_type == 'multipolygon':
-                    feature_coords = feat_geojson.get('geometry', {}).get('coordinates', [])
-                    if feature_coords:
-                        normalized_feature_coords = _normalize_coordinates(feature_coords)
-                        if normalized_coords == normalized_feature_coords:
-                            existing_features.append(feat)
-
-        elif geom_type == 'multipoint':
-            # For multipoints, normalize coordinates and compare in Python to handle floating point precision differences
-            all_features = FeatureStore.objects.filter(
-                user_id=user_id,
-                geometry__isnull=False
-            ).values('id', 'geojson', 'timestamp')
-            
-            # Filter to only multipoints and compare normalized coordinates
-            existing_features = []
-            for feat in all_features:
-                feat_geojson = feat['geojson'] if isinstance(feat['geojson'], dict) else json.loads(feat['geojson'])
-                feat_geom_type = feat_geojson.get('geometry', {}).get('type', '').lower()
-                if feat_geom_type == 'multipoint':
-                    feature_coords = feat_geojson.get('geometry', {}).get('coordinates', [])
-                    if feature_coords:
-                        normalized_feature_coords = _normalize_coordinates(feature_coords)
-                        if normalized_coords == normalized_feature_coords:
-                            existing_features.append(feat)
-
-        elif geom_type == 'geometrycollection':
-            # For geometry collections, we need to handle this differently
-            # since GeometryCollection uses 'geometries' not 'coordinates'
-            # and contains multiple geometries of different types
-            return _find_geometry_collection_duplicates(coordinates, user_id)
-
-        else:
-            return []
-
-        # Convert to list and add feature info
-        result = []
-        for feature in existing_features:
-            geojson_data = feature['geojson'] if isinstance(feature['geojson'], dict) else json.loads(feature['geojson'])
-            result.append({
-                'id': feature['id'],
-                'name': geojson_data.get('properties', {}).get('name', 'Unnamed'),
-                'type': geojson_data.get('geometry', {}).get('type', 'Unknown'),
-                'timestamp': feature['timestamp'].isoformat(),
-                'geojson': geojson_data
-            })
-
-        return result
-
-    except Exception as e:
-        # Log internal error details but don't expose to user
-        logger.error(f"Error finding existing features by coordinates: {type(e).__name__}: {str(e)}")
-        logger.error(f"Coordinate lookup error traceback: {traceback.format_exc()}")
-        return []
+def _format_existing_feature(feature_id: int, geojson_data: Dict | str, timestamp) -> Dict:
+    """Build the existing feature info shown in the duplicate review UI."""
+    if not isinstance(geojson_data, dict):
+        geojson_data = json.loads(geojson_data)
+    return {
+        'id': feature_id,
+        'name': geojson_data.get('properties', {}).get('name', 'Unnamed'),
+        'type': geojson_data.get('geometry', {}).get('type', 'Unknown'),
+        'timestamp': timestamp.isoformat(),
+        'geojson': geojson_data
+    }
 
 
-def _find_geometry_collection_duplicates(geometries: List, user_id: int) -> List[Dict]:
+def _find_existing_features_by_fingerprints(fingerprints: List[str], user_id: int) -> Dict[str, List[Dict]]:
     """
-    Find existing features that match any geometry within a GeometryCollection.
-    Returns the first match found for any geometry in the collection.
+    Find existing features with matching geometry fingerprints in one round trip.
+    The fingerprints are sent as a single array parameter and joined against the
+    (user, geometry_fingerprint) index, so the query size doesn't grow with the upload.
+    Returns a dict of fingerprint -> list of existing feature info.
+    """
+    table = FeatureStore._meta.db_table
+    sql = f"""
+        SELECT fs.id, fs.geojson, fs.timestamp, fs.geometry_fingerprint
+        FROM unnest(%s::varchar[]) AS candidate(fingerprint)
+        JOIN {table} fs ON fs.user_id = %s AND fs.geometry_fingerprint = candidate.fingerprint
+        ORDER BY fs.id
     """
-    try:
-        # Check each geometry in the collection for duplicates
-        for geometry in geometries:
-            geom_type = geometry.get('type', '').lower()
-            coordinates = geometry.get('coordinates', [])
-
-            if coordinates:
-                # Recursively check this geometry for duplicates
-                existing_features = _find_existing_features_by_coordinates(coordinates, geom_type, user_id)
-                if existing_features:
-                    # Return the first match found
-                    return existing_features
-
-        # No duplicates found in any geometry
-        return []
 
-    except Exception as e:
-        logger.error(f"Error finding geometry collection duplicates: {type(e).__name__}: {str(e)}")
-        logger.error(f"Geometry collection error traceback: {traceback.format_exc()}")
-        return []
+    existing_lookup = {}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [fingerprints, user_id])
+        for feature_id, geojson_data, timestamp, fingerprint in cursor.fetchall():
+            existing_lookup.setdefault(fingerprint, []).append(_format_existing_feature(feature_id, geojson_data, timestamp))
+
+    return existing_lookup
 
 
 # TODO: allow re-import of old previously uploaded by re-uploading it
@@ -525,12 +199,6 @@ def _get_logs_by_log_id(log_id):
     return [{'timestamp': log.timestamp.isoformat(), 'msg': log.text, 'source': log.source, 'level': log.level} for log in logs]
 
 
-def _delete_logs_by_log_id(log_id):
-    """Delete all logs from DatabaseLogging table by log_id"""
-    deleted_count = DatabaseLogging.objects.filter(log_id=log_id).delete()[0]
-    return deleted_count
-
-
 class DocumentForm(forms.Form):
     file = forms.FileField()
 
@@ -548,10 +216,11 @@ def upload_item(request):
             file_name = uploaded_file.name
 
             # Comprehensive file validation using security module
+            # The validation result is handed to the upload job so the file isn't validated again
             validator = SecureFileValidator()
-            is_valid, validation_message = validator.validate_file(uploaded_file)
+            validated_upload, validation_message = validator.validate_upload(uploaded_file)
 
-            if not is_valid:
+            if validated_upload is None:
                 logger.warning(f"File validation failed for {file_name}: {validation_message}")
                 return JsonResponse({
                     'success': False,
@@ -559,8 +228,8 @@ def upload_item(request):
                     'job_id': None
                 }, status=400)
 
-            # Read file data after validation
-            file_data = uploaded_file.read()
+            # File data was read during validation
+            file_data = validated_upload.file_data
 
             # Get optional replacement parameter (feature ID being updated)
             replacement_feature_id = None
@@ -578,7 +247,7 @@ def upload_item(request):
             job_id = status_tracker.create_job(file_name, request.user.id)
 
             # Start background processing
-            if upload_job.start_upload_job(job_id, file_data, file_name, request.user.id, replacement_feature_id=replacement_feature_id):
+            if upload_job.start_upload_job(job_id, file_data, file_name, request.user.id, replacement_feature_id=replacement_feature_id, validated_upload=validated_upload):
                 return JsonResponse({
                     'success': True,
                     'msg': 'File uploaded successfully, processing started',
@@ -654,7 +323,11 @@ def fetch_import_history_item(request, item_id: int):
     if item.user_id != request.user.id:
         return JsonResponse({'success': False, 'msg': 'not authorized to view this item', 'code': 403}, status=400)
 
-    response = HttpResponse(item.raw_file, content_type='application/octet-stream')
+    raw_file = get_raw_file(item)
+    if raw_file is None:
+        return JsonResponse({'success': False, 'msg': 'the original file is not available', 'code': 404}, status=400)
+
+    response = HttpResponse(raw_file, content_type='application/octet-stream')
     response['Content-Disposition'] = 'attachment; filename="%s"' % item.original_filename
     return response
 
@@ -670,7 +343,7 @@ def get_import_queue_item_features(request, item_id: int):
         
         return JsonResponse({
             'success': True,
-            'geofeatures': item.geofeatures,
+            'geofeatures': get_staged_features(item.id),
             'original_filename': item.original_filename,
             'imported': item.imported,
             'replacement': item.replacement
@@ -785,11 +458,13 @@ def update_import_item(request, item_id):
             logger.error(f"Feature parsing error traceback: {traceback.format_exc()}")
             continue
 
-    # Update features in the geofeatures array by matching IDs
-    updated_count = 0
-    for i, existing_feature in enumerate(queue.geofeatures):
-        feature_id = existing_feature.get('properties', {}).get('id')
-        if feature_id and feature_id in updates_by_id:
+    # Update the staged features with matching IDs, only their rows are read and written
+    changed_rows = []
+    review_changed = False
+    with transaction.atomic():
+        rows = ImportQueueFeature.objects.select_for_update().filter(import_queue_id=queue.id, feature_id__in=list(updates_by_id))
+        for row in rows:
+            existing_feature = row.feature
             # Preserve protected tags from original feature
             original_tags = existing_feature.get('properties', {}).get('tags', [])
             if not isinstance(original_tags, list):
@@ -797,7 +472,8 @@ def update_import_item(request, item_id):
             protected_tags = [tag for tag in original_tags if is_protected_tag(tag, CONST_INTERNAL_TAGS)]
 
             # Filter protected tags from incoming feature
-            updated_feature = updates_by_id[feature_id]
+            updated_feature = updates_by_id[row.feature_id]
+            updated_feature = {**updated_feature, 'properties': dict(updated_feature['properties'])}
             new_tags = updated_feature.get('properties', {}).get('tags', [])
             if not isinstance(new_tags, list):
                 new_tags = []
@@ -805,11 +481,13 @@ def update_import_item(request, item_id):
 
             # Combine filtered user tags with preserved protected tags
             updated_feature['properties']['tags'] = filtered_tags + protected_tags
-            queue.geofeatures[i] = updated_feature
-            updated_count += 1
-
-    # Save the updated queue
-    queue.save()
+            review_changed |= update_staged_feature(row, updated_feature)
+            changed_rows.append(row)
+        ImportQueueFeature.objects.bulk_update(changed_rows, STAGED_FEATURE_UPDATE_FIELDS)
+        if review_changed:
+            # Moved features or lost duplicates change the review order
+            invalidate_review_index(queue.id)
+    updated_count = len(changed_rows)
 
     return JsonResponse({
         'success': True,
@@ -871,257 +549,26 @@ def import_to_featurestore(request, item_id):
                 'code': 409
             }, status=409)
 
-    # Prepare features for bulk import
-    features_to_create = []
-    existing_hashes = set()
-    current_batch_hashes = set()  # Track hashes in current import batch
-
-    # Get existing feature hashes for this user to avoid duplicates
-    existing_features = FeatureStore.objects.filter(user=request.user).values_list('file_hash', flat=True)
-    existing_hashes.update(existing_features)
-
-    # Thread-safe duplicate checking
-    duplicate_check_lock = threading.Lock()
-
-    def process_feature_with_index(args: Tuple[int, Dict[str, Any]]) -> Optional[FeatureStore]:
-        """Wrapper to unpack index and feature for executor.map()"""
-        feature_index, feature = args
-        return process_single_feature_for_import(feature, feature_index)
-
-    def process_single_feature_for_import(feature: Dict[str, Any], feature_index: int) -> Optional[FeatureStore]:
-        """
-        Process a single feature for import, including validation, tag generation, and FeatureStore creation.
-        This is a worker function designed to be called in parallel.
-        
-        Args:
-            feature: Feature dictionary from geofeatures
-            feature_index: Index of the feature (for logging)
-            
-        Returns:
-            FeatureStore object if successful, None if skipped or failed
-        """
-        try:
-            c = None
-            if 'geometry' not in feature or not feature['geometry']:
-                logger.warning(f"Skipping feature {feature_index} due to missing or empty geometry: {feature.get('properties', {}).get('name', 'Unnamed')}")
-                return None
-
-            geometry_type = feature['geometry']['type'].lower()
-            match geometry_type:
-                case 'point':
-                    c = PointFeature
-                case 'multipoint':
-                    c = PointFeature
-                case 'linestring':
-                    c = LineStringFeature
-                case 'multilinestring':
-                    c = MultiLineStringFeature
-                case 'polygon':
-                    c = PolygonFeature
-                case 'multipolygon':
-                    c = PolygonFeature
-                case _:
-                    feature_name = feature.get('properties', {}).get('name', 'Unnamed')
-                    logger.warning(f"Skipping feature {feature_index} '{feature_name}' due to unsupported geometry type: {geometry_type}")
-                    return None
-
-            assert c is not None
-
-            # Strip icon properties if import_custom_icons is False
-            if not import_custom_icons:
-                feature = strip_icon_properties(feature.copy())
-
-            feature_instance = c(**feature)
-            # Tags are already generated during processing step, just use existing tags
-            existing_tags = feature_instance.properties.tags or []
-            feature_instance.properties.tags = existing_tags
-
-            # Create the GeoJSON data
-            geojson_data = json.loads(feature_instance.model_dump_json())
-
-            # Generate hash-based ID for the feature
-            feature_hash = generate_feature_hash(geojson_data)
-
-            # Check if this feature already exists for this user or in current batch (thread-safe)
-            with duplicate_check_lock:
-                if feature_hash in existing_hashes or feature_hash in current_batch_hashes:
-                    # Skip importing duplicate features
-                    feature_name = geojson_data.get('properties', {}).get('name', 'Unnamed')
-                    # Skipping duplicate feature (normal operation)
-                    return None
-
-                # Add to current batch hashes to prevent duplicates within the same import
-                current_batch_hashes.add(feature_hash)
-
-            # Update the feature's ID in the GeoJSON data
-            geojson_data['properties']['id'] = feature_hash
-
-            # Create geometry object for spatial queries
-            geometry = None
-            if 'geometry' in geojson_data and geojson_data['geometry']:
-                try:
-                    # Ensure coordinates are properly formatted for GEOSGeometry
-                    geom_data = geojson_data['geometry'].copy()
-
-                    # Handle 3D coordinates by ensuring they're properly structured
-                    if geom_data['type'] == 'Point':
-                        coords = geom_data['coordinates']
-                        # Ensure Point has exactly 3 coordinates (x, y, z) or 2 (x, y)
-                        if len(coords) == 2:
-                            coords = [coords[0], coords[1], 0.0]  # Add Z=0 for 2D points
-                        elif len(coords) == 3:
-                            coords = [coords[0], coords[1], coords[2]]  # Keep 3D
-                        geom_data['coordinates'] = coords
-
-                    elif geom_data['type'] == 'LineString':
-                        coords = geom_data['coordinates']
-                        # Ensure each coordinate in LineString has 3 dimensions
-                        geom_data['coordinates'] = [
-                            [coord[0], coord[1], coord[2] if len(coord) > 2 else 0.0]
-                            for coord in coords
-                        ]
-
-                    elif geom_data['type'] == 'Polygon':
-                        coords = geom_data['coordinates']
-                        # Ensure each coordinate in Polygon has 3 dimensions
-                        geom_data['coordinates'] = [
-                            [
-                                [coord[0], coord[1], coord[2] if len(coord) > 2 else 0.0]
-                                for coord in ring
-                            ]
-                            for ring in coords
-                        ]
-
-                    geometry = GEOSGeometry(json.dumps(geom_data))
-                except Exception as e:
-                    # Log internal error details for debugging - don't expose to user
-                    logger.warning(f"Error creating geometry for feature {feature_index}: {type(e).__name__}: {str(e)}")
-                    logger.error(f"Geometry creation error traceback for feature {feature_index}: {traceback.format_exc()}")
-
-            # Create FeatureStore object
-            return FeatureStore(
-                geojson=geojson_data,
-                file_hash=feature_hash,
-                geometry=geometry,
-                source=import_item,
-                user=request.user
-            )
-        except Exception as e:
-            feature_name = feature.get('properties', {}).get('name', 'Unnamed')
-            logger.error(f"Error processing feature {feature_index} '{feature_name}': {type(e).__name__}: {str(e)}")
-            logger.error(f"Feature processing error traceback: {traceback.format_exc()}")
-            return None
-
-    # Filter out skipped features before processing
-    features_to_process = []
-    skipped_count = 0
-    for feature in import_item.geofeatures:
-        feature_id = feature.get('properties', {}).get('id')
-        if feature_id and feature_id in skipped_feature_ids:
-            skipped_count += 1
-            continue
-        features_to_process.append(feature)
-
-    # Get number of threads from settings
-    from django.conf import settings
-    num_threads = getattr(settings, 'IMPORT_PROCESSING_THREADS', 4)
-
-    # Process features in parallel using ThreadPoolExecutor
-    if len(features_to_process) > 0:
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            # Process all features in parallel and collect results
-            results = executor.map(
-                process_feature_with_index,
-                enumerate(features_to_process)
-            )
-
-            # Collect results from all workers
-            for feature_store in results:
-                if feature_store is not None:
-                    features_to_create.append(feature_store)
-
-    # Track successful feature creation
-    successful_imports = 0
-
-    # Bulk create all features at once for better performance
-    if features_to_create:
-        try:
-            # Importing features to database
-
-            bulk_batch_size = getattr(settings, 'BULK_CREATE_BATCH_SIZE', 1000)
-            FeatureStore.objects.bulk_create(features_to_create, batch_size=bulk_batch_size)
-            successful_imports = len(features_to_create)
-            # Features imported successfully
-        except Exception as e:
-            logger.warning(f"Bulk import failed for user {request.user.id}, falling back to individual imports: {str(e)}")
-            logger.error(f"Bulk import error traceback: {traceback.format_exc()}")
-            # Fallback to individual creation if bulk fails
-            for feature in features_to_create:
-                try:
-                    feature.save()
-                    successful_imports += 1
-                except Exception as individual_error:
-                    logger.error(f"Error creating individual feature for user {request.user.id}: {individual_error}")
-                    logger.error(f"Individual feature creation error traceback: {traceback.format_exc()}")
-                    # If it's a duplicate key error, that's expected and we can continue
-                    if "duplicate key" not in str(individual_error).lower():
-                        logger.error(f"Unexpected error creating feature for user {request.user.id}: {individual_error}")
-
-            # Fallback import completed
-
-    # Log final summary
-    total_processed = len(import_item.geofeatures)
-    total_imported = successful_imports
-    total_skipped_duplicates = total_processed - skipped_count - len(features_to_create)  # Features skipped due to duplicates or errors
-    
-    # Build success message
-    msg_parts = [f'Successfully imported {total_imported} features']
-    if skipped_count > 0:
-        msg_parts.append(f'{skipped_count} skipped by user')
-    if total_skipped_duplicates > 0:
-        msg_parts.append(f'{total_skipped_duplicates} already existed')
-    success_msg = ' (' + ', '.join(msg_parts[1:]) + ')' if len(msg_parts) > 1 else ''
-    success_msg = msg_parts[0] + success_msg
-
-    # Only mark as imported and proceed with cleanup if at least one feature was successfully created
-    if successful_imports > 0:
-        # Import completed
-
-        # Mark as imported only after successful feature creation
-        import_item.imported = True
-
-        # Delete logs before clearing the log_id
-        if import_item.log_id:
-            _delete_logs_by_log_id(str(import_item.log_id))
-
-        # Erase some unneeded data since it's not needed anymore now that it's in the feature store.
-        import_item.geofeatures = []
-        import_item.log_id = None
-
-        import_item.save()
-
-        # Broadcast WebSocket event for item import
-        _broadcast_item_imported(request.user.id, item_id)
-
-        return JsonResponse({'success': True, 'msg': success_msg})
-    else:
-        # No features were successfully imported
-        logger.warning(f"Import failed for user {request.user.id}: No features were imported from '{import_item.original_filename}'")
-
-        # Determine reason for failure
-        if len(features_to_create) == 0:
-            if total_processed == 0:
-                reason = "No features found in the file"
-            else:
-                reason = f"All {total_processed} features were skipped (duplicates, missing geometry, or unsupported types)"
-        else:
-            reason = f"Failed to create {len(features_to_create)} features in the database"
-
+    # One import of an item at a time, a double click or retry would queue a second job
+    if any(job.job_type == JobType.IMPORT and job.status.value not in TERMINAL_STATUSES
+           and (job.result_data or {}).get('item_id') == import_item.id
+           for job in status_tracker.get_user_jobs(request.user.id)):
         return JsonResponse({
             'success': False,
-            'msg': f'No features were imported. {reason}.',
-            'code': 400
-        }, status=400)
+            'msg': 'This item is already being imported',
+            'code': 409
+        }, status=409)
+
+    # Features are written by a background job, large imports would run into proxy timeouts
+    job_id = import_job.start_import_job(
+        import_item.id, request.user.id, import_item.original_filename,
+        import_custom_icons=import_custom_icons,
+        skipped_feature_ids=list(skipped_feature_ids)
+    )
+    if not job_id:
+        return JsonResponse({'success': False, 'msg': 'Failed to start the import', 'code': 500}, status=500)
+
+    return JsonResponse({'success': True, 'msg': 'Import started', 'job_id': job_id}, status=202)
 
 
 def _hash_kml(b: str):
@@ -1170,41 +617,3 @@ def _broadcast_items_deleted(user_id: int, item_ids: list):
                 'data': {'ids': item_ids}
             }
         )
-
-
-def _broadcast_item_imported(user_id: int, item_id: int):
-    """Broadcast WebSocket event when an item is imported."""
-    from channels.layers import get_channel_layer
-    from asgiref.sync import async_to_sync
-    from api.models import ImportQueue
-
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        # Get item details for history broadcast
-        try:
-            item = ImportQueue.objects.get(id=item_id)
-            item_data = {
-                'id': item_id,
-                'original_filename': item.original_filename,
-                'timestamp': item.timestamp.isoformat()
-            }
-        except ImportQueue.DoesNotExist:
-            item_data = {'id': item_id}
-
-        # Broadcast to import queue module
-        async_to_sync(channel_layer.group_send)(
-            f"realtime_{user_id}",
-            {
-                'type': 'import_queue_item_imported',
-                'data': {'id': item_id}
-            }
-        )
-
-        # Broadcast to import history module
-        async_to_sync(channel_layer.group_send)(
-            f"realtime_{user_id}",
-            {
-                'type': 'import_history_item_added',
-                'data': item_data
-            }
-        )
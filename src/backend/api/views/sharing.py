@@ -9,7 +9,8 @@ from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 
 from api.models import TagShare, CollectionShare, Collection, FeatureStore
-from api.views.bbox_query import BboxQueryResult, _build_bbox_response, _get_features_in_bbox, _validate_bbox_params
+from api.views.bbox_query import BboxQueryResult, _build_bbox_response, _get_features_in_bbox, _validate_bbox_params, _get_features_tile, \
+    _validate_tile_coordinates, _build_tile_response, _stream_feature_collection
 from geo_lib.logging.console import get_access_logger
 from geo_lib.website.auth import login_required_401
 
@@ -293,7 +294,7 @@ def get_public_share(request, share_id):
     Public endpoint to get features for a shared tag within a bounding box.
     No authentication required.
     Returns GeoJSON FeatureCollection of features with the shared tag in the specified bbox.
-    Increments access_count on each successful access.
+    Increments access_count on each access whose response was sent completely.
 
     Query parameters:
     - bbox: comma-separated bounding box (min_lon,min_lat,max_lon,max_lat) - required
@@ -327,17 +328,15 @@ def get_public_share(request, share_id):
 
         # Fetch data from database with optimized single query
         query_result = _get_public_share_features_in_bbox(bbox, share.user.id, share.tag, zoom_level)
-        features = query_result.features
-        total_features_in_bbox = query_result.total_count
-        fallback_used = query_result.fallback_used
 
         # Build response using helper function, including tag for frontend display
-        response_data = _build_bbox_response(features, total_features_in_bbox, zoom_level, fallback_used, tag=share.tag)
+        response_data = _build_bbox_response(query_result.feature_count, query_result.total_count, zoom_level, query_result.fallback_used, tag=share.tag)
 
-        # Increment access count atomically only on successful response
-        TagShare.objects.filter(share_id=share_id).update(access_count=F('access_count') + 1)
-
-        return JsonResponse(response_data)
+        # Increment access count atomically, once the response was sent completely
+        return _stream_feature_collection(
+            query_result.features, response_data,
+            on_complete=lambda: TagShare.objects.filter(share_id=share_id).aupdate(access_count=F('access_count') + 1)
+        )
 
     except Exception:
         logger.error(f"Error getting public share: {traceback.format_exc()}")
@@ -434,6 +433,52 @@ def create_collection_share(request):
 
 
 
+@require_http_methods(["GET"])
+def get_public_share_tile(request, share_id, z, x, y):
+    """
+    Public endpoint to get a Mapbox Vector Tile of the features for a shared tag.
+    No authentication required.
+    Does not increment access_count, since a single map view requests many tiles.
+
+    Path parameters:
+    - z, x, y: XYZ tile coordinates
+    """
+    try:
+        # Validate share_id format (must be UUID4)
+        if not _validate_share_id(share_id):
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid share link',
+                'code': 404
+            }, status=404)
+
+        share = TagShare.objects.filter(share_id=share_id).first()
+
+        if not share:
+            # Return same error message to prevent information disclosure
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid share link',
+                'code': 404
+            }, status=404)
+
+        validation_error = _validate_tile_coordinates(z, x, y)
+        if validation_error:
+            return validation_error
+
+        tile = _get_features_tile(z, x, y, share.user.id, tag=share.tag, public_safe=True)
+        return _build_tile_response(tile, 'public, max-age=300')
+
+    except Exception:
+        logger.error(f"Error getting public share tile: {traceback.format_exc()}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to get shared features',
+            'code': 500
+        }, status=500)
+
+
+
 
 @require_http_methods(["GET"])
 def get_public_collection_share(request, share_id):
@@ -441,7 +486,7 @@ def get_public_collection_share(request, share_id):
     Public endpoint to get features for a shared collection within a bounding box.
     No authentication required.
     Returns GeoJSON FeatureCollection of features in the shared collection in the specified bbox.
-    Increments access_count on each successful access.
+    Increments access_count on each access whose response was sent completely.
 
     Query parameters:
     - bbox: comma-separated bounding box (min_lon,min_lat,max_lon,max_lat) - required
@@ -475,17 +520,15 @@ def get_public_collection_share(request, share_id):
 
         # Fetch data from database using collection query
         query_result = _get_features_in_bbox(bbox, share.user.id, zoom_level, collection_id=share.collection.id, public_safe=True, include_tags=share.include_tags)
-        features = query_result.features
-        total_features_in_bbox = query_result.total_count
-        fallback_used = query_result.fallback_used
 
         # Build response using helper function, including collection name for frontend display
-        response_data = _build_bbox_response(features, total_features_in_bbox, zoom_level, fallback_used, collection_name=share.collection.name)
+        response_data = _build_bbox_response(query_result.feature_count, query_result.total_count, zoom_level, query_result.fallback_used, collection_name=share.collection.name)
 
-        # Increment access count atomically only on successful response
-        CollectionShare.objects.filter(share_id=share_id).update(access_count=F('access_count') + 1)
-
-        return JsonResponse(response_data)
+        # Increment access count atomically, once the response was sent completely
+        return _stream_feature_collection(
+            query_result.features, response_data,
+            on_complete=lambda: CollectionShare.objects.filter(share_id=share_id).aupdate(access_count=F('access_count') + 1)
+        )
 
     except Exception:
         logger.error(f"Error getting public collection share: {traceback.format_exc()}")
@@ -495,3 +538,48 @@ def get_public_collection_share(request, share_id):
             'code': 500
         }, status=500)
 
+
+
+@require_http_methods(["GET"])
+def get_public_collection_share_tile(request, share_id, z, x, y):
+    """
+    Public endpoint to get a Mapbox Vector Tile of the features in a shared collection.
+    No authentication required.
+    Does not increment access_count, since a single map view requests many tiles.
+
+    Path parameters:
+    - z, x, y: XYZ tile coordinates
+    """
+    try:
+        # Validate share_id format (must be UUID4)
+        if not _validate_share_id(share_id):
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid share link',
+                'code': 404
+            }, status=404)
+
+        share = CollectionShare.objects.filter(share_id=share_id).select_related('collection').first()
+
+        if not share:
+            # Return same error message to prevent information disclosure
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid share link',
+                'code': 404
+            }, status=404)
+
+        validation_error = _validate_tile_coordinates(z, x, y)
+        if validation_error:
+            return validation_error
+
+        tile = _get_features_tile(z, x, y, share.user.id, collection_id=share.collection.id, public_safe=True, include_tags=share.include_tags)
+        return _build_tile_response(tile, 'public, max-age=300')
+
+    except Exception:
+        logger.error(f"Error getting public collection share tile: {traceback.format_exc()}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to get shared features',
+            'code': 500
+        }, status=500)
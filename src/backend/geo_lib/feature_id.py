@@ -3,7 +3,7 @@ Utility functions for generating consistent feature IDs based on GeoJSON content
 """
 import hashlib
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from functools import lru_cache
 
 
@@ -74,3 +74,49 @@ def get_feature_id_from_geojson(geojson_feature: Dict[str, Any]) -> str:
     
     # Otherwise, generate a hash-based ID
     return generate_feature_hash(geojson_feature)
+
+
+def _round_coordinates(coords: List) -> List:
+    """
+    Round coordinates to 6 decimal places (~10cm), recursively for nested coordinate arrays.
+    Values are converted to float so 1 and 1.0 (and -0.0 and 0.0) produce the same output.
+    """
+    if coords and isinstance(coords[0], (int, float)):
+        return [round(float(coord), 6) + 0.0 for coord in coords]
+    return [_round_coordinates(coord) for coord in coords]
+
+
+def generate_geometry_fingerprint(geom_type: str, coordinates: List) -> str | None:
+    """
+    Generate a fingerprint of a geometry for coordinate duplicate detection.
+
+    The fingerprint is a SHA-256 hash of the geometry type and the coordinates rounded
+    to 6 decimal places, so geometries that only differ by floating point noise get the
+    same fingerprint. Unlike generate_feature_hash(), properties are not included.
+
+    Args:
+        geom_type: GeoJSON geometry type (case-insensitive)
+        coordinates: GeoJSON coordinates array
+
+    Returns:
+        A SHA-256 hash string, or None if the geometry has no type or coordinates
+        (e.g. a GeometryCollection, which uses 'geometries' instead)
+    """
+    if not geom_type or not coordinates:
+        return None
+    fingerprint_data = json.dumps([geom_type.lower(), _round_coordinates(coordinates)], separators=(',', ':'))
+    return hashlib.sha256(fingerprint_data.encode('utf-8')).hexdigest()
+
+
+def get_geometry_fingerprint(geojson_feature: Dict[str, Any]) -> str | None:
+    """
+    Get the geometry fingerprint of a GeoJSON feature (see generate_geometry_fingerprint()).
+
+    Args:
+        geojson_feature: A GeoJSON feature dictionary
+
+    Returns:
+        A SHA-256 hash string, or None if the feature has no fingerprintable geometry
+    """
+    geometry = geojson_feature.get('geometry') or {}
+    return generate_geometry_fingerprint(geometry.get('type', ''), geometry.get('coordinates'))
@@ -0,0 +1,233 @@
+"""
+Persistent reverse geocoding cache.
+
+Lookups are keyed by a grid cell (the coordinate rounded down to GEOCODING_CACHE_PRECISION
+decimal places) and stored per lookup kind, so a point near one that was geocoded before
+reuses its admin, city, protected area and lake results instead of querying Overpass/Nominatim again.
+Country, state and county boundaries are large, so the admin lookup uses the coarser
+GEOCODING_ADMIN_CACHE_PRECISION grid.
+Empty results are cached too. Failed requests are not.
+"""
+import math
+import threading
+from datetime import timedelta
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from geo_lib.geolocation.overpass_planner import ADMIN
+from geo_lib.logging.console import get_geocode_logger
+
+logger = get_geocode_logger()
+
+# Returned by GeocodeCache.get() when there is no usable entry (None is a valid cached result)
+CACHE_MISS = object()
+
+
+def cell_key(latitude: float, longitude: float, precision: int) -> str:
+    """
+    Get the grid cell key for a coordinate.
+    With a precision of 3 decimal places a cell is roughly 110 m tall.
+    """
+    scale = 10 ** precision
+    return f"{precision}:{math.floor(latitude * scale)}:{math.floor(longitude * scale)}"
+
+
+def cell_center(latitude: float, longitude: float, precision: int) -> Tuple[float, float]:
+    """Get the center of the grid cell containing a coordinate."""
+    scale = 10 ** precision
+    return (math.floor(latitude * scale) + 0.5) / scale, (math.floor(longitude * scale) + 0.5) / scale
+
+
+class GeocodeCacheStats:
+    """Thread-safe hit/miss counters for the cache lookups made during one import."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    def summary(self) -> str:
+        hit_rate = (self.hits / self.lookups * 100) if self.lookups else 0.0
+        return f"Geocoding cache: {self.hits} hit(s), {self.misses} miss(es) ({hit_rate:.0f}% hit rate)"
+
+
+class GeocodeCache:
+    """
+    Database backed cache of reverse geocoding lookups.
+    Database errors are logged and treated as misses so the cache can never break geocoding.
+    """
+
+    def __init__(self):
+        self.enabled = getattr(settings, 'GEOCODING_CACHE_ENABLED', True)
+        self.precision = getattr(settings, 'GEOCODING_CACHE_PRECISION', 3)
+        self.admin_precision = min(self.precision, getattr(settings, 'GEOCODING_ADMIN_CACHE_PRECISION', 2))
+        self.ttl = timedelta(days=getattr(settings, 'GEOCODING_CACHE_TTL_DAYS', 30))
+
+    def precision_for(self, kind: str) -> int:
+        """Get the cell precision used for a lookup kind."""
+        return self.admin_precision if kind == ADMIN else self.precision
+
+    def cell(self, kind: str, latitude: float, longitude: float) -> str:
+        """Get the cell key a lookup of this kind is stored under."""
+        return cell_key(latitude, longitude, self.precision_for(kind))
+
+    def get(self, kind: str, latitude: float, longitude: float) -> Any:
+        """
+        Get a cached lookup result.
+
+        Returns:
+            The cached result (may be None), or CACHE_MISS
+        """
+        if not self.enabled:
+            return CACHE_MISS
+        try:
+            from api.models import GeocodeCache as GeocodeCacheModel
+            row = GeocodeCacheModel.objects.filter(
+                cell=self.cell(kind, latitude, longitude),
+                kind=kind,
+                updated_at__gte=timezone.now() - self.ttl
+            ).values_list('result').first()
+            return CACHE_MISS if row is None else row[0]
+        except Exception as e:
+            logger.warning(f"Geocoding cache read failed: {e}")
+            return CACHE_MISS
+
+    def get_many(self, kinds: List[str], points: List[Tuple[float, float]]) -> Dict[Tuple[str, str], Any]:
+        """
+        Get cached results for several kinds and points with one query.
+
+        Returns:
+            Dict mapping (kind, cell key) to the cached result, missing entries are left out
+        """
+        if not self.enabled or not kinds or not points:
+            return {}
+        try:
+            from api.models import GeocodeCache as GeocodeCacheModel
+            cells = {self.cell(kind, latitude, longitude) for kind in kinds for latitude, longitude in points}
+            rows = GeocodeCacheModel.objects.filter(
+                cell__in=cells,
+                kind__in=kinds,
+                updated_at__gte=timezone.now() - self.ttl
+            ).values_list('kind', 'cell', 'result')
+            return {(kind, cell): result for kind, cell, result in rows}
+        except Exception as e:
+            logger.warning(f"Geocoding cache read failed: {e}")
+            return {}
+
+    def set(self, kind: str, latitude: float, longitude: float, result: Any):
+        """Store a lookup result, replacing an expired entry for the same cell."""
+        if not self.enabled:
+            return
+        try:
+            from api.models import GeocodeCache as GeocodeCacheModel
+            GeocodeCacheModel.objects.bulk_create(
+                [GeocodeCacheModel(
+                    cell=self.cell(kind, latitude, longitude),
+                    kind=kind,
+                    result=result,
+                    updated_at=timezone.now()
+                )],
+                update_conflicts=True,
+                unique_fields=['cell', 'kind'],
+                update_fields=['result', 'updated_at']
+            )
+        except Exception as e:
+            logger.warning(f"Geocoding cache write failed: {e}")
+
+    def set_many(self, entries: List[Tuple[str, Tuple[float, float], Any]]):
+        """Store several (kind, (latitude, longitude), result) lookup results with one query."""
+        if not self.enabled or not entries:
+            return
+        try:
+            from api.models import GeocodeCache as GeocodeCacheModel
+            now = timezone.now()
+            rows = {}
+            for kind, (latitude, longitude), result in entries:
+                cell = self.cell(kind, latitude, longitude)
+                # A single upsert can't touch the same row twice
+                rows[(cell, kind)] = GeocodeCacheModel(cell=cell, kind=kind, result=result, updated_at=now)
+            GeocodeCacheModel.objects.bulk_create(
+                list(rows.values()),
+                update_conflicts=True,
+                unique_fields=['cell', 'kind'],
+                update_fields=['result', 'updated_at']
+            )
+        except Exception as e:
+            logger.warning(f"Geocoding cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL. Returns the number of deleted entries."""
+        from api.models import GeocodeCache as GeocodeCacheModel
+        deleted, _ = GeocodeCacheModel.objects.filter(updated_at__lt=timezone.now() - self.ttl).delete()
+        return deleted
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        """Count cached entries per lookup kind."""
+        from django.db.models import Count
+        from api.models import GeocodeCache as GeocodeCacheModel
+        return {row['kind']: row['count'] for row in GeocodeCacheModel.objects.values('kind').annotate(count=Count('id'))}
+
+
+class MemoryGeocodeCache(GeocodeCache):
+    """
+    In-memory geocoding cache with the same cells and interface, starting out empty.
+    Used by the geocoding benchmark so results from the mock server never end up in the database cache.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.enabled = True
+        self._entries: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, latitude: float, longitude: float) -> Any:
+        with self._lock:
+            return self._entries.get((kind, self.cell(kind, latitude, longitude)), CACHE_MISS)
+
+    def get_many(self, kinds: List[str], points: List[Tuple[float, float]]) -> Dict[Tuple[str, str], Any]:
+        with self._lock:
+            keys = {(kind, self.cell(kind, latitude, longitude)) for kind in kinds for latitude, longitude in points}
+            return {key: self._entries[key] for key in keys if key in self._entries}
+
+    def set(self, kind: str, latitude: float, longitude: float, result: Any):
+        with self._lock:
+            self._entries[(kind, self.cell(kind, latitude, longitude))] = result
+
+    def set_many(self, entries: List[Tuple[str, Tuple[float, float], Any]]):
+        with self._lock:
+            for kind, (latitude, longitude), result in entries:
+                self._entries[(kind, self.cell(kind, latitude, longitude))] = result
+
+    def purge_expired(self) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for kind, _ in self._entries:
+                counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+
+_geocode_cache = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache()
+    return _geocode_cache
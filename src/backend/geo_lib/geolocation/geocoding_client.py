@@ -0,0 +1,217 @@
+"""
+Asynchronous HTTP client for the geocoding services.
+
+All Overpass/Nominatim requests of a process go through one aiohttp session running on a
+dedicated event loop thread, which gives:
+- connection pooling and keep-alive instead of a new connection (and TLS handshake) per call
+- a token bucket rate limit per endpoint (Nominatim's usage policy allows 1 request per second),
+  the configured rate is split between the processes that geocode (see geocoding_client_processes())
+- retries with exponential backoff for timeouts, connection errors, 429 and 5xx responses
+- a bound on the number of requests in flight
+
+Synchronous code (the import worker threads) calls request_sync(), async code can await
+request() directly or submit many requests at once with run().
+"""
+import asyncio
+import concurrent.futures
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Coroutine
+
+import aiohttp
+from django.conf import settings
+
+from geo_lib.logging.console import get_geocode_logger
+
+logger = get_geocode_logger()
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 60
+# How often run() asks its cancel check whether to stop waiting
+CANCEL_CHECK_INTERVAL_SECONDS = 1.0
+
+
+class GeocodingCancelled(Exception):
+    """Raised by AsyncGeocodingClient.run() when the caller's job was cancelled."""
+
+
+class GeocodingResponse:
+    """Minimal response object, compatible with how the geocoding code used `requests` responses."""
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    Allows `burst` requests at once, refilled at `rate` tokens per second. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def geocoding_client_processes() -> int:
+    """
+    Number of processes that send geocoding requests, each one gets an equal share of the rate limits.
+    The limiter isn't shared between processes, so without this every job worker would send the full rate.
+    """
+    processes = getattr(settings, 'GEOCODING_CLIENT_PROCESSES', 0)
+    if processes > 0:
+        return processes
+    if getattr(settings, 'JOB_QUEUE_BACKEND', 'database') == 'database':
+        # The web server and the run_workers processes
+        return 1 + max(1, getattr(settings, 'JOB_WORKER_PROCESSES', 2))
+    return 1
+
+
+class AsyncGeocodingClient:
+    """
+    Pooled, rate limited HTTP client for the geocoding endpoints ('overpass' and 'nominatim').
+    Use get_geocoding_client() to get the process wide instance.
+    """
+
+    def __init__(self):
+        self.max_concurrency = max(1, getattr(settings, 'GEOCODING_MAX_CONCURRENCY', 4))
+        self.max_retries = max(0, getattr(settings, 'GEOCODING_MAX_RETRIES', 3))
+        self.retry_backoff = getattr(settings, 'GEOCODING_RETRY_BACKOFF_SECONDS', 1.0)
+        # The configured rates are shared by every process with a client
+        processes = geocoding_client_processes()
+        self.rates = {
+            'overpass': getattr(settings, 'OVERPASS_REQUESTS_PER_SECOND', 2.0) / processes,
+            'nominatim': getattr(settings, 'NOMINATIM_REQUESTS_PER_SECOND', 1.0) / processes,
+        }
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name='geocoding-client', daemon=True)
+        self._thread.start()
+
+        # Created on the event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _get_bucket(self, endpoint: str) -> TokenBucket:
+        if endpoint not in self._buckets:
+            self._buckets[endpoint] = TokenBucket(self.rates.get(endpoint, 0))
+        return self._buckets[endpoint]
+
+    async def request(self, endpoint: str, method: str, url: str, params: Dict[str, Any] = None,
+                      data: Dict[str, Any] = None, headers: Dict[str, str] = None, timeout: float = 15) -> GeocodingResponse:
+        """
+        Make a rate limited request, retrying transient failures.
+        Must be awaited on the client's event loop (see run()).
+
+        Args:
+            endpoint: Rate limit bucket ('overpass' or 'nominatim')
+
+        Returns:
+            The response. After the last retry the failed response is returned as is.
+
+        Raises:
+            aiohttp.ClientError or asyncio.TimeoutError if the last attempt failed without a response
+        """
+        session = self._get_session()
+        bucket = self._get_bucket(endpoint)
+        attempt = 0
+        while True:
+            retry_after = None
+            await bucket.acquire()
+            try:
+                async with self._semaphore:
+                    async with session.request(method, url, params=params, data=data, headers=headers,
+                                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                        text = await response.text()
+                        result = GeocodingResponse(response.status, text)
+                        if response.status not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                            return result
+                        retry_after = response.headers.get('Retry-After')
+                        logger.debug(f"{endpoint} returned status {response.status}, retrying")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.debug(f"{endpoint} request failed ({type(e).__name__}), retrying")
+
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass
+        # Exponential backoff with jitter so parallel requests don't retry in lockstep
+        return self.retry_backoff * (2 ** attempt) * (0.5 + random.random())
+
+    def run(self, coro: Coroutine, is_cancelled: Optional[Callable[[], bool]] = None) -> Any:
+        """
+        Run a coroutine on the client's event loop and wait for its result.
+        If is_cancelled is given it's checked while waiting, once it returns True the coroutine is
+        cancelled (so no further requests are made) and GeocodingCancelled is raised.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if is_cancelled is None:
+            return future.result()
+        while True:
+            try:
+                return future.result(timeout=CANCEL_CHECK_INTERVAL_SECONDS)
+            except concurrent.futures.TimeoutError:
+                if is_cancelled():
+                    future.cancel()
+                    raise GeocodingCancelled()
+
+    def request_sync(self, endpoint: str, method: str, url: str, **kwargs) -> GeocodingResponse:
+        """Blocking version of request() for synchronous callers."""
+        return self.run(self.request(endpoint, method, url, **kwargs))
+
+
+_geocoding_client = None
+_geocoding_client_pid = None
+_geocoding_client_lock = threading.Lock()
+
+
+def get_geocoding_client() -> AsyncGeocodingClient:
+    """Get the process wide geocoding client (recreated after a fork, the event loop thread doesn't survive it)."""
+    global _geocoding_client, _geocoding_client_pid
+    with _geocoding_client_lock:
+        if _geocoding_client is None or _geocoding_client_pid != os.getpid():
+            _geocoding_client = AsyncGeocodingClient()
+            _geocoding_client_pid = os.getpid()
+        return _geocoding_client
@@ -0,0 +1,206 @@
+"""
+Offline reverse geocoding backend.
+Answers the same questions as the Overpass/Nominatim backend with ST_Contains/ST_DWithin queries
+against boundaries loaded into PostGIS by `manage.py load_geocoding_boundaries`.
+"""
+import math
+from typing import Optional, Dict, Any, List
+
+from django.conf import settings
+from django.db import connection
+
+from geo_lib.geolocation.reverse_geocode import ReverseGeocodingService
+from geo_lib.logging.console import get_geocode_logger
+
+logger = get_geocode_logger()
+
+BOUNDARY_KINDS = ('country', 'state', 'county', 'city', 'protected_area', 'water')
+
+METERS_PER_MILE = 1609.34
+METERS_PER_DEGREE = 111320.0
+
+_POINT_SQL = "ST_SetSRID(ST_MakePoint(%s, %s), 4326)"
+
+
+def _search_radius_degrees(latitude: float, radius_meters: float) -> float:
+    """
+    Degrees to expand a point by so the box covers radius_meters in every direction.
+    Used as an index-friendly prefilter before the exact geography distance check.
+    """
+    cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+    return radius_meters / (METERS_PER_DEGREE * cos_lat)
+
+
+class LocalBoundaryGeocodingService(ReverseGeocodingService):
+    """
+    Reverse geocoding from local boundary tables.
+    Every lookup is a single indexed query, so results are not cached.
+    """
+
+    def prefetch_location_data(self, points, cache_stats=None, import_log=None, is_cancelled=None) -> int:
+        """Local lookups are cheap, nothing to prefetch."""
+        return 0
+
+    def _containing(self, kinds: List[str], latitude: float, longitude: float) -> List[Dict[str, Any]]:
+        """Get boundaries of the given kinds that contain the point, smallest first."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT kind, name, code, subtype
+                FROM api_geocodingboundary
+                WHERE kind = ANY(%s)
+                  AND ST_Contains(geometry, {_POINT_SQL})
+                ORDER BY ST_Area(geometry) ASC
+            """, [list(kinds), longitude, latitude])
+            return [
+                {'kind': kind, 'name': name, 'code': code, 'subtype': subtype}
+                for kind, name, code, subtype in cursor.fetchall()
+            ]
+
+    def _nearby(self, kind: str, latitude: float, longitude: float, radius_meters: float, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get boundaries of a kind within radius_meters of the point, closest first."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                WITH pt AS (SELECT {_POINT_SQL} AS geom)
+                SELECT b.name, b.code, b.subtype, ST_Distance(b.geometry::geography, pt.geom::geography) AS distance
+                FROM api_geocodingboundary b, pt
+                WHERE b.kind = %s
+                  AND b.geometry && ST_Expand(pt.geom, %s)
+                  AND ST_DWithin(b.geometry::geography, pt.geom::geography, %s)
+                ORDER BY distance ASC
+                LIMIT %s
+            """, [longitude, latitude, kind, _search_radius_degrees(latitude, radius_meters), radius_meters, limit])
+            return [
+                {'name': name, 'code': code, 'subtype': subtype, 'distance_meters': distance}
+                for name, code, subtype, distance in cursor.fetchall()
+            ]
+
+    def _admin_result(self, boundaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        result = {
+            'country_code': '',
+            'state': '',
+            'county': '',
+        }
+        for boundary in boundaries:
+            kind = boundary['kind']
+            if kind == 'country' and not result['country_code']:
+                result['country_code'] = boundary['code'].upper()
+            elif kind == 'state' and not result['state']:
+                result['state'] = boundary['name']
+            elif kind == 'county' and not result['county']:
+                result['county'] = boundary['name']
+            # States and counties may carry the country code when no country layer is loaded
+            if kind in ('state', 'county') and boundary['code'] and not result['country_code']:
+                result['country_code'] = boundary['code'].upper()
+        return result
+
+    def is_point_in_water(self, latitude: float, longitude: float) -> bool:
+        """Check if a point is inside a water polygon."""
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return False
+        try:
+            return bool(self._containing(['water'], latitude, longitude))
+        except Exception as e:
+            logger.warning(f"Local water check failed: {e}")
+            return False
+
+    def reverse_geocode_overpass(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
+        """Get country, state and county from the local admin boundaries."""
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return None
+        try:
+            result = self._admin_result(self._containing(['country', 'state', 'county'], latitude, longitude))
+        except Exception as e:
+            self._log_failure(f"Local admin boundary lookup failed for coordinates ({latitude}, {longitude}): {str(e)}", import_log)
+            return None
+        if result['country_code'] or result['state']:
+            return result
+        return None
+
+    def reverse_geocode_nominatim(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
+        """Get the containing city along with country, state and county from the local boundaries."""
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return None
+        try:
+            boundaries = self._containing(['country', 'state', 'county', 'city'], latitude, longitude)
+        except Exception as e:
+            self._log_failure(f"Local city lookup failed for coordinates ({latitude}, {longitude}): {str(e)}", import_log)
+            return None
+
+        result = self._admin_result(boundaries)
+        result['city'] = ''
+        result['place_type'] = ''
+        city = next((b for b in boundaries if b['kind'] == 'city'), None)
+        if city:
+            result['city'] = city['name']
+            result['place_type'] = city['subtype'] or 'city'
+
+        if result['city'] or result['state'] or result['country_code']:
+            return result
+        return None
+
+    def reverse_geocode(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
+        """Both lookups come from the same tables, so one query answers everything."""
+        return self.reverse_geocode_nominatim(latitude, longitude, import_log)
+
+    def check_city_proximity(self, latitude: float, longitude: float, threshold_miles: float, import_log=None) -> Optional[Dict[str, Any]]:
+        """Find the closest city boundary or place point within threshold_miles."""
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return None
+        try:
+            # Don't return city proximity if point is in water
+            if self.is_point_in_water(latitude, longitude):
+                return None
+            cities = self._nearby('city', latitude, longitude, threshold_miles * METERS_PER_MILE, limit=1)
+            if not cities:
+                return None
+            admin = self.reverse_geocode_overpass(latitude, longitude, import_log) or {}
+            return {
+                'name': cities[0]['name'],
+                'admin1': admin.get('state', ''),
+                'admin2': admin.get('county', ''),
+                'cc': admin.get('country_code', '') or cities[0]['code'].upper(),
+                'distance_miles': cities[0]['distance_meters'] / METERS_PER_MILE
+            }
+        except Exception as e:
+            self._log_failure(f"City proximity check failed for coordinates ({latitude}, {longitude}): {str(e)}", import_log)
+            return None
+
+    def search_protected_areas(self, latitude: float, longitude: float) -> List[Dict[str, Any]]:
+        """Get protected areas containing the point."""
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return []
+        try:
+            return [
+                {
+                    'name': area['name'],
+                    'type': area['subtype'] or 'protected_area',
+                    'class': 'boundary',
+                    'boundary_type': 'protected_area',
+                    'protect_class': area['subtype'],
+                }
+                for area in self._containing(['protected_area'], latitude, longitude)
+            ]
+        except Exception as e:
+            logger.warning(f"Local protected area lookup failed: {e}")
+            return []
+
+    def search_lakes(self, latitude: float, longitude: float, proximity_miles: float = 1.0) -> List[Dict[str, Any]]:
+        """Get named water bodies containing the point, or if there are none, within proximity_miles of it."""
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return []
+        try:
+            lakes = [{'name': water['name'], 'distance_miles': 0.0} for water in self._containing(['water'], latitude, longitude) if water['name']]
+            if lakes:
+                return lakes
+            nearby = self._nearby('water', latitude, longitude, proximity_miles * METERS_PER_MILE)
+            return [{'name': water['name'], 'distance_miles': water['distance_meters'] / METERS_PER_MILE} for water in nearby if water['name']]
+        except Exception as e:
+            logger.warning(f"Local lake lookup failed: {e}")
+            return []
+
+    @staticmethod
+    def _log_failure(error_msg: str, import_log=None):
+        logger.warning(error_msg)
+        if import_log:
+            from geo_lib.processing.logging import DatabaseLogLevel
+            import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
@@ -0,0 +1,293 @@
+"""
+Local stand-in for the Overpass and Nominatim APIs.
+
+Answers the queries ReverseGeocodingService makes (single lookups and merged planner queries)
+from a fixture file instead of OpenStreetMap data, with optional added latency and a
+server side rate limit that returns 429 like the public servers do. Used by the
+`benchmark_geocoding` command and `tests/Scripts/test_geocoding.py --mock`, so geocoding can
+be measured and tried out without network access or load on the public instances.
+
+Fixture file format (see tests/geocoding_fixtures.json), bounding boxes are [min_lon, min_lat, max_lon, max_lat]:
+    {
+        "overpass": [{"type": "relation", "bbox": [...], "tags": {...}}, ...],
+        "nominatim": [{"bbox": [...], "addresstype": "city", "address": {...}}, ...]
+    }
+An Overpass element matches `is_in` when the point is inside its bbox and `around` when its bbox
+center is within the radius. Nominatim returns the smallest place whose bbox contains the point.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from geo_lib.geolocation.overpass_planner import haversine_distance
+from geo_lib.logging.console import get_geocode_logger
+
+logger = get_geocode_logger()
+
+OVERPASS_PATH = '/api/interpreter'
+NOMINATIM_PATH = '/reverse'
+
+_IS_IN_RE = re.compile(r'is_in\(([-\d.]+),([-\d.]+)\)(?:->\.a(\d+))?')
+_AROUND_RE = re.compile(r'\(around:(\d+),([-\d.]+),([-\d.]+)\)')
+_LAKE_WATER_TYPES = ('lake', 'reservoir', 'pond')
+
+
+def load_fixtures(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+    fixtures.setdefault('overpass', [])
+    fixtures.setdefault('nominatim', [])
+    return fixtures
+
+
+def _contains(bbox: List[float], latitude: float, longitude: float) -> bool:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return min_lon <= longitude <= max_lon and min_lat <= latitude <= max_lat
+
+
+def _center(bbox: List[float]) -> Tuple[float, float]:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+
+class _RateLimit:
+    """Server side token bucket, one request per token."""
+
+    def __init__(self, requests_per_second: float):
+        self.rate = requests_per_second
+        self._tokens = max(1.0, requests_per_second)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class MockGeocodingServer:
+    """
+    Threaded HTTP server answering Overpass and Nominatim requests from fixtures.
+
+    Args:
+        fixtures: Fixture dict, see load_fixtures()
+        latency_ms: Delay added to every response
+        overpass_requests_per_second: Overpass rate limit, 0 for none
+        nominatim_requests_per_second: Nominatim rate limit, 0 for none
+
+    Use as a context manager, or call start() and stop(). Point ReverseGeocodingService at
+    overpass_url and nominatim_url.
+    """
+
+    def __init__(self, fixtures: Dict[str, Any], latency_ms: float = 0.0,
+                 overpass_requests_per_second: float = 0.0, nominatim_requests_per_second: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000.0
+        self._rate_limits = {
+            'overpass': _RateLimit(overpass_requests_per_second),
+            'nominatim': _RateLimit(nominatim_requests_per_second),
+        }
+        self._elements = [
+            {'id': i + 1, **element} for i, element in enumerate(fixtures.get('overpass', []))
+        ]
+        # Smallest place first, so the most specific one containing a point wins
+        self._places = sorted(
+            fixtures.get('nominatim', []),
+            key=lambda place: (place['bbox'][2] - place['bbox'][0]) * (place['bbox'][3] - place['bbox'][1])
+        )
+        self._counts_lock = threading.Lock()
+        self.request_counts = {'overpass': 0, 'nominatim': 0, 'rate_limited': 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def overpass_url(self) -> str:
+        return f"{self.base_url}{OVERPASS_PATH}"
+
+    @property
+    def nominatim_url(self) -> str:
+        return self.base_url
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-geocoding-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Mock geocoding server listening on {self.base_url}")
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockGeocodingServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _count(self, key: str):
+        with self._counts_lock:
+            self.request_counts[key] += 1
+
+    def reset_counts(self):
+        with self._counts_lock:
+            for key in self.request_counts:
+                self.request_counts[key] = 0
+
+    # Overpass
+
+    def _element(self, element: Dict[str, Any], center: bool = False) -> Dict[str, Any]:
+        result = {'type': element.get('type', 'relation'), 'id': element['id'], 'tags': element.get('tags', {})}
+        if center:
+            latitude, longitude = _center(element['bbox'])
+            result['center'] = {'lat': latitude, 'lon': longitude}
+        return result
+
+    def _lookup(self, lookup: str, latitude: float, longitude: float, radius_meters: int = 0) -> List[Dict[str, Any]]:
+        """Elements answering one of the lookups of a merged planner query."""
+        elements = []
+        for element in self._elements:
+            tags = element.get('tags', {})
+            is_water = tags.get('natural') == 'water' or 'water' in tags or tags.get('place') == 'sea'
+            if lookup == 'lakes_nearby':
+                if is_water and (tags.get('natural') == 'water' or tags.get('water') in _LAKE_WATER_TYPES):
+                    distance_meters = haversine_distance(latitude, longitude, *_center(element['bbox'])) * 1609.34
+                    if distance_meters <= radius_meters or _contains(element['bbox'], latitude, longitude):
+                        elements.append(self._element(element, center=True))
+                continue
+            if not _contains(element['bbox'], latitude, longitude):
+                continue
+            if lookup == 'admin' and tags.get('admin_level') in ('2', '4', '6'):
+                elements.append(self._element(element))
+            elif lookup == 'water' and is_water:
+                elements.append(self._element(element))
+            elif lookup == 'protected_areas' and tags.get('boundary') == 'protected_area':
+                elements.append(self._element(element))
+        return elements
+
+    def answer_overpass(self, query: str) -> Dict[str, Any]:
+        """Answer an Overpass QL query made by ReverseGeocodingService."""
+        radius = _AROUND_RE.search(query)
+        radius_meters = int(radius.group(1)) if radius else 0
+
+        if 'make marker' in query:
+            # Merged planner query, one block of named sets per point
+            elements = []
+            for match in _IS_IN_RE.finditer(query):
+                latitude, longitude, index = float(match.group(1)), float(match.group(2)), match.group(3)
+                for lookup in ('admin', 'water', 'protected_areas', 'lakes_nearby'):
+                    elements.append({'type': 'marker', 'id': len(elements) + 1, 'tags': {'point': index, 'lookup': lookup}})
+                    elements.extend(self._lookup(lookup, latitude, longitude, radius_meters))
+            return {'version': 0.6, 'generator': 'geovault mock', 'elements': elements}
+
+        # Single lookup query
+        match = _IS_IN_RE.search(query)
+        if match:
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+        elif radius:
+            latitude, longitude = float(radius.group(2)), float(radius.group(3))
+        else:
+            return {'version': 0.6, 'generator': 'geovault mock', 'elements': []}
+
+        if 'admin_level' in query:
+            lookup = 'admin'
+        elif 'protected_area' in query:
+            lookup = 'protected_areas'
+        elif radius:
+            lookup = 'lakes_nearby'
+        else:
+            # The water check and the lakes-inside query. `out count` isn't emulated, the
+            # matching elements are returned instead
+            lookup = 'water'
+        return {'version': 0.6, 'generator': 'geovault mock', 'elements': self._lookup(lookup, latitude, longitude, radius_meters)}
+
+    # Nominatim
+
+    def answer_nominatim(self, latitude: float, longitude: float) -> Dict[str, Any]:
+        for place in self._places:
+            if _contains(place['bbox'], latitude, longitude):
+                address = place.get('address', {})
+                name = address.get('city') or address.get('town') or address.get('state') or ''
+                return {
+                    'lat': str(latitude),
+                    'lon': str(longitude),
+                    'name': name,
+                    'addresstype': place.get('addresstype', 'state'),
+                    'display_name': ', '.join(value for key, value in address.items() if key != 'country_code'),
+                    'address': address,
+                }
+        return {'error': 'Unable to geocode'}
+
+    # HTTP
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, endpoint: str, answer):
+                server._count(endpoint)
+                if server.latency:
+                    time.sleep(server.latency)
+                if not server._rate_limits[endpoint].allow():
+                    server._count('rate_limited')
+                    self._send(429, {'error': 'Too Many Requests'}, {'Retry-After': '1'})
+                    return
+                try:
+                    self._send(200, answer())
+                except Exception as e:
+                    logger.warning(f"Mock geocoding server failed to answer {self.path}: {e}")
+                    self._send(400, {'error': str(e)})
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                content = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                if url.path == NOMINATIM_PATH:
+                    self._respond('nominatim', lambda: server.answer_nominatim(float(params['lat'][0]), float(params['lon'][0])))
+                elif url.path == OVERPASS_PATH:
+                    self._respond('overpass', lambda: server.answer_overpass(params.get('data', [''])[0]))
+                else:
+                    self._send(404, {'error': 'Not found'})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path != OVERPASS_PATH:
+                    self._send(404, {'error': 'Not found'})
+                    return
+                length = int(self.headers.get('Content-Length') or 0)
+                body = parse_qs(self.rfile.read(length).decode('utf-8'))
+                self._respond('overpass', lambda: server.answer_overpass(body.get('data', [''])[0]))
+
+        return Handler
@@ -0,0 +1,262 @@
+"""
+Overpass query planner.
+
+Merges the Overpass lookups made for a point (admin boundaries, water, protected areas,
+lakes inside and nearby) into one request, and many points into a single request.
+Each result set is preceded by a `make marker` element naming its point and lookup, so the
+flat element list Overpass returns can be split back per point and lookup.
+"""
+import math
+from typing import Optional, Dict, Any, List, Tuple
+
+# Lookup kinds produced by the planner, also used as geocoding cache kinds
+ADMIN = 'admin'
+WATER = 'water'
+PROTECTED_AREAS = 'protected_areas'
+
+_LAKE_WATER_TYPES = ['lake', 'reservoir', 'pond']
+
+
+class OverpassQueryError(Exception):
+    """The merged query failed or returned incomplete results."""
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    R = 3958.8
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+def lakes_kind(proximity_miles: float) -> str:
+    """Lake results depend on the search radius, so each radius is its own kind."""
+    return f'lakes:{proximity_miles:g}'
+
+
+def parse_admin_elements(elements: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Get country code, state and county from admin_level 2/4/6 relations."""
+    result = {
+        'country_code': '',
+        'state': '',
+        'county': '',
+    }
+
+    # Process elements for country, state, county
+    for element in elements:
+        tags = element.get('tags', {})
+
+        # Get country
+        if not result['country_code']:
+            country_code = tags.get('ISO3166-1:alpha2', '') or tags.get('ISO3166-1', '')
+            if country_code:
+                result['country_code'] = country_code.upper()
+            else:
+                # Try to get from boundary=administrative with admin_level=2
+                if tags.get('boundary') == 'administrative' and tags.get('admin_level') == '2':
+                    country_code = tags.get('ref', '') or tags.get('ISO3166-1:alpha2', '')
+                    if country_code:
+                        result['country_code'] = country_code.upper()
+
+        # Get state/province
+        if not result['state']:
+            if tags.get('boundary') == 'administrative' and tags.get('admin_level') == '4':
+                state_name = tags.get('name', '')
+                if state_name:
+                    result['state'] = state_name
+            elif tags.get('is_in:state'):
+                result['state'] = tags.get('is_in:state', '')
+
+        # Get county
+        if not result['county']:
+            if tags.get('boundary') == 'administrative' and tags.get('admin_level') == '6':
+                county_name = tags.get('name', '')
+                if county_name:
+                    result['county'] = county_name
+            elif tags.get('is_in:county'):
+                result['county'] = tags.get('is_in:county', '')
+
+    # Looser matching for boundaries that aren't tagged boundary=administrative
+    if not result['country_code'] or not result['state']:
+        for element in elements:
+            tags = element.get('tags', {})
+            if not result['country_code'] and tags.get('admin_level') == '2':
+                country_code = tags.get('ISO3166-1:alpha2', '') or tags.get('ISO3166-1', '') or tags.get('ref', '')
+                if country_code:
+                    result['country_code'] = country_code.upper()
+            if not result['state'] and tags.get('admin_level') == '4':
+                state_name = tags.get('name', '')
+                if state_name:
+                    result['state'] = state_name
+
+    # Only return if we have at least country or state
+    if result['country_code'] or result['state']:
+        return result
+    return None
+
+
+def parse_protected_area_elements(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    protected_areas = []
+    for element in elements:
+        tags = element.get('tags', {})
+        name = tags.get('name', '')
+        if name and element.get('type') in ['relation', 'way']:
+            boundary_type = tags.get('boundary', '')
+            protect_class = tags.get('protect_class', '')
+            leisure = tags.get('leisure', '')
+            if boundary_type == 'protected_area' or protect_class or leisure in ['nature_reserve', 'national_park']:
+                protected_areas.append({
+                    'name': name,
+                    'type': tags.get('protect_class', '') or tags.get('leisure', '') or 'protected_area',
+                    'class': 'boundary',
+                    'boundary_type': boundary_type,
+                    'protect_class': protect_class,
+                })
+    return protected_areas
+
+
+def _is_lake(element: Dict[str, Any]) -> bool:
+    tags = element.get('tags', {})
+    return bool(tags.get('name')) and element.get('type') in ['relation', 'way'] and \
+        (tags.get('natural', '') == 'water' or tags.get('water', '') in _LAKE_WATER_TYPES)
+
+
+def parse_lakes_inside(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Get named lakes from water bodies containing the point."""
+    return [{'name': element['tags']['name'], 'distance_miles': 0.0} for element in elements if _is_lake(element)]
+
+
+def parse_lakes_nearby(elements: List[Dict[str, Any]], latitude: float, longitude: float, proximity_miles: float) -> List[Dict[str, Any]]:
+    """Get named lakes whose center is within proximity_miles of the point (elements need `out center`)."""
+    lakes = []
+    for element in elements:
+        if not _is_lake(element):
+            continue
+        name = element['tags']['name']
+        center = element.get('center', {})
+        if center:
+            lake_lat = center.get('lat', 0)
+            lake_lon = center.get('lon', 0)
+            if lake_lat and lake_lon:
+                distance = haversine_distance(latitude, longitude, lake_lat, lake_lon)
+                if distance <= proximity_miles:
+                    lakes.append({'name': name, 'distance_miles': distance})
+        else:
+            lakes.append({'name': name, 'distance_miles': proximity_miles})
+    return lakes
+
+
+class OverpassQueryPlanner:
+    """
+    Builds merged Overpass queries and splits their results per point.
+
+    For every point the query returns these named sets:
+        admin           admin_level 2/4/6 relations containing the point
+        water           water bodies (and sea) containing the point
+        protected_areas protected areas containing the point
+        lakes_nearby    water bodies within the lake search radius
+    which are parsed into the ADMIN, WATER, PROTECTED_AREAS and lakes_kind() lookups.
+    """
+
+    def __init__(self, overpass_timeout: int, lake_proximity_miles: float):
+        self.overpass_timeout = overpass_timeout
+        self.lake_proximity_miles = lake_proximity_miles
+
+    @property
+    def kinds(self) -> List[str]:
+        return [ADMIN, WATER, PROTECTED_AREAS, lakes_kind(self.lake_proximity_miles)]
+
+    def query_timeout(self, point_count: int) -> int:
+        """Server side timeout, scaled with the number of points in the request."""
+        return self.overpass_timeout + 2 * max(0, point_count - 1)
+
+    def build_query(self, points: List[Tuple[float, float]]) -> str:
+        """Build one Overpass request answering every lookup for every point."""
+        radius_meters = int(self.lake_proximity_miles * 1609.34)
+        statements = [f"[out:json][timeout:{self.query_timeout(len(points))}];"]
+        for i, (latitude, longitude) in enumerate(points):
+            area = f".a{i}"
+            around = f"(around:{radius_meters},{latitude},{longitude})"
+            statements.append(f"""is_in({latitude},{longitude})->{area};
+make marker point="{i}",lookup="admin";
+out;
+(
+  relation["admin_level"="2"](pivot{area});
+  relation["admin_level"="4"](pivot{area});
+  relation["admin_level"="6"](pivot{area});
+);
+out tags;
+make marker point="{i}",lookup="water";
+out;
+(
+  relation["natural"="water"](pivot{area});
+  way["natural"="water"](pivot{area});
+  relation["water"](pivot{area});
+  way["water"](pivot{area});
+  relation["place"="sea"](pivot{area});
+  way["place"="sea"](pivot{area});
+);
+out tags;
+make marker point="{i}",lookup="protected_areas";
+out;
+(
+  relation["boundary"="protected_area"](pivot{area});
+  way["boundary"="protected_area"](pivot{area});
+);
+out tags;
+make marker point="{i}",lookup="lakes_nearby";
+out;
+(
+  relation["natural"="water"]{around};
+  way["natural"="water"]{around};
+  relation["water"~"^(lake|reservoir|pond)$"]{around};
+  way["water"~"^(lake|reservoir|pond)$"]{around};
+);
+out tags center;""")
+        return "\n".join(statements)
+
+    def parse_response(self, data: Dict[str, Any], points: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """
+        Split a merged response into lookup results per point.
+
+        Returns:
+            One dict per point, mapping each kind in self.kinds to its parsed result
+
+        Raises:
+            OverpassQueryError: If the response is missing results (e.g. the query timed out)
+        """
+        if not data or 'elements' not in data:
+            raise OverpassQueryError("Overpass API returned no elements")
+        remark = data.get('remark', '')
+        if 'error' in remark.lower():
+            # Overpass returns partial results with a remark when a query times out or runs out of memory
+            raise OverpassQueryError(f"Overpass API query incomplete: {remark}")
+
+        sets: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        current = None
+        for element in data['elements']:
+            if element.get('type') == 'marker':
+                tags = element.get('tags', {})
+                current = (int(tags.get('point', -1)), tags.get('lookup', ''))
+                sets[current] = []
+            elif current is not None:
+                sets[current].append(element)
+
+        results = []
+        for i, (latitude, longitude) in enumerate(points):
+            if any((i, name) not in sets for name in ('admin', 'water', 'protected_areas', 'lakes_nearby')):
+                raise OverpassQueryError(f"Overpass API response is missing results for point {i}")
+            water_elements = sets[(i, 'water')]
+            lakes = parse_lakes_inside(water_elements)
+            if not lakes:
+                lakes = parse_lakes_nearby(sets[(i, 'lakes_nearby')], latitude, longitude, self.lake_proximity_miles)
+            results.append({
+                ADMIN: parse_admin_elements(sets[(i, 'admin')]),
+                WATER: len(water_elements) > 0,
+                PROTECTED_AREAS: parse_protected_area_elements(sets[(i, 'protected_areas')]),
+                lakes_kind(self.lake_proximity_miles): lakes,
+            })
+        return results
@@ -1,42 +1,327 @@
 """
 Reverse geocoding service using Overpass API and reverse-geocoder.
+See local_geocode.py for the offline backend that uses local PostGIS boundary tables.
+All HTTP requests go through the pooled, rate limited client in geocoding_client.py.
 """
-import math
-from typing import Optional, Dict, Any, List
+import asyncio
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Callable, Iterable, Tuple
 
-import requests
 from django.conf import settings
 
+from geo_lib.geolocation.geocode_cache import get_geocode_cache, CACHE_MISS, GeocodeCache, GeocodeCacheStats, cell_key
+from geo_lib.geolocation.geocoding_client import get_geocoding_client, AsyncGeocodingClient, GeocodingCancelled, GeocodingResponse
+from geo_lib.geolocation.overpass_planner import (
+    OverpassQueryPlanner,
+    OverpassQueryError,
+    haversine_distance,
+    lakes_kind,
+    parse_admin_elements,
+    parse_protected_area_elements,
+    parse_lakes_inside,
+    parse_lakes_nearby,
+)
 from geo_lib.logging.console import get_geocode_logger
 
 logger = get_geocode_logger()
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 3958.8
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+# Prefetched lookup results are kept in memory for the lookups that follow
+PREFETCH_MEMO_SIZE = 20000
+PREFETCH_MEMO_TTL_SECONDS = 3600
+
+
+# Cache kind of the Nominatim lookup
+CITY = 'city'
+
+
+class LookupFailed(Exception):
+    """A geocoding request failed (as opposed to finding nothing), so its result must not be cached."""
+
+
+def parse_nominatim_response(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Get city, place type, state, county and country code from a Nominatim reverse geocoding response."""
+    if not data or 'address' not in data:
+        return None
+
+    address = data.get('address', {})
+    result = {
+        'country_code': '',
+        'state': '',
+        'county': '',
+        'city': '',
+        'place_type': '',
+    }
+
+    # Nominatim uses addresstype to indicate what the result represents
+    addresstype = data.get('addresstype', '')
+
+    # Extract city/town name
+    # Nominatim returns different fields depending on the location
+    city_name = (
+            address.get('city') or
+            address.get('town') or
+            address.get('village') or
+            address.get('municipality') or
+            address.get('city_district') or
+            address.get('suburb') or
+            address.get('neighbourhood') or
+            ''
+    )
+
+    # If addresstype is 'city', use the display_name or name
+    if addresstype == 'city' and not city_name:
+        city_name = data.get('name', '')
+
+    # Determine place type from addresstype or address fields
+    if addresstype == 'city' or address.get('city'):
+        result['place_type'] = 'city'
+    elif addresstype == 'town' or address.get('town'):
+        result['place_type'] = 'town'
+    elif address.get('village'):
+        result['place_type'] = 'village'
+    elif address.get('suburb') or address.get('neighbourhood'):
+        result['place_type'] = 'neighbourhood'
+
+    if city_name:
+        result['city'] = city_name
+
+    # Extract state
+    result['state'] = (
+            address.get('state') or
+            address.get('region') or
+            address.get('province') or
+            ''
+    )
+
+    # Extract country code
+    country_code = address.get('country_code', '').upper()
+    if country_code:
+        result['country_code'] = country_code
+
+    # Extract county
+    result['county'] = (
+            address.get('county') or
+            address.get('state_district') or
+            ''
+    )
+
+    # Only return if we have meaningful data
+    if result['city'] or result['state'] or result['country_code']:
+        return result
+    return None
 
 
 class ReverseGeocodingService:
-    def __init__(self, overpass_url: Optional[str] = None, nominatim_url: Optional[str] = None):
+    def __init__(self, overpass_url: Optional[str] = None, nominatim_url: Optional[str] = None,
+                 client: Optional[AsyncGeocodingClient] = None, cache: Optional[GeocodeCache] = None):
         self.overpass_url = overpass_url or getattr(settings, 'OVERPASS_API_URL', 'https://overpass-api.de/api/interpreter')
         self.nominatim_url = nominatim_url or getattr(settings, 'NOMINATIM_API_URL', 'https://nominatim.openstreetmap.org')
         self.user_agent = "GeoVault/1.0"
         self.overpass_timeout = getattr(settings, 'OVERPASS_TIMEOUT_SECONDS', 10)
         self.overpass_request_timeout = getattr(settings, 'OVERPASS_REQUEST_TIMEOUT_SECONDS', 15)
+        self.cache = cache if cache is not None else get_geocode_cache()
+        self.client = client
+        self.overpass_batch_size = max(1, getattr(settings, 'OVERPASS_BATCH_SIZE', 20))
+        # Hit/miss counters of the get_location_tags() call running in this thread
+        self._local = threading.local()
+        # Results of merged Overpass queries, keyed by (kind, cell), waiting to be used by the lookups
+        self._prefetched: 'OrderedDict[Tuple[str, str], Any]' = OrderedDict()
+        self._prefetched_lock = threading.Lock()
+
+    def _planner(self) -> OverpassQueryPlanner:
+        return OverpassQueryPlanner(self.overpass_timeout, getattr(settings, 'LAKE_PROXIMITY_MILES', 1.0))
+
+    def _remember(self, kind: str, cell: str, result: Any):
+        with self._prefetched_lock:
+            self._prefetched[(kind, cell)] = (time.monotonic(), result)
+            self._prefetched.move_to_end((kind, cell))
+            while len(self._prefetched) > PREFETCH_MEMO_SIZE:
+                self._prefetched.popitem(last=False)
+
+    def _recall(self, kind: str, cell: str) -> Any:
+        with self._prefetched_lock:
+            entry = self._prefetched.get((kind, cell))
+        if entry is None or time.monotonic() - entry[0] > PREFETCH_MEMO_TTL_SECONDS:
+            return CACHE_MISS
+        return entry[1]
+
+    def _client(self) -> AsyncGeocodingClient:
+        return self.client or get_geocoding_client()
+
+    def _overpass_request(self, query: str, timeout: float) -> Dict[str, Any]:
+        """Arguments of an Overpass API request."""
+        return {
+            'url': self.overpass_url,
+            'data': {'data': query},
+            'headers': {'User-Agent': self.user_agent, 'Content-Type': 'application/x-www-form-urlencoded'},
+            'timeout': timeout,
+        }
+
+    def _overpass_post(self, query: str) -> GeocodingResponse:
+        return self._client().request_sync('overpass', 'POST', **self._overpass_request(query, self.overpass_request_timeout))
+
+    def prefetch_location_data(self, points: Iterable[Tuple[float, float]], cache_stats: Optional[GeocodeCacheStats] = None, import_log=None,
+                               is_cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Fetch every lookup (admin, water, protected areas, lakes and city) for many points at once.
+        Points already in the cache are skipped. For the rest, the Overpass lookups are sent
+        OVERPASS_BATCH_SIZE points per merged request and the city lookups go to Nominatim.
+        All requests are submitted to the geocoding client together, which runs them concurrently
+        within the rate limits of each endpoint.
+        Results are cached and kept in memory for the per-point lookups that follow.
+        If a request fails, those points are simply looked up one query at a time later.
+
+        Args:
+            points: (latitude, longitude) tuples
+            cache_stats: Optional counters for the cache hits/misses
+            import_log: Optional ImportLog for database logging
+            is_cancelled: Optional check of the caller's job, no more requests are made once it returns True
+
+        Returns:
+            Number of requests made
+        """
+        if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+            return 0
+
+        planner = self._planner()
+        kinds = planner.kinds + [CITY]
+
+        # One point per cell is enough, and skip cells whose results are already in memory
+        cells: Dict[str, Tuple[float, float]] = {}
+        for latitude, longitude in points:
+            cell = cell_key(latitude, longitude, self.cache.precision)
+            if cell not in cells and any(self._recall(kind, self.cache.cell(kind, latitude, longitude)) is CACHE_MISS for kind in kinds):
+                cells[cell] = (latitude, longitude)
+        if not cells:
+            return 0
+
+        # Use cached results where possible. Kinds on a coarser grid (admin) are only looked up
+        # once per coarse cell.
+        cached = self.cache.get_many(kinds, list(cells.values()))
+        overpass_pending: Dict[str, Tuple[float, float]] = {}
+        nominatim_pending: Dict[str, Tuple[float, float]] = {}
+        seen = set()
+        for cell, point in cells.items():
+            for kind in kinds:
+                kind_cell = self.cache.cell(kind, *point)
+                if (kind, kind_cell) in seen:
+                    continue
+                seen.add((kind, kind_cell))
+                result = self._recall(kind, kind_cell)
+                if result is not CACHE_MISS:
+                    continue
+                result = cached.get((kind, kind_cell), CACHE_MISS)
+                hit = result is not CACHE_MISS
+                if hit:
+                    self._remember(kind, kind_cell, result)
+                elif kind == CITY:
+                    nominatim_pending[cell] = point
+                else:
+                    overpass_pending[cell] = point
+                if cache_stats and self.cache.enabled:
+                    cache_stats.record(hit=hit)
+
+        pending = list(overpass_pending.items())
+        batches = [pending[start:start + self.overpass_batch_size] for start in range(0, len(pending), self.overpass_batch_size)]
+        cities = list(nominatim_pending.items())
+        if not batches and not cities:
+            return 0
+        if is_cancelled and is_cancelled():
+            return 0
+
+        async def fetch_all():
+            return await asyncio.gather(
+                *[self._run_merged_query(planner, [point for _, point in batch]) for batch in batches],
+                *[self._fetch_nominatim(latitude, longitude) for _, (latitude, longitude) in cities],
+                return_exceptions=True
+            )
+
+        try:
+            responses = self._client().run(fetch_all(), is_cancelled)
+        except GeocodingCancelled:
+            # Whatever was fetched before the cancel is thrown away, the job won't use it
+            logger.info(f"Geocoding prefetch of {len(cells)} point(s) cancelled")
+            return 0
+
+        entries = []
+        for batch, results in zip(batches, responses[:len(batches)]):
+            if isinstance(results, BaseException):
+                error_msg = f"Merged Overpass query for {len(batch)} point(s) failed, falling back to single queries: {results}"
+                logger.warning(error_msg)
+                if import_log:
+                    from geo_lib.processing.logging import DatabaseLogLevel
+                    import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
+                continue
+            for (_, point), point_results in zip(batch, results):
+                for kind, result in point_results.items():
+                    self._remember(kind, self.cache.cell(kind, *point), result)
+                    entries.append((kind, point, result))
+
+        failed_cities = 0
+        for (_, point), result in zip(cities, responses[len(batches):]):
+            if isinstance(result, BaseException):
+                failed_cities += 1
+                continue
+            self._remember(CITY, self.cache.cell(CITY, *point), result)
+            entries.append((CITY, point, result))
+        if failed_cities:
+            logger.warning(f"Nominatim lookup failed for {failed_cities} of {len(cities)} point(s), they will be retried one at a time")
+
+        self.cache.set_many(entries)
+        return len(batches) + len(cities)
+
+    async def _run_merged_query(self, planner: OverpassQueryPlanner, points: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        query = planner.build_query(points)
+        timeout = self.overpass_request_timeout + planner.query_timeout(len(points)) - self.overpass_timeout
+        try:
+            response = await self._client().request('overpass', 'POST', **self._overpass_request(query, timeout))
+            if response.status_code != 200:
+                raise OverpassQueryError(f"Overpass API returned status {response.status_code}")
+            return planner.parse_response(response.json(), points)
+        except OverpassQueryError:
+            raise
+        except Exception as e:
+            raise OverpassQueryError(str(e) or type(e).__name__)
+
+    def _cached_lookup(self, kind: str, latitude: float, longitude: float, query: Callable[[], Any], default: Any) -> Any:
+        """
+        Return the cached result of a lookup, or run the query and cache its result.
+        If the query fails, default is returned and nothing is cached.
+        """
+        # Results of a merged query made for this point were already counted by prefetch_location_data()
+        prefetched = self._recall(kind, self.cache.cell(kind, latitude, longitude))
+        if prefetched is not CACHE_MISS:
+            return prefetched
+
+        stats: Optional[GeocodeCacheStats] = getattr(self._local, 'cache_stats', None)
+        cached = self.cache.get(kind, latitude, longitude)
+        if cached is not CACHE_MISS:
+            if stats:
+                stats.record(hit=True)
+            return cached
+        if stats and self.cache.enabled:
+            stats.record(hit=False)
+
+        try:
+            result = query()
+        except LookupFailed:
+            return default
+        self.cache.set(kind, latitude, longitude, result)
+        return result
 
     def is_point_in_water(self, latitude: float, longitude: float) -> bool:
         """Check if a point is in water using Overpass API."""
         # Check if geocoding is enabled
         if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
             return False
-        
+
+        return self._cached_lookup('water', latitude, longitude, lambda: self._query_point_in_water(latitude, longitude), False)
+
+    def _query_point_in_water(self, latitude: float, longitude: float) -> bool:
         try:
             query = f"""[out:json][timeout:{self.overpass_timeout}];
 (
@@ -49,17 +334,18 @@ class ReverseGeocodingService:
   way["place"="sea"](pivot.a);
 );
 out count;"""
-            headers = {'User-Agent': self.user_agent, 'Content-Type': 'application/x-www-form-urlencoded'}
-            response = requests.post(self.overpass_url, data={'data': query}, headers=headers, timeout=self.overpass_request_timeout)
+            response = self._overpass_post(query)
             if response.status_code == 200:
                 data = response.json()
                 if data and 'elements' in data:
                     # If we have any water elements, the point is in water
                     return len(data.get('elements', [])) > 0
-            return False
+            raise LookupFailed(f"Overpass API returned status {response.status_code}")
+        except LookupFailed:
+            raise
         except Exception as e:
             logger.warning(f"Water check failed: {e}")
-            return False
+            raise LookupFailed(str(e))
 
     def reverse_geocode_overpass(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
         """
@@ -74,7 +360,10 @@ out count;"""
         # Check if geocoding is enabled
         if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
             return None
-        
+
+        return self._cached_lookup('admin', latitude, longitude, lambda: self._query_admin_overpass(latitude, longitude, import_log), None)
+
+    def _query_admin_overpass(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
         try:
             # Get administrative boundaries for state, country, and county only
             query = f"""[out:json][timeout:{self.overpass_timeout}];
@@ -86,98 +375,31 @@ out count;"""
 );
 out tags;"""
 
-            headers = {'User-Agent': self.user_agent, 'Content-Type': 'application/x-www-form-urlencoded'}
-            response = requests.post(self.overpass_url, data={'data': query}, headers=headers, timeout=self.overpass_request_timeout)
+            response = self._overpass_post(query)
             if response.status_code != 200:
                 error_msg = f"Overpass API returned status {response.status_code} for coordinates ({latitude}, {longitude})"
                 logger.warning(error_msg)
                 if import_log:
                     from geo_lib.processing.logging import DatabaseLogLevel
                     import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
-                return None
+                raise LookupFailed(error_msg)
 
             data = response.json()
             if not data or 'elements' not in data:
-                return None
+                raise LookupFailed("Overpass API returned no elements")
 
-            result = {
-                'country_code': '',
-                'state': '',
-                'county': '',
-            }
-
-            # Process elements for country, state, county
-            for element in data.get('elements', []):
-                tags = element.get('tags', {})
-
-                # Get country
-                if not result['country_code']:
-                    country_code = tags.get('ISO3166-1:alpha2', '') or tags.get('ISO3166-1', '')
-                    if country_code:
-                        result['country_code'] = country_code.upper()
-                    else:
-                        # Try to get from boundary=administrative with admin_level=2
-                        if tags.get('boundary') == 'administrative' and tags.get('admin_level') == '2':
-                            country_code = tags.get('ref', '') or tags.get('ISO3166-1:alpha2', '')
-                            if country_code:
-                                result['country_code'] = country_code.upper()
-
-                # Get state/province
-                if not result['state']:
-                    if tags.get('boundary') == 'administrative' and tags.get('admin_level') == '4':
-                        state_name = tags.get('name', '')
-                        if state_name:
-                            result['state'] = state_name
-                    elif tags.get('is_in:state'):
-                        result['state'] = tags.get('is_in:state', '')
-
-                # Get county
-                if not result['county']:
-                    if tags.get('boundary') == 'administrative' and tags.get('admin_level') == '6':
-                        county_name = tags.get('name', '')
-                        if county_name:
-                            result['county'] = county_name
-                    elif tags.get('is_in:county'):
-                        result['county'] = tags.get('is_in:county', '')
-
-            # If we didn't get country/state from boundaries, try a fallback query
-            if not result['country_code'] or not result['state']:
-                fallback_query = f"""[out:json][timeout:10];
-(
-  is_in({latitude},{longitude})->.a;
-  relation["admin_level"="2"](pivot.a);
-  relation["admin_level"="4"](pivot.a);
-);
-out tags;"""
-                try:
-                    fallback_response = requests.post(self.overpass_url, data={'data': fallback_query}, headers=headers, timeout=self.overpass_request_timeout)
-                    if fallback_response.status_code == 200:
-                        fallback_data = fallback_response.json()
-                        if fallback_data and 'elements' in fallback_data:
-                            for element in fallback_data.get('elements', []):
-                                tags = element.get('tags', {})
-                                if not result['country_code'] and tags.get('admin_level') == '2':
-                                    country_code = tags.get('ISO3166-1:alpha2', '') or tags.get('ISO3166-1', '') or tags.get('ref', '')
-                                    if country_code:
-                                        result['country_code'] = country_code.upper()
-                                if not result['state'] and tags.get('admin_level') == '4':
-                                    state_name = tags.get('name', '')
-                                    if state_name:
-                                        result['state'] = state_name
-                except Exception as e:
-                    logger.debug(f"Fallback admin query failed: {e}")
-
-            # Only return if we have at least country or state
-            if result['country_code'] or result['state']:
-                return result
-            return None
+            # The fallback admin query only asked for a subset of the same relations, so it is
+            # handled by the looser second pass in parse_admin_elements()
+            return parse_admin_elements(data.get('elements', []))
+        except LookupFailed:
+            raise
         except Exception as e:
             error_msg = f"Overpass reverse geocoding failed for coordinates ({latitude}, {longitude}): {str(e)}"
             logger.warning(error_msg)
             if import_log:
                 from geo_lib.processing.logging import DatabaseLogLevel
                 import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
-            return None
+            raise LookupFailed(error_msg)
 
     def reverse_geocode_nominatim(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
         """
@@ -192,108 +414,59 @@ out tags;"""
         # Check if geocoding is enabled
         if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
             return None
-        
-        try:
-            url = f"{self.nominatim_url}/reverse"
-            params = {
-                'lat': latitude,
-                'lon': longitude,
+
+        return self._cached_lookup(CITY, latitude, longitude, lambda: self._query_nominatim(latitude, longitude, import_log), None)
+
+    def _nominatim_request(self, latitude: float, longitude: float) -> Dict[str, Any]:
+        """Arguments of the Nominatim reverse geocoding request for a point."""
+        return {
+            'url': f"{self.nominatim_url}/reverse",
+            'params': {
+                'lat': str(latitude),
+                'lon': str(longitude),
                 'format': 'json',
-                'addressdetails': 1,
-                'zoom': 18,  # Higher zoom for more detailed results
-                'namedetails': 1
-            }
-            headers = {
+                'addressdetails': '1',
+                'zoom': '18',  # Higher zoom for more detailed results
+                'namedetails': '1'
+            },
+            'headers': {
                 'User-Agent': self.user_agent,
                 'Accept': 'application/json'
-            }
-
-            response = requests.get(url, params=params, headers=headers, timeout=self.overpass_timeout)
-            if response.status_code != 200:
-                error_msg = f"Nominatim API returned status {response.status_code} for coordinates ({latitude}, {longitude})"
-                logger.warning(error_msg)
-                if import_log:
-                    from geo_lib.processing.logging import DatabaseLogLevel
-                    import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
-                return None
-
-            data = response.json()
-            if not data or 'address' not in data:
-                return None
+            },
+            'timeout': self.overpass_timeout,
+        }
 
-            address = data.get('address', {})
-            result = {
-                'country_code': '',
-                'state': '',
-                'county': '',
-                'city': '',
-                'place_type': '',
-            }
-
-            # Nominatim uses addresstype to indicate what the result represents
-            addresstype = data.get('addresstype', '')
-            place_rank = data.get('place_rank', 999)
-
-            # Extract city/town name
-            # Nominatim returns different fields depending on the location
-            city_name = (
-                    address.get('city') or
-                    address.get('town') or
-                    address.get('village') or
-                    address.get('municipality') or
-                    address.get('city_district') or
-                    address.get('suburb') or
-                    address.get('neighbourhood') or
-                    ''
-            )
-
-            # If addresstype is 'city', use the display_name or name
-            if addresstype == 'city' and not city_name:
-                city_name = data.get('name', '')
-
-            # Determine place type from addresstype or address fields
-            if addresstype == 'city' or address.get('city'):
-                result['place_type'] = 'city'
-            elif addresstype == 'town' or address.get('town'):
-                result['place_type'] = 'town'
-            elif address.get('village'):
-                result['place_type'] = 'village'
-            elif address.get('suburb') or address.get('neighbourhood'):
-                result['place_type'] = 'neighbourhood'
-
-            if city_name:
-                result['city'] = city_name
-
-            # Extract state
-            result['state'] = (
-                    address.get('state') or
-                    address.get('region') or
-                    address.get('province') or
-                    ''
-            )
-
-            # Extract country code
-            country_code = address.get('country_code', '').upper()
-            if country_code:
-                result['country_code'] = country_code
-
-            # Extract county
-            result['county'] = (
-                    address.get('county') or
-                    address.get('state_district') or
-                    ''
-            )
+    def _parse_nominatim(self, response: GeocodingResponse, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
+        if response.status_code != 200:
+            error_msg = f"Nominatim API returned status {response.status_code} for coordinates ({latitude}, {longitude})"
+            logger.warning(error_msg)
+            if import_log:
+                from geo_lib.processing.logging import DatabaseLogLevel
+                import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
+            raise LookupFailed(error_msg)
+        return parse_nominatim_response(response.json())
 
-            # Only return if we have meaningful data
-            if result['city'] or result['state'] or result['country_code']:
-                return result
-            return None
+    def _query_nominatim(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
+        try:
+            response = self._client().request_sync('nominatim', 'GET', **self._nominatim_request(latitude, longitude))
+            return self._parse_nominatim(response, latitude, longitude, import_log)
+        except LookupFailed:
+            raise
         except Exception as e:
             logger.warning(f"Nominatim reverse geocoding failed for coordinates ({latitude}, {longitude}): {str(e)}")
             if import_log:
                 from geo_lib.processing.logging import DatabaseLogLevel
                 import_log.add(f'Nominatim reverse geocoding failed for coordinates ({latitude}, {longitude})', "Geocoding", DatabaseLogLevel.WARNING)
-            return None
+            raise LookupFailed(str(e))
+
+    async def _fetch_nominatim(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
+        try:
+            response = await self._client().request('nominatim', 'GET', **self._nominatim_request(latitude, longitude))
+            return self._parse_nominatim(response, latitude, longitude, import_log)
+        except LookupFailed:
+            raise
+        except Exception as e:
+            raise LookupFailed(f"Nominatim reverse geocoding failed for coordinates ({latitude}, {longitude}): {str(e)}")
 
     def reverse_geocode(self, latitude: float, longitude: float, import_log=None) -> Optional[Dict[str, Any]]:
         """
@@ -335,7 +508,10 @@ out tags;"""
         # Check if geocoding is enabled
         if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
             return []
-        
+
+        return self._cached_lookup('protected_areas', latitude, longitude, lambda: self._query_protected_areas(latitude, longitude), [])
+
+    def _query_protected_areas(self, latitude: float, longitude: float) -> List[Dict[str, Any]]:
         try:
             query = f"""[out:json][timeout:{self.overpass_timeout}];
 (
@@ -344,34 +520,19 @@ out tags;"""
   way["boundary"="protected_area"](pivot.a);
 );
 out tags;"""
-            headers = {'User-Agent': self.user_agent, 'Content-Type': 'application/x-www-form-urlencoded'}
-            response = requests.post(self.overpass_url, data={'data': query}, headers=headers, timeout=self.overpass_request_timeout)
+            response = self._overpass_post(query)
             if response.status_code != 200:
                 logger.warning(f"Overpass API returned status {response.status_code}")
-                return []
+                raise LookupFailed(f"Overpass API returned status {response.status_code}")
             data = response.json()
             if not data or 'elements' not in data:
-                return []
-            protected_areas = []
-            for element in data.get('elements', []):
-                tags = element.get('tags', {})
-                name = tags.get('name', '')
-                if name and element.get('type') in ['relation', 'way']:
-                    boundary_type = tags.get('boundary', '')
-                    protect_class = tags.get('protect_class', '')
-                    leisure = tags.get('leisure', '')
-                    if boundary_type == 'protected_area' or protect_class or leisure in ['nature_reserve', 'national_park']:
-                        protected_areas.append({
-                            'name': name,
-                            'type': tags.get('protect_class', '') or tags.get('leisure', '') or 'protected_area',
-                            'class': 'boundary',
-                            'boundary_type': boundary_type,
-                            'protect_class': protect_class,
-                        })
-            return protected_areas
+                raise LookupFailed("Overpass API returned no elements")
+            return parse_protected_area_elements(data.get('elements', []))
+        except LookupFailed:
+            raise
         except Exception as e:
             logger.warning(f"Overpass API query failed: {e}")
-            return []
+            raise LookupFailed(str(e))
 
     def search_protected_areas(self, latitude: float, longitude: float) -> List[Dict[str, Any]]:
         """Search for protected areas using Overpass API."""
@@ -382,7 +543,11 @@ out tags;"""
         # Check if geocoding is enabled
         if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
             return []
-        
+
+        # The result depends on the search radius, so each radius is cached separately
+        return self._cached_lookup(lakes_kind(proximity_miles), latitude, longitude, lambda: self._query_lakes(latitude, longitude, proximity_miles), [])
+
+    def _query_lakes(self, latitude: float, longitude: float, proximity_miles: float) -> List[Dict[str, Any]]:
         try:
             radius_meters = int(proximity_miles * 1609.34)
             query_inside = f"""[out:json][timeout:10];
@@ -398,20 +563,11 @@ out tags;"""
   way["water"="pond"](pivot.a);
 );
 out tags;"""
-            headers = {'User-Agent': self.user_agent, 'Content-Type': 'application/x-www-form-urlencoded'}
-            response = requests.post(self.overpass_url, data={'data': query_inside}, headers=headers, timeout=self.overpass_request_timeout)
-            lakes = []
-            if response.status_code == 200:
-                data = response.json()
-                if data and 'elements' in data:
-                    for element in data.get('elements', []):
-                        tags = element.get('tags', {})
-                        name = tags.get('name', '')
-                        if name and element.get('type') in ['relation', 'way']:
-                            natural = tags.get('natural', '')
-                            water = tags.get('water', '')
-                            if natural == 'water' or water in ['lake', 'reservoir', 'pond']:
-                                lakes.append({'name': name, 'distance_miles': 0.0})
+            response = self._overpass_post(query_inside)
+            if response.status_code != 200:
+                raise LookupFailed(f"Overpass API returned status {response.status_code}")
+            data = response.json()
+            lakes = parse_lakes_inside(data.get('elements', [])) if data else []
             if lakes:
                 return lakes
             query_nearby = f"""[out:json][timeout:10];
@@ -426,33 +582,18 @@ out tags;"""
   way["water"="pond"](around:{radius_meters},{latitude},{longitude});
 );
 out tags center;"""
-            response = requests.post(self.overpass_url, data={'data': query_nearby}, headers=headers, timeout=self.overpass_request_timeout)
+            response = self._overpass_post(query_nearby)
             if response.status_code != 200:
-                return lakes
+                raise LookupFailed(f"Overpass API returned status {response.status_code}")
             data = response.json()
             if not data or 'elements' not in data:
                 return lakes
-            for element in data.get('elements', []):
-                tags = element.get('tags', {})
-                name = tags.get('name', '')
-                if name and element.get('type') in ['relation', 'way']:
-                    natural = tags.get('natural', '')
-                    water = tags.get('water', '')
-                    if natural == 'water' or water in ['lake', 'reservoir', 'pond']:
-                        center = element.get('center', {})
-                        if center:
-                            lake_lat = center.get('lat', 0)
-                            lake_lon = center.get('lon', 0)
-                            if lake_lat and lake_lon:
-                                distance = haversine_distance(latitude, longitude, lake_lat, lake_lon)
-                                if distance <= proximity_miles:
-                                    lakes.append({'name': name, 'distance_miles': distance})
-                        else:
-                            lakes.append({'name': name, 'distance_miles': proximity_miles})
-            return lakes
+            return parse_lakes_nearby(data.get('elements', []), latitude, longitude, proximity_miles)
+        except LookupFailed:
+            raise
         except Exception as e:
             logger.warning(f"Overpass API query failed for lake search: {e}")
-            return []
+            raise LookupFailed(str(e))
 
     def check_city_proximity(self, latitude: float, longitude: float, threshold_miles: float, import_log=None) -> Optional[Dict[str, Any]]:
         """
@@ -497,7 +638,8 @@ out tags center;"""
                 import_log.add(error_msg, "Geocoding", DatabaseLogLevel.WARNING)
             return None
 
-    def get_location_tags(self, latitude: float, longitude: float, import_log=None) -> List[str]:
+    def get_location_tags(self, latitude: float, longitude: float, import_log=None,
+                          cache_stats: Optional[GeocodeCacheStats] = None) -> List[str]:
         """
         Generate location tags for a given coordinate.
         
@@ -505,12 +647,23 @@ out tags center;"""
             latitude: Latitude coordinate
             longitude: Longitude coordinate
             import_log: Optional ImportLog for database logging
+            cache_stats: Optional counters for the cache hits/misses of this lookup
         
         Logic:
         1. Use Nominatim to find city/town (handles administrative boundaries well)
         2. If no city found, check proximity for nearby cities within 5 miles
         3. Also add state, country, protected areas, and lakes
         """
+        self._local.cache_stats = cache_stats
+        try:
+            return self._get_location_tags(latitude, longitude, import_log)
+        finally:
+            self._local.cache_stats = None
+
+    def _get_location_tags(self, latitude: float, longitude: float, import_log=None) -> List[str]:
+        # One merged Overpass request instead of separate admin, water, protected area and lake queries
+        self.prefetch_location_data([(latitude, longitude)], getattr(self._local, 'cache_stats', None), import_log)
+
         tags = []
         # Step 1: Get location data (uses Nominatim for cities)
         location_data = self.reverse_geocode(latitude, longitude, import_log)
@@ -584,7 +737,30 @@ _reverse_geocoding_service = None
 
 
 def get_reverse_geocoding_service() -> ReverseGeocodingService:
+    """
+    Get the reverse geocoding service selected by GEOCODING_BACKEND:
+    'online' queries Overpass/Nominatim, 'local' queries boundaries loaded into PostGIS.
+    """
     global _reverse_geocoding_service
     if _reverse_geocoding_service is None:
-        _reverse_geocoding_service = ReverseGeocodingService()
+        backend = getattr(settings, 'GEOCODING_BACKEND', 'online')
+        if backend == 'local':
+            from geo_lib.geolocation.local_geocode import LocalBoundaryGeocodingService
+            _reverse_geocoding_service = LocalBoundaryGeocodingService()
+        else:
+            if backend != 'online':
+                logger.warning(f"Unknown geocoding backend '{backend}', using 'online'")
+            _reverse_geocoding_service = ReverseGeocodingService()
     return _reverse_geocoding_service
+
+
+@contextlib.contextmanager
+def override_reverse_geocoding_service(service: ReverseGeocodingService):
+    """Make get_reverse_geocoding_service() return another service (e.g. one using the mock server) within a block."""
+    global _reverse_geocoding_service
+    previous = _reverse_geocoding_service
+    _reverse_geocoding_service = service
+    try:
+        yield service
+    finally:
+        _reverse_geocoding_service = previous
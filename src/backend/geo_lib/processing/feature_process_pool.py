@@ -0,0 +1,100 @@
+"""
+Process pool for CPU bound feature processing.
+
+Without geocoding, processing a feature is pure Python work (description conversion,
+pydantic validation, feature hashing) that threads can't run in parallel because of the GIL.
+Features are sent to a persistent pool of worker processes in chunks instead, and the
+processed features and their logs are sent back. Geocoding is I/O bound and keeps using threads.
+
+Workers are started with 'forkserver', so they don't inherit the threads and database
+connections of the job worker, and set up Django once when they start.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+
+from geo_lib.logging.console import get_import_logger
+
+logger = get_import_logger()
+
+
+def _init_worker():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'website.settings')
+    import django
+    django.setup()
+
+
+def process_feature_chunk(features: List[Dict[str, Any]], filename: str, minimal_processing: bool) -> List[Union[Tuple, Exception]]:
+    """
+    Process a chunk of raw features in a worker process, without geocoding.
+
+    Returns:
+        One (processed_features_list, feature_log, skipped_count, was_split) tuple per feature,
+        or the exception raised while processing it
+    """
+    from geo_lib.processing.processors.base_processor import process_single_feature
+
+    results = []
+    for feature in features:
+        try:
+            results.append(process_single_feature(feature, filename, minimal_processing, geocode=False))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def process_pool_size() -> int:
+    processes = getattr(settings, 'IMPORT_PROCESSING_PROCESSES', 0)
+    return processes if processes > 0 else (os.cpu_count() or 1)
+
+
+def use_process_pool(geocoding: bool, feature_count: Optional[int] = None) -> bool:
+    """
+    Check if features should be processed in the process pool.
+    Only when they aren't geocoded by the workers, there's more than one core to use,
+    and the file isn't too small to be worth sending to other processes.
+
+    Args:
+        geocoding: If the workers will geocode the features
+        feature_count: Number of raw features, None if unknown (streaming)
+    """
+    if geocoding or getattr(settings, 'IMPORT_PROCESSING_EXECUTOR', 'auto') != 'auto':
+        return False
+    if process_pool_size() < 2:
+        return False
+    return feature_count is None or feature_count >= getattr(settings, 'IMPORT_PROCESS_CHUNK_SIZE', 100)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_feature_process_pool() -> ProcessPoolExecutor:
+    """Get the process wide feature process pool, started on first use."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            size = process_pool_size()
+            _pool = ProcessPoolExecutor(
+                max_workers=size,
+                mp_context=multiprocessing.get_context('forkserver'),
+                initializer=_init_worker
+            )
+            _pool_pid = os.getpid()
+            logger.info(f"Started feature process pool with {size} worker(s)")
+        return _pool
+
+
+def reset_feature_process_pool():
+    """Drop the pool (e.g. after a worker died and broke it), the next call starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
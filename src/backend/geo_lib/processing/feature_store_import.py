@@ -0,0 +1,376 @@
+"""
+Import of staged features into the feature store.
+
+The staged features of an item are streamed in batches. Each batch is written to a temporary
+table with COPY (geometry as hex EWKB, encoded here from the GeoJSON coordinates) and moved into
+the feature store with INSERT ... ON CONFLICT (file_hash) DO NOTHING, so features that exist
+already are skipped by the unique constraint instead of a preloaded set of the user's hashes.
+Used by the import and bulk import jobs.
+"""
+import csv
+import io
+import json
+import struct
+import traceback
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from geo_lib.feature_id import generate_feature_hash, get_geometry_fingerprint
+from geo_lib.logging.console import get_import_logger
+from geo_lib.processing.import_staging import clear_staged_features, count_staged_features, iter_staged_features
+from geo_lib.types.feature import feature_to_geojson
+
+logger = get_import_logger()
+
+FEATURE_STORE_SRID = 4326
+
+# Geometry types that can be imported (see the feature classes in geo_lib.types.feature)
+IMPORTABLE_GEOMETRY_TYPES = {'point', 'multipoint', 'linestring', 'multilinestring', 'polygon', 'multipolygon'}
+
+_WKB_TYPES = {
+    'Point': 1,
+    'LineString': 2,
+    'Polygon': 3,
+    'MultiPoint': 4,
+    'MultiLineString': 5,
+    'MultiPolygon': 6,
+}
+_WKB_Z = 0x80000000
+_WKB_SRID = 0x20000000
+
+_COPY_TABLE = 'featurestore_import'
+
+# (geojson, file_hash, hex EWKB geometry or None, geometry_fingerprint)
+FeatureRow = Tuple[Dict[str, Any], str, Optional[str], Optional[str]]
+
+
+def strip_icon_properties(feature: dict) -> dict:
+    """
+    Remove icon-related properties from a feature.
+
+    Args:
+        feature: Feature dictionary with properties
+
+    Returns:
+        Feature dictionary with icon properties removed
+    """
+    if not isinstance(feature, dict) or 'properties' not in feature:
+        return feature
+
+    # Common property names that might contain icon hrefs
+    icon_property_names = [
+        'marker-symbol',
+        'icon',
+        'icon-href',
+        'iconUrl',
+        'icon_url',
+        'marker-icon',
+        'symbol',
+        'styleUrl',  # KML style URLs might reference icons
+    ]
+
+    # Remove icon properties
+    for prop_name in icon_property_names:
+        if prop_name in feature['properties']:
+            del feature['properties'][prop_name]
+
+    # Also check nested structures (e.g., style objects)
+    def remove_icons_from_dict(d):
+        if not isinstance(d, dict):
+            return
+        for key, value in list(d.items()):
+            if key in icon_property_names:
+                del d[key]
+            elif isinstance(value, dict):
+                remove_icons_from_dict(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        remove_icons_from_dict(item)
+
+    remove_icons_from_dict(feature['properties'])
+
+    return feature
+
+
+def _pack_position(position: Any) -> bytes:
+    """Pack a GeoJSON position as x, y, z doubles, z is 0 for 2D positions."""
+    if not isinstance(position, (list, tuple)) or len(position) < 2:
+        raise ValueError(f"Invalid position: {position!r}")
+    z = position[2] if len(position) > 2 and position[2] is not None else 0.0
+    return struct.pack('<3d', float(position[0]), float(position[1]), float(z))
+
+
+def _pack_positions(positions: Any, min_positions: int) -> bytes:
+    if not isinstance(positions, list) or len(positions) < min_positions:
+        raise ValueError(f"Expected at least {min_positions} positions")
+    return struct.pack('<I', len(positions)) + b''.join(_pack_position(position) for position in positions)
+
+
+def _pack_rings(rings: Any) -> bytes:
+    if not isinstance(rings, list) or not rings:
+        raise ValueError("Polygon without rings")
+    parts = [struct.pack('<I', len(rings))]
+    for ring in rings:
+        # PostGIS rejects rings that aren't closed
+        if not isinstance(ring, list) or not ring or list(ring[0][:2]) != list(ring[-1][:2]):
+            raise ValueError("Polygon ring is not closed")
+        parts.append(_pack_positions(ring, 4))
+    return b''.join(parts)
+
+
+def _pack_geometry(geometry_type: str, coordinates: Any, srid: Optional[int] = None) -> bytes:
+    wkb_type = _WKB_TYPES.get(geometry_type)
+    if wkb_type is None:
+        raise ValueError(f"Unsupported geometry type: {geometry_type}")
+
+    # Little endian, 3D, the SRID is only set on the outer geometry
+    header = struct.pack('<BI', 1, wkb_type | _WKB_Z | (_WKB_SRID if srid is not None else 0))
+    if srid is not None:
+        header += struct.pack('<i', srid)
+
+    if geometry_type == 'Point':
+        body = _pack_position(coordinates)
+    elif geometry_type == 'LineString':
+        body = _pack_positions(coordinates, 2)
+    elif geometry_type == 'Polygon':
+        body = _pack_rings(coordinates)
+    else:
+        if not isinstance(coordinates, list):
+            raise ValueError(f"Invalid {geometry_type} coordinates")
+        part_type = geometry_type[len('Multi'):]
+        body = struct.pack('<I', len(coordinates)) + b''.join(_pack_geometry(part_type, part) for part in coordinates)
+    return header + body
+
+
+def geojson_to_ewkb(geometry: Dict[str, Any]) -> bytes:
+    """
+    Encode a GeoJSON geometry as 3D EWKB in the feature store SRID, positions without
+    elevation get z = 0 like the geometry column expects.
+
+    Raises:
+        ValueError: If the geometry type isn't supported or the coordinates are invalid
+    """
+    try:
+        return _pack_geometry(geometry.get('type'), geometry.get('coordinates'), FEATURE_STORE_SRID)
+    except (TypeError, IndexError, struct.error) as e:
+        raise ValueError(f"Invalid coordinates: {e}") from e
+
+
+def prepare_feature_row(feature: Dict[str, Any], import_custom_icons: bool = True) -> Optional[FeatureRow]:
+    """
+    Build the feature store row of a staged feature.
+
+    Returns:
+        The row, or None if the feature has no importable geometry
+    """
+    geometry = feature.get('geometry')
+    if not geometry or (geometry.get('type') or '').lower() not in IMPORTABLE_GEOMETRY_TYPES:
+        return None
+
+    # Features validated during processing are used as they are,
+    # tags are already generated during processing step, just use existing tags
+    geojson_data, feature_hash = feature_to_geojson(feature)
+
+    # Strip icon properties if import_custom_icons is False
+    if not import_custom_icons:
+        geojson_data = strip_icon_properties(geojson_data)
+        feature_hash = None
+
+    # Generate hash-based ID for the feature
+    if feature_hash is None:
+        feature_hash = generate_feature_hash(geojson_data)
+    geojson_data['properties']['id'] = feature_hash
+
+    # Geometry for spatial queries
+    geometry_ewkb = None
+    try:
+        geometry_ewkb = geojson_to_ewkb(geojson_data['geometry']).hex()
+    except ValueError as e:
+        logger.warning(f"Error creating geometry for feature '{geojson_data['properties'].get('name', 'Unnamed')}': {e}")
+
+    return geojson_data, feature_hash, geometry_ewkb, get_geometry_fingerprint(geojson_data)
+
+
+def copy_features_to_store(rows: Iterable[FeatureRow], user_id: int, source_id: Optional[int]) -> int:
+    """
+    Insert feature rows into the feature store. Features with a file_hash that exists already
+    (in the store or earlier in the rows) are skipped.
+
+    Returns:
+        Number of inserted features
+    """
+    from api.models import FeatureStore
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for geojson_data, feature_hash, geometry_ewkb, geometry_fingerprint in rows:
+        # None is written unquoted and empty, which COPY reads as NULL
+        writer.writerow([json.dumps(geojson_data), feature_hash, geometry_ewkb, geometry_fingerprint])
+    buffer.seek(0)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TEMPORARY TABLE IF NOT EXISTS {_COPY_TABLE} (
+                geojson jsonb,
+                file_hash varchar(64),
+                geometry geometry,
+                geometry_fingerprint varchar(64)
+            ) ON COMMIT DROP
+        """)
+        cursor.execute(f"TRUNCATE {_COPY_TABLE}")
+        cursor.copy_expert(f"COPY {_COPY_TABLE} (geojson, file_hash, geometry, geometry_fingerprint) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(f"""
+            INSERT INTO {FeatureStore._meta.db_table} (user_id, source_id, geojson, file_hash, geometry, geometry_fingerprint, "timestamp")
+            SELECT %s, %s, geojson, file_hash, geometry, geometry_fingerprint, now()
+            FROM {_COPY_TABLE}
+            ON CONFLICT (file_hash) DO NOTHING
+        """, [user_id, source_id])
+        return cursor.rowcount
+
+
+def import_staged_features(import_item, user_id: int, import_custom_icons: bool = True,
+                           skipped_feature_ids: Optional[Set[str]] = None,
+                           progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """
+    Import the staged features of an import queue item into the feature store. If any feature
+    was imported, the item is marked as imported, its logs and staged features are deleted.
+
+    Every batch is committed on its own, so the job status can be updated (and the job
+    cancelled or its heartbeat written) while a large item is imported. Batches are idempotent
+    thanks to the unique file_hash: an import that was interrupted can simply be run again,
+    the features it wrote already are counted as imported.
+    Must not be called inside a transaction.
+
+    Args:
+        import_item: ImportQueue item
+        user_id: Owner of the imported features
+        import_custom_icons: Keep the icon properties of the features
+        skipped_feature_ids: IDs of features the user chose not to import
+        progress_callback: Called with (processed, total) features after every committed batch
+
+    Returns:
+        Dict with 'total', 'skipped' (by the user), 'invalid' (no importable geometry),
+        'existing' (already in the feature store) and 'imported' feature counts
+    """
+    from api.models import DatabaseLogging, FeatureStore, ImportQueue
+
+    skipped_feature_ids = skipped_feature_ids or set()
+    batch_size = getattr(settings, 'BULK_CREATE_BATCH_SIZE', 1000)
+    total = count_staged_features(import_item.id)
+    # Features written by an earlier run of this import that didn't finish
+    imported = FeatureStore.objects.filter(source_id=import_item.id).count()
+    processed = skipped = prepared = 0
+
+    batch = []
+    for feature in iter_staged_features(import_item.id):
+        processed += 1
+        feature_id = (feature.get('properties') or {}).get('id')
+        if feature_id and feature_id in skipped_feature_ids:
+            skipped += 1
+            continue
+
+        try:
+            row = prepare_feature_row(feature, import_custom_icons)
+        except Exception as e:
+            feature_name = (feature.get('properties') or {}).get('name', 'Unnamed')
+            logger.error(f"Error processing feature '{feature_name}': {type(e).__name__}: {str(e)}")
+            logger.error(f"Feature processing error traceback: {traceback.format_exc()}")
+            row = None
+        if row is not None:
+            batch.append(row)
+
+        if len(batch) >= batch_size:
+            imported += copy_features_to_store(batch, user_id, import_item.id)
+            prepared += len(batch)
+            batch = []
+            if progress_callback:
+                progress_callback(processed, total)
+
+    if batch:
+        imported += copy_features_to_store(batch, user_id, import_item.id)
+        prepared += len(batch)
+    if progress_callback:
+        progress_callback(processed, total)
+
+    # Only mark as imported if at least one feature was created
+    if imported > 0:
+        with transaction.atomic():
+            item = ImportQueue.objects.select_for_update().filter(id=import_item.id).only('id', 'imported', 'log_id').first()
+            if item is not None and not item.imported:
+                # The logs aren't needed anymore now that the features are in the feature store
+                if item.log_id:
+                    DatabaseLogging.objects.filter(log_id=item.log_id).delete()
+                item.imported = True
+                item.log_id = None
+                item.save(update_fields=['imported', 'log_id'])
+                clear_staged_features(item.id)
+        import_item.imported = True
+        import_item.log_id = None
+
+    return {
+        'total': processed,
+        'skipped': skipped,
+        'invalid': processed - skipped - prepared,
+        'existing': max(prepared - imported, 0),
+        'imported': imported,
+    }
+
+
+def import_result_message(result: Dict[str, int]) -> str:
+    """User facing summary of an import_staged_features() result."""
+    if result['imported'] == 0:
+        if result['total'] == 0:
+            reason = "No features found in the file"
+        else:
+            reason = f"All {result['total']} features were skipped (duplicates, missing geometry, or unsupported types)"
+        return f"No features were imported. {reason}."
+
+    msg_parts = []
+    if result['skipped'] > 0:
+        msg_parts.append(f"{result['skipped']} skipped by user")
+    if result['existing'] > 0:
+        msg_parts.append(f"{result['existing']} already existed")
+    if result['invalid'] > 0:
+        msg_parts.append(f"{result['invalid']} without a usable geometry")
+    msg = f"Successfully imported {result['imported']} features"
+    return f"{msg} ({', '.join(msg_parts)})" if msg_parts else msg
+
+
+def broadcast_item_imported(user_id: int, item_id: int):
+    """Broadcast WebSocket events when an item is imported."""
+    from channels.layers import get_channel_layer
+    from asgiref.sync import async_to_sync
+    from api.models import ImportQueue
+
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        try:
+            item = ImportQueue.objects.get(id=item_id)
+            item_data = {
+                'id': item_id,
+                'original_filename': item.original_filename,
+                'timestamp': item.timestamp.isoformat()
+            }
+        except ImportQueue.DoesNotExist:
+            item_data = {'id': item_id}
+
+        # Broadcast to import queue module
+        async_to_sync(channel_layer.group_send)(
+            f"realtime_{user_id}",
+            {
+                'type': 'import_queue_item_imported',
+                'data': {'id': item_id}
+            }
+        )
+
+        # Broadcast to import history module
+        async_to_sync(channel_layer.group_send)(
+            f"realtime_{user_id}",
+            {
+                'type': 'import_history_item_added',
+                'data': item_data
+            }
+        )
@@ -307,24 +307,7 @@ def process_geojson_icons(geojson_data: dict, file_type: str, file_data: Optiona
     # Process features - only process icons for Point geometries
     if 'features' in geojson_data:
         for feature in geojson_data['features']:
-            if not isinstance(feature, dict):
-                continue
-            
-            # Check geometry type - only process icons for Point features
-            geometry = feature.get('geometry', {})
-            geometry_type = geometry.get('type', '').lower() if isinstance(geometry, dict) else ''
-            
-            if geometry_type == 'point' and 'properties' in feature:
-                _process_properties_icons(feature['properties'], file_type, file_data, href_mapping, is_point=True)
-            elif geometry_type != 'point' and 'properties' in feature:
-                # For non-Point features, remove icon properties entirely
-                # This prevents fetching icons for LineString, Polygon, etc.
-                props = feature.get('properties', {})
-                icon_props = [k for k in ['icon', 'icon-href', 'iconUrl', 'icon_url', 'marker-icon', 'marker-symbol', 'symbol'] if k in props]
-                if icon_props:
-                    for prop_name in icon_props:
-                        del props[prop_name]
-                # Note: We keep 'styleUrl' as it's a style reference, not an icon URL
+            process_feature_icons(feature, file_type, file_data, href_mapping)
     
     # Process properties at root level if present
     # Root-level properties should not contain feature-specific icons, but if they do,
@@ -335,6 +318,46 @@ def process_geojson_icons(geojson_data: dict, file_type: str, file_data: Optiona
     return geojson_data
 
 
+def process_feature_icons(feature: dict, file_type: str, file_data: Optional[bytes] = None, href_mapping: Optional[Dict[str, str]] = None) -> dict:
+    """
+    Process the icon hrefs of a single GeoJSON feature.
+    Used directly by the streaming parser, which sees one feature at a time. Pass the same
+    href_mapping for every feature of a file so each icon is only fetched/stored once.
+    
+    Args:
+        feature: GeoJSON feature dictionary (modified in place)
+        file_type: File type ('kmz' or 'kml')
+        file_data: File data as bytes (required for KMZ)
+        href_mapping: Mapping of original hrefs to new hrefs shared across the file's features
+        
+    Returns:
+        The modified feature
+    """
+    if not settings.ICON_PROCESSING_ENABLED or not isinstance(feature, dict):
+        return feature
+    
+    if href_mapping is None:
+        href_mapping = {}
+    
+    # Check geometry type - only process icons for Point features
+    geometry = feature.get('geometry', {})
+    geometry_type = geometry.get('type', '').lower() if isinstance(geometry, dict) else ''
+    
+    if geometry_type == 'point' and 'properties' in feature:
+        _process_properties_icons(feature['properties'], file_type, file_data, href_mapping, is_point=True)
+    elif geometry_type != 'point' and 'properties' in feature:
+        # For non-Point features, remove icon properties entirely
+        # This prevents fetching icons for LineString, Polygon, etc.
+        props = feature.get('properties', {})
+        icon_props = [k for k in ['icon', 'icon-href', 'iconUrl', 'icon_url', 'marker-icon', 'marker-symbol', 'symbol'] if k in props]
+        if icon_props:
+            for prop_name in icon_props:
+                del props[prop_name]
+        # Note: We keep 'styleUrl' as it's a style reference, not an icon URL
+    
+    return feature
+
+
 def _fix_nested_caltopo_url(url: str) -> str:
     """
     Fix nested CalTopo URLs that occur when CalTopo reimports files.
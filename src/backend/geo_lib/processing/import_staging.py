@@ -0,0 +1,309 @@
+"""
+Row-per-feature staging of processed uploads.
+
+The processed features of an import queue item are stored one per ImportQueueFeature row,
+together with what the review UI needs to page through them: the spatial sort key
+(bounding box center, north to south then west to east), the geometry fingerprint, and
+whether the feature duplicates features already in the user's library.
+Edits update single rows, so a large upload never has to be loaded as a whole. The number of
+features is kept on the item (ImportQueue.feature_count) for the queue listing.
+
+The review order is computed once, when the features are staged: every row gets its position
+in spatial order (review_position), and the item keeps the number of features and the positions
+of the duplicates (ImportQueue.review_index). A page is then a range of positions, so it costs
+the same on any upload. Edits that move a feature clear the review index, and it's rebuilt
+from the sort keys of the rows when the next page is read.
+"""
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db import connection, transaction
+
+from geo_lib.feature_id import get_geometry_fingerprint
+from geo_lib.logging.console import get_import_logger
+
+logger = get_import_logger()
+
+STAGING_BATCH_SIZE = 500
+
+# Sort key of features without a usable geometry, they go to the end
+NO_CENTER_SORT_KEY = (math.inf, math.inf)
+
+
+def _iter_points(coordinates: Any, depth: int) -> Iterator[list]:
+    """Yield the positions of a coordinates array nested `depth` levels deep (0 for a single position)."""
+    if not isinstance(coordinates, list):
+        return
+    if depth == 0:
+        if len(coordinates) >= 2:
+            yield coordinates
+        return
+    for item in coordinates:
+        yield from _iter_points(item, depth - 1)
+
+
+_COORDINATE_DEPTHS = {
+    'point': 0,
+    'multipoint': 1,
+    'linestring': 1,
+    'multilinestring': 2,
+    'polygon': 2,
+    'multipolygon': 3,
+}
+
+
+def feature_center(feature: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    Get the bounding box center of a feature.
+
+    Returns:
+        Tuple of (lat, lon), or None if the feature has no valid geometry
+    """
+    geometry = feature.get('geometry') or {}
+    depth = _COORDINATE_DEPTHS.get((geometry.get('type') or '').lower())
+    coordinates = geometry.get('coordinates')
+    if depth is None or not coordinates:
+        return None
+
+    try:
+        # GeoJSON uses [lon, lat] order
+        points = list(_iter_points(coordinates, depth))
+        lons = [point[0] for point in points if isinstance(point[0], (int, float))]
+        lats = [point[1] for point in points if isinstance(point[1], (int, float))]
+        if not lons or not lats:
+            return None
+        return (min(lats) + max(lats)) / 2.0, (min(lons) + max(lons)) / 2.0
+    except (TypeError, IndexError, ValueError) as e:
+        logger.debug(f"Error calculating bounding box center for feature: {str(e)}")
+        return None
+
+
+def review_sort_key(feature: Dict[str, Any]) -> Tuple[float, float]:
+    """Sort key of a feature in the review UI: (-lat, lon) of its center, north to south then west to east."""
+    center = feature_center(feature)
+    if center is None:
+        return NO_CENTER_SORT_KEY
+    return -center[0], center[1]
+
+
+def _existing_features_summary(existing_features: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The part of the existing feature info the review UI shows."""
+    return [{
+        'id': existing.get('id'),
+        'name': existing.get('name'),
+        'type': existing.get('type'),
+        'timestamp': existing.get('timestamp')
+    } for existing in existing_features]
+
+
+def _feature_id(feature: Dict[str, Any]) -> Optional[str]:
+    feature_id = (feature.get('properties') or {}).get('id')
+    return str(feature_id) if feature_id is not None else None
+
+
+def build_staged_feature(import_queue_id: int, index: int, feature: Dict[str, Any],
+                         duplicates_by_fingerprint: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                         sort_key: Optional[Tuple[float, float]] = None, review_position: Optional[int] = None):
+    """Build the (unsaved) staging row of a feature."""
+    from api.models import ImportQueueFeature
+    sort_lat, sort_lon = sort_key if sort_key is not None else review_sort_key(feature)
+    fingerprint = get_geometry_fingerprint(feature)
+    existing_features = (duplicates_by_fingerprint or {}).get(fingerprint) if fingerprint else None
+    return ImportQueueFeature(
+        import_queue_id=import_queue_id,
+        feature_index=index,
+        feature_id=_feature_id(feature),
+        feature=feature,
+        sort_lat=sort_lat,
+        sort_lon=sort_lon,
+        fingerprint=fingerprint,
+        is_duplicate=existing_features is not None,
+        existing_features=existing_features or [],
+        review_position=review_position,
+    )
+
+
+def _review_index(total: int, duplicate_indices: List[int]) -> Dict[str, Any]:
+    return {'total': total, 'duplicate_indices': duplicate_indices}
+
+
+def stage_features(import_queue_id: int, features: List[Dict[str, Any]],
+                   duplicate_features: Optional[List[Dict[str, Any]]] = None) -> int:
+    """
+    Replace the staged features of an import queue item and store their review order.
+
+    Args:
+        import_queue_id: Import queue item ID
+        features: Processed features, in file order
+        duplicate_features: Duplicate info from find_coordinate_duplicates(). Every feature with
+            the same geometry as a duplicate is marked as one.
+
+    Returns:
+        Number of staged features
+    """
+    from api.models import ImportQueue, ImportQueueFeature
+
+    duplicates_by_fingerprint = {}
+    for duplicate_info in duplicate_features or []:
+        fingerprint = get_geometry_fingerprint(duplicate_info.get('feature') or {})
+        if fingerprint and fingerprint not in duplicates_by_fingerprint:
+            duplicates_by_fingerprint[fingerprint] = _existing_features_summary(duplicate_info.get('existing_features', []))
+
+    # Review order: by sort key, features with the same key stay in file order
+    sort_keys = [review_sort_key(feature) for feature in features]
+    review_positions = [0] * len(features)
+    for position, index in enumerate(sorted(range(len(features)), key=lambda i: (sort_keys[i], i))):
+        review_positions[index] = position
+
+    duplicate_indices = []
+    with transaction.atomic():
+        ImportQueueFeature.objects.filter(import_queue_id=import_queue_id).delete()
+        for start in range(0, len(features), STAGING_BATCH_SIZE):
+            rows = [
+                build_staged_feature(import_queue_id, index, feature, duplicates_by_fingerprint,
+                                     sort_keys[index], review_positions[index])
+                for index, feature in enumerate(features[start:start + STAGING_BATCH_SIZE], start)
+            ]
+            duplicate_indices.extend(row.review_position for row in rows if row.is_duplicate)
+            ImportQueueFeature.objects.bulk_create(rows)
+        ImportQueue.objects.filter(id=import_queue_id).update(
+            feature_count=len(features),
+            review_index=_review_index(len(features), sorted(duplicate_indices))
+        )
+    return len(features)
+
+
+def iter_staged_features(import_queue_id: int, chunk_size: int = STAGING_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield the staged features of an import queue item in file order, loading them in chunks."""
+    from api.models import ImportQueueFeature
+    queryset = ImportQueueFeature.objects.filter(import_queue_id=import_queue_id).order_by('feature_index')
+    yield from queryset.values_list('feature', flat=True).iterator(chunk_size=chunk_size)
+
+
+def get_staged_features(import_queue_id: int) -> List[Dict[str, Any]]:
+    """Get all staged features of an import queue item in file order."""
+    return list(iter_staged_features(import_queue_id))
+
+
+def get_staged_feature(import_queue_id: int, index: int) -> Optional[Dict[str, Any]]:
+    """Get the staged feature at a position in the file, None if there is none."""
+    from api.models import ImportQueueFeature
+    return ImportQueueFeature.objects.filter(import_queue_id=import_queue_id, feature_index=index).values_list('feature', flat=True).first()
+
+
+def count_staged_features(import_queue_id: int) -> int:
+    from api.models import ImportQueueFeature
+    return ImportQueueFeature.objects.filter(import_queue_id=import_queue_id).count()
+
+
+def clear_staged_features(import_queue_id: int) -> int:
+    """Delete the staged features of an import queue item (e.g. once it was imported)."""
+    from api.models import ImportQueue, ImportQueueFeature
+    with transaction.atomic():
+        deleted, _ = ImportQueueFeature.objects.filter(import_queue_id=import_queue_id).delete()
+        ImportQueue.objects.filter(id=import_queue_id).update(review_index=None)
+    return deleted
+
+
+def update_staged_feature(row, feature: Dict[str, Any]) -> bool:
+    """
+    Replace the feature of a staging row (not saved).
+    If the geometry changed, the sort key is recomputed and the feature is no longer a duplicate.
+
+    Returns:
+        True if the review index of the item has to be rebuilt, see invalidate_review_index()
+    """
+    review_changed = False
+    fingerprint = get_geometry_fingerprint(feature)
+    if fingerprint != row.fingerprint:
+        sort_key = review_sort_key(feature)
+        review_changed = row.is_duplicate or sort_key != (row.sort_lat, row.sort_lon)
+        row.sort_lat, row.sort_lon = sort_key
+        row.fingerprint = fingerprint
+        row.is_duplicate = False
+        row.existing_features = []
+    row.feature = feature
+    row.feature_id = _feature_id(feature)
+    return review_changed
+
+
+STAGED_FEATURE_UPDATE_FIELDS = ['feature', 'feature_id', 'sort_lat', 'sort_lon', 'fingerprint', 'is_duplicate', 'existing_features']
+
+
+def invalidate_review_index(import_queue_id: int):
+    """Clear the review index of an item after its features moved, it's rebuilt when the next page is read."""
+    from api.models import ImportQueue
+    ImportQueue.objects.filter(id=import_queue_id).update(review_index=None)
+
+
+def rebuild_review_index(import_queue_id: int) -> Dict[str, Any]:
+    """
+    Recompute the review positions of the staged features of an item from their sort keys,
+    and store its review index.
+
+    Returns:
+        The review index: {'total': number of features, 'duplicate_indices': positions of the duplicates}
+    """
+    from api.models import ImportQueue, ImportQueueFeature
+    with transaction.atomic():
+        # Serialize rebuilds of the same item, another request may have done it already
+        review_index = ImportQueue.objects.select_for_update().filter(id=import_queue_id).values_list('review_index', flat=True).first()
+        if review_index is not None:
+            return review_index
+
+        table = ImportQueueFeature._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                UPDATE {table} f
+                SET review_position = ordered.position
+                FROM (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY sort_lat, sort_lon, feature_index) - 1 AS position
+                    FROM {table}
+                    WHERE import_queue_id = %s
+                ) ordered
+                WHERE f.id = ordered.id AND f.review_position IS DISTINCT FROM ordered.position
+            """, [import_queue_id])
+
+        rows = ImportQueueFeature.objects.filter(import_queue_id=import_queue_id)
+        review_index = _review_index(
+            rows.count(),
+            list(rows.filter(is_duplicate=True).order_by('review_position').values_list('review_position', flat=True))
+        )
+        ImportQueue.objects.filter(id=import_queue_id).update(review_index=review_index)
+    logger.debug(f"Rebuilt review index of import queue item {import_queue_id}")
+    return review_index
+
+
+def get_review_page(import_queue_id: int, page: int, page_size: int) -> Dict[str, Any]:
+    """
+    Get a page of staged features in review (spatial) order.
+
+    Returns:
+        Dict with 'features' (the page), 'duplicates' (existing feature info of the duplicates
+        on the page, with their index on the page), 'total' and 'duplicate_indices'
+        (positions of all duplicates in review order)
+    """
+    from api.models import ImportQueue, ImportQueueFeature
+    review_index = ImportQueue.objects.filter(id=import_queue_id).values_list('review_index', flat=True).first()
+    if review_index is None:
+        review_index = rebuild_review_index(import_queue_id)
+
+    start = (page - 1) * page_size
+    rows = list(
+        ImportQueueFeature.objects.filter(import_queue_id=import_queue_id, review_position__gte=start, review_position__lt=start + page_size)
+        .order_by('review_position')
+        .values_list('feature', 'is_duplicate', 'existing_features')
+    )
+
+    duplicates = [
+        {'existing_features': existing_features, 'page_index': page_index}
+        for page_index, (_, is_duplicate, existing_features) in enumerate(rows)
+        if is_duplicate
+    ]
+
+    return {
+        'features': [row[0] for row in rows],
+        'duplicates': duplicates,
+        'total': review_index['total'],
+        'duplicate_indices': review_index['duplicate_indices'],
+    }
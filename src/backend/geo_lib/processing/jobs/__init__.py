@@ -1,16 +1,33 @@
 """
 Job processors for asynchronous operations.
-Provides singleton instances for import and delete jobs.
+Provides singleton instances for upload, import, delete, geocode and retag jobs.
 """
 
+from typing import Optional
+
 from geo_lib.processing.status_tracker import status_tracker
+from .base_job import BaseJob
 from .upload_job import UploadJob
 from .delete_job import DeleteJob
+from .import_job import ImportJob
 from .bulk_import_job import BulkImportJob
 from .bulk_delete_job import BulkDeleteJob
+from .geocode_job import GeocodeJob
+from .bulk_retag_job import BulkRetagJob
 
 # Singleton instances to avoid repeated object creation
 upload_job = UploadJob(status_tracker)
 delete_job = DeleteJob(status_tracker)
+import_job = ImportJob(status_tracker)
 bulk_import_job = BulkImportJob(status_tracker)
-bulk_delete_job = BulkDeleteJob(status_tracker)
\ No newline at end of file
+bulk_delete_job = BulkDeleteJob(status_tracker)
+geocode_job = GeocodeJob(status_tracker)
+bulk_retag_job = BulkRetagJob(status_tracker)
+
+# Lookup by job type, used by the job workers to run queued jobs
+JOB_PROCESSORS = {job.get_job_type(): job for job in (upload_job, delete_job, import_job, bulk_import_job, bulk_delete_job,
+                                                  geocode_job, bulk_retag_job)}
+
+
+def get_job_processor(job_type: str) -> Optional[BaseJob]:
+    return JOB_PROCESSORS.get(job_type)
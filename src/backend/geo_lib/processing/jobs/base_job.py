@@ -5,7 +5,9 @@ Base job class for all asynchronous operations.
 import threading
 import traceback
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from django.conf import settings
 
 from geo_lib.processing.status_tracker import ProcessingStatusTracker, ProcessingStatus
 from geo_lib.logging.console import get_job_logger
@@ -30,7 +32,8 @@ class BaseJob(ABC):
 
     def start_job(self, job_id: str, **kwargs) -> bool:
         """
-        Start a job in a background thread.
+        Start a job in a background thread, or queue it for the job workers
+        (`manage.py run_workers`) when JOB_QUEUE_BACKEND is 'database'.
         
         Args:
             job_id: Unique job identifier
@@ -45,6 +48,14 @@ class BaseJob(ABC):
             logger.warning(f"Cannot start {self.get_job_type()} job {job_id}: job not found or cancelled")
             return False
 
+        if getattr(settings, 'JOB_QUEUE_BACKEND', 'database') == 'database':
+            from geo_lib.processing.jobs.job_queue import enqueue_job
+            job_kwargs, payload = self.serialize_job_kwargs(kwargs)
+            if not enqueue_job(job_id, job_kwargs, payload):
+                logger.warning(f"Job {job_id} is already queued")
+                return False
+            return True
+
         # Check if already processing
         if job_id in self._active_threads:
             logger.warning(f"Job {job_id} is already being processed")
@@ -95,6 +106,28 @@ class BaseJob(ABC):
             if job_id in self._active_threads:
                 del self._active_threads[job_id]
 
+    def run_queued_job(self, job_id: str, job_kwargs: Dict[str, Any], payload: Optional[bytes]):
+        """
+        Run a job claimed from the durable queue in the current (worker) process.
+        Goes through the same cancellation and error handling as threaded jobs.
+        """
+        self._active_threads[job_id] = threading.current_thread()
+        self._job_worker(job_id, self.deserialize_job_kwargs(job_kwargs, payload))
+
+    def serialize_job_kwargs(self, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """
+        Convert job parameters into something that can be stored in the job queue.
+        Override in jobs with non-JSON parameters.
+        
+        Returns:
+            Tuple of (json_serializable_kwargs, binary_payload)
+        """
+        return kwargs, None
+
+    def deserialize_job_kwargs(self, job_kwargs: Dict[str, Any], payload: Optional[bytes]) -> Dict[str, Any]:
+        """Reverse of serialize_job_kwargs()."""
+        return dict(job_kwargs)
+
     @abstractmethod
     def _execute_job(self, job_id: str, kwargs: Dict[str, Any]):
         """
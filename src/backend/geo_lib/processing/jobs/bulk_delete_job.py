@@ -12,6 +12,7 @@ from django.db import transaction
 from api.models import ImportQueue, DatabaseLogging
 from geo_lib.processing.jobs.base_job import BaseJob
 from geo_lib.processing.status_tracker import ProcessingStatus, JobType
+from geo_lib.processing.upload_blob_store import delete_unreferenced_upload_blobs
 from geo_lib.logging.console import get_job_logger
 
 logger = get_job_logger()
@@ -127,6 +128,9 @@ class BulkDeleteJob(BaseJob):
                         'error': error_msg
                     })
 
+            # Drop the raw files nothing references anymore
+            delete_unreferenced_upload_blobs(item.raw_blob_id for item in items)
+
             # Mark as completed
             if failed_deletes:
                 completion_msg = f"Completed: {successful_deletes} deleted, {len(failed_deletes)} failed"
@@ -0,0 +1,253 @@
+"""
+Bulk retag job processor for regenerating the automatic tags of many feature store rows.
+Does what the regenerate tags button does for a single feature, for every feature with a tag,
+in a collection, inside a bounding box, or for all of a user's features.
+"""
+
+import uuid
+from typing import Dict, Any, List, Optional
+
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.db import transaction
+
+from api.models import FeatureStore
+from api.services.feature_query import build_feature_query
+from geo_lib.geolocation.geocode_cache import GeocodeCacheStats
+from geo_lib.processing.jobs.base_job import BaseJob
+from geo_lib.processing.status_tracker import ProcessingStatus, JobType
+from geo_lib.processing.tagging import LocationTagGrid, generate_location_tags_for_features, is_location_tag
+from geo_lib.logging.console import get_job_logger
+
+logger = get_job_logger()
+
+SELECTOR_TYPES = ('all', 'tag', 'collection', 'bbox')
+
+
+def parse_selector(selector: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Validate a bulk retag selector.
+
+    Accepted selectors:
+        {'type': 'all'}
+        {'type': 'tag', 'tag': 'hiking'}
+        {'type': 'collection', 'collection_id': '<uuid>'}
+        {'type': 'bbox', 'bbox': [min_lon, min_lat, max_lon, max_lat]}
+
+    Returns:
+        The normalized (JSON serializable) selector, or None if it's invalid
+    """
+    if not isinstance(selector, dict) or selector.get('type') not in SELECTOR_TYPES:
+        return None
+    selector_type = selector['type']
+    if selector_type == 'all':
+        return {'type': 'all'}
+    if selector_type == 'tag':
+        tag = selector.get('tag')
+        if not isinstance(tag, str) or not tag.strip():
+            return None
+        return {'type': 'tag', 'tag': tag.strip()}
+    if selector_type == 'collection':
+        try:
+            collection_id = uuid.UUID(str(selector.get('collection_id')))
+        except ValueError:
+            return None
+        return {'type': 'collection', 'collection_id': str(collection_id)}
+    bbox = selector.get('bbox')
+    try:
+        bbox = [float(value) for value in bbox]
+    except (TypeError, ValueError):
+        return None
+    if len(bbox) != 4:
+        return None
+    return {'type': 'bbox', 'bbox': bbox}
+
+
+def _selector_queryset(user_id: int, selector: Dict[str, Any]):
+    """Get the feature store rows matched by a (normalized) selector."""
+    selector_type = selector['type']
+    if selector_type == 'collection':
+        queryset = build_feature_query(user_id, collection_id=selector['collection_id'])
+    elif selector_type == 'tag':
+        queryset = build_feature_query(user_id, tag=selector['tag'])
+    else:
+        queryset = build_feature_query(user_id)
+        if selector_type == 'bbox':
+            bbox_polygon = Polygon.from_bbox(selector['bbox'])
+            bbox_polygon.srid = 4326
+            queryset = queryset.filter(geometry__intersects=bbox_polygon)
+    return queryset.order_by('id')
+
+
+def _describe_selector(selector: Dict[str, Any]) -> str:
+    selector_type = selector['type']
+    if selector_type == 'tag':
+        return f"features tagged {selector['tag']}"
+    if selector_type == 'collection':
+        return "collection features"
+    if selector_type == 'bbox':
+        return "features in area"
+    return "all features"
+
+
+def retag_feature(feature: Dict[str, Any], location_tags: List[str], replace_location_tags: bool) -> bool:
+    """
+    Replace the automatic tags of a GeoJSON feature dict, keeping every other tag.
+
+    The type tag is regenerated from the geometry. Location tags are replaced when
+    replace_location_tags is set, otherwise the new ones are only added, so a geocoding
+    outage can't strip the tags features already have.
+
+    Returns:
+        True if the feature changed
+    """
+    properties = feature.setdefault('properties', {})
+    existing_tags = properties.get('tags')
+    if not isinstance(existing_tags, list):
+        existing_tags = []
+
+    new_tags = [
+        tag for tag in existing_tags
+        if not (isinstance(tag, str) and (tag.startswith('type:') or (replace_location_tags and is_location_tag(tag))))
+    ]
+    geometry_type = (feature.get('geometry') or {}).get('type')
+    if geometry_type:
+        new_tags.append(f"type:{geometry_type.lower()}")
+    new_tags.extend(tag for tag in location_tags if tag not in new_tags)
+
+    if new_tags == existing_tags:
+        return False
+    properties['tags'] = new_tags
+    return True
+
+
+class BulkRetagJob(BaseJob):
+    """
+    Regenerates the automatic tags of feature store rows in ID ordered chunks.
+    One geocoding cache and location grid are shared by the whole job and results are written
+    back with bulk_update. The last processed ID and the number of processed rows are stored with
+    the job, so a job that was requeued after a restart, or a cancelled job that is resumed,
+    continues where it stopped.
+    """
+
+    def get_job_type(self) -> str:
+        return "bulk_retag"
+
+    def start_bulk_retag_job(self, user_id: int, selector: Dict[str, Any],
+                             resume_job_id: Optional[str] = None) -> Optional[str]:
+        """
+        Start regenerating the tags of the features matched by a selector.
+
+        Args:
+            user_id: ID of the user who owns the features
+            selector: Which features to retag, see parse_selector()
+            resume_job_id: Continue a cancelled (or failed) bulk retag job instead, with its selector
+
+        Returns:
+            Job ID for tracking the retag, or None if the job couldn't be started
+        """
+        after_id = 0
+        done = 0
+        if resume_job_id:
+            previous_job = self.status_tracker.get_job(resume_job_id)
+            if (not previous_job or previous_job.user_id != user_id
+                    or previous_job.job_type != JobType.BULK_RETAG or not previous_job.result_data):
+                return None
+            selector = previous_job.result_data.get('selector')
+            after_id = previous_job.result_data.get('last_id', 0)
+            done = previous_job.result_data.get('done', 0)
+
+        selector = parse_selector(selector)
+        if selector is None:
+            return None
+
+        job_id = self.status_tracker.create_job(f"Regenerating tags of {_describe_selector(selector)}", user_id, JobType.BULK_RETAG)
+        self.status_tracker.set_job_result(job_id, {'selector': selector, 'last_id': after_id, 'done': done})
+
+        if self.start_job(job_id, user_id=user_id, selector=selector, after_id=after_id):
+            return job_id
+        return None
+
+    def _execute_job(self, job_id: str, kwargs: Dict[str, Any]):
+        """
+        Execute the bulk retag job processing logic.
+        """
+        user_id = kwargs['user_id']
+        selector = kwargs['selector']
+
+        job = self.status_tracker.get_job(job_id)
+        if not job:
+            logger.error(f"Bulk retag job {job_id} not found")
+            return
+
+        # Continue after the checkpoint if this job already ran before being requeued
+        checkpoint = job.result_data or {}
+        last_id = max(kwargs.get('after_id') or 0, checkpoint.get('last_id') or 0)
+        updated_count = checkpoint.get('updated_count', 0)
+        # Counted as the rows are processed, the rows before last_id may no longer match the selector
+        # (e.g. once their selector tag was regenerated away)
+        done = checkpoint.get('done', 0)
+
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.PROCESSING, "Starting tag regeneration...", 0.0)
+        self._broadcast_job_started(user_id, job_id, selector=selector)
+
+        queryset = _selector_queryset(user_id, selector)
+        total = done + queryset.filter(id__gt=last_id).count()
+
+        geocode = getattr(settings, 'REVERSE_GEOCODING_ENABLED', True)
+        chunk_size = max(1, getattr(settings, 'GEOCODING_PREFETCH_FEATURES', 500))
+        batch_size = getattr(settings, 'BULK_CREATE_BATCH_SIZE', 1000)
+        cache_stats = GeocodeCacheStats()
+        grid = LocationTagGrid()
+
+        while True:
+            if self._is_cancelled(job_id):
+                logger.info(f"Bulk retag job {job_id} cancelled after feature {last_id}")
+                return
+            rows = list(queryset.filter(id__gt=last_id).values_list('id', 'geojson')[:chunk_size])
+            if not rows:
+                break
+
+            rows_to_tag = [(feature_id, geojson) for feature_id, geojson in rows if isinstance(geojson, dict)]
+            if geocode:
+                location_tags = generate_location_tags_for_features([geojson for _, geojson in rows_to_tag], cache_stats, grid)
+            else:
+                location_tags = [[] for _ in rows_to_tag]
+            tags_by_id = {feature_id: tags for (feature_id, _), tags in zip(rows_to_tag, location_tags)}
+
+            with transaction.atomic():
+                # Re-read the rows under a lock so edits made while geocoding are kept
+                changed = []
+                for feature in FeatureStore.objects.select_for_update().filter(id__in=list(tags_by_id)).order_by('id'):
+                    if not isinstance(feature.geojson, dict):
+                        continue
+                    tags = tags_by_id[feature.id]
+                    if retag_feature(feature.geojson, tags, replace_location_tags=bool(tags)):
+                        changed.append(feature)
+                FeatureStore.objects.bulk_update(changed, ['geojson'], batch_size=batch_size)
+
+            last_id = rows[-1][0]
+            updated_count += len(changed)
+            done += len(rows)
+            self.status_tracker.set_job_result(job_id, {'selector': selector, 'last_id': last_id, 'done': done, 'updated_count': updated_count})
+            self._report_progress(job_id, user_id, done, total)
+
+        if self._is_cancelled(job_id):
+            return
+
+        completion_msg = f"Regenerated tags of {done} feature(s), {updated_count} changed"
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.COMPLETED, completion_msg, 100.0)
+        self._broadcast_job_completed(user_id, job_id, selector=selector, updated_count=updated_count, total=done)
+
+        summary = f"{grid.summary()}, {cache_stats.summary()}" if grid.points else completion_msg
+        logger.info(f"Bulk retag job {job_id} completed: {completion_msg}. {summary}")
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        job = self.status_tracker.get_job(job_id)
+        return job is not None and job.status == ProcessingStatus.CANCELLED
+
+    def _report_progress(self, job_id: str, user_id: int, done: int, total: int):
+        progress = min(100.0, (done / total) * 100.0) if total else 100.0
+        message = f"Regenerated tags of {done}/{total} feature(s)"
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.PROCESSING, message, progress)
+        self._broadcast_job_status_updated(user_id, job_id, "processing", progress, message)
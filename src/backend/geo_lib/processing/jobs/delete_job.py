@@ -12,6 +12,7 @@ from django.db import transaction
 from api.models import ImportQueue, DatabaseLogging
 from geo_lib.processing.jobs.base_job import BaseJob
 from geo_lib.processing.status_tracker import ProcessingStatus, JobType
+from geo_lib.processing.upload_blob_store import delete_unreferenced_upload_blobs
 from geo_lib.logging.console import get_job_logger
 
 logger = get_job_logger()
@@ -123,6 +124,7 @@ class DeleteJob(BaseJob):
             # Delete the item
             with transaction.atomic():
                 import_queue_item.delete()
+            delete_unreferenced_upload_blobs([import_queue_item.raw_blob_id])
 
             # Mark as completed
             completion_msg = f"Successfully deleted '{filename}'"
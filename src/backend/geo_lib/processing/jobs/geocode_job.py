@@ -0,0 +1,249 @@
+"""
+Geocode job processor for adding location tags in the background.
+With GEOCODING_DEFERRED enabled, upload jobs finish with only the cheap tags and queue a
+geocode job for the import queue item, so the file can be reviewed right away.
+Also used to add location tags to features that are already in the feature store.
+"""
+
+from typing import Dict, Any, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from api.models import ImportQueue, ImportQueueFeature, FeatureStore
+from geo_lib.geolocation.geocode_cache import GeocodeCacheStats
+from geo_lib.processing.jobs.base_job import BaseJob
+from geo_lib.processing.status_tracker import ProcessingStatus, JobType
+from geo_lib.processing.tagging import LocationTagGrid, generate_location_tags_for_features, has_location_tags
+from geo_lib.types.feature import is_validated, mark_validated
+from geo_lib.logging.console import get_job_logger
+
+logger = get_job_logger()
+
+
+def _merge_location_tags(feature: Dict[str, Any], location_tags: List[str]) -> bool:
+    """Add location tags the feature doesn't have yet. Returns True if the feature changed."""
+    properties = feature.setdefault('properties', {})
+    existing_tags = properties.get('tags')
+    if not isinstance(existing_tags, list):
+        existing_tags = []
+    new_tags = [tag for tag in location_tags if tag not in existing_tags]
+    if not new_tags:
+        return False
+    validated = is_validated(feature)
+    properties['tags'] = existing_tags + new_tags
+    if validated:
+        # Adding tags keeps the feature valid, the import can still skip validating it
+        mark_validated(feature)
+    return True
+
+
+class GeocodeJob(BaseJob):
+    """
+    Adds location tags to the features of an import queue item, or to feature store rows.
+    Features that already have location tags are skipped and results are written back
+    in chunks, so a job that is run again after a restart continues where it stopped.
+    """
+
+    def get_job_type(self) -> str:
+        return "geocode"
+
+    def start_geocode_job(self, user_id: int, import_queue_id: Optional[int] = None,
+                          feature_ids: Optional[List[int]] = None) -> Optional[str]:
+        """
+        Start a geocode job for an import queue item (and its features once they are imported),
+        or for a list of feature store rows.
+
+        Args:
+            user_id: ID of the user who owns the features
+            import_queue_id: ImportQueue item to geocode
+            feature_ids: FeatureStore IDs to geocode, if no import_queue_id is given
+
+        Returns:
+            Job ID for tracking the geocoding, or None if the job couldn't be started
+        """
+        if import_queue_id is not None:
+            item = ImportQueue.objects.filter(id=import_queue_id, user_id=user_id).values('original_filename').first()
+            if item is None:
+                return None
+            filename = f"Geocoding {item['original_filename']}"
+        else:
+            filename = f"Geocoding {len(feature_ids or [])} feature(s)"
+        job_id = self.status_tracker.create_job(filename, user_id, JobType.GEOCODE)
+        self.status_tracker.set_job_result(job_id, {}, import_queue_id)
+
+        if self.start_job(job_id, user_id=user_id, import_queue_id=import_queue_id, feature_ids=feature_ids):
+            return job_id
+        return None
+
+    def _execute_job(self, job_id: str, kwargs: Dict[str, Any]):
+        """
+        Execute the geocode job processing logic.
+        """
+        user_id = kwargs['user_id']
+        import_queue_id = kwargs.get('import_queue_id')
+        feature_ids = kwargs.get('feature_ids') or []
+
+        job = self.status_tracker.get_job(job_id)
+        if not job:
+            logger.error(f"Geocode job {job_id} not found")
+            return
+
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.PROCESSING, "Starting geocoding...", 0.0)
+        self._broadcast_job_started(user_id, job_id, import_queue_id=import_queue_id)
+
+        cache_stats = GeocodeCacheStats()
+        grid = LocationTagGrid()
+        if import_queue_id is not None:
+            try:
+                tagged_count = self._geocode_import_queue_item(job_id, user_id, import_queue_id, cache_stats, grid)
+            finally:
+                # Also cleared when the job is cancelled or fails, so the item doesn't stay pending
+                ImportQueue.objects.filter(id=import_queue_id).update(geocoding_pending=False)
+        else:
+            queryset = FeatureStore.objects.filter(user_id=user_id, id__in=feature_ids)
+            tagged_count = self._geocode_feature_store(job_id, user_id, queryset, None, cache_stats, grid)
+
+        if self._is_cancelled(job_id):
+            return
+
+        completion_msg = f"Added location tags to {tagged_count} feature(s)"
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.COMPLETED, completion_msg, 100.0)
+        self.status_tracker.set_job_result(job_id, {'tagged_count': tagged_count}, import_queue_id)
+        self._broadcast_job_completed(user_id, job_id, import_queue_id=import_queue_id, tagged_count=tagged_count)
+        if import_queue_id is not None:
+            self._broadcast_import_queue_updated(user_id, import_queue_id)
+
+        summary = f"{grid.summary()}, {cache_stats.summary()}" if grid.points else completion_msg
+        logger.info(f"Geocode job {job_id} completed: {completion_msg}. {summary}")
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        job = self.status_tracker.get_job(job_id)
+        return job is not None and job.status == ProcessingStatus.CANCELLED
+
+    def _geocode_import_queue_item(self, job_id: str, user_id: int, import_queue_id: int,
+                                   cache_stats: GeocodeCacheStats, grid: LocationTagGrid) -> int:
+        """Geocode the features of an import queue item, or its feature store rows if it was imported in the meantime."""
+        item = ImportQueue.objects.filter(id=import_queue_id, user_id=user_id).first()
+        if item is None:
+            logger.info(f"Geocode job {job_id}: import queue item {import_queue_id} was deleted")
+            return 0
+
+        tagged_count = 0
+        imported = item.imported
+        if not imported:
+            # Staged features in row ID order, loaded one chunk at a time
+            queryset = ImportQueueFeature.objects.filter(import_queue_id=import_queue_id).order_by('id')
+            total = queryset.count()
+            chunk_size = self._chunk_size()
+            done = 0
+            last_id = 0
+            while True:
+                if self._is_cancelled(job_id):
+                    return tagged_count
+                rows = list(queryset.filter(id__gt=last_id).values_list('id', 'feature')[:chunk_size])
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                done += len(rows)
+
+                pending = [
+                    (row_id, feature) for row_id, feature in rows
+                    if isinstance(feature, dict) and feature.get('geometry') and not has_location_tags(feature)
+                ]
+                location_tags = generate_location_tags_for_features([feature for _, feature in pending], cache_stats, grid)
+                tags_by_row = {row_id: tags for (row_id, _), tags in zip(pending, location_tags) if tags}
+                applied = self._apply_to_import_queue(import_queue_id, tags_by_row)
+                if applied is None:
+                    # Imported (or deleted) while we were geocoding
+                    imported = ImportQueue.objects.filter(id=import_queue_id, imported=True).exists()
+                    break
+                tagged_count += applied
+                self._report_progress(job_id, user_id, done, total, import_queue_id)
+
+        if imported:
+            # The features were moved to the feature store
+            queryset = FeatureStore.objects.filter(user_id=user_id, source_id=import_queue_id)
+            tagged_count += self._geocode_feature_store(job_id, user_id, queryset, import_queue_id, cache_stats, grid)
+
+        return tagged_count
+
+    def _geocode_feature_store(self, job_id: str, user_id: int, queryset, import_queue_id: Optional[int],
+                               cache_stats: GeocodeCacheStats, grid: LocationTagGrid) -> int:
+        """Geocode feature store rows that don't have location tags yet, in ID order."""
+        queryset = queryset.order_by('id')
+        total = queryset.count()
+        chunk_size = self._chunk_size()
+        tagged_count = 0
+        done = 0
+        last_id = 0
+        while True:
+            if self._is_cancelled(job_id):
+                return tagged_count
+            rows = list(queryset.filter(id__gt=last_id).values_list('id', 'geojson')[:chunk_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            done += len(rows)
+
+            pending = [(feature_id, geojson) for feature_id, geojson in rows if isinstance(geojson, dict) and not has_location_tags(geojson)]
+            location_tags = generate_location_tags_for_features([geojson for _, geojson in pending], cache_stats, grid)
+            tags_by_id = {feature_id: tags for (feature_id, _), tags in zip(pending, location_tags) if tags}
+            if tags_by_id:
+                with transaction.atomic():
+                    changed = []
+                    for feature in FeatureStore.objects.select_for_update().filter(id__in=list(tags_by_id)):
+                        if _merge_location_tags(feature.geojson, tags_by_id[feature.id]):
+                            changed.append(feature)
+                    FeatureStore.objects.bulk_update(changed, ['geojson'])
+                tagged_count += len(changed)
+            self._report_progress(job_id, user_id, done, total, import_queue_id)
+        return tagged_count
+
+    @staticmethod
+    def _apply_to_import_queue(import_queue_id: int, tags_by_row: Dict[int, List[str]]) -> Optional[int]:
+        """
+        Merge location tags into the item's staged features, matched by staging row ID.
+        The rows are re-read under a lock so edits made during geocoding are kept.
+
+        Returns:
+            Number of features changed, or None if the item was imported or deleted
+        """
+        with transaction.atomic():
+            item = ImportQueue.objects.select_for_update().filter(id=import_queue_id).values('imported').first()
+            if item is None or item['imported']:
+                return None
+            if not tags_by_row:
+                return 0
+            changed = []
+            for row in ImportQueueFeature.objects.select_for_update().filter(import_queue_id=import_queue_id, id__in=list(tags_by_row)):
+                if isinstance(row.feature, dict) and _merge_location_tags(row.feature, tags_by_row[row.id]):
+                    changed.append(row)
+            ImportQueueFeature.objects.bulk_update(changed, ['feature'])
+            return len(changed)
+
+    @staticmethod
+    def _chunk_size() -> int:
+        return max(1, getattr(settings, 'GEOCODING_PREFETCH_FEATURES', 500))
+
+    def _report_progress(self, job_id: str, user_id: int, done: int, total: int, import_queue_id: Optional[int]):
+        progress = (done / total) * 100.0 if total else 100.0
+        message = f"Geocoded {done}/{total} feature(s)"
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.PROCESSING, message, progress)
+        self._broadcast_job_status_updated(user_id, job_id, "processing", progress, message, import_queue_id=import_queue_id)
+
+    @staticmethod
+    def _broadcast_import_queue_updated(user_id: int, import_queue_id: int):
+        """Refresh the import queue so the item is no longer shown as geocoding."""
+        from channels.layers import get_channel_layer
+        from asgiref.sync import async_to_sync
+
+        channel_layer = get_channel_layer()
+        if channel_layer:
+            async_to_sync(channel_layer.group_send)(
+                f"realtime_{user_id}",
+                {
+                    'type': 'import_queue_status_updated',
+                    'data': {'id': import_queue_id}
+                }
+            )
@@ -0,0 +1,101 @@
+"""
+Import job processor for asynchronous import of a queue item to the feature store.
+"""
+
+import traceback
+from typing import Dict, Any, List, Optional
+
+from api.models import ImportQueue
+from geo_lib.processing.feature_store_import import broadcast_item_imported, import_result_message, import_staged_features
+from geo_lib.processing.jobs.base_job import BaseJob
+from geo_lib.processing.status_tracker import ProcessingStatus, JobType
+from geo_lib.logging.console import get_job_logger
+
+logger = get_job_logger()
+
+
+class ImportJob(BaseJob):
+    """
+    Handles asynchronous import of an import queue item to the feature store,
+    with progress updates while its features are written.
+    """
+
+    def get_job_type(self) -> str:
+        return "import"
+
+    def start_import_job(self, item_id: int, user_id: int, filename: str, import_custom_icons: bool = True,
+                         skipped_feature_ids: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Start an import job for an import queue item.
+
+        Args:
+            item_id: ImportQueue item ID
+            user_id: ID of the user who owns the item
+            filename: Original filename of the item
+            import_custom_icons: Whether to import custom icons (default True)
+            skipped_feature_ids: IDs of features the user chose not to import
+
+        Returns:
+            Job ID for tracking the import, None if it couldn't be started
+        """
+        job_id = self.status_tracker.create_job(filename, user_id, JobType.IMPORT)
+        self.status_tracker.set_job_result(job_id, {'item_id': item_id})
+
+        if self.start_job(job_id, item_id=item_id, user_id=user_id, import_custom_icons=import_custom_icons,
+                          skipped_feature_ids=list(skipped_feature_ids or [])):
+            return job_id
+        else:
+            return None
+
+    def _execute_job(self, job_id: str, kwargs: Dict[str, Any]):
+        """
+        Execute the import job processing logic.
+        """
+        item_id = kwargs['item_id']
+        user_id = kwargs['user_id']
+        import_custom_icons = kwargs.get('import_custom_icons', True)
+        skipped_feature_ids = set(kwargs.get('skipped_feature_ids') or [])
+
+        try:
+            self.status_tracker.update_job_status(job_id, ProcessingStatus.PROCESSING, "Starting import...", 0.0)
+            self._broadcast_job_started(user_id, job_id, item_id=item_id)
+
+            import_item = ImportQueue.objects.filter(id=item_id, user_id=user_id).first()
+            if import_item is None:
+                self._fail(job_id, item_id, "Item not found or not authorized")
+                return
+            if import_item.imported:
+                # Another import of the item finished first, there's nothing left to do
+                message = "This item has already been imported to the feature store"
+                self.status_tracker.update_job_status(job_id, ProcessingStatus.COMPLETED, message, 100.0)
+                self._broadcast_job_completed(user_id, job_id, item_id=item_id, message=message)
+                return
+
+            # Called between the committed batches, so the status update isn't held in a transaction
+            def report_progress(processed: int, total: int):
+                progress = (processed / total) * 100.0 if total else 100.0
+                message = f"Imported {processed}/{total} feature(s)"
+                self.status_tracker.update_job_status(job_id, ProcessingStatus.PROCESSING, message, progress)
+                self._broadcast_job_status_updated(user_id, job_id, "processing", progress, message, item_id=item_id)
+
+            result = import_staged_features(import_item, user_id, import_custom_icons, skipped_feature_ids, report_progress)
+            message = import_result_message(result)
+
+            if result['imported'] == 0:
+                logger.warning(f"Import failed for user {user_id}: No features were imported from '{import_item.original_filename}'")
+                self._fail(job_id, item_id, message)
+                return
+
+            self.status_tracker.update_job_status(job_id, ProcessingStatus.COMPLETED, message, 100.0)
+            self._broadcast_job_completed(user_id, job_id, item_id=item_id, message=message, **result)
+            broadcast_item_imported(user_id, item_id)
+            logger.info(f"Import job {job_id}: {message}")
+
+        except Exception as e:
+            logger.error(f"Import job {job_id} error: {str(e)}")
+            logger.error(f"Import job error traceback: {traceback.format_exc()}")
+            self._fail(job_id, item_id, f"Import failed: {str(e)}")
+
+    def _fail(self, job_id: str, item_id: int, error_msg: str):
+        self.status_tracker.update_job_status(job_id, ProcessingStatus.FAILED, error_msg, error_message=error_msg)
+        self._broadcast_job_failed(job_id, error_msg, item_id=item_id)
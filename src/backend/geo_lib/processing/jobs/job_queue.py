@@ -0,0 +1,125 @@
+"""
+Durable job queue backed by the BackgroundJob table.
+
+Web processes enqueue jobs, `manage.py run_workers` processes claim them with
+SELECT ... FOR UPDATE SKIP LOCKED so any number of workers can poll the same table
+without handing a job out twice. Running jobs heartbeat, and jobs whose worker died
+are put back in the queue (or failed after too many attempts).
+"""
+
+from datetime import timedelta
+from typing import Dict, Any, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import BackgroundJob
+from geo_lib.processing.status_tracker import ProcessingStatus, TERMINAL_STATUSES
+from geo_lib.logging.console import get_job_logger
+
+logger = get_job_logger()
+
+
+def enqueue_job(job_id: str, job_kwargs: Dict[str, Any], payload: Optional[bytes] = None) -> bool:
+    """
+    Queue an existing job for the workers.
+
+    Args:
+        job_id: ID of a job created by the status tracker
+        job_kwargs: JSON serializable job parameters
+        payload: Optional binary parameter (e.g. uploaded file data)
+
+    Returns:
+        True if the job was queued, False if it doesn't exist or was already queued
+    """
+    return BackgroundJob.objects.filter(job_id=job_id, queue_state='new').update(
+        queue_state='pending',
+        job_kwargs=job_kwargs,
+        payload=payload
+    ) > 0
+
+
+def claim_next_job(worker_id: str) -> Optional[BackgroundJob]:
+    """
+    Claim the oldest pending job.
+    Rows locked by other workers are skipped instead of waited on.
+
+    Returns:
+        The claimed job record (including its parameters), or None if the queue is empty
+    """
+    with transaction.atomic():
+        record = (BackgroundJob.objects
+                  .select_for_update(skip_locked=True)
+                  .filter(queue_state='pending')
+                  .order_by('created_at')
+                  .first())
+        if record is None:
+            return None
+
+        now = timezone.now()
+        record.queue_state = 'running'
+        record.worker_id = worker_id
+        record.heartbeat_at = now
+        record.attempts += 1
+        record.save(update_fields=['queue_state', 'worker_id', 'heartbeat_at', 'attempts'])
+        return record
+
+
+def heartbeat_job(job_id: str, worker_id: str) -> bool:
+    """Mark a running job as still alive. Returns False if the job is no longer owned by this worker."""
+    return BackgroundJob.objects.filter(job_id=job_id, worker_id=worker_id, queue_state='running').update(
+        heartbeat_at=timezone.now()
+    ) > 0
+
+
+def finish_job(job_id: str, worker_id: str):
+    """Mark a job as done and drop its payload and kwargs, they aren't needed anymore."""
+    BackgroundJob.objects.filter(job_id=job_id, worker_id=worker_id).update(queue_state='done', payload=None, job_kwargs={})
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Put jobs whose worker stopped heartbeating back into the queue.
+    Jobs that already used up JOB_MAX_ATTEMPTS are failed instead.
+
+    Returns:
+        Number of jobs requeued
+    """
+    stale_after = getattr(settings, 'JOB_STALE_AFTER_SECONDS', 120)
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale_jobs = BackgroundJob.objects.filter(queue_state='running', heartbeat_at__lt=cutoff)
+
+    failed = stale_jobs.filter(attempts__gte=max_attempts).exclude(status__in=TERMINAL_STATUSES).update(
+        queue_state='done',
+        payload=None,
+        status=ProcessingStatus.FAILED.value,
+        message="Job failed: worker stopped responding",
+        error_message="Worker stopped responding",
+        completed_at=timezone.now()
+    )
+    if failed:
+        logger.warning(f"Failed {failed} job(s) whose worker stopped responding too many times")
+
+    requeued = stale_jobs.exclude(status__in=TERMINAL_STATUSES).update(
+        queue_state='pending',
+        worker_id=None,
+        status=ProcessingStatus.UPLOADED.value,
+        progress=0.0,
+        message="Waiting for a worker (previous worker stopped responding)"
+    )
+    # Jobs that had already reached a final status only missed being marked done
+    stale_jobs.update(queue_state='done', payload=None)
+
+    if requeued:
+        logger.warning(f"Requeued {requeued} job(s) whose worker stopped responding")
+    return requeued
+
+
+def get_queue_stats() -> Dict[str, int]:
+    """Count jobs waiting for and being processed by workers."""
+    return {
+        'pending': BackgroundJob.objects.filter(queue_state='pending').count(),
+        'running': BackgroundJob.objects.filter(queue_state='running').count(),
+    }
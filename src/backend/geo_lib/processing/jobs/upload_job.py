@@ -5,8 +5,9 @@ Upload job processor for asynchronous file processing.
 import subprocess
 import time
 import traceback
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import transaction
 
@@ -15,7 +16,9 @@ from geo_lib.processing.jobs.base_job import BaseJob
 from geo_lib.processing.logging import RealTimeImportLog, DatabaseLogLevel
 from geo_lib.processing.processors import get_processor
 from geo_lib.processing.status_tracker import ProcessingStatus
-from geo_lib.security.file_validation import SecureFileValidator, SecurityError, FileValidationError
+from geo_lib.processing.import_staging import stage_features
+from geo_lib.processing.upload_blob_store import store_upload_blob
+from geo_lib.security.file_validation import SecureFileValidator, SecurityError, FileValidationError, ValidatedUpload
 from geo_lib.logging.console import get_import_logger
 
 logger = get_import_logger()
@@ -30,7 +33,8 @@ class UploadJob(BaseJob):
     def get_job_type(self) -> str:
         return "upload"
 
-    def start_upload_job(self, job_id: str, file_data: bytes, filename: str, user_id: int, replacement_feature_id: Optional[int] = None) -> bool:
+    def start_upload_job(self, job_id: str, file_data: bytes, filename: str, user_id: int, replacement_feature_id: Optional[int] = None,
+                         validated_upload: Optional[ValidatedUpload] = None) -> bool:
         """
         Start processing a file in a background thread.
         
@@ -40,6 +44,7 @@ class UploadJob(BaseJob):
             filename: Original filename
             user_id: ID of the user who uploaded the file
             replacement_feature_id: Optional ID of the feature being updated (for replacement uploads)
+            validated_upload: Optional validation artifact from the upload view, skips re-validating the file
             
         Returns:
             True if processing started successfully, False otherwise
@@ -56,7 +61,25 @@ class UploadJob(BaseJob):
             return False
 
         # Start the job
-        return self.start_job(job_id, file_data=file_data, filename=filename, user_id=user_id)
+        return self.start_job(job_id, file_data=file_data, filename=filename, user_id=user_id, validated_upload=validated_upload)
+
+    def serialize_job_kwargs(self, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """Store the file data as the binary payload and the validation artifact without its copies of the data."""
+        job_kwargs = dict(kwargs)
+        file_data = job_kwargs.pop('file_data')
+        if isinstance(file_data, str):
+            file_data = file_data.encode('utf-8')
+        validated_upload = job_kwargs.pop('validated_upload', None)
+        if validated_upload is not None and validated_upload.matches(file_data):
+            job_kwargs['validated_upload'] = validated_upload.to_dict()
+        return job_kwargs, file_data
+
+    def deserialize_job_kwargs(self, job_kwargs: Dict[str, Any], payload: Optional[bytes]) -> Dict[str, Any]:
+        kwargs = dict(job_kwargs)
+        kwargs['file_data'] = bytes(payload)
+        if kwargs.get('validated_upload'):
+            kwargs['validated_upload'] = ValidatedUpload.from_dict(kwargs['validated_upload'], kwargs['file_data'])
+        return kwargs
 
     def _execute_job(self, job_id: str, kwargs: Dict[str, Any]):
         """
@@ -65,6 +88,7 @@ class UploadJob(BaseJob):
         file_data = kwargs['file_data']
         filename = kwargs['filename']
         user_id = kwargs['user_id']
+        validated_upload = kwargs.get('validated_upload')
 
         # Get the job for user info
         job = self.status_tracker.get_job(job_id)
@@ -89,7 +113,7 @@ class UploadJob(BaseJob):
             return
 
         # Create real-time logger
-        realtime_log = RealTimeImportLog(user_id, log_uuid)
+        realtime_log = RealTimeImportLog(user_id, log_uuid, import_queue_id=import_queue_id)
 
         # Track overall processing time
         overall_start_time = time.time()
@@ -130,22 +154,26 @@ class UploadJob(BaseJob):
             })
             realtime_log.add("Validating file format and security", "UploadJob", DatabaseLogLevel.INFO)
 
-            # Create a mock uploaded file for validation
-            from django.core.files.uploadedfile import SimpleUploadedFile
-            uploaded_file = SimpleUploadedFile(
-                name=filename,
-                content=file_data,
-                content_type='application/zip' if filename.lower().endswith('.kmz') else 'text/xml'
-            )
+            if validated_upload is not None and validated_upload.matches(file_data):
+                # Already validated when it was uploaded
+                realtime_log.add_timing("File validation", validated_upload.validation_duration, "UploadJob")
+            else:
+                # Create a mock uploaded file for validation
+                from django.core.files.uploadedfile import SimpleUploadedFile
+                uploaded_file = SimpleUploadedFile(
+                    name=filename,
+                    content=file_data,
+                    content_type='application/zip' if filename.lower().endswith('.kmz') else 'text/xml'
+                )
 
-            # Validate file with timing
-            validator = SecureFileValidator()
-            validation_start = time.time()
-            is_valid, validation_message = validator.validate_file(uploaded_file)
-            validation_duration = time.time() - validation_start
-            realtime_log.add_timing("File validation", validation_duration, "UploadJob")
+                # Validate file with timing
+                validator = SecureFileValidator()
+                validation_start = time.time()
+                validated_upload, validation_message = validator.validate_upload(uploaded_file)
+                validation_duration = time.time() - validation_start
+                realtime_log.add_timing("File validation", validation_duration, "UploadJob")
 
-            if not is_valid:
+            if validated_upload is None:
                 error_msg = f"File validation failed: {validation_message}"
                 realtime_log.add(error_msg, "UploadJob", DatabaseLogLevel.ERROR)
                 self.status_tracker.update_job_status(
@@ -223,13 +251,18 @@ class UploadJob(BaseJob):
 
             # Convert to GeoJSON with timing using new processor API
             # Use minimal processing for replacement uploads (skip tags, geocoding)
+            # With deferred geocoding, location tags are added by a geocode job after the upload completes
+            defer_geocoding = (not is_replacement and getattr(settings, 'GEOCODING_DEFERRED', False)
+                               and getattr(settings, 'REVERSE_GEOCODING_ENABLED', True))
             conversion_start = time.time()
             processor = get_processor(
                 file_data, 
                 filename, 
                 job_id=job_id, 
                 status_tracker=self.status_tracker,
-                minimal_processing=is_replacement
+                minimal_processing=is_replacement,
+                validated_upload=validated_upload,
+                defer_geocoding=defer_geocoding
             )
             geojson_data, processing_log = processor.process()
             conversion_duration = time.time() - conversion_start
@@ -244,10 +277,8 @@ class UploadJob(BaseJob):
             # Add processing log messages to real-time log
             realtime_log.extend(processing_log)
 
-            # Prepare GeoJSON string and size for database storage
-            import json
-            geojson_str = json.dumps(geojson_data)
-            geojson_size_mb = len(geojson_str) / (1024 * 1024)
+            # Size of the upload for the log, the processed GeoJSON isn't serialized just to measure it
+            upload_size_mb = len(file_data) / (1024 * 1024)
 
             # Update progress
             self.status_tracker.update_job_status(
@@ -289,7 +320,7 @@ class UploadJob(BaseJob):
             # Update existing import queue entry with timing
             feature_processing_start = time.time()
             import_queue_id = self._update_import_queue_entry(
-                geojson_data, realtime_log, filename, user_id, job_id, geojson_str, geojson_size_mb, file_data
+                geojson_data, realtime_log, filename, user_id, job_id, upload_size_mb, file_data
             )
             feature_processing_duration = time.time() - feature_processing_start
             realtime_log.add_timing("Feature processing and database update", feature_processing_duration, "UploadJob")
@@ -319,16 +350,20 @@ class UploadJob(BaseJob):
             })
             realtime_log.add(completion_msg, "UploadJob", DatabaseLogLevel.INFO)
 
-            # Set result data
+            # Set result data. The GeoJSON and log are already saved to the import queue entry,
+            # only keep a JSON serializable summary here (the database tracker stores it as JSON).
             self.status_tracker.set_job_result(
                 job_id,
-                {'geojson_data': geojson_data, 'processing_log': realtime_log},
+                {'feature_count': feature_count},
                 import_queue_id
             )
 
             # Log completion with features and time
             logger.info(f"Job {job_id} completed: {feature_count} features processed in {overall_duration:.1f}s")
 
+            if defer_geocoding and feature_count > 0:
+                self._start_deferred_geocoding(user_id, import_queue_id, realtime_log)
+
         except (SecurityError, FileValidationError) as e:
             # Use the error message directly from the validation
             error_msg = f"File validation failed: {str(e)}"
@@ -409,6 +444,22 @@ class UploadJob(BaseJob):
                     'error_message': error_msg
                 })
 
+        finally:
+            # Write any log messages still waiting in the buffer
+            realtime_log.flush()
+
+    @staticmethod
+    def _start_deferred_geocoding(user_id: int, import_queue_id: int, realtime_log: RealTimeImportLog):
+        """Queue a geocode job to add the location tags that were skipped during processing."""
+        from geo_lib.processing.jobs import geocode_job
+
+        ImportQueue.objects.filter(id=import_queue_id).update(geocoding_pending=True)
+        if geocode_job.start_geocode_job(user_id, import_queue_id=import_queue_id):
+            realtime_log.add("Location tags will be added in the background", "UploadJob", DatabaseLogLevel.INFO)
+        else:
+            ImportQueue.objects.filter(id=import_queue_id).update(geocoding_pending=False)
+            realtime_log.add("Failed to start background geocoding, location tags were not added", "UploadJob", DatabaseLogLevel.WARNING)
+
     def _create_initial_import_queue_entry(self, filename: str, user_id: int, job_id: str, replacement_feature_id: Optional[int] = None) -> int:
         """Create an initial ImportQueue entry for async processing."""
         try:
@@ -416,12 +467,10 @@ class UploadJob(BaseJob):
                 # Get user
                 user = User.objects.get(id=user_id)
 
-                # Create import queue entry with empty geofeatures during processing
+                # Create import queue entry, its features are staged once processing is done
                 import_queue = ImportQueue.objects.create(
-                    raw_file='{"type": "FeatureCollection", "features": []}',  # Empty GeoJSON
                     original_filename=filename,
                     user=user,
-                    geofeatures=[],  # Empty array during processing
                     replacement=replacement_feature_id  # Set replacement feature ID if provided
                 )
 
@@ -434,7 +483,7 @@ class UploadJob(BaseJob):
 
     def _update_import_queue_entry(self, geojson_data: Dict[str, Any],
                                    processing_log: RealTimeImportLog, filename: str,
-                                   user_id: int, job_id: str, geojson_str: str, geojson_size_mb: float,
+                                   user_id: int, job_id: str, upload_size_mb: float,
                                    raw_file_data: bytes) -> int:
         """Update an existing ImportQueue entry with processed data."""
         # Get the import queue entry
@@ -450,166 +499,159 @@ class UploadJob(BaseJob):
             return job.import_queue_id  # Return the ID even though we can't update it
 
         try:
-            with transaction.atomic():
-
-                # Hash the raw file content for duplicate detection
-                # This ensures files with the same source content get the same hash,
-                # regardless of processing differences or file format (KML vs KMZ)
-                import hashlib
-                if isinstance(raw_file_data, str):
-                    raw_file_data = raw_file_data.encode('utf-8')
-                file_hash = hashlib.sha256(raw_file_data).hexdigest()
-
-                # Process features using the processor's already processed features
-                features = geojson_data.get('features', [])
-
-                processing_log.add(f"Processing {len(features)} features from uploaded file", "UploadJob", DatabaseLogLevel.INFO)
-                # Features are already processed by the processor, so we use them directly
-                processed_features = features
-
-                # Log feature type breakdown
-                feature_types = {}
-                for feature in processed_features:
-                    geom_type = feature.get('geometry', {}).get('type', 'Unknown')
-                    feature_types[geom_type] = feature_types.get(geom_type, 0) + 1
-
-                type_summary = ', '.join([f"{count} {ftype}" for ftype, count in feature_types.items()])
-                processing_log.add(f"Feature breakdown: {type_summary}", "UploadJob", DatabaseLogLevel.INFO)
-                processing_log.add(f"Successfully processed {len(processed_features)} features", "UploadJob", DatabaseLogLevel.INFO)
-                processing_log.add("Preparing to save processed data to database", "UploadJob", DatabaseLogLevel.INFO)
-
-                # Store the raw file hash for duplicate detection
-                # Note: field is named geojson_hash for historical reasons, but stores raw file hash
-                geojson_hash = file_hash
-
-                # Check if this is a replacement upload - skip duplicate detection for fast path
-                is_replacement = import_queue.replacement is not None
-                
-                if is_replacement:
-                    # Fast path: skip duplicate detection entirely for replacement uploads
-                    processing_log.add("Skipping duplicate detection for replacement upload (fast path)", "UploadJob", DatabaseLogLevel.INFO)
-                    duplicate_features = []  # No duplicates tracked for replacements
-                else:
-                    # Normal path: perform duplicate detection
-                    # Check for cancellation before duplicate detection
-                    job = self.status_tracker.get_job(job_id)
-                    if job and job.status == ProcessingStatus.CANCELLED:
-                        logger.info(f"Job {job_id} was cancelled before duplicate detection")
-                        processing_log.add("Processing cancelled before duplicate detection", "UploadJob", DatabaseLogLevel.WARNING)
-                        return import_queue.id
-
-                    # Update progress for duplicate detection
-                    self.status_tracker.update_job_status(
-                        job_id, ProcessingStatus.PROCESSING,
-                        "Checking for duplicate features...", 84.0
-                    )
-
-                    # Broadcast WebSocket event for status update
-                    self._broadcast_to_upload_status_module(user_id, import_queue.id, 'status_updated', {
-                        'status': 'processing',
-                        'progress': 84.0,
-                        'message': 'Checking for duplicate features...'
-                    })
-
-                    # Perform duplicate detection against existing features
-                    processing_log.add("Starting duplicate detection against existing feature store", "UploadJob", DatabaseLogLevel.INFO)
-
-                    # Import the duplicate detection functions
-                    from api.views.import_item import find_coordinate_duplicates, strip_duplicate_features
-
-                    # First, check for internal duplicates within the file
-                    processing_log.add("Checking for internal duplicates within the uploaded file", "UploadJob", DatabaseLogLevel.INFO)
-                    unique_internal_features, internal_duplicate_count, internal_duplicate_log = strip_duplicate_features(processed_features)
-                    processing_log.extend(internal_duplicate_log)
-
-                    # Check for cancellation after internal duplicate detection
-                    job = self.status_tracker.get_job(job_id)
-                    if job and job.status == ProcessingStatus.CANCELLED:
-                        logger.info(f"Job {job_id} was cancelled after internal duplicate detection")
-                        processing_log.add("Processing cancelled after internal duplicate detection", "UploadJob", DatabaseLogLevel.WARNING)
-                        return import_queue.id
-
-                    # Then check for coordinate duplicates against existing features
-                    processing_log.add("Checking for coordinate duplicates against existing features in your library", "UploadJob", DatabaseLogLevel.INFO)
-                    duplicate_detection_start = time.time()
-                    unique_features, duplicate_features, duplicate_log = find_coordinate_duplicates(unique_internal_features, user_id)
-                    duplicate_detection_duration = time.time() - duplicate_detection_start
-                    processing_log.extend(duplicate_log)
-                    processing_log.add_timing("Duplicate detection", duplicate_detection_duration, "UploadJob")
-
-                    # Check for cancellation after duplicate detection
-                    job = self.status_tracker.get_job(job_id)
-                    if job and job.status == ProcessingStatus.CANCELLED:
-                        logger.info(f"Job {job_id} was cancelled after duplicate detection")
-                        processing_log.add("Processing cancelled after duplicate detection", "UploadJob", DatabaseLogLevel.WARNING)
-                        return import_queue.id
-
-                    # Log summary of duplicate detection results
-                    total_duplicates = internal_duplicate_count + len(duplicate_features)
-                    processing_log.add(f"Duplicate detection completed: {internal_duplicate_count} internal duplicates, {len(duplicate_features)} existing duplicates", "UploadJob", DatabaseLogLevel.INFO)
-
-                    # Use the original processed_features (not unique_features) to preserve all features
-                    # The duplicate_features list contains the duplicate information we need
-                    processing_log.add(f"Total duplicate features found: {total_duplicates}", "UploadJob", DatabaseLogLevel.INFO)
-
-                # Check for cancellation before database save
+            # Hash the raw file content for duplicate detection
+            # This ensures files with the same source content get the same hash,
+            # regardless of processing differences or file format (KML vs KMZ)
+            import hashlib
+            if isinstance(raw_file_data, str):
+                raw_file_data = raw_file_data.encode('utf-8')
+            file_hash = hashlib.sha256(raw_file_data).hexdigest()
+
+            # Process features using the processor's already processed features
+            features = geojson_data.get('features', [])
+
+            processing_log.add(f"Processing {len(features)} features from uploaded file", "UploadJob", DatabaseLogLevel.INFO)
+            # Features are already processed by the processor, so we use them directly
+            processed_features = features
+
+            # Log feature type breakdown
+            feature_types = {}
+            for feature in processed_features:
+                geom_type = feature.get('geometry', {}).get('type', 'Unknown')
+                feature_types[geom_type] = feature_types.get(geom_type, 0) + 1
+
+            type_summary = ', '.join([f"{count} {ftype}" for ftype, count in feature_types.items()])
+            processing_log.add(f"Feature breakdown: {type_summary}", "UploadJob", DatabaseLogLevel.INFO)
+            processing_log.add(f"Successfully processed {len(processed_features)} features", "UploadJob", DatabaseLogLevel.INFO)
+            processing_log.add("Preparing to save processed data to database", "UploadJob", DatabaseLogLevel.INFO)
+
+            # Store the raw file hash for duplicate detection
+            # Note: field is named geojson_hash for historical reasons, but stores raw file hash
+            geojson_hash = file_hash
+
+            # Check if this is a replacement upload - skip duplicate detection for fast path
+            is_replacement = import_queue.replacement is not None
+            
+            if is_replacement:
+                # Fast path: skip duplicate detection entirely for replacement uploads
+                processing_log.add("Skipping duplicate detection for replacement upload (fast path)", "UploadJob", DatabaseLogLevel.INFO)
+                duplicate_features = []  # No duplicates tracked for replacements
+            else:
+                # Normal path: perform duplicate detection
+                # Check for cancellation before duplicate detection
                 job = self.status_tracker.get_job(job_id)
                 if job and job.status == ProcessingStatus.CANCELLED:
-                    logger.info(f"Job {job_id} was cancelled before database save")
-                    processing_log.add("Processing cancelled before database save", "UploadJob", DatabaseLogLevel.WARNING)
+                    logger.info(f"Job {job_id} was cancelled before duplicate detection")
+                    processing_log.add("Processing cancelled before duplicate detection", "UploadJob", DatabaseLogLevel.WARNING)
                     return import_queue.id
 
-                # Update progress for database save (different percentages for fast vs normal path)
-                if is_replacement:
-                    # Fast path: already at 100% since we skipped duplicate detection
-                    progress = 100.0
-                    message = "Saving features to database..."
-                else:
-                    # Normal path: 96% after duplicate detection
-                    progress = 96.0
-                    message = "Saving features to database..."
-                
+                # Update progress for duplicate detection
                 self.status_tracker.update_job_status(
                     job_id, ProcessingStatus.PROCESSING,
-                    message, progress
+                    "Checking for duplicate features...", 84.0
                 )
 
                 # Broadcast WebSocket event for status update
                 self._broadcast_to_upload_status_module(user_id, import_queue.id, 'status_updated', {
                     'status': 'processing',
-                    'progress': progress,
-                    'message': message
+                    'progress': 84.0,
+                    'message': 'Checking for duplicate features...'
                 })
 
-                # Save the features to the database
-                processing_log.add(f"Saving {len(processed_features)} features to database ({geojson_size_mb:.2f} MB)", "UploadJob", DatabaseLogLevel.INFO)
-
-                # Store raw file content (convert bytes to string if needed)
-                if isinstance(raw_file_data, bytes):
-                    # Try to decode as UTF-8, fall back to base64 if it's binary
-                    try:
-                        raw_file_content = raw_file_data.decode('utf-8')
-                    except UnicodeDecodeError:
-                        # For binary files like KMZ, store as base64
-                        import base64
-                        raw_file_content = base64.b64encode(raw_file_data).decode('utf-8')
-                else:
-                    raw_file_content = raw_file_data
-                
-                import_queue.raw_file = raw_file_content
+                # Perform duplicate detection against existing features
+                processing_log.add("Starting duplicate detection against existing feature store", "UploadJob", DatabaseLogLevel.INFO)
+
+                # Import the duplicate detection functions
+                from api.views.import_item import find_coordinate_duplicates, strip_duplicate_features
+
+                # First, check for internal duplicates within the file
+                processing_log.add("Checking for internal duplicates within the uploaded file", "UploadJob", DatabaseLogLevel.INFO)
+                unique_internal_features, internal_duplicate_count, internal_duplicate_log = strip_duplicate_features(processed_features)
+                processing_log.extend(internal_duplicate_log)
+
+                # Check for cancellation after internal duplicate detection
+                job = self.status_tracker.get_job(job_id)
+                if job and job.status == ProcessingStatus.CANCELLED:
+                    logger.info(f"Job {job_id} was cancelled after internal duplicate detection")
+                    processing_log.add("Processing cancelled after internal duplicate detection", "UploadJob", DatabaseLogLevel.WARNING)
+                    return import_queue.id
+
+                # Then check for coordinate duplicates against existing features
+                processing_log.add("Checking for coordinate duplicates against existing features in your library", "UploadJob", DatabaseLogLevel.INFO)
+                duplicate_detection_start = time.time()
+                unique_features, duplicate_features, duplicate_log = find_coordinate_duplicates(unique_internal_features, user_id)
+                duplicate_detection_duration = time.time() - duplicate_detection_start
+                processing_log.extend(duplicate_log)
+                processing_log.add_timing("Duplicate detection", duplicate_detection_duration, "UploadJob")
+
+                # Check for cancellation after duplicate detection
+                job = self.status_tracker.get_job(job_id)
+                if job and job.status == ProcessingStatus.CANCELLED:
+                    logger.info(f"Job {job_id} was cancelled after duplicate detection")
+                    processing_log.add("Processing cancelled after duplicate detection", "UploadJob", DatabaseLogLevel.WARNING)
+                    return import_queue.id
+
+                # Log summary of duplicate detection results
+                total_duplicates = internal_duplicate_count + len(duplicate_features)
+                processing_log.add(f"Duplicate detection completed: {internal_duplicate_count} internal duplicates, {len(duplicate_features)} existing duplicates", "UploadJob", DatabaseLogLevel.INFO)
+
+                # Use the original processed_features (not unique_features) to preserve all features
+                # The duplicate_features list contains the duplicate information we need
+                processing_log.add(f"Total duplicate features found: {total_duplicates}", "UploadJob", DatabaseLogLevel.INFO)
+
+            # Check for cancellation before database save
+            job = self.status_tracker.get_job(job_id)
+            if job and job.status == ProcessingStatus.CANCELLED:
+                logger.info(f"Job {job_id} was cancelled before database save")
+                processing_log.add("Processing cancelled before database save", "UploadJob", DatabaseLogLevel.WARNING)
+                return import_queue.id
+
+            # Update progress for database save (different percentages for fast vs normal path)
+            if is_replacement:
+                # Fast path: already at 100% since we skipped duplicate detection
+                progress = 100.0
+                message = "Saving features to database..."
+            else:
+                # Normal path: 96% after duplicate detection
+                progress = 96.0
+                message = "Saving features to database..."
+            
+            self.status_tracker.update_job_status(
+                job_id, ProcessingStatus.PROCESSING,
+                message, progress
+            )
+
+            # Broadcast WebSocket event for status update
+            self._broadcast_to_upload_status_module(user_id, import_queue.id, 'status_updated', {
+                'status': 'processing',
+                'progress': progress,
+                'message': message
+            })
+
+            # Save the features to the database
+            processing_log.add(f"Saving {len(processed_features)} features to database (uploaded file: {upload_size_mb:.2f} MB)", "UploadJob", DatabaseLogLevel.INFO)
+
+            # Only the writes of the item are in a transaction. The job status updates above stay
+            # outside of it, so the BackgroundJob row isn't locked while the features are checked
+            # and staged (that would block the heartbeat and cancel requests).
+            with transaction.atomic():
+                # Store the raw file in the blob store, shared with earlier uploads of the same content
+                import_queue.raw_blob_id = store_upload_blob(raw_file_data, file_hash)
                 import_queue.geojson_hash = geojson_hash
-                import_queue.geofeatures = processed_features
-                import_queue.duplicate_features = duplicate_features  # Store duplicate information
                 import_queue.save()
+                # One staging row per feature, duplicates of library features are marked
+                stage_features(import_queue.id, processed_features, duplicate_features)
 
-                processing_log.add("Import queue entry updated successfully", "UploadJob", DatabaseLogLevel.INFO)
+                # Send the queue delta once the rows are committed, the import queue module reads
+                # the item back from the database (feature count, duplicate status)
+                import_queue_id = import_queue.id
+                transaction.on_commit(lambda: self._broadcast_to_import_queue_module(user_id, 'status_updated', {'id': import_queue_id}))
 
-                # Broadcast status update to trigger queue refresh so duplicate status is updated
-                self._broadcast_to_import_queue_module(user_id, 'status_updated', {'id': import_queue.id})
+            processing_log.add("Import queue entry updated successfully", "UploadJob", DatabaseLogLevel.INFO)
 
-                # Note: No need to call importlog_to_db since RealTimeImportLog writes to DB immediately
+            # Note: No need to call importlog_to_db since RealTimeImportLog writes to DB during processing
 
-                return import_queue.id
+            return import_queue.id
 
         except Exception as e:
             logger.error(f"Failed to update import queue entry for job {job_id}: {str(e)}")
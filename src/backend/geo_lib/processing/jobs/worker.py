@@ -0,0 +1,108 @@
+"""
+Job worker process for the durable job queue.
+Started by `manage.py run_workers`, each worker process runs one queued job at a time.
+"""
+
+import os
+import socket
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from geo_lib.processing.jobs import get_job_processor
+from geo_lib.processing.jobs.job_queue import claim_next_job, heartbeat_job, finish_job, requeue_stale_jobs
+from geo_lib.processing.status_tracker import status_tracker, ProcessingStatus
+from geo_lib.logging.console import get_job_logger
+
+logger = get_job_logger()
+
+
+class JobWorker:
+    """
+    Polls the job queue and runs claimed jobs in this process.
+    While a job runs, a heartbeat thread keeps its claim alive so other workers
+    don't mistake it for a job left behind by a dead worker.
+    """
+
+    def __init__(self, worker_id: str = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = getattr(settings, 'JOB_WORKER_POLL_INTERVAL_SECONDS', 1.0)
+        self.heartbeat_interval = getattr(settings, 'JOB_HEARTBEAT_INTERVAL_SECONDS', 15)
+        self.stale_check_interval = getattr(settings, 'JOB_STALE_AFTER_SECONDS', 120) / 2
+        self._stop_event = threading.Event()
+        self._last_stale_check = 0.0
+
+    def stop(self):
+        """Ask the worker to exit once its current job is done."""
+        self._stop_event.set()
+
+    def run(self):
+        """Process jobs until stop() is called."""
+        logger.info(f"Job worker {self.worker_id} started")
+        while not self._stop_event.is_set():
+            try:
+                self._requeue_stale_jobs()
+                record = claim_next_job(self.worker_id)
+            except Exception:
+                logger.error(f"Job worker {self.worker_id} failed to poll the job queue: {traceback.format_exc()}")
+                close_old_connections()
+                self._stop_event.wait(self.poll_interval * 5)
+                continue
+
+            if record is None:
+                self._stop_event.wait(self.poll_interval)
+                continue
+
+            self._run_job(record)
+            close_old_connections()
+
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def _requeue_stale_jobs(self):
+        now = time.monotonic()
+        if now - self._last_stale_check < self.stale_check_interval:
+            return
+        self._last_stale_check = now
+        requeue_stale_jobs()
+
+    def _run_job(self, record):
+        """Run a claimed job with a heartbeat, then mark it done."""
+        job_id = record.job_id
+        processor = get_job_processor(record.job_type)
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, done), daemon=True)
+        heartbeat.start()
+
+        try:
+            if processor is None:
+                error_msg = f"Unknown job type: {record.job_type}"
+                logger.error(f"Job {job_id}: {error_msg}")
+                status_tracker.update_job_status(job_id, ProcessingStatus.FAILED, error_msg, error_message=error_msg)
+                return
+
+            logger.info(f"Job worker {self.worker_id} running {record.job_type} job {job_id} (attempt {record.attempts})")
+            processor.run_queued_job(job_id, record.job_kwargs, record.payload)
+        except Exception:
+            # _job_worker() handles job errors, this only catches failures to start the job
+            logger.error(f"Job worker {self.worker_id} failed to run job {job_id}: {traceback.format_exc()}")
+            status_tracker.update_job_status(job_id, ProcessingStatus.FAILED, "Job failed to start", error_message="Job failed to start")
+        finally:
+            done.set()
+            heartbeat.join()
+            finish_job(job_id, self.worker_id)
+
+    def _heartbeat(self, job_id: str, done: threading.Event):
+        try:
+            while not done.wait(self.heartbeat_interval):
+                if not heartbeat_job(job_id, self.worker_id):
+                    logger.warning(f"Job worker {self.worker_id} lost its claim on job {job_id}")
+                    return
+        except Exception:
+            logger.error(f"Heartbeat for job {job_id} failed: {traceback.format_exc()}")
+        finally:
+            # Each thread has its own database connection
+            connection.close()
@@ -1,12 +1,14 @@
 import datetime
 import json
 import logging
+import threading
 import time
 import traceback
 from contextlib import contextmanager
 from enum import Enum
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from pydantic import BaseModel, Field
 from django.utils import timezone
@@ -78,107 +80,194 @@ class ImportLog:
 
 class RealTimeImportLog:
     """
-    ImportLog that writes messages to the database immediately when add() is called.
+    ImportLog that writes messages to the database during processing.
     This allows for real-time log updates during async processing.
+
+    Messages are buffered and written with a single bulk_create once the buffer reaches
+    IMPORT_LOG_FLUSH_SIZE messages or IMPORT_LOG_FLUSH_INTERVAL_SECONDS have passed since
+    the last write. A timer writes messages that are still waiting after the interval, so they
+    show up during long steps that don't log anything. Each write is broadcast to the WebSocket
+    as one batch. Errors are written immediately. Call flush() when processing ends so no messages
+    are left in the buffer.
     """
-    
-    def __init__(self, user_id: int, log_id: str = None):
+
+    def __init__(self, user_id: int, log_id: str = None, import_queue_id: int = None):
+        from django.conf import settings
         self._messages: List[DatabaseLogMsg] = []
+        self._pending: List[DatabaseLogMsg] = []
+        self._lock = threading.Lock()
         self.user_id = user_id
         self.log_id = log_id  # This should be a UUID string
+        # Import item and its owner, looked up from log_id on the first broadcast if not given
+        self.import_queue_id = import_queue_id
+        self._import_item_user_id = user_id if import_queue_id is not None else None
+        self._import_item_resolved = import_queue_id is not None
+        self._flush_size = max(1, getattr(settings, 'IMPORT_LOG_FLUSH_SIZE', 50))
+        self._flush_interval = getattr(settings, 'IMPORT_LOG_FLUSH_INTERVAL_SECONDS', 1.0)
+        self._last_flush = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
         from geo_lib.logging.console import get_database_logger
         self._db_logger = get_database_logger()
-    
+
     def add(self, msg: str, source: str, level=DatabaseLogLevel.INFO, duration: float = None):
-        """Add a log message and immediately write it to the database."""
+        """Add a log message, it is written to the database with the next flush."""
         assert isinstance(msg, str)
-        
+
         # Add timing information to the message if provided
         if duration is not None:
             timing_info = f" ({duration:.1f}s)"
             msg = msg + timing_info
-        
-        # Generate timestamp once for both in-memory object and database write
+
+        log_msg = DatabaseLogMsg(msg=msg, source=source, level=level, timestamp=timezone.now())
+        with self._lock:
+            self._messages.append(log_msg)
+            self._pending.append(log_msg)
+        self._flush_if_needed(force=log_msg.level.value >= DatabaseLogLevel.ERROR.value)
+        self._schedule_timed_flush()
+
+    def extend(self, msgs: 'ImportLog'):
+        """Extend with messages from another ImportLog, they are written to the DB in one batch."""
         timestamp = timezone.now()
-        
-        # Create the log message with the timestamp
-        log_msg = DatabaseLogMsg(msg=msg, source=source, level=level, timestamp=timestamp)
-        self._messages.append(log_msg)
-        
-        # Write to database immediately with the same timestamp
+        new_msgs = [
+            DatabaseLogMsg(msg=msg.msg, source=msg.source, level=msg.level, timestamp=timestamp)
+            for msg in msgs.get()
+        ]
+        if not new_msgs:
+            return
+        with self._lock:
+            self._messages.extend(new_msgs)
+            self._pending.extend(new_msgs)
+        self._flush_if_needed()
+        self._schedule_timed_flush()
+
+    def flush(self):
+        """Write all buffered messages to the database and broadcast them."""
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if batch:
+                self._write_batch(batch)
+
+    def get(self) -> List[DatabaseLogMsg]:
+        """Get all messages (for compatibility with ImportLog)."""
+        with self._lock:
+            return self._messages.copy()
+
+    def json(self) -> str:
+        """Get messages as JSON string."""
+        return json.dumps([x.model_dump() for x in self.get()])
+
+    def add_timing(self, step_name: str, duration: float, source: str = "Processing", level=DatabaseLogLevel.INFO):
+        """Add a timing log message for a completed step."""
+        self.add(f"{step_name} completed", source, level, duration)
+
+    def _flush_if_needed(self, force: bool = False):
+        with self._lock:
+            pending_count = len(self._pending)
+            interval_elapsed = time.monotonic() - self._last_flush >= self._flush_interval
+        if pending_count and (force or pending_count >= self._flush_size or interval_elapsed):
+            self.flush()
+
+    def _schedule_timed_flush(self):
+        """Start the timer that writes the buffered messages once the flush interval is over."""
+        with self._lock:
+            if not self._pending or self._timer is not None or self._flush_interval <= 0:
+                return
+            delay = max(0.0, self._last_flush + self._flush_interval - time.monotonic())
+            self._timer = threading.Timer(delay, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self):
+        from django.db import connection
+        with self._lock:
+            self._timer = None
+        try:
+            self._flush_if_needed()
+            self._schedule_timed_flush()
+        finally:
+            # The timer thread has its own database connection
+            connection.close()
+
+    def _write_batch(self, batch: List[DatabaseLogMsg]):
+        """Write a batch of messages with one query. Must be called with the lock held."""
         try:
             from api.models import DatabaseLogging
-            db_log = DatabaseLogging.objects.create(
-                user_id=self.user_id,
-                log_id=self.log_id,
-                level=log_msg.level.value,
-                text=log_msg.msg,
-                source=log_msg.source,
-                attributes={},
-                timestamp=timestamp,
-            )
-            # Assign the database ID to the log message for WebSocket broadcast
-            log_msg.id = db_log.id
-            self._db_logger.debug(f"Real-time log written: {source} - {msg}")
-            
+            db_logs = DatabaseLogging.objects.bulk_create([
+                DatabaseLogging(
+                    user_id=self.user_id,
+                    log_id=self.log_id,
+                    level=log_msg.level.value,
+                    text=log_msg.msg,
+                    source=log_msg.source,
+                    attributes={},
+                    timestamp=log_msg.timestamp,
+                )
+                for log_msg in batch
+            ])
+            # Assign the database IDs to the log messages for WebSocket broadcast
+            for log_msg, db_log in zip(batch, db_logs):
+                log_msg.id = db_log.id
+            self._db_logger.debug(f"Real-time log wrote {len(batch)} message(s)")
+
             # Broadcast to WebSocket if we have a log_id (indicating this is for an import item)
             if self.log_id:
-                self._broadcast_log_to_websocket(log_msg)
-                
+                self._broadcast_logs_to_websocket(batch)
+
         except Exception as e:
             self._db_logger.error(f"Failed to write real-time log to database: {str(e)}")
             self._db_logger.error(f"Real-time log database write error traceback: {traceback.format_exc()}")
             # Don't raise the exception - we still want processing to continue
-    
-    def extend(self, msgs: 'ImportLog'):
-        """Extend with messages from another ImportLog and write them to DB."""
-        for msg in msgs.get():
-            self.add(msg.msg, msg.source, msg.level)
-    
-    def get(self) -> List[DatabaseLogMsg]:
-        """Get all messages (for compatibility with ImportLog)."""
-        return self._messages.copy()
-    
-    def json(self) -> str:
-        """Get messages as JSON string."""
-        return json.dumps([x.model_dump() for x in self._messages])
-    
-    def add_timing(self, step_name: str, duration: float, source: str = "Processing", level=DatabaseLogLevel.INFO):
-        """Add a timing log message for a completed step."""
-        self.add(f"{step_name} completed", source, level, duration)
-    
-    def _broadcast_log_to_websocket(self, log_msg: DatabaseLogMsg):
-        """Broadcast log message to WebSocket channels."""
+
+    def _resolve_import_item(self) -> Optional[Tuple[int, int]]:
+        """Find the import item (id, user_id) associated with this log_id, only queried once."""
+        if not self._import_item_resolved:
+            from api.models import ImportQueue
+            item = ImportQueue.objects.filter(log_id=self.log_id).values_list('id', 'user_id').first()
+            if item:
+                self.import_queue_id, self._import_item_user_id = item
+            self._import_item_resolved = True
+        if self.import_queue_id is None:
+            return None
+        return self.import_queue_id, self._import_item_user_id
+
+    def _broadcast_logs_to_websocket(self, batch: List[DatabaseLogMsg]):
+        """Broadcast a batch of log messages to WebSocket channels."""
         try:
             from channels.layers import get_channel_layer
             from asgiref.sync import async_to_sync
-            
-            # Find the import item associated with this log_id
-            from api.models import ImportQueue
-            try:
-                import_item = ImportQueue.objects.get(log_id=self.log_id)
-                user_id = import_item.user_id
-                item_id = import_item.id
-                
-                # Broadcast to the upload status channel for this specific item
-                channel_layer = get_channel_layer()
-                if channel_layer:
-                    async_to_sync(channel_layer.group_send)(
-                        f"upload_status_{user_id}_{item_id}",
-                        {
-                            'type': 'logs_added',
-                            'data': {
-                                'id': log_msg.id if hasattr(log_msg, 'id') else None,
-                                'timestamp': log_msg.timestamp.isoformat(),
-                                'msg': log_msg.msg,
-                                'source': log_msg.source,
-                                'level': log_msg.level.value
-                            }
-                        }
-                    )
-            except ImportQueue.DoesNotExist:
+
+            import_item = self._resolve_import_item()
+            if import_item is None:
                 # Import item not found, skip broadcasting
-                pass
+                return
+            item_id, user_id = import_item
+
+            # Broadcast to the upload status channel for this specific item
+            channel_layer = get_channel_layer()
+            if channel_layer:
+                async_to_sync(channel_layer.group_send)(
+                    f"upload_status_{user_id}_{item_id}",
+                    {
+                        'type': 'logs_added',
+                        'data': {
+                            'logs': [
+                                {
+                                    'id': log_msg.id,
+                                    'timestamp': log_msg.timestamp.isoformat(),
+                                    'msg': log_msg.msg,
+                                    'source': log_msg.source,
+                                    'level': log_msg.level.value
+                                }
+                                for log_msg in batch
+                            ]
+                        }
+                    }
+                )
         except Exception as e:
             self._db_logger.error(f"Failed to broadcast log to WebSocket: {str(e)}")
             # Don't raise the exception - we still want processing to continue
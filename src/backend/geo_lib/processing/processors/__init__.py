@@ -5,19 +5,40 @@ Factory module for creating appropriate processors based on file type.
 
 from typing import Union, Optional
 
+from django.conf import settings
+
 from geo_lib.processing.file_types import FileType
 from geo_lib.processing.file_types import detect_file_type
 from geo_lib.processing.status_tracker import ProcessingStatusTracker
+from geo_lib.security.file_validation import ValidatedUpload
 from .base_processor import BaseProcessor
 from .gpx_processor import GPXProcessor
 from .kml_processor import KMLProcessor
 from .kmz_processor import KMZProcessor
+from .streaming_processor import StreamingKMLProcessor, StreamingKMZProcessor, StreamingGPXProcessor
+
+# Processor classes for each parser engine
+PROCESSOR_ENGINES = {
+    'togeojson': {
+        FileType.KML: KMLProcessor,
+        FileType.KMZ: KMZProcessor,
+        FileType.GPX: GPXProcessor,
+    },
+    'lxml': {
+        FileType.KML: StreamingKMLProcessor,
+        FileType.KMZ: StreamingKMZProcessor,
+        FileType.GPX: StreamingGPXProcessor,
+    },
+}
 
 
 def get_processor(file_data: Union[bytes, str], filename: str = "", 
                   job_id: Optional[str] = None,
                   status_tracker: Optional[ProcessingStatusTracker] = None,
-                  minimal_processing: bool = False) -> BaseProcessor:
+                  minimal_processing: bool = False,
+                  engine: Optional[str] = None,
+                  validated_upload: Optional[ValidatedUpload] = None,
+                  defer_geocoding: bool = False) -> BaseProcessor:
     """
     Factory function to create the appropriate processor for a file type.
     
@@ -27,23 +48,33 @@ def get_processor(file_data: Union[bytes, str], filename: str = "",
         job_id: Optional job ID for cancellation checking
         status_tracker: Optional status tracker for cancellation checking
         minimal_processing: If True, skip tag generation and other expensive operations
+        engine: Parser engine ('togeojson' or 'lxml'), defaults to the IMPORT_PARSER_ENGINE setting
+        validated_upload: Optional validation artifact for file_data, skips re-validation and archive extraction
+        defer_geocoding: If True, skip reverse geocoding (location tags are added later by a GeocodeJob)
         
     Returns:
         Appropriate processor instance
         
     Raises:
-        ValueError: If file type is not supported
+        ValueError: If file type or engine is not supported
     """
-    file_type = detect_file_type(file_data, filename)
-
-    if file_type == FileType.KML:
-        return KMLProcessor(file_data, filename, job_id=job_id, status_tracker=status_tracker, minimal_processing=minimal_processing)
-    elif file_type == FileType.KMZ:
-        return KMZProcessor(file_data, filename, job_id=job_id, status_tracker=status_tracker, minimal_processing=minimal_processing)
-    elif file_type == FileType.GPX:
-        return GPXProcessor(file_data, filename, job_id=job_id, status_tracker=status_tracker, minimal_processing=minimal_processing)
+    if engine is None:
+        engine = getattr(settings, 'IMPORT_PARSER_ENGINE', 'togeojson')
+    if engine not in PROCESSOR_ENGINES:
+        raise ValueError(f"Unsupported parser engine: {engine}")
+
+    if validated_upload is not None and validated_upload.matches(file_data):
+        file_type = validated_upload.file_type
     else:
+        validated_upload = None
+        file_type = detect_file_type(file_data, filename)
+
+    processor_class = PROCESSOR_ENGINES[engine].get(file_type)
+    if processor_class is None:
         raise ValueError(f"Unsupported file type: {file_type}")
+    return processor_class(file_data, filename, job_id=job_id, status_tracker=status_tracker,
+                           minimal_processing=minimal_processing, validated_upload=validated_upload,
+                           defer_geocoding=defer_geocoding)
 
 
 __all__ = [
@@ -51,5 +82,8 @@ __all__ = [
     'KMLProcessor',
     'KMZProcessor',
     'GPXProcessor',
+    'StreamingKMLProcessor',
+    'StreamingKMZProcessor',
+    'StreamingGPXProcessor',
     'get_processor'
 ]
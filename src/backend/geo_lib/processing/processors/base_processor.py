@@ -9,9 +9,21 @@ import subprocess
 import tempfile
 import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, Tuple, Union, List, Optional
-
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Callable, Dict, Any, Tuple, Union, List, Optional
+
+from geo_lib.geolocation.geocode_cache import GeocodeCacheStats
+from geo_lib.geolocation.reverse_geocode import get_reverse_geocoding_service
+from geo_lib.processing.feature_process_pool import (
+    get_feature_process_pool,
+    process_feature_chunk,
+    process_pool_size,
+    reset_feature_process_pool,
+    use_process_pool,
+)
 from geo_lib.processing.file_types import FileType, detect_file_type
 from geo_lib.processing.geo_processor import (
     extract_track_created_date,
@@ -20,13 +32,169 @@ from geo_lib.processing.geo_processor import (
 )
 from geo_lib.processing.logging import ImportLog, DatabaseLogLevel
 from geo_lib.processing.status_tracker import ProcessingStatusTracker, ProcessingStatus
-from geo_lib.processing.tagging import generate_auto_tags
-from geo_lib.security.file_validation import SecureFileValidator
+from geo_lib.processing.tagging import generate_auto_tags, get_geometry_representative_points, LocationTagGrid
+from geo_lib.processing.togeojson_pool import get_togeojson_pool, TogeojsonWorkerTimeout, TogeojsonConversionError
+from geo_lib.security.file_validation import SecureFileValidator, ValidatedUpload
 from geo_lib.logging.console import get_import_logger
-from geo_lib.types.feature import PointFeature, LineStringFeature, MultiLineStringFeature, PolygonFeature
+from geo_lib.types.feature import (
+    PointFeature, LineStringFeature, MultiLineStringFeature, PolygonFeature, VALIDATED_KEY, validated_feature
+)
 
 logger = get_import_logger()
 
+# The job status is read from the database at most this often by _is_cancelled()
+CANCEL_CHECK_INTERVAL_SECONDS = 1.0
+
+
+def process_single_feature(feature: Dict[str, Any], filename: str = "", minimal_processing: bool = False,
+                           geocode: bool = True, geocode_cache_stats: Optional[GeocodeCacheStats] = None,
+                           location_tag_grid: Optional[LocationTagGrid] = None,
+                           is_cancelled: Callable[[], bool] = lambda: False) -> Tuple[List[Dict[str, Any]], ImportLog, int, bool]:
+    """
+    Process a single feature, including splitting complex geometries and geocoding.
+    Doesn't use the processor instance, so it can also run in the feature process pool.
+
+    Args:
+        feature: Single feature dictionary from GeoJSON
+        filename: Original filename, used for the source-file tag
+        minimal_processing: If True, skip tag generation
+        geocode: If False, location tags are not generated
+        geocode_cache_stats: Optional shared geocoding cache counters
+        location_tag_grid: Optional shared location tag grid
+        is_cancelled: Checked between steps, processing stops once it returns True
+
+    Returns:
+        Tuple of (processed_features_list, feature_log, skipped_count, was_split)
+    """
+    # Check for cancellation at the very start
+    if is_cancelled():
+        return [], ImportLog(), 0, False
+
+    feature_log = ImportLog()
+    processed_features = []
+    skipped_count = 0
+    was_split = False
+
+    # Split complex geometries (GeometryCollection, MultiPoint, MultiPolygon) into separate features
+    split_features = split_complex_geometries(feature)
+
+    # Check if this feature was split
+    if len(split_features) > 1:
+        was_split = True
+
+    # Skip features with no valid geometry
+    if not split_features:
+        skipped_count += 1
+        return processed_features, feature_log, skipped_count, was_split
+
+    for split_feature in split_features:
+        # Check for cancellation before processing each split feature
+        if is_cancelled():
+            break
+            
+        if split_feature['geometry']['type'] in ['Point', 'MultiPoint', 'LineString', 'MultiLineString', 'Polygon', 'MultiPolygon']:
+            # Geometry validated for tag generation, reused when validating the final feature
+            validated_geometry = None
+            try:
+                # Generate properties with appropriate styling based on file type and feature geometry
+                split_feature['properties'] = geojson_property_generation(split_feature)
+
+                # Extract track created date from first point timestamp (for KML/GPX tracks)
+                # Only set if created date is not already present
+                if 'created' not in split_feature['properties'] or not split_feature['properties']['created']:
+                    track_timestamp = extract_track_created_date(split_feature)
+                    if track_timestamp:
+                        split_feature['properties']['created'] = track_timestamp
+
+                # Skip tag generation in minimal processing mode
+                if not minimal_processing:
+                    # Generate all auto tags (type, import-year, import-month, geocoding) using generate_auto_tags()
+                    # Check for cancellation before tag generation
+                    if is_cancelled():
+                        break
+                    
+                    try:
+                        geometry_type = split_feature['geometry']['type'].lower()
+                        
+                        # Determine the appropriate feature class
+                        feature_class = None
+                        if geometry_type in ['point', 'multipoint']:
+                            feature_class = PointFeature
+                        elif geometry_type == 'linestring':
+                            feature_class = LineStringFeature
+                        elif geometry_type == 'multilinestring':
+                            feature_class = MultiLineStringFeature
+                        elif geometry_type in ['polygon', 'multipolygon']:
+                            feature_class = PolygonFeature
+                        
+                        if feature_class:
+                            # Create feature instance for tag generation
+                            feature_instance = feature_class(**split_feature)
+                            validated_geometry = feature_instance.geometry
+                            
+                            # Check for cancellation before generating tags
+                            if is_cancelled():
+                                break
+                            
+                            # Generate all auto tags (includes type, import-year, import-month, source-file, and geocoding)
+                            auto_tags = generate_auto_tags(feature_instance, feature_log, filename=filename,
+                                                           geocode_cache_stats=geocode_cache_stats,
+                                                           location_tag_grid=location_tag_grid,
+                                                           geocode=geocode)
+                            
+                            # Check for cancellation after tag generation
+                            if is_cancelled():
+                                break
+                            
+                            # Merge auto tags with existing tags, avoiding duplicates
+                            existing_tags = split_feature['properties'].get('tags', [])
+                            if not isinstance(existing_tags, list):
+                                existing_tags = []
+                            # Combine existing tags with auto tags, avoiding duplicates
+                            all_tags = list(existing_tags) + [tag for tag in auto_tags if tag not in existing_tags]
+                            split_feature['properties']['tags'] = all_tags
+                    except Exception as tag_error:
+                        # Log error but don't fail the feature processing
+                        feature_name = split_feature.get('properties', {}).get('name', 'Unnamed')
+                        feature_log.add(
+                            f"Tag generation failed for feature '{feature_name}': {str(tag_error)}",
+                            "Tag Generation",
+                            DatabaseLogLevel.WARNING
+                        )
+                        logger.warning(f"Tag generation failed for feature '{feature_name}': {tag_error}")
+                # In minimal processing mode, preserve existing tags from file if any, but don't generate new ones
+
+                # Check for cancellation before finalizing feature
+                if is_cancelled():
+                    break
+                
+                # Convert to our property format
+                from geo_lib.types.geojson import GeojsonRawProperty
+                split_feature['properties'] = GeojsonRawProperty(**split_feature['properties']).model_dump(mode='json')
+                has_id = 'id' in split_feature['properties']
+
+                # Validate the final feature once and mark it, so the import stores it as is
+                # instead of validating and dumping it again
+                split_feature = validated_feature(split_feature, geometry=validated_geometry)
+                
+                # Generate and set feature ID if not already present
+                if not has_id:
+                    from geo_lib.feature_id import generate_feature_hash
+                    feature_id = split_feature.get(VALIDATED_KEY) or generate_feature_hash(split_feature)
+                    split_feature['properties']['id'] = feature_id
+                
+                processed_features.append(split_feature)
+            except Exception as e:
+                feature_name = split_feature.get('properties', {}).get('name', 'Unnamed')
+                feature_log.add(f"Failed to process feature '{feature_name}', skipping", 'Feature Processing', DatabaseLogLevel.WARNING)
+                logger.error(f"Feature processing error for '{feature_name}': {str(e)}")
+                skipped_count += 1
+        else:
+            feature_log.add(f'Skipping unsupported geometry type: {split_feature["geometry"]["type"]}', 'Feature Processing', DatabaseLogLevel.WARNING)
+            skipped_count += 1
+
+    return processed_features, feature_log, skipped_count, was_split
+
 
 class BaseProcessor(ABC):
     """
@@ -37,7 +205,9 @@ class BaseProcessor(ABC):
     def __init__(self, file_data: Union[bytes, str], filename: str = "", 
                  job_id: Optional[str] = None, 
                  status_tracker: Optional[ProcessingStatusTracker] = None,
-                 minimal_processing: bool = False):
+                 minimal_processing: bool = False,
+                 validated_upload: Optional[ValidatedUpload] = None,
+                 defer_geocoding: bool = False):
         """
         Initialize the processor.
         
@@ -47,6 +217,8 @@ class BaseProcessor(ABC):
             job_id: Optional job ID for cancellation checking
             status_tracker: Optional status tracker for cancellation checking
             minimal_processing: If True, skip tag generation and other expensive operations
+            validated_upload: Optional validation artifact for file_data from an earlier stage
+            defer_geocoding: If True, skip reverse geocoding, location tags are added later by a GeocodeJob
         """
         self.file_data = file_data
         self.filename = filename
@@ -57,7 +229,14 @@ class BaseProcessor(ABC):
         self.job_id = job_id
         self.status_tracker = status_tracker
         self.minimal_processing = minimal_processing
+        self.defer_geocoding = defer_geocoding
         self._executor = None  # Store executor reference for proper shutdown
+        self._geocode_cache_stats: Optional[GeocodeCacheStats] = None
+        self._location_tag_grid: Optional[LocationTagGrid] = None
+        self._cancelled = False
+        self._cancel_checked_at = None
+        # Only trust the artifact if it was produced for this exact file data
+        self.validated_upload = validated_upload if validated_upload is not None and validated_upload.matches(file_data) else None
 
     def detect_file_type(self) -> FileType:
         """
@@ -68,17 +247,24 @@ class BaseProcessor(ABC):
             FileType enum value
         """
         if self.file_type is None:
-            self.file_type = detect_file_type(self.file_data, self.filename)
+            if self.validated_upload is not None:
+                self.file_type = self.validated_upload.file_type
+            else:
+                self.file_type = detect_file_type(self.file_data, self.filename)
         return self.file_type
 
     def validate(self) -> bool:
         """
         Validate file security and format.
-        Uses the existing SecureFileValidator.
+        Uses the existing SecureFileValidator, unless the file was already validated earlier in the pipeline.
         
         Returns:
             True if validation passes, False otherwise
         """
+        if self.validated_upload is not None:
+            self.import_log.add("File validation passed on upload, skipping re-validation", "Validation", DatabaseLogLevel.INFO)
+            return True
+
         try:
             # Create a mock uploaded file for validation
             from django.core.files.uploadedfile import SimpleUploadedFile
@@ -99,11 +285,11 @@ class BaseProcessor(ABC):
             # Validate file with timing
             validation_start = time.time()
             validator = SecureFileValidator()
-            is_valid, validation_message = validator.validate_file(uploaded_file)
+            self.validated_upload, validation_message = validator.validate_upload(uploaded_file)
             validation_duration = time.time() - validation_start
             self.import_log.add_timing("File validation", validation_duration, "Processing")
 
-            if not is_valid:
+            if self.validated_upload is None:
                 self.import_log.add(f"File validation failed: {validation_message}", "Validation", DatabaseLogLevel.ERROR)
                 return False
 
@@ -137,136 +323,82 @@ class BaseProcessor(ABC):
         Returns:
             Tuple of (processed_features_list, feature_log, skipped_count, was_split)
         """
-        # Check for cancellation at the very start
-        if self._is_cancelled():
-            return [], ImportLog(), 0, False
-
-        feature_log = ImportLog()
-        processed_features = []
-        skipped_count = 0
-        was_split = False
-
-        # Split complex geometries (GeometryCollection, MultiPoint, MultiPolygon) into separate features
-        split_features = split_complex_geometries(feature)
-
-        # Check if this feature was split
-        if len(split_features) > 1:
-            was_split = True
-
-        # Skip features with no valid geometry
-        if not split_features:
-            skipped_count += 1
-            return processed_features, feature_log, skipped_count, was_split
-
-        for split_feature in split_features:
-            # Check for cancellation before processing each split feature
-            if self._is_cancelled():
-                break
-                
-            if split_feature['geometry']['type'] in ['Point', 'MultiPoint', 'LineString', 'MultiLineString', 'Polygon', 'MultiPolygon']:
-                try:
-                    # Generate properties with appropriate styling based on file type and feature geometry
-                    split_feature['properties'] = geojson_property_generation(split_feature)
-
-                    # Extract track created date from first point timestamp (for KML/GPX tracks)
-                    # Only set if created date is not already present
-                    if 'created' not in split_feature['properties'] or not split_feature['properties']['created']:
-                        track_timestamp = extract_track_created_date(split_feature)
-                        if track_timestamp:
-                            split_feature['properties']['created'] = track_timestamp
-
-                    # Skip tag generation in minimal processing mode
-                    if not self.minimal_processing:
-                        # Generate all auto tags (type, import-year, import-month, geocoding) using generate_auto_tags()
-                        # Check for cancellation before tag generation
-                        if self._is_cancelled():
-                            break
-                        
-                        try:
-                            geometry_type = split_feature['geometry']['type'].lower()
-                            
-                            # Determine the appropriate feature class
-                            feature_class = None
-                            if geometry_type in ['point', 'multipoint']:
-                                feature_class = PointFeature
-                            elif geometry_type == 'linestring':
-                                feature_class = LineStringFeature
-                            elif geometry_type == 'multilinestring':
-                                feature_class = MultiLineStringFeature
-                            elif geometry_type in ['polygon', 'multipolygon']:
-                                feature_class = PolygonFeature
-                            
-                            if feature_class:
-                                # Create feature instance for tag generation
-                                feature_instance = feature_class(**split_feature)
-                                
-                                # Check for cancellation before generating tags
-                                if self._is_cancelled():
-                                    break
-                                
-                                # Generate all auto tags (includes type, import-year, import-month, source-file, and geocoding)
-                                auto_tags = generate_auto_tags(feature_instance, feature_log, filename=self.filename)
-                                
-                                # Check for cancellation after tag generation
-                                if self._is_cancelled():
-                                    break
-                                
-                                # Merge auto tags with existing tags, avoiding duplicates
-                                existing_tags = split_feature['properties'].get('tags', [])
-                                if not isinstance(existing_tags, list):
-                                    existing_tags = []
-                                # Combine existing tags with auto tags, avoiding duplicates
-                                all_tags = list(existing_tags) + [tag for tag in auto_tags if tag not in existing_tags]
-                                split_feature['properties']['tags'] = all_tags
-                        except Exception as tag_error:
-                            # Log error but don't fail the feature processing
-                            feature_name = split_feature.get('properties', {}).get('name', 'Unnamed')
-                            feature_log.add(
-                                f"Tag generation failed for feature '{feature_name}': {str(tag_error)}",
-                                "Tag Generation",
-                                DatabaseLogLevel.WARNING
-                            )
-                            logger.warning(f"Tag generation failed for feature '{feature_name}': {tag_error}")
-                    # In minimal processing mode, preserve existing tags from file if any, but don't generate new ones
-
-                    # Check for cancellation before finalizing feature
-                    if self._is_cancelled():
-                        break
-                    
-                    # Convert to our property format
-                    from geo_lib.types.geojson import GeojsonRawProperty
-                    split_feature['properties'] = GeojsonRawProperty(**split_feature['properties']).model_dump(mode='json')
-                    
-                    # Generate and set feature ID if not already present
-                    if 'id' not in split_feature.get('properties', {}):
-                        from geo_lib.feature_id import generate_feature_hash
-                        feature_id = generate_feature_hash(split_feature)
-                        split_feature['properties']['id'] = feature_id
-                    
-                    processed_features.append(split_feature)
-                except Exception as e:
-                    feature_name = split_feature.get('properties', {}).get('name', 'Unnamed')
-                    feature_log.add(f"Failed to process feature '{feature_name}', skipping", 'Feature Processing', DatabaseLogLevel.WARNING)
-                    logger.error(f"Feature processing error for '{feature_name}': {str(e)}")
-                    skipped_count += 1
-            else:
-                feature_log.add(f'Skipping unsupported geometry type: {split_feature["geometry"]["type"]}', 'Feature Processing', DatabaseLogLevel.WARNING)
-                skipped_count += 1
-
-        return processed_features, feature_log, skipped_count, was_split
+        return process_single_feature(feature, self.filename, self.minimal_processing,
+                                      geocode=not self.defer_geocoding,
+                                      geocode_cache_stats=self._geocode_cache_stats,
+                                      location_tag_grid=self._location_tag_grid,
+                                      is_cancelled=self._is_cancelled)
+
+    def _process_feature_batch(self, features: List[Dict[str, Any]]) -> List[Union[Tuple, Exception]]:
+        """Process several features in this process, an exception takes the place of a failed feature's result."""
+        results = []
+        for feature in features:
+            try:
+                results.append(self._process_single_feature(feature))
+            except Exception as e:
+                results.append(e)
+        return results
 
     def _is_cancelled(self) -> bool:
         """
         Check if the current job has been cancelled.
+        The job is looked up at most once per CANCEL_CHECK_INTERVAL_SECONDS.
         
         Returns:
             True if job is cancelled, False otherwise
         """
-        if self.job_id and self.status_tracker:
-            job = self.status_tracker.get_job(self.job_id)
-            if job and job.status == ProcessingStatus.CANCELLED:
-                return True
-        return False
+        if self._cancelled:
+            return True
+        if not self.job_id or not self.status_tracker:
+            return False
+        # Called several times per feature, so the answer is reused for a moment
+        now = time.monotonic()
+        if self._cancel_checked_at is not None and now - self._cancel_checked_at < CANCEL_CHECK_INTERVAL_SECONDS:
+            return False
+        self._cancel_checked_at = now
+        job = self.status_tracker.get_job(self.job_id)
+        self._cancelled = job is not None and job.status == ProcessingStatus.CANCELLED
+        return self._cancelled
+
+    def _prefetch_geocoding(self, features: List[Dict[str, Any]], feature_log: ImportLog):
+        """
+        Look up the representative points of several raw features at once, one per grid cell.
+        The per-feature tag generation then finds the results in memory or in the geocoding cache.
+        """
+        points = []
+        for feature in features:
+            try:
+                for split_feature in split_complex_geometries(feature):
+                    points.extend(get_geometry_representative_points(split_feature['geometry']))
+            except Exception:
+                # Invalid features are reported when they are processed
+                continue
+        if self._location_tag_grid:
+            points = self._location_tag_grid.snap(points)
+        if not points or self._is_cancelled():
+            return
+        try:
+            get_reverse_geocoding_service().prefetch_location_data(points, self._geocode_cache_stats, feature_log,
+                                                                   is_cancelled=self._is_cancelled)
+        except Exception as e:
+            logger.warning(f"Geocoding prefetch failed: {e}")
+
+    def _count_geocodable(self, feature: Dict[str, Any]) -> int:
+        """
+        Count how many of a raw feature's split features will be geocoded (points and lines only).
+        
+        Args:
+            feature: Raw feature dictionary from GeoJSON
+            
+        Returns:
+            Number of geocodable features
+        """
+        count = 0
+        for split_feature in split_complex_geometries(feature):
+            geometry_type = split_feature.get('geometry', {}).get('type', '').lower()
+            if geometry_type in ['point', 'linestring', 'multilinestring']:
+                count += 1
+        return count
 
     def process_features(self, geojson_data: Dict[str, Any]) -> Tuple[list, ImportLog]:
         """
@@ -275,6 +407,10 @@ class BaseProcessor(ABC):
         Uses parallel processing via ThreadPoolExecutor for improved performance.
         Supports cancellation checking during processing.
         
+        'features' may be a list or any iterable (the streaming engine passes a generator).
+        Features are pulled from it as worker threads free up, so only a bounded number of
+        raw features is held at once and processing starts before parsing finishes.
+        
         Args:
             geojson_data: GeoJSON data dictionary
             
@@ -282,7 +418,7 @@ class BaseProcessor(ABC):
             Tuple of (processed_features, processing_log)
         """
         features = geojson_data.get('features', [])
-        file_type = self.detect_file_type()
+        is_streaming = not isinstance(features, list)
 
         # Process features using the logic that was in process_togeojson_features
         processed_features = []
@@ -290,8 +426,10 @@ class BaseProcessor(ABC):
 
         skipped_count = 0
         geometry_collection_count = 0
+        raw_feature_count = 0
 
-        feature_log.add(f"Processing {len(features)} raw features from file", "Feature Processing", DatabaseLogLevel.INFO)
+        if not is_streaming:
+            feature_log.add(f"Processing {len(features)} raw features from file", "Feature Processing", DatabaseLogLevel.INFO)
 
         # Check for cancellation before starting
         if self._is_cancelled():
@@ -299,86 +437,160 @@ class BaseProcessor(ABC):
             return processed_features, feature_log
 
         # Count features that will be geocoded (points and lines only)
+        # A stream can only be counted as it's consumed, so it's counted during submission below
         from django.conf import settings
-        geocoding_enabled = getattr(settings, 'REVERSE_GEOCODING_ENABLED', True)
+        geocoding_enabled = getattr(settings, 'REVERSE_GEOCODING_ENABLED', True) and not self.defer_geocoding
         geocoding_count = 0
-        if geocoding_enabled:
+        if geocoding_enabled and not is_streaming:
             for feature in features:
-                split_features = split_complex_geometries(feature)
-                for split_feature in split_features:
-                    geometry_type = split_feature.get('geometry', {}).get('type', '').lower()
-                    if geometry_type in ['point', 'linestring', 'multilinestring']:
-                        geocoding_count += 1
+                geocoding_count += self._count_geocodable(feature)
             if geocoding_count > 0:
                 feature_log.add(f"Geocoding {geocoding_count} feature(s)", "Geocoding", DatabaseLogLevel.INFO)
 
+        # Shared by the worker threads, summarized in the log once processing is done
+        self._geocode_cache_stats = GeocodeCacheStats() if geocoding_enabled else None
+        # Points close to each other are geocoded once and share their location tags
+        self._location_tag_grid = LocationTagGrid() if geocoding_enabled else None
+
         # Get number of threads from settings
         num_threads = getattr(settings, 'IMPORT_PROCESSING_THREADS', 4)
-
-        # Process features in parallel using ThreadPoolExecutor
-        # Use submit() instead of map() to allow cancellation checking between tasks
-        if len(features) > 0:
+        prefetch_features = max(1, getattr(settings, 'GEOCODING_PREFETCH_FEATURES', 500))
+
+        # Without geocoding the work is CPU bound, so it's spread over the feature process pool in chunks.
+        # Geocoding waits on the network and runs in threads, one feature per task
+        geocoding_in_workers = geocoding_enabled and not self.minimal_processing
+        use_processes = use_process_pool(geocoding_in_workers, None if is_streaming else len(features))
+        if use_processes:
+            process_pool = get_feature_process_pool()
+            batch_size = max(1, getattr(settings, 'IMPORT_PROCESS_CHUNK_SIZE', 100))
+            max_pending = process_pool_size() * 2
+            self._executor = None
+            feature_log.add(f"Processing features in {process_pool_size()} worker processes", "Feature Processing", DatabaseLogLevel.DEBUG)
+        else:
+            process_pool = None
+            batch_size = 1
+            max_pending = num_threads * 4
+            # Use submit() instead of map() to allow cancellation checking between tasks
             self._executor = ThreadPoolExecutor(max_workers=num_threads)
-            executor_shutdown_called = False
+
+        def submit(batch: List[Dict[str, Any]]):
+            nonlocal process_pool
+            if process_pool is None:
+                return self._executor.submit(self._process_feature_batch, batch)
             try:
-                # Submit all tasks
-                future_to_feature = {
-                    self._executor.submit(self._process_single_feature, feature): feature 
-                    for feature in features
-                }
-
-                # Collect results as they complete, checking for cancellation
-                completed_count = 0
-                cancelled = False
-                for future in as_completed(future_to_feature):
+                return process_pool.submit(process_feature_chunk, batch, self.filename, self.minimal_processing)
+            except BrokenProcessPool:
+                # A worker process died earlier, start a new pool
+                reset_feature_process_pool()
+                process_pool = get_feature_process_pool()
+                return process_pool.submit(process_feature_chunk, batch, self.filename, self.minimal_processing)
+
+        executor_shutdown_called = False
+        future_to_batch = {}
+        try:
+            feature_iter = iter(features)
+            features_exhausted = False
+            lookahead = deque()
+            completed_count = 0
+            cancelled = False
+
+            while True:
+                # Keep the pool fed without pulling the whole stream into memory
+                to_submit = []
+                while len(future_to_batch) + len(to_submit) < max_pending:
+                    if len(lookahead) < batch_size and not features_exhausted:
+                        # Read ahead a chunk of features and geocode all of their points at once,
+                        # so the geocoding client can run the requests concurrently before the workers need them
+                        chunk = list(islice(feature_iter, max(prefetch_features, batch_size)))
+                        features_exhausted = len(chunk) < max(prefetch_features, batch_size)
+                        raw_feature_count += len(chunk)
+                        if geocoding_enabled and is_streaming:
+                            for feature in chunk:
+                                geocoding_count += self._count_geocodable(feature)
+                        if geocoding_in_workers:
+                            self._prefetch_geocoding(chunk, feature_log)
+                        lookahead.extend(chunk)
+                    if not lookahead:
+                        break
+                    to_submit.append([lookahead.popleft() for _ in range(min(batch_size, len(lookahead)))])
+
+                for batch in to_submit:
+                    future_to_batch[submit(batch)] = batch
+
+                if not future_to_batch:
+                    break
+
+                done, _ = wait(future_to_batch, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = future_to_batch.pop(future)
+
                     # Check for cancellation before processing each result
                     if self._is_cancelled():
-                        if not cancelled:
-                            feature_log.add(f"Processing cancelled after {completed_count} features", "Feature Processing", DatabaseLogLevel.WARNING)
-                            cancelled = True
-                            # Cancel remaining futures (they'll finish but we won't process results)
-                            for remaining_future in future_to_feature:
-                                if not remaining_future.done():
-                                    remaining_future.cancel()
-                            # Shutdown executor without waiting for remaining tasks
+                        feature_log.add(f"Processing cancelled after {completed_count} features", "Feature Processing", DatabaseLogLevel.WARNING)
+                        cancelled = True
+                        # Cancel remaining futures (they'll finish but we won't process results)
+                        for remaining_future in future_to_batch:
+                            if not remaining_future.done():
+                                remaining_future.cancel()
+                        # Shutdown executor without waiting for remaining tasks
+                        if self._executor:
                             self._executor.shutdown(wait=False)
-                            executor_shutdown_called = True
-                            # Break immediately - don't process any more results
-                            break
-
-                    # Only process results if not cancelled
-                    if not cancelled:
-                        try:
-                            result_features, result_log, result_skipped, was_split = future.result()
+                        executor_shutdown_called = True
+                        # Break immediately - don't process any more results
+                        break
+
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool:
+                        # A worker process died, process this chunk here. The next submit starts a new pool
+                        logger.warning(f"Feature process pool broke, processing {len(batch)} feature(s) in this process")
+                        results = self._process_feature_batch(batch)
+                    except Exception as e:
+                        results = [e] * len(batch)
+
+                    for feature, result in zip(batch, results):
+                        if isinstance(result, Exception):
+                            feature_name = feature.get('properties', {}).get('name', 'Unnamed')
+                            logger.error(f"Error processing feature '{feature_name}': {str(result)}")
+                            feature_log.add(f"Error processing feature '{feature_name}': {str(result)}", "Feature Processing", DatabaseLogLevel.ERROR)
+                            skipped_count += 1
+                        else:
+                            result_features, result_log, result_skipped, was_split = result
                             processed_features.extend(result_features)
                             feature_log.extend(result_log)
                             skipped_count += result_skipped
-                            
+
                             # Track what type of split occurred by checking the original feature
                             if was_split:
-                                original_feature = future_to_feature[future]
-                                original_geom_type = original_feature.get('geometry', {}).get('type', '')
+                                original_geom_type = (feature.get('geometry') or {}).get('type', '')
                                 if original_geom_type == 'GeometryCollection':
                                     geometry_collection_count += 1
                                 # MultiPoint and MultiPolygon should not appear (they should be GeometryCollection)
                                 # If they do, split_complex_geometries() will assert/error
-                            completed_count += 1
-                        except Exception as e:
-                            feature = future_to_feature[future]
-                            feature_name = feature.get('properties', {}).get('name', 'Unnamed')
-                            logger.error(f"Error processing feature '{feature_name}': {str(e)}")
-                            feature_log.add(f"Error processing feature '{feature_name}': {str(e)}", "Feature Processing", DatabaseLogLevel.ERROR)
-                            skipped_count += 1
-                            completed_count += 1
-                    else:
-                        # Cancellation detected - skip processing this result
                         completed_count += 1
-            finally:
-                # Ensure executor is always properly shut down
-                if not executor_shutdown_called:
-                    # If not already shut down, wait for all tasks to complete
-                    self._executor.shutdown(wait=True)
-                self._executor = None  # Clear reference
+
+                if cancelled:
+                    break
+        finally:
+            # Ensure executor is always properly shut down
+            if self._executor and not executor_shutdown_called:
+                # If not already shut down, wait for all tasks to complete
+                self._executor.shutdown(wait=True)
+            elif process_pool is not None:
+                # The process pool is shared, only drop what this file still has queued
+                for remaining_future in future_to_batch:
+                    remaining_future.cancel()
+            self._executor = None  # Clear reference
+
+        if is_streaming:
+            feature_log.add(f"Processed {raw_feature_count} raw features from file", "Feature Processing", DatabaseLogLevel.INFO)
+            if geocoding_count > 0:
+                feature_log.add(f"Geocoded {geocoding_count} feature(s)", "Geocoding", DatabaseLogLevel.INFO)
+
+        if self._location_tag_grid and self._location_tag_grid.points > 0:
+            feature_log.add(self._location_tag_grid.summary(), "Geocoding", DatabaseLogLevel.INFO)
+        if self._geocode_cache_stats and self._geocode_cache_stats.lookups > 0:
+            feature_log.add(self._geocode_cache_stats.summary(), "Geocoding", DatabaseLogLevel.INFO)
 
         # Log summary
         if self._is_cancelled():
@@ -486,6 +698,9 @@ class BaseProcessor(ABC):
         Returns:
             File content as string
         """
+        if self.validated_upload is not None and self.validated_upload.file_type != FileType.KMZ:
+            # Already decoded during validation
+            return self.validated_upload.content
         if isinstance(self.file_data, str):
             return self.file_data
         else:
@@ -505,6 +720,11 @@ class BaseProcessor(ABC):
         Returns:
             GeoJSON data as dictionary
         """
+        from django.conf import settings
+        if getattr(settings, 'TOGEOJSON_POOL_ENABLED', True):
+            # Persistent workers take the content directly, no temp file needed
+            return self._convert_via_worker_pool(content, suffix.lstrip('.'), file_type_name)
+
         # Create temporary file with appropriate mode
         if is_text:
             with tempfile.NamedTemporaryFile(mode='w', suffix=suffix, delete=False, encoding='utf-8') as temp_file:
@@ -523,6 +743,35 @@ class BaseProcessor(ABC):
             # Clean up temporary file
             os.unlink(temp_file_path)
 
+    def _convert_via_worker_pool(self, content: Union[str, bytes], file_type: str, file_type_name: str) -> Dict[str, Any]:
+        """
+        Convert file content to GeoJSON using the persistent togeojson worker pool.
+        
+        Args:
+            content: File content as string or bytes
+            file_type: Converter file type ('kml', 'kmz' or 'gpx')
+            file_type_name: Name of file type for logging (e.g., "KML", "KMZ", "GPX")
+            
+        Returns:
+            GeoJSON data as dictionary
+        """
+        timeout = self._calculate_timeout()
+        try:
+            self.import_log.add(f"Converting {file_type_name} file to GeoJSON format", "File Conversion", DatabaseLogLevel.INFO)
+            return get_togeojson_pool().convert(file_type, content, timeout)
+
+        except TogeojsonWorkerTimeout:
+            self.import_log.add(f"{file_type_name} conversion timed out after {timeout}s", "File Conversion", DatabaseLogLevel.ERROR)
+            raise Exception(f"{file_type_name} file conversion timed out")
+        except TogeojsonConversionError as e:
+            self.import_log.add(f"{file_type_name} conversion failed - file may be corrupted", "File Conversion", DatabaseLogLevel.ERROR)
+            logger.error(f"{file_type_name} conversion error: {str(e)}")
+            raise Exception(f"{file_type_name} file conversion failed")
+        except Exception as e:
+            self.import_log.add(f"{file_type_name} conversion failed: {type(e).__name__}", "File Conversion", DatabaseLogLevel.ERROR)
+            logger.error(f"{file_type_name} conversion error: {str(e)}")
+            raise
+
     def _convert_via_nodejs(self, file_path: str, file_type_name: str) -> Dict[str, Any]:
         """
         Convert file to GeoJSON using JavaScript togeojson library.
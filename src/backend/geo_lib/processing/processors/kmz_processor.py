@@ -3,10 +3,13 @@ KMZ file processor for the unified import pipeline.
 Inherits from KMLProcessor since KMZ is just a zipped KML file.
 """
 
+import io
+import zipfile
 from typing import Dict, Any
 
 from geo_lib.processing.icon_manager import process_geojson_icons
-from .kml_processor import KMLProcessor
+from geo_lib.security.file_validation import main_kml_filename, validate_kml_content
+from .kml_processor import KMLProcessor, _remove_namespaces
 
 logger = __import__('logging').getLogger(__name__)
 
@@ -29,8 +32,13 @@ class KMZProcessor(KMLProcessor):
         # Ensure file_data is bytes for KMZ
         kmz_data = self.file_data if isinstance(self.file_data, bytes) else self.file_data.encode('utf-8')
 
-        # Convert using shared temp file helper (binary mode for KMZ)
-        geojson_data = self._convert_to_geojson(kmz_data, '.kmz', 'KMZ', is_text=False)
+        if self.validated_upload is not None:
+            # Usually the KML extracted during validation, namespaces are stripped as for KML uploads
+            content = _remove_namespaces(self._first_kml_content(kmz_data))
+            geojson_data = self._convert_to_geojson(content, '.kml', 'KMZ', is_text=True)
+        else:
+            # Convert using shared temp file helper (binary mode for KMZ)
+            geojson_data = self._convert_to_geojson(kmz_data, '.kmz', 'KMZ', is_text=False)
 
         # Process icons in GeoJSON
         geojson_data = process_geojson_icons(
@@ -40,3 +48,17 @@ class KMZProcessor(KMLProcessor):
         )
 
         return geojson_data
+
+    def _first_kml_content(self, kmz_data: bytes) -> str:
+        """
+        Get the KML converted from the archive: the first .kml entry, like the togeojson converter
+        reads it. Validation prefers doc.kml, so its extracted copy is only used when that's the same file.
+        """
+        with zipfile.ZipFile(io.BytesIO(kmz_data), 'r') as kmz:
+            kml_files = [name for name in kmz.namelist() if name.lower().endswith('.kml')]
+            if main_kml_filename(kml_files) == kml_files[0]:
+                return self.validated_upload.content
+            content = kmz.read(kml_files[0]).decode('utf-8')
+        # Only the doc.kml was checked during validation
+        validate_kml_content(content)
+        return content
@@ -0,0 +1,111 @@
+"""
+Streaming processors for the unified import pipeline.
+Parse KML/KMZ/GPX with lxml iterparse instead of togeojson so features are produced
+one at a time and feature processing starts before the whole file has been parsed.
+"""
+
+import io
+import zipfile
+from typing import Dict, Any, Iterator, IO
+
+from lxml import etree
+
+from geo_lib.processing.icon_manager import process_feature_icons
+from geo_lib.processing.logging import DatabaseLogLevel
+from geo_lib.processing.streaming_parser import iter_kml_features, iter_gpx_features
+from geo_lib.logging.console import get_import_logger
+from .gpx_processor import GPXProcessor
+from .kml_processor import KMLProcessor
+from .kmz_processor import KMZProcessor
+
+logger = get_import_logger()
+
+
+class StreamingProcessorMixin:
+    """
+    Shared streaming conversion logic.
+    convert_to_geojson() returns a FeatureCollection whose 'features' is a generator,
+    which process_features() consumes incrementally.
+    """
+
+    file_type_name = ''
+
+    def convert_to_geojson(self) -> Dict[str, Any]:
+        """
+        Start streaming the file as GeoJSON features.
+
+        Returns:
+            GeoJSON FeatureCollection with a lazily evaluated features iterator
+        """
+        self.import_log.add(f"Streaming {self.file_type_name} file to GeoJSON features", "File Conversion", DatabaseLogLevel.INFO)
+        return {
+            'type': 'FeatureCollection',
+            'features': self._iter_converted_features()
+        }
+
+    def _iter_converted_features(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over parsed features, turning parser errors into the usual conversion failure."""
+        try:
+            for feature in self._iter_features():
+                yield feature
+        except (etree.XMLSyntaxError, zipfile.BadZipFile) as e:
+            self.import_log.add(f"{self.file_type_name} conversion failed - file may be corrupted", "File Conversion", DatabaseLogLevel.ERROR)
+            logger.error(f"{self.file_type_name} streaming conversion error: {str(e)}")
+            raise Exception(f"{self.file_type_name} file conversion failed")
+
+    def _iter_features(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _open_xml(self) -> IO[bytes]:
+        """Wrap the raw file data in a binary stream for the parser."""
+        data = self.file_data if isinstance(self.file_data, bytes) else self.file_data.encode('utf-8')
+        return io.BytesIO(data)
+
+
+class StreamingKMLProcessor(StreamingProcessorMixin, KMLProcessor):
+    """
+    Streaming processor for KML files.
+    Namespaces are handled by the parser, so no namespace stripping copy is made.
+    """
+
+    file_type_name = 'KML'
+
+    def _iter_features(self) -> Iterator[Dict[str, Any]]:
+        href_mapping: Dict[str, str] = {}
+        for feature in iter_kml_features(self._open_xml()):
+            yield process_feature_icons(feature, 'kml', None, href_mapping)
+
+
+class StreamingKMZProcessor(StreamingProcessorMixin, KMZProcessor):
+    """
+    Streaming processor for KMZ files.
+    The main KML is decompressed and parsed incrementally straight out of the archive.
+    """
+
+    file_type_name = 'KMZ'
+
+    def _iter_features(self) -> Iterator[Dict[str, Any]]:
+        kmz_data = self.file_data if isinstance(self.file_data, bytes) else self.file_data.encode('utf-8')
+        href_mapping: Dict[str, str] = {}
+
+        with zipfile.ZipFile(io.BytesIO(kmz_data)) as kmz:
+            kml_files = [name for name in kmz.namelist() if name.lower().endswith('.kml')]
+            if not kml_files:
+                raise zipfile.BadZipFile('No KML file found in KMZ archive')
+            # Use doc.kml if available, otherwise first .kml file (same as the validator)
+            kml_file = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
+
+            with kmz.open(kml_file) as kml_stream:
+                for feature in iter_kml_features(kml_stream):
+                    yield process_feature_icons(feature, 'kmz', kmz_data, href_mapping)
+
+
+class StreamingGPXProcessor(StreamingProcessorMixin, GPXProcessor):
+    """
+    Streaming processor for GPX files.
+    """
+
+    file_type_name = 'GPX'
+
+    def _iter_features(self) -> Iterator[Dict[str, Any]]:
+        yield from iter_gpx_features(self._open_xml())
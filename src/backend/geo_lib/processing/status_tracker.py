@@ -1,6 +1,7 @@
 """
-In-memory status tracker for asynchronous file processing.
-Tracks multiple concurrent file uploads and their processing status.
+Status tracker for asynchronous file processing.
+Tracks multiple concurrent file uploads and their processing status, either in memory
+(jobs run as threads in the web process) or in the database (jobs run by `manage.py run_workers`).
 """
 
 import threading
@@ -29,8 +30,11 @@ class JobType(Enum):
     """Type of job being processed."""
     UPLOAD = "upload"  # File upload job
     DELETE = "delete"  # Item deletion job
+    IMPORT = "import"  # Import of a queue item to the feature store
     BULK_IMPORT = "bulk_import"  # Bulk import job
     BULK_DELETE = "bulk_delete"  # Bulk delete job
+    GEOCODE = "geocode"  # Background geocoding job
+    BULK_RETAG = "bulk_retag"  # Bulk tag regeneration job
 
 
 @dataclass
@@ -200,5 +204,172 @@ class ProcessingStatusTracker:
             }
 
 
+TERMINAL_STATUSES = [ProcessingStatus.COMPLETED.value, ProcessingStatus.FAILED.value, ProcessingStatus.CANCELLED.value]
+
+
+class DatabaseStatusTracker(ProcessingStatusTracker):
+    """
+    Status tracker backed by the BackgroundJob table.
+    Shares job state between the web processes and the job worker processes, and survives restarts.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._jobs = None  # State lives in the database
+
+    @staticmethod
+    def _model():
+        # Imported lazily since this module is loaded before the apps are ready
+        from api.models import BackgroundJob
+        return BackgroundJob
+
+    @staticmethod
+    def _to_timestamp(value) -> Optional[float]:
+        return value.timestamp() if value else None
+
+    def _to_job(self, record) -> ProcessingJob:
+        return ProcessingJob(
+            job_id=record.job_id,
+            filename=record.filename,
+            user_id=record.user_id,
+            status=ProcessingStatus(record.status),
+            job_type=JobType(record.job_type),
+            created_at=self._to_timestamp(record.created_at),
+            started_at=self._to_timestamp(record.started_at),
+            completed_at=self._to_timestamp(record.completed_at),
+            progress=record.progress,
+            message=record.message,
+            error_message=record.error_message,
+            result_data=record.result_data,
+            import_queue_id=record.import_queue_id
+        )
+
+    def create_job(self, filename: str, user_id: int, job_type: JobType = JobType.UPLOAD) -> str:
+        """Create a new processing job and return its ID."""
+        job_id = str(uuid.uuid4())
+        self._model().objects.create(
+            job_id=job_id,
+            job_type=job_type.value,
+            user_id=user_id,
+            filename=filename,
+            status=ProcessingStatus.UPLOADED.value
+        )
+        self._cleanup_old_jobs()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[ProcessingJob]:
+        """Get a processing job by ID."""
+        record = self._model().objects.defer('payload', 'job_kwargs').filter(job_id=job_id).first()
+        return self._to_job(record) if record else None
+
+    def update_job_status(self, job_id: str, status: ProcessingStatus,
+                          message: str = "", progress: float = None,
+                          error_message: str = None) -> bool:
+        """Update a job's status and return True if successful. A cancelled job stays cancelled."""
+        from django.db.models.functions import Coalesce, Now
+
+        updates = {'status': status.value, 'message': message}
+        if progress is not None:
+            updates['progress'] = progress
+        if error_message:
+            updates['error_message'] = error_message
+
+        # Update timestamps
+        if status == ProcessingStatus.PROCESSING:
+            updates['started_at'] = Coalesce('started_at', Now())
+        elif status.value in TERMINAL_STATUSES:
+            updates['completed_at'] = Now()
+
+        jobs = self._model().objects.filter(job_id=job_id)
+        if status != ProcessingStatus.CANCELLED:
+            jobs = jobs.exclude(status=ProcessingStatus.CANCELLED.value)
+        return jobs.update(**updates) > 0
+
+    def set_job_result(self, job_id: str, result_data: Dict[str, Any],
+                       import_queue_id: int = None) -> bool:
+        """Set the result data for a completed job."""
+        return self._model().objects.filter(job_id=job_id).update(
+            result_data=result_data,
+            import_queue_id=import_queue_id
+        ) > 0
+
+    def get_user_jobs(self, user_id: int) -> list[ProcessingJob]:
+        """Get all jobs for a specific user."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        cutoff = timezone.now() - timedelta(seconds=self._max_job_age)
+        records = self._model().objects.defer('payload', 'job_kwargs').filter(user_id=user_id, created_at__gte=cutoff).order_by('created_at')
+        return [self._to_job(record) for record in records]
+
+    def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job status as a dictionary for API responses."""
+        job = self.get_job(job_id)
+        if not job:
+            return None
+
+        return {
+            'job_id': job.job_id,
+            'filename': job.filename,
+            'job_type': job.job_type.value,
+            'status': job.status.value,
+            'progress': job.progress,
+            'message': job.message,
+            'error_message': job.error_message,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'completed_at': job.completed_at,
+            'import_queue_id': job.import_queue_id
+        }
+
+    def cancel_job(self, job_id: str) -> bool:
+        """Cancel a job if it's not already completed."""
+        from django.db.models.functions import Now
+
+        return self._model().objects.filter(job_id=job_id).exclude(status__in=TERMINAL_STATUSES).update(
+            status=ProcessingStatus.CANCELLED.value,
+            completed_at=Now(),
+            message="Job cancelled by user"
+        ) > 0
+
+    def _cleanup_old_jobs(self):
+        """Remove old finished jobs to keep the table small."""
+        current_time = time.time()
+        if current_time - self._last_cleanup < self._cleanup_interval:
+            return
+
+        from datetime import timedelta
+        from django.db.models import Q
+        from django.utils import timezone
+
+        self._last_cleanup = current_time
+        cutoff = timezone.now() - timedelta(seconds=self._max_job_age)
+        finished = Q(status__in=TERMINAL_STATUSES, queue_state='new') | Q(queue_state='done')
+        self._model().objects.filter(finished, created_at__lt=cutoff).delete()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about current jobs."""
+        from django.db.models import Count, Min, Max
+
+        records = self._model().objects.all()
+        status_counts = {status.value: 0 for status in ProcessingStatus}
+        for row in records.values('status').annotate(count=Count('job_id')):
+            status_counts[row['status']] = row['count']
+        bounds = records.aggregate(oldest=Min('created_at'), newest=Max('created_at'))
+
+        return {
+            'total_jobs': sum(status_counts.values()),
+            'status_counts': status_counts,
+            'oldest_job': self._to_timestamp(bounds['oldest']),
+            'newest_job': self._to_timestamp(bounds['newest'])
+        }
+
+
+def _create_status_tracker() -> ProcessingStatusTracker:
+    if getattr(settings, 'JOB_QUEUE_BACKEND', 'database') == 'database':
+        return DatabaseStatusTracker()
+    return ProcessingStatusTracker()
+
+
 # Global instance for the application
-status_tracker = ProcessingStatusTracker()
+status_tracker = _create_status_tracker()
@@ -0,0 +1,423 @@
+"""
+Streaming KML/GPX to GeoJSON parser built on lxml.etree.iterparse.
+
+Unlike the togeojson converter this never builds a DOM of the whole document. Features are
+yielded one Placemark, trk, rte or wpt at a time and the parsed elements are freed as soon as
+they've been converted, so peak memory stays roughly constant regardless of file size.
+The output mirrors togeojson's (property names, styles, coordinateProperties.times) so the
+rest of the import pipeline doesn't care which engine produced a feature.
+"""
+
+from typing import Dict, Any, Iterator, List, Optional, IO
+
+from lxml import etree
+
+KML_GEOMETRY_TAGS = {'Point', 'LineString', 'Polygon', 'MultiGeometry', 'Track', 'MultiTrack'}
+
+
+def _local(tag) -> str:
+    """Get the tag name without its namespace. Comments and processing instructions return ''."""
+    if not isinstance(tag, str):
+        return ''
+    return tag.rpartition('}')[2]
+
+
+def _child(elem, name: str):
+    """Get the first direct child with the given local name."""
+    for child in elem:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _children(elem, name: str) -> List:
+    """Get all direct children with the given local name."""
+    return [child for child in elem if _local(child.tag) == name]
+
+
+def _text(elem, name: str) -> Optional[str]:
+    """Get the stripped text of the first direct child with the given local name."""
+    child = _child(elem, name)
+    if child is None:
+        return None
+    text = ''.join(child.itertext()).strip()
+    return text if text else None
+
+
+def _iterparse(source: IO[bytes]):
+    """iterparse with entity resolution and network access disabled."""
+    return etree.iterparse(
+        source,
+        events=('end',),
+        resolve_entities=False,
+        no_network=True,
+        load_dtd=False,
+        huge_tree=True,
+        remove_comments=True,
+        remove_pis=True
+    )
+
+
+def _free(elem, same_tag_only: bool = False):
+    """
+    Release a processed element and the already processed siblings before it.
+    With same_tag_only, only preceding siblings with the same tag are removed so the
+    parent's own children (name, desc, ...) survive until the parent is converted.
+    """
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is None:
+        return
+    previous = elem.getprevious()
+    while previous is not None and (not same_tag_only or previous.tag == elem.tag):
+        parent.remove(previous)
+        previous = elem.getprevious()
+
+
+# ---------------------------------------------------------------------------
+# KML
+# ---------------------------------------------------------------------------
+
+def _parse_kml_coordinates(text: Optional[str]) -> List[List[float]]:
+    """Parse a KML coordinates string ("lon,lat[,alt] lon,lat[,alt] ...")."""
+    coordinates = []
+    if not text:
+        return coordinates
+    for item in text.split():
+        try:
+            values = [float(value) for value in item.split(',') if value != '']
+        except ValueError:
+            continue
+        if len(values) >= 2:
+            coordinates.append(values[:3])
+    return coordinates
+
+
+def _kml_color(value: str, prefix: str) -> Dict[str, Any]:
+    """Convert a KML aabbggrr color into a #rrggbb color property and an opacity property."""
+    properties = {}
+    color_prop = prefix if prefix in ('stroke', 'fill') else f'{prefix}-color'
+    value = value.strip().lstrip('#')
+    if len(value) in (3, 6):
+        properties[color_prop] = f'#{value}'
+    elif len(value) == 8:
+        try:
+            properties[f'{prefix}-opacity'] = int(value[0:2], 16) / 255
+        except ValueError:
+            return {}
+        properties[color_prop] = f'#{value[6:8]}{value[4:6]}{value[2:4]}'
+    return properties
+
+
+def _kml_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _extract_kml_style(style) -> Dict[str, Any]:
+    """Extract togeojson style properties from a KML Style element."""
+    properties = {}
+
+    icon_style = _child(style, 'IconStyle')
+    if icon_style is not None:
+        icon = _child(icon_style, 'Icon')
+        href = _text(icon, 'href') if icon is not None else None
+        if href:
+            properties['icon'] = href
+        color = _text(icon_style, 'color')
+        if color:
+            properties.update(_kml_color(color, 'icon'))
+        scale = _kml_number(_text(icon_style, 'scale'))
+        if scale is not None:
+            properties['icon-scale'] = scale
+        heading = _kml_number(_text(icon_style, 'heading'))
+        if heading is not None:
+            properties['icon-heading'] = heading
+
+    label_style = _child(style, 'LabelStyle')
+    if label_style is not None:
+        color = _text(label_style, 'color')
+        if color:
+            properties.update(_kml_color(color, 'label'))
+        scale = _kml_number(_text(label_style, 'scale'))
+        if scale is not None:
+            properties['label-scale'] = scale
+
+    line_style = _child(style, 'LineStyle')
+    if line_style is not None:
+        color = _text(line_style, 'color')
+        if color:
+            properties.update(_kml_color(color, 'stroke'))
+        width = _kml_number(_text(line_style, 'width'))
+        if width is not None:
+            properties['stroke-width'] = width
+
+    poly_style = _child(style, 'PolyStyle')
+    if poly_style is not None:
+        color = _text(poly_style, 'color')
+        if color:
+            properties.update(_kml_color(color, 'fill'))
+        if _text(poly_style, 'fill') == '0':
+            properties['fill-opacity'] = 0
+        if _text(poly_style, 'outline') == '0':
+            properties['stroke-opacity'] = 0
+
+    return properties
+
+
+def _kml_track(track) -> Optional[Dict[str, Any]]:
+    """Convert a gx:Track into a LineString with its timestamps."""
+    coordinates = []
+    for coord in _children(track, 'coord'):
+        try:
+            values = [float(value) for value in (coord.text or '').split()]
+        except ValueError:
+            continue
+        if len(values) >= 2:
+            coordinates.append(values[:3])
+    if not coordinates:
+        return None
+    times = [(when.text or '').strip() for when in _children(track, 'when')]
+    return {
+        'geometry': {'type': 'LineString', 'coordinates': coordinates},
+        'times': times if len(times) == len(coordinates) else None
+    }
+
+
+def _kml_geometries(elem, geometries: List[Dict[str, Any]], times: List[List[str]]):
+    """Collect the geometries (and track timestamps) of a KML geometry element."""
+    name = _local(elem.tag)
+    if name == 'Point':
+        coordinates = _parse_kml_coordinates(_text(elem, 'coordinates'))
+        if coordinates:
+            geometries.append({'type': 'Point', 'coordinates': coordinates[0]})
+    elif name == 'LineString':
+        coordinates = _parse_kml_coordinates(_text(elem, 'coordinates'))
+        if coordinates:
+            geometries.append({'type': 'LineString', 'coordinates': coordinates})
+    elif name == 'Polygon':
+        rings = []
+        for boundary_name in ('outerBoundaryIs', 'innerBoundaryIs'):
+            for boundary in _children(elem, boundary_name):
+                for ring in _children(boundary, 'LinearRing'):
+                    coordinates = _parse_kml_coordinates(_text(ring, 'coordinates'))
+                    if coordinates:
+                        rings.append(coordinates)
+        if rings:
+            geometries.append({'type': 'Polygon', 'coordinates': rings})
+    elif name == 'Track':
+        track = _kml_track(elem)
+        if track:
+            geometries.append(track['geometry'])
+            if track['times']:
+                times.append(track['times'])
+    elif name in ('MultiGeometry', 'MultiTrack'):
+        for child in elem:
+            if _local(child.tag) in KML_GEOMETRY_TAGS:
+                _kml_geometries(child, geometries, times)
+
+
+def _kml_placemark_to_feature(placemark, styles: Dict[str, Dict[str, Any]], style_maps: Dict[str, str]) -> Dict[str, Any]:
+    """Convert a Placemark element into a GeoJSON feature."""
+    properties: Dict[str, Any] = {}
+
+    for name in ('name', 'address', 'description', 'styleUrl'):
+        value = _text(placemark, name)
+        if value is not None:
+            properties[name] = value
+
+    visibility = _text(placemark, 'visibility')
+    if visibility is not None:
+        properties['visibility'] = visibility not in ('0', 'false')
+
+    timestamp = _child(placemark, 'TimeStamp')
+    if timestamp is not None:
+        when = _text(timestamp, 'when')
+        if when:
+            properties['timestamp'] = when
+    timespan = _child(placemark, 'TimeSpan')
+    if timespan is not None:
+        properties['timespan'] = {'begin': _text(timespan, 'begin'), 'end': _text(timespan, 'end')}
+
+    # Shared style first, then inline style on top of it
+    style_url = properties.get('styleUrl')
+    if style_url:
+        style_id = style_url.rpartition('#')[2]
+        style_id = style_maps.get(style_id, style_id)
+        properties.update(styles.get(style_id, {}))
+    inline_style = _child(placemark, 'Style')
+    if inline_style is not None:
+        properties.update(_extract_kml_style(inline_style))
+
+    extended_data = _child(placemark, 'ExtendedData')
+    if extended_data is not None:
+        for data in _children(extended_data, 'Data'):
+            if data.get('name'):
+                properties[data.get('name')] = _text(data, 'value')
+        for schema_data in _children(extended_data, 'SchemaData'):
+            for simple_data in _children(schema_data, 'SimpleData'):
+                if simple_data.get('name'):
+                    properties[simple_data.get('name')] = ''.join(simple_data.itertext()).strip()
+
+    geometries: List[Dict[str, Any]] = []
+    times: List[List[str]] = []
+    for child in placemark:
+        if _local(child.tag) in KML_GEOMETRY_TAGS:
+            _kml_geometries(child, geometries, times)
+
+    if times:
+        properties['coordinateProperties'] = {'times': times[0] if len(times) == 1 else times}
+
+    if not geometries:
+        geometry = None
+    elif len(geometries) == 1:
+        geometry = geometries[0]
+    else:
+        geometry = {'type': 'GeometryCollection', 'geometries': geometries}
+
+    feature = {'type': 'Feature', 'geometry': geometry, 'properties': properties}
+    if placemark.get('id'):
+        feature['id'] = placemark.get('id')
+    return feature
+
+
+def iter_kml_features(source: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream GeoJSON features from a KML document.
+
+    Shared styles are resolved as they're encountered, so a Placemark referencing a style that is
+    only defined later in the document won't pick it up (KML writers put styles first in practice).
+
+    Args:
+        source: Binary file-like object containing the KML document
+
+    Yields:
+        GeoJSON feature dictionaries, one per Placemark
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the document is malformed
+    """
+    styles: Dict[str, Dict[str, Any]] = {}
+    style_maps: Dict[str, str] = {}
+
+    for _, elem in _iterparse(source):
+        name = _local(elem.tag)
+
+        if name == 'Placemark':
+            yield _kml_placemark_to_feature(elem, styles, style_maps)
+            _free(elem)
+        elif name in ('Style', 'StyleMap'):
+            parent = elem.getparent()
+            if parent is not None and _local(parent.tag) == 'Placemark':
+                # Inline style, handled along with its Placemark
+                continue
+            style_id = elem.get('id')
+            if style_id:
+                if name == 'Style':
+                    styles[style_id] = _extract_kml_style(elem)
+                else:
+                    for pair in _children(elem, 'Pair'):
+                        if _text(pair, 'key') == 'normal':
+                            normal_url = _text(pair, 'styleUrl')
+                            if normal_url:
+                                style_maps[style_id] = normal_url.rpartition('#')[2]
+            _free(elem)
+
+
+# ---------------------------------------------------------------------------
+# GPX
+# ---------------------------------------------------------------------------
+
+GPX_PROPERTY_TAGS = ('name', 'cmt', 'desc', 'src', 'number', 'type', 'time', 'sym')
+
+
+def _gpx_point(elem) -> Optional[List[float]]:
+    """Get [lon, lat(, ele)] for a wpt/trkpt/rtept element."""
+    try:
+        coordinate = [float(elem.get('lon')), float(elem.get('lat'))]
+    except (TypeError, ValueError):
+        return None
+    ele = _kml_number(_text(elem, 'ele'))
+    if ele is not None:
+        coordinate.append(ele)
+    return coordinate
+
+
+def _gpx_properties(elem, gpx_type: str) -> Dict[str, Any]:
+    properties: Dict[str, Any] = {'_gpxType': gpx_type}
+    for name in GPX_PROPERTY_TAGS:
+        value = _text(elem, name)
+        if value is not None:
+            properties[name] = value
+    link = _child(elem, 'link')
+    if link is not None and link.get('href'):
+        properties['link'] = link.get('href')
+    return properties
+
+
+def iter_gpx_features(source: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream GeoJSON features from a GPX document.
+    Track points are consumed and freed as they're parsed, so even a single huge track
+    only keeps its coordinate list in memory.
+
+    Args:
+        source: Binary file-like object containing the GPX document
+
+    Yields:
+        GeoJSON feature dictionaries, one per trk, rte or wpt
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the document is malformed
+    """
+    points: List[List[float]] = []
+    point_times: List[Optional[str]] = []
+    segments: List[List[List[float]]] = []
+    segment_times: List[List[Optional[str]]] = []
+
+    for _, elem in _iterparse(source):
+        name = _local(elem.tag)
+
+        if name in ('trkpt', 'rtept'):
+            coordinate = _gpx_point(elem)
+            if coordinate is not None:
+                points.append(coordinate)
+                point_times.append(_text(elem, 'time'))
+            _free(elem, same_tag_only=True)
+
+        elif name == 'trkseg':
+            if points:
+                segments.append(points)
+                segment_times.append(point_times)
+            points, point_times = [], []
+            _free(elem, same_tag_only=True)
+
+        elif name in ('trk', 'rte'):
+            if name == 'rte' and points:
+                segments.append(points)
+                segment_times.append(point_times)
+            properties = _gpx_properties(elem, name)
+
+            geometry = None
+            if len(segments) == 1:
+                geometry = {'type': 'LineString', 'coordinates': segments[0]}
+                times = segment_times[0]
+            elif segments:
+                geometry = {'type': 'MultiLineString', 'coordinates': segments}
+                times = segment_times
+            if geometry and any(time for seg_times in segment_times for time in seg_times):
+                properties['coordinateProperties'] = {'times': times}
+
+            yield {'type': 'Feature', 'geometry': geometry, 'properties': properties}
+            points, point_times, segments, segment_times = [], [], [], []
+            _free(elem)
+
+        elif name == 'wpt':
+            coordinate = _gpx_point(elem)
+            geometry = {'type': 'Point', 'coordinates': coordinate} if coordinate else None
+            yield {'type': 'Feature', 'geometry': geometry, 'properties': _gpx_properties(elem, 'wpt')}
+            _free(elem)
@@ -1,16 +1,78 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from django.conf import settings
 
 from geo_lib.types.feature import GeoFeatureSupported
+from geo_lib.geolocation.geocode_cache import GeocodeCacheStats, cell_key, cell_center
 from geo_lib.geolocation.reverse_geocode import get_reverse_geocoding_service
 from geo_lib.processing.logging import DatabaseLogLevel
 from geo_lib.logging.console import get_import_logger
 
 logger = get_import_logger()
 
+# Prefixes of the tags added by reverse geocoding, see ReverseGeocodingService.get_location_tags()
+LOCATION_TAG_PREFIXES = ('city', 'city-proximity', 'state', 'country', 'national-forest', 'national-park',
+                         'national-monument', 'state-park', 'wilderness', 'lake')
+
+
+class LocationTagGrid:
+    """
+    Location tags of the grid cells geocoded during one import.
+    Representative points are snapped to the center of their cell (GEOCODING_GRID_PRECISION
+    decimal places), each cell is geocoded once and its tags are shared by every feature
+    with a point in it. Safe to use from the processing threads.
+    """
+
+    def __init__(self, precision: Optional[int] = None):
+        self.precision = precision if precision is not None else getattr(settings, 'GEOCODING_GRID_PRECISION', 3)
+        self.points = 0
+        self._tags: Dict[str, List[str]] = {}
+        self._cell_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def snap(self, points: Iterable[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """Get the centers of the distinct cells containing the points."""
+        centers = {}
+        for latitude, longitude in points:
+            cell = cell_key(latitude, longitude, self.precision)
+            if cell not in centers:
+                centers[cell] = cell_center(latitude, longitude, self.precision)
+        return list(centers.values())
+
+    def get_tags(self, latitude: float, longitude: float, lookup: Callable[[float, float], List[str]]) -> List[str]:
+        """
+        Get the location tags of the point's cell, calling lookup(latitude, longitude) with the
+        cell center the first time the cell is seen. Threads asking for the same cell wait for that lookup.
+        """
+        cell = cell_key(latitude, longitude, self.precision)
+        with self._lock:
+            self.points += 1
+            tags = self._tags.get(cell)
+            if tags is not None:
+                return tags
+            cell_lock = self._cell_locks.setdefault(cell, threading.Lock())
+
+        with cell_lock:
+            with self._lock:
+                tags = self._tags.get(cell)
+            if tags is None:
+                tags = lookup(*cell_center(latitude, longitude, self.precision))
+                with self._lock:
+                    self._tags[cell] = tags
+                    self._cell_locks.pop(cell, None)
+        return tags
+
+    @property
+    def cells(self) -> int:
+        return len(self._tags)
+
+    def summary(self) -> str:
+        return f"Geocoded {self.points} point(s) in {self.cells} grid cell(s)"
+
 
 def get_representative_points(feature: GeoFeatureSupported) -> List[Tuple[float, float]]:
     """
@@ -22,44 +84,174 @@ def get_representative_points(feature: GeoFeatureSupported) -> List[Tuple[float,
     Returns:
         List of (latitude, longitude) tuples
     """
-    points = []
     geometry = feature.geometry
-    
-    if geometry.type.value.lower() == 'point':
-        coords = geometry.coordinates
+    return get_geometry_representative_points({'type': geometry.type.value, 'coordinates': geometry.coordinates})
+
+
+def get_geometry_representative_points(geometry: Dict[str, Any]) -> List[Tuple[float, float]]:
+    """
+    Same as get_representative_points(), for a GeoJSON geometry dict.
+    Lets the points of raw features be collected before feature models are built.
+    """
+    points = []
+    geometry_type = (geometry.get('type') or '').lower()
+    coordinates = geometry.get('coordinates')
+
+    if geometry_type == 'point':
+        coords = coordinates
         # GeoJSON coordinates are [longitude, latitude] or [longitude, latitude, elevation]
         points.append((coords[1], coords[0]))  # (lat, lon)
-    
-    elif geometry.type.value.lower() in ['linestring', 'multilinestring']:
+
+    elif geometry_type in ['linestring', 'multilinestring']:
         # For linestrings, use start, middle, and end points
-        if geometry.type.value.lower() == 'linestring':
-            coords_list = geometry.coordinates
+        if geometry_type == 'linestring':
+            coords_list = coordinates
         else:  # multilinestring
             # Use the first linestring
-            coords_list = geometry.coordinates[0] if geometry.coordinates else []
-        
+            coords_list = coordinates[0] if coordinates else []
+
         if coords_list:
             # Start point
             start_coords = coords_list[0]
             points.append((start_coords[1], start_coords[0]))  # (lat, lon)
-            
+
             # Middle point
             if len(coords_list) > 2:
                 mid_idx = len(coords_list) // 2
                 mid_coords = coords_list[mid_idx]
                 points.append((mid_coords[1], mid_coords[0]))  # (lat, lon)
-            
+
             # End point
             if len(coords_list) > 1:
                 end_coords = coords_list[-1]
                 points.append((end_coords[1], end_coords[0]))  # (lat, lon)
-    
+
     # Polygons are not geocoded (as per user's requirement)
-    
     return points
 
 
-def generate_auto_tags(feature: GeoFeatureSupported, import_log=None, filename: Optional[str] = None) -> List[str]:
+def is_location_tag(tag: str) -> bool:
+    """Check if a tag was added by reverse geocoding."""
+    return isinstance(tag, str) and tag.split(':', 1)[0] in LOCATION_TAG_PREFIXES
+
+
+def has_location_tags(feature: Dict[str, Any]) -> bool:
+    """Check if a GeoJSON feature dict already has reverse geocoding tags."""
+    tags = (feature.get('properties') or {}).get('tags') or []
+    return isinstance(tags, list) and any(is_location_tag(tag) for tag in tags)
+
+
+def generate_location_tags(points: List[Tuple[float, float]], import_log=None,
+                           geocode_cache_stats: Optional[GeocodeCacheStats] = None,
+                           location_tag_grid: Optional[LocationTagGrid] = None) -> List[str]:
+    """
+    Reverse geocode the representative points of a feature into location tags.
+
+    Args:
+        points: (latitude, longitude) tuples, see get_representative_points()
+        import_log: Optional ImportLog for database logging
+        geocode_cache_stats: Optional counters for geocoding cache hits/misses
+        location_tag_grid: Optional grid shared by the features of an import, points are
+            geocoded once per grid cell instead of individually
+
+    Returns:
+        Sorted list of location tags
+    """
+    if not getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+        return []
+    try:
+        if location_tag_grid:
+            points = location_tag_grid.snap(points)
+        if not points:
+            return []
+        geocoding_service = get_reverse_geocoding_service()
+        all_location_tags = set()
+
+        def lookup(lat: float, lon: float) -> List[str]:
+            return geocoding_service.get_location_tags(lat, lon, import_log, cache_stats=geocode_cache_stats)
+
+        # Look up the start, middle and end of a line with one request
+        if len(points) > 1:
+            geocoding_service.prefetch_location_data(points, geocode_cache_stats, import_log)
+
+        for lat, lon in points:
+            try:
+                if location_tag_grid:
+                    location_tags = location_tag_grid.get_tags(lat, lon, lookup)
+                else:
+                    location_tags = lookup(lat, lon)
+                all_location_tags.update(location_tags)
+            except Exception as geocode_point_error:
+                error_msg = f"Geocoding failed at coordinates ({lat}, {lon}): {str(geocode_point_error)}"
+                logger.warning(error_msg)
+                if import_log:
+                    import_log.add(
+                        error_msg,
+                        "Geocoding",
+                        DatabaseLogLevel.WARNING
+                    )
+
+        if import_log:
+            tag_count = len(all_location_tags)
+            if tag_count > 0:
+                import_log.add(
+                    f"Added {tag_count} geocoding tag(s) to feature",
+                    "Geocoding",
+                    DatabaseLogLevel.INFO
+                )
+        return sorted(all_location_tags)
+    except Exception as e:
+        logger.warning(f"Failed to geocode feature for tagging: {e}")
+        if import_log:
+            import_log.add(
+                f"Geocoding failed: {str(e)}",
+                "Geocoding",
+                DatabaseLogLevel.WARNING
+            )
+        return []
+
+
+def generate_location_tags_for_features(features: List[Dict[str, Any]],
+                                        geocode_cache_stats: Optional[GeocodeCacheStats] = None,
+                                        location_tag_grid: Optional[LocationTagGrid] = None) -> List[List[str]]:
+    """
+    Get the location tags of many GeoJSON feature dicts.
+    The points of all features are prefetched at once, then the features are tagged in parallel.
+
+    Returns:
+        One sorted list of location tags per feature
+    """
+    if location_tag_grid is None:
+        location_tag_grid = LocationTagGrid()
+
+    points_per_feature = []
+    for feature in features:
+        try:
+            points_per_feature.append(get_geometry_representative_points(feature.get('geometry') or {}))
+        except Exception:
+            points_per_feature.append([])
+
+    all_points = location_tag_grid.snap(point for points in points_per_feature for point in points)
+    if all_points and getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
+        try:
+            get_reverse_geocoding_service().prefetch_location_data(all_points, geocode_cache_stats)
+        except Exception as e:
+            logger.warning(f"Geocoding prefetch failed: {e}")
+
+    def location_tags(points):
+        if not points:
+            return []
+        return generate_location_tags(points, geocode_cache_stats=geocode_cache_stats, location_tag_grid=location_tag_grid)
+
+    num_threads = getattr(settings, 'IMPORT_PROCESSING_THREADS', 4)
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        return list(executor.map(location_tags, points_per_feature))
+
+
+def generate_auto_tags(feature: GeoFeatureSupported, import_log=None, filename: Optional[str] = None,
+                       geocode_cache_stats: Optional[GeocodeCacheStats] = None,
+                       location_tag_grid: Optional[LocationTagGrid] = None,
+                       geocode: bool = True) -> List[str]:
     """
     Generate automatic tags for a feature including geocoding tags.
     
@@ -67,6 +259,10 @@ def generate_auto_tags(feature: GeoFeatureSupported, import_log=None, filename:
         feature: The feature to generate tags for
         import_log: Optional ImportLog for database logging
         filename: Optional original filename to add as source-file tag
+        geocode_cache_stats: Optional counters for geocoding cache hits/misses
+        location_tag_grid: Optional grid shared by the features of an import, points are
+            geocoded once per grid cell instead of individually
+        geocode: If False, only the cheap tags are generated (location tags are added later by a GeocodeJob)
         
     Returns:
         List of tag strings
@@ -87,46 +283,8 @@ def generate_auto_tags(feature: GeoFeatureSupported, import_log=None, filename:
     
     # Add geocoding tags for points and lines only
     geometry_type = feature.geometry.type.value.lower()
-    if geometry_type in ['point', 'multipoint', 'linestring', 'multilinestring']:
-        # Check if geocoding is enabled before attempting to geocode
-        if getattr(settings, 'REVERSE_GEOCODING_ENABLED', True):
-            try:
-                points = get_representative_points(feature)
-                if points:
-                    geocoding_service = get_reverse_geocoding_service()
-                    all_location_tags = set()
-                    
-                    for lat, lon in points:
-                        try:
-                            location_tags = geocoding_service.get_location_tags(lat, lon, import_log)
-                            all_location_tags.update(location_tags)
-                        except Exception as geocode_point_error:
-                            error_msg = f"Geocoding failed at coordinates ({lat}, {lon}): {str(geocode_point_error)}"
-                            logger.warning(error_msg)
-                            if import_log:
-                                import_log.add(
-                                    error_msg,
-                                    "Geocoding",
-                                    DatabaseLogLevel.WARNING
-                                )
-                    
-                    tags.extend(sorted(all_location_tags))
-                    
-                    if import_log:
-                        tag_count = len(all_location_tags)
-                        if tag_count > 0:
-                            import_log.add(
-                                f"Added {tag_count} geocoding tag(s) to feature",
-                                "Geocoding",
-                                DatabaseLogLevel.INFO
-                            )
-            except Exception as e:
-                logger.warning(f"Failed to geocode feature for tagging: {e}")
-                if import_log:
-                    import_log.add(
-                        f"Geocoding failed: {str(e)}",
-                        "Geocoding",
-                        DatabaseLogLevel.WARNING
-                    )
+    if geocode and geometry_type in ['point', 'multipoint', 'linestring', 'multilinestring']:
+        tags.extend(generate_location_tags(get_representative_points(feature), import_log,
+                                           geocode_cache_stats, location_tag_grid))
     
     return [str(x) for x in tags]
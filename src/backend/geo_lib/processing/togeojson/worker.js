@@ -0,0 +1,88 @@
+#!/usr/bin/env node
+
+/**
+ * Long-lived KML/KMZ/GPX to GeoJSON conversion worker.
+ * Used by the backend worker pool (geo_lib/processing/togeojson_pool.py) so Node startup
+ * and module loading only happen once per worker instead of once per upload.
+ *
+ * Protocol (stdin/stdout), one request at a time:
+ *   Each frame is a 4-byte big-endian length followed by that many bytes of UTF-8 JSON.
+ *   Request:  {"id": 1, "type": "kml" | "kmz" | "gpx" | "ping", "content": "..."}
+ *             KMZ content is base64 encoded.
+ *   Response: {"id": 1, "ok": true, "geojson": {...}, "rss": 12345678}
+ *             {"id": 1, "ok": false, "error": "...", "rss": 12345678}
+ *   rss is the worker's resident memory in bytes, so the pool can recycle bloated workers.
+ */
+
+const { convertKmlContent, convertKmzContent, convertGpxContent } = require('./index');
+
+// stdout is reserved for frames, send any stray logging to stderr
+console.log = console.error;
+console.info = console.error;
+console.warn = console.error;
+
+/**
+ * Write a response frame to stdout
+ * @param {Object} response - Response object
+ */
+function writeFrame(response) {
+    response.rss = process.memoryUsage().rss;
+    const payload = Buffer.from(JSON.stringify(response), 'utf8');
+    const header = Buffer.alloc(4);
+    header.writeUInt32BE(payload.length, 0);
+    process.stdout.write(Buffer.concat([header, payload]));
+}
+
+/**
+ * Handle a single request
+ * @param {Object} request - Parsed request object
+ * @returns {Object} Response object
+ */
+function handleRequest(request) {
+    try {
+        switch (request.type) {
+            case 'ping':
+                return { id: request.id, ok: true };
+            case 'kml':
+                return { id: request.id, ok: true, geojson: convertKmlContent(request.content) };
+            case 'gpx':
+                return { id: request.id, ok: true, geojson: convertGpxContent(request.content) };
+            case 'kmz':
+                return { id: request.id, ok: true, geojson: convertKmzContent(Buffer.from(request.content, 'base64')) };
+            default:
+                return { id: request.id, ok: false, error: `Unknown request type: ${request.type}` };
+        }
+    } catch (error) {
+        return { id: request.id, ok: false, error: error.message };
+    }
+}
+
+let buffer = Buffer.alloc(0);
+
+process.stdin.on('data', (chunk) => {
+    buffer = Buffer.concat([buffer, chunk]);
+
+    // Process every complete frame in the buffer
+    while (buffer.length >= 4) {
+        const length = buffer.readUInt32BE(0);
+        if (buffer.length < 4 + length) {
+            break;
+        }
+        const payload = buffer.subarray(4, 4 + length);
+        buffer = buffer.subarray(4 + length);
+
+        let request;
+        try {
+            request = JSON.parse(payload.toString('utf8'));
+        } catch (error) {
+            writeFrame({ id: null, ok: false, error: `Invalid request: ${error.message}` });
+            continue;
+        }
+        writeFrame(handleRequest(request));
+    }
+});
+
+// The pool closes stdin to shut the worker down
+process.stdin.on('end', () => {
+    process.exit(0);
+});
@@ -0,0 +1,255 @@
+"""
+Pool of long-lived Node.js togeojson workers.
+
+Starting `node` and loading the togeojson modules costs more than converting most
+uploads, so conversions are sent to persistent workers (togeojson/worker.js) over a
+length-prefixed JSON protocol on stdin/stdout instead of spawning a process per file.
+Workers that crash, time out or grow past the memory limit are replaced.
+"""
+
+import base64
+import json
+import os
+import queue
+import select
+import struct
+import subprocess
+import threading
+import time
+from typing import Dict, Any, Optional, Union
+
+from django.conf import settings
+
+from geo_lib.logging.console import get_import_logger
+
+logger = get_import_logger()
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'togeojson', 'worker.js')
+
+
+class TogeojsonWorkerError(Exception):
+    """Raised when a worker fails to convert a file (bad input, crash or timeout)."""
+    pass
+
+
+class TogeojsonWorkerTimeout(TogeojsonWorkerError):
+    """Raised when a worker doesn't respond within the request timeout."""
+    pass
+
+
+class TogeojsonConversionError(TogeojsonWorkerError):
+    """Raised when the worker reports that the file couldn't be converted. The worker itself is still usable."""
+    pass
+
+
+class TogeojsonWorker:
+    """A single Node.js worker process handling one request at a time."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ['node', WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self.request_count = 0
+        self.rss_bytes = 0
+        self.last_used = time.monotonic()
+        self._next_id = 0
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, request_type: str, content: str, timeout: float) -> Dict[str, Any]:
+        """
+        Send a request and wait for the response.
+
+        Raises:
+            TogeojsonWorkerTimeout: If no response arrives within timeout seconds
+            TogeojsonConversionError: If the worker couldn't convert the content
+            TogeojsonWorkerError: If the worker died or the protocol broke down
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        payload = json.dumps({'id': request_id, 'type': request_type, 'content': content}).encode('utf-8')
+
+        try:
+            self.process.stdin.write(struct.pack('>I', len(payload)) + payload)
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise TogeojsonWorkerError(f"Worker is not accepting requests: {e}")
+
+        deadline = time.monotonic() + timeout
+        header = self._read_exact(4, deadline)
+        (length,) = struct.unpack('>I', header)
+        response = json.loads(self._read_exact(length, deadline))
+
+        self.request_count += 1
+        self.rss_bytes = response.get('rss', 0)
+        self.last_used = time.monotonic()
+
+        if response.get('id') != request_id:
+            raise TogeojsonWorkerError("Worker returned a response for a different request")
+        if not response.get('ok'):
+            raise TogeojsonConversionError(response.get('error', 'Unknown conversion error'))
+        return response
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        """Read exactly size bytes from the worker's stdout before the deadline."""
+        fd = self.process.stdout.fileno()
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                raise TogeojsonWorkerTimeout("Worker did not respond in time")
+            readable, _, _ = select.select([fd], [], [], time_left)
+            if not readable:
+                raise TogeojsonWorkerTimeout("Worker did not respond in time")
+            chunk = os.read(fd, min(remaining, 1024 * 1024))
+            if not chunk:
+                raise TogeojsonWorkerError("Worker exited unexpectedly")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    def stop(self):
+        """Stop the worker, killing it if it doesn't exit promptly."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except Exception:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=2)
+            except Exception:
+                pass
+
+
+class TogeojsonWorkerPool:
+    """
+    Fixed-size pool of TogeojsonWorker processes.
+    Workers are started lazily and checked out for one request at a time.
+    """
+
+    def __init__(self, size: int, max_memory_mb: int, max_requests: int, health_check_interval: float):
+        self.size = max(1, size)
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.max_requests = max_requests
+        self.health_check_interval = health_check_interval
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def convert(self, file_type: str, content: Union[str, bytes], timeout: float) -> Dict[str, Any]:
+        """
+        Convert file content to GeoJSON using a pooled worker.
+
+        Args:
+            file_type: 'kml', 'kmz' or 'gpx'
+            content: File content (bytes for KMZ, string otherwise)
+            timeout: Seconds to wait for the conversion (including waiting for a free worker)
+
+        Returns:
+            GeoJSON data as dictionary
+        """
+        deadline = time.monotonic() + timeout
+        if isinstance(content, bytes):
+            content = base64.b64encode(content).decode('ascii') if file_type == 'kmz' else content.decode('utf-8')
+
+        worker = self._checkout(deadline)
+        healthy = False
+        try:
+            response = worker.request(file_type, content, max(0.0, deadline - time.monotonic()))
+            healthy = True
+            return response['geojson']
+        except TogeojsonConversionError:
+            # A conversion error leaves the worker usable, anything else (crash, timeout, broken pipe) doesn't
+            healthy = True
+            raise
+        finally:
+            self._checkin(worker, healthy)
+
+    def _checkout(self, deadline: float) -> TogeojsonWorker:
+        """Get an idle, healthy worker, starting one if the pool isn't full yet."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = None
+                with self._lock:
+                    if self._started < self.size:
+                        self._started += 1
+                        try:
+                            return TogeojsonWorker()
+                        except Exception:
+                            self._started -= 1
+                            raise
+                time_left = deadline - time.monotonic()
+                if time_left <= 0:
+                    raise TogeojsonWorkerTimeout("No togeojson worker became available in time")
+                try:
+                    worker = self._idle.get(timeout=time_left)
+                except queue.Empty:
+                    raise TogeojsonWorkerTimeout("No togeojson worker became available in time")
+
+            if self._is_healthy(worker):
+                return worker
+            self._discard(worker)
+
+    def _is_healthy(self, worker: TogeojsonWorker) -> bool:
+        """Check a worker before use, pinging it if it has been idle for a while."""
+        if not worker.is_alive():
+            return False
+        if time.monotonic() - worker.last_used < self.health_check_interval:
+            return True
+        try:
+            worker.request('ping', '', timeout=5)
+            return True
+        except TogeojsonWorkerError:
+            logger.warning("togeojson worker failed health check, restarting it")
+            return False
+
+    def _checkin(self, worker: TogeojsonWorker, healthy: bool):
+        """Return a worker to the pool, or replace it if it's broken or due for recycling."""
+        if not healthy:
+            logger.warning("togeojson worker crashed or timed out, restarting it")
+            self._discard(worker)
+        elif self.max_memory_bytes > 0 and worker.rss_bytes > self.max_memory_bytes:
+            logger.info(f"Recycling togeojson worker using {worker.rss_bytes / (1024 * 1024):.0f}MB of memory")
+            self._discard(worker)
+        elif 0 < self.max_requests <= worker.request_count:
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: TogeojsonWorker):
+        """Stop a worker and free its slot so a replacement can be started."""
+        worker.stop()
+        with self._lock:
+            self._started -= 1
+
+    def shutdown(self):
+        """Stop all idle workers."""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_togeojson_pool: Optional[TogeojsonWorkerPool] = None
+_togeojson_pool_lock = threading.Lock()
+
+
+def get_togeojson_pool() -> TogeojsonWorkerPool:
+    global _togeojson_pool
+    with _togeojson_pool_lock:
+        if _togeojson_pool is None:
+            _togeojson_pool = TogeojsonWorkerPool(
+                size=getattr(settings, 'TOGEOJSON_POOL_SIZE', 2),
+                max_memory_mb=getattr(settings, 'TOGEOJSON_WORKER_MAX_MEMORY_MB', 512),
+                max_requests=getattr(settings, 'TOGEOJSON_WORKER_MAX_REQUESTS', 500),
+                health_check_interval=getattr(settings, 'TOGEOJSON_HEALTH_CHECK_INTERVAL_SECONDS', 60),
+            )
+        return _togeojson_pool
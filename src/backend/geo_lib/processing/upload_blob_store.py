@@ -0,0 +1,121 @@
+"""
+Content addressed storage for raw uploaded files.
+
+Uploads are stored once per SHA-256 of their content (the hash ImportQueue.geojson_hash already
+holds for duplicate detection), zlib compressed, in the UploadBlob table. Import queue items
+reference the blob, so identical re-uploads share one copy and queue rows stay small.
+KMZ files are already compressed and are stored as they are when compressing doesn't help.
+Blobs are deleted once no import queue item references them anymore.
+"""
+import base64
+import binascii
+import hashlib
+import zlib
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+
+from geo_lib.logging.console import get_import_logger
+
+logger = get_import_logger()
+
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_NONE = 'none'
+COMPRESSION_LEVEL = 6
+
+
+def store_upload_blob(data: bytes, sha256: Optional[str] = None) -> str:
+    """
+    Store raw file content, unless a blob with the same content exists already.
+    Call it in the transaction that references the blob: the row stays locked until that
+    transaction ends, so the orphan cleanup can't delete it in between.
+
+    Args:
+        data: Raw file content
+        sha256: SHA-256 hash of data, if it's already known
+
+    Returns:
+        The blob key (SHA-256 hash of the content)
+    """
+    from api.models import UploadBlob
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if sha256 is None:
+        sha256 = hashlib.sha256(data).hexdigest()
+
+    with transaction.atomic():
+        if UploadBlob.objects.select_for_update().filter(sha256=sha256).exists():
+            return sha256
+
+        compressed = zlib.compress(data, COMPRESSION_LEVEL)
+        if len(compressed) < len(data):
+            blob = UploadBlob(sha256=sha256, data=compressed, compression=COMPRESSION_ZLIB, size=len(data))
+        else:
+            blob = UploadBlob(sha256=sha256, data=data, compression=COMPRESSION_NONE, size=len(data))
+        # Another upload of the same content may have stored it in the meantime
+        UploadBlob.objects.bulk_create([blob], ignore_conflicts=True)
+        UploadBlob.objects.select_for_update().filter(sha256=sha256).exists()
+    return sha256
+
+
+def read_upload_blob(sha256: str) -> Optional[bytes]:
+    """Get the content of a blob, None if it doesn't exist."""
+    from api.models import UploadBlob
+    row = UploadBlob.objects.filter(sha256=sha256).values_list('data', 'compression').first()
+    if row is None:
+        return None
+    data, compression = bytes(row[0]), row[1]
+    return zlib.decompress(data) if compression == COMPRESSION_ZLIB else data
+
+
+def get_raw_file(import_queue) -> Optional[bytes]:
+    """
+    Get the raw uploaded file of an import queue item.
+    Falls back to the raw_file column for items from before the blob store.
+    """
+    if import_queue.raw_blob_id:
+        return read_upload_blob(import_queue.raw_blob_id)
+    if not import_queue.raw_file:
+        return None
+    if import_queue.original_filename.lower().endswith('.kmz'):
+        # Binary uploads were stored base64 encoded
+        try:
+            return base64.b64decode(import_queue.raw_file, validate=True)
+        except (binascii.Error, ValueError):
+            pass
+    return import_queue.raw_file.encode('utf-8')
+
+
+def delete_unreferenced_upload_blobs(sha256s: Optional[Iterable[str]] = None) -> int:
+    """
+    Delete blobs no import queue item references anymore.
+
+    Args:
+        sha256s: Only check these blobs (e.g. the ones of deleted items), None to check all
+
+    Returns:
+        Number of deleted blobs
+    """
+    from api.models import ImportQueue, UploadBlob
+    blob_table = UploadBlob._meta.db_table
+    queue_table = ImportQueue._meta.db_table
+    where, params = '', []
+    if sha256s is not None:
+        params = [list({sha256 for sha256 in sha256s if sha256})]
+        if not params[0]:
+            return 0
+        where = 'b.sha256 = ANY(%s) AND'
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"""
+                DELETE FROM {blob_table} b
+                WHERE {where} NOT EXISTS (SELECT 1 FROM {queue_table} q WHERE q.raw_blob_id = b.sha256)
+            """, params)
+            deleted = cursor.rowcount
+    except Exception as e:
+        # A blob referenced again while it was being deleted is caught by the foreign key
+        logger.warning(f"Failed to delete unreferenced upload blobs: {e}")
+        return 0
+    if deleted:
+        logger.info(f"Deleted {deleted} unreferenced upload blob(s)")
+    return deleted
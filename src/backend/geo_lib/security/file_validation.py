@@ -8,10 +8,12 @@ and XML security measures.
 
 import io
 import os
+import time
 import traceback
 import xml.etree.ElementTree as ET
 import zipfile
-from typing import Union, Tuple
+from dataclasses import dataclass
+from typing import List, Union, Tuple, Optional
 
 import magic
 from django.conf import settings
@@ -36,6 +38,57 @@ class SecurityError(Exception):
     pass
 
 
+@dataclass
+class ValidatedUpload:
+    """
+    Artifact produced by a successful SecureFileValidator.validate_upload() run.
+    Handed to the later pipeline stages (UploadJob, processors) so they can trust the
+    upload instead of validating it again, and so KMZ archives only get opened once.
+    """
+    filename: str
+    file_type: FileType
+    file_data: bytes
+    content: str  # Decoded KML/GPX document, for KMZ the main KML extracted from the archive
+    root_tag: str  # Root element of the parsed document
+    validation_duration: float
+
+    def matches(self, file_data: Union[bytes, str]) -> bool:
+        """Check that this artifact belongs to the given file data."""
+        return file_data is self.file_data or file_data == self.file_data
+
+    def to_dict(self) -> dict:
+        """
+        Serialize everything except the file data, which is stored separately by the job queue.
+        The decoded content is left out too, it's rebuilt from the file data by from_dict().
+        """
+        return {
+            'filename': self.filename,
+            'file_type': self.file_type.value,
+            'root_tag': self.root_tag,
+            'validation_duration': self.validation_duration
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, file_data: bytes) -> 'ValidatedUpload':
+        file_type = FileType(data['file_type'])
+        content = decode_upload_content(file_type, file_data)
+        return cls(file_data=file_data, content=content, **{**data, 'file_type': file_type})
+
+
+def decode_upload_content(file_type: FileType, file_data: bytes) -> str:
+    """Decode an already validated upload, for KMZ the main KML is read from the archive."""
+    if file_type == FileType.KMZ:
+        with zipfile.ZipFile(io.BytesIO(file_data), 'r') as kmz:
+            kml_files = [name for name in kmz.namelist() if name.lower().endswith('.kml')]
+            return kmz.read(main_kml_filename(kml_files)).decode('utf-8')
+    return file_data.decode('utf-8')
+
+
+def main_kml_filename(kml_files: List[str]) -> str:
+    """Pick the main document of a KMZ archive from the KML files it contains."""
+    return 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
+
+
 class SecureFileValidator:
     """
     Comprehensive file validator for KML/KMZ/GPX files with security measures.
@@ -72,6 +125,20 @@ class SecureFileValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        validated_upload, message = self.validate_upload(uploaded_file)
+        return validated_upload is not None, message
+
+    def validate_upload(self, uploaded_file: UploadedFile) -> Tuple[Optional[ValidatedUpload], str]:
+        """
+        Comprehensive file validation pipeline, returning a reusable validation artifact.
+        
+        Args:
+            uploaded_file: Django UploadedFile object
+            
+        Returns:
+            Tuple of (validated_upload, error_message), validated_upload is None if validation failed
+        """
+        validation_start = time.time()
         try:
             # Basic file checks
             self._validate_basic_properties(uploaded_file)
@@ -86,16 +153,24 @@ class SecureFileValidator:
             self._validate_file_size(uploaded_file)
 
             # Content validation
-            self._validate_content(uploaded_file)
-
-            return True, "File validation successful"
+            file_type, file_data, content, root_tag = self._validate_content(uploaded_file)
+
+            validated_upload = ValidatedUpload(
+                filename=uploaded_file.name,
+                file_type=file_type,
+                file_data=file_data,
+                content=content,
+                root_tag=root_tag,
+                validation_duration=time.time() - validation_start
+            )
+            return validated_upload, "File validation successful"
 
         except (SecurityError, FileValidationError) as e:
             logger.warning(f"File validation failed for {uploaded_file.name}: {str(e)}")
-            return False, str(e)
+            return None, str(e)
         except Exception as e:
             logger.error(f"File validation error for {uploaded_file.name}: {traceback.format_exc()}")
-            return False, "Invalid file format"
+            return None, "Invalid file format"
 
     def _validate_basic_properties(self, uploaded_file: UploadedFile):
         """Validate basic file properties."""
@@ -172,24 +247,30 @@ class SecureFileValidator:
         except ValueError:
             raise FileValidationError("Invalid file type")
 
-    def _validate_content(self, uploaded_file: UploadedFile):
-        """Validate file content structure."""
+    def _validate_content(self, uploaded_file: UploadedFile) -> Tuple[FileType, bytes, str, str]:
+        """
+        Validate file content structure.
+        
+        Returns:
+            Tuple of (file_type, file_data, decoded_content, root_tag)
+        """
         try:
             import os
             _, ext = os.path.splitext(uploaded_file.name)
             file_type = get_file_type_by_extension(ext)
-            
-            if file_type == FileType.KMZ:
-                self._validate_kmz_content(uploaded_file)
-            elif file_type == FileType.GPX:
-                self._validate_gpx_content(uploaded_file)
-            else:
-                self._validate_kml_content(uploaded_file)
         except ValueError:
             raise FileValidationError("Invalid file type")
 
-    def _validate_kmz_content(self, uploaded_file: UploadedFile):
-        """Validate KMZ content and check for zip slip attacks."""
+        if file_type == FileType.KMZ:
+            file_data, content, root_tag = self._validate_kmz_content(uploaded_file)
+        elif file_type == FileType.GPX:
+            file_data, content, root_tag = self._validate_gpx_content(uploaded_file)
+        else:
+            file_data, content, root_tag = self._validate_kml_content(uploaded_file)
+        return file_type, file_data, content, root_tag
+
+    def _validate_kmz_content(self, uploaded_file: UploadedFile) -> Tuple[bytes, str, str]:
+        """Validate KMZ content and check for zip slip attacks. Returns (file_data, main_kml_content, root_tag)."""
         try:
             file_data = uploaded_file.read()
             uploaded_file.seek(0)  # Reset file pointer
@@ -215,7 +296,7 @@ class SecureFileValidator:
                     raise FileValidationError("The KMZ file must contain at least one KML file. Please ensure your KMZ archive includes a KML document.")
 
                 # Validate the main KML file
-                main_kml_file = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
+                main_kml_file = main_kml_filename(kml_files)
                 kml_content = kmz.read(main_kml_file).decode('utf-8')
                 
                 # Check embedded KML size against KML file type limit (not KMZ limit)
@@ -230,7 +311,8 @@ class SecureFileValidator:
                         f"Embedded KML file too large: {kml_size_mb:.1f}MB exceeds {kml_limit_mb:.0f}MB limit for KML content"
                     )
                 
-                self._validate_kml_structure(kml_content)
+                root_tag = self._validate_kml_structure(kml_content)
+                return file_data, kml_content, root_tag
 
         except zipfile.BadZipFile:
             raise SecurityError("The KMZ file appears to be corrupted or invalid. Please try re-saving the file or use a different KMZ file.")
@@ -243,14 +325,15 @@ class SecureFileValidator:
             logger.warning(f"KMZ validation error: {type(e).__name__}")
             raise SecurityError("KMZ file validation failed")
 
-    def _validate_kml_content(self, uploaded_file: UploadedFile):
-        """Validate KML content structure."""
+    def _validate_kml_content(self, uploaded_file: UploadedFile) -> Tuple[bytes, str, str]:
+        """Validate KML content structure. Returns (file_data, kml_content, root_tag)."""
         try:
             file_data = uploaded_file.read()
             uploaded_file.seek(0)  # Reset file pointer
 
             kml_content = file_data.decode('utf-8')
-            self._validate_kml_structure(kml_content)
+            root_tag = self._validate_kml_structure(kml_content)
+            return file_data, kml_content, root_tag
 
         except UnicodeDecodeError:
             raise SecurityError("The file contains invalid text encoding. Please save the file with UTF-8 encoding and try again.")
@@ -261,14 +344,15 @@ class SecureFileValidator:
             logger.warning(f"KML validation error: {type(e).__name__}")
             raise SecurityError("KML file validation failed")
 
-    def _validate_gpx_content(self, uploaded_file: UploadedFile):
-        """Validate GPX content structure."""
+    def _validate_gpx_content(self, uploaded_file: UploadedFile) -> Tuple[bytes, str, str]:
+        """Validate GPX content structure. Returns (file_data, gpx_content, root_tag)."""
         try:
             file_data = uploaded_file.read()
             uploaded_file.seek(0)  # Reset file pointer
 
             gpx_content = file_data.decode('utf-8')
-            self._validate_gpx_structure(gpx_content)
+            root_tag = self._validate_gpx_structure(gpx_content)
+            return file_data, gpx_content, root_tag
 
         except UnicodeDecodeError:
             raise SecurityError("The file contains invalid text encoding. Please save the file with UTF-8 encoding and try again.")
@@ -279,8 +363,8 @@ class SecureFileValidator:
             logger.warning(f"GPX validation error: {type(e).__name__}")
             raise SecurityError("GPX file validation failed")
 
-    def _validate_kml_structure(self, kml_content: str):
-        """Validate KML XML structure and check for dangerous content."""
+    def _validate_kml_structure(self, kml_content: str) -> str:
+        """Validate KML XML structure and check for dangerous content. Returns the root tag."""
         try:
             # Parse XML with secure settings
             root = self._secure_xml_parse(kml_content)
@@ -295,6 +379,8 @@ class SecureFileValidator:
             if not self._is_valid_kml(root):
                 raise FileValidationError("The KML file doesn't contain valid geographic features. Please ensure it includes placemarks, polygons, or other geographic elements.")
 
+            return root.tag
+
         except ET.ParseError:
             raise FileValidationError("The KML file contains invalid XML structure. Please check the file format and try again.")
         except Exception as e:
@@ -304,8 +390,8 @@ class SecureFileValidator:
             logger.warning(f"KML structure validation error: {type(e).__name__}")
             raise SecurityError("KML file structure validation failed")
 
-    def _validate_gpx_structure(self, gpx_content: str):
-        """Validate GPX XML structure and check for dangerous content."""
+    def _validate_gpx_structure(self, gpx_content: str) -> str:
+        """Validate GPX XML structure and check for dangerous content. Returns the root tag."""
         try:
             # Parse XML with secure settings
             root = self._secure_xml_parse(gpx_content)
@@ -320,6 +406,8 @@ class SecureFileValidator:
             if not self._is_valid_gpx(root):
                 raise FileValidationError("The GPX file doesn't contain valid tracks, routes, or waypoints. Please ensure it includes GPS data.")
 
+            return root.tag
+
         except ET.ParseError:
             raise FileValidationError("The GPX file contains invalid XML structure. Please check the file format and try again.")
         except Exception as e:
@@ -71,6 +71,97 @@ class PolygonFeature(Feature):
 
 GeoFeatureSupported = Type[PolygonFeature | LineStringFeature | MultiLineStringFeature | PointFeature]
 
+FEATURE_CLASSES = {
+    'point': PointFeature,
+    'multipoint': PointFeature,
+    'linestring': LineStringFeature,
+    'multilinestring': MultiLineStringFeature,
+    'polygon': PolygonFeature,
+    'multipolygon': PolygonFeature,
+}
+
+# Top level key of a feature dict that was validated by its feature model and dumped, holding the
+# feature hash it had at that point. Any change to the geometry or properties breaks the match,
+# so a stale marker is never trusted. Not part of the hash or the GeoJSON that is stored.
+VALIDATED_KEY = '_validated'
+
+
+def get_feature_class(geometry_type: Optional[str]) -> Optional[GeoFeatureSupported]:
+    """Get the feature model for a GeoJSON geometry type, None if it isn't supported."""
+    return FEATURE_CLASSES.get((geometry_type or '').lower())
+
+
+def validated_feature(feature: dict, geometry: Optional[BaseModel] = None) -> dict:
+    """
+    Validate a feature dict once and return it in the exact form the import would produce
+    (`json.loads(FeatureModel(**feature).model_dump_json())`), stamped as validated.
+
+    Args:
+        feature: Feature dict
+        geometry: The feature's geometry, if it was already validated (its coordinates are the expensive part)
+
+    Returns:
+        The validated feature dict, or the feature unchanged (and unstamped) if it doesn't validate
+    """
+    try:
+        if geometry is not None:
+            result = {
+                'type': str(feature.get('type', 'Feature')),
+                'geometry': geometry.model_dump(mode='json'),
+                'properties': Properties.model_validate(feature.get('properties') or {}).model_dump(mode='json'),
+            }
+        else:
+            feature_class = get_feature_class((feature.get('geometry') or {}).get('type'))
+            if feature_class is None:
+                return feature
+            result = feature_class.model_validate(feature).model_dump(mode='json')
+    except (ValueError, TypeError):
+        # Left for the import to reject
+        return feature
+    if result['properties'].get('tags') is None:
+        result['properties']['tags'] = []
+    result[VALIDATED_KEY] = generate_feature_hash(result)
+    return result
+
+
+def is_validated(feature: dict) -> bool:
+    """Check if a feature dict carries a validated marker that still matches its content."""
+    marker = feature.get(VALIDATED_KEY)
+    return bool(marker) and marker == generate_feature_hash(feature)
+
+
+def mark_validated(feature: dict) -> dict:
+    """Update the marker of a validated feature dict after a change that keeps it valid (e.g. adding tags)."""
+    feature[VALIDATED_KEY] = generate_feature_hash(feature)
+    return feature
+
+
+def feature_to_geojson(feature: dict) -> Tuple[dict, Optional[str]]:
+    """
+    Get the validated GeoJSON of a feature dict for storing it.
+    Features stamped by validated_feature() are copied as they are, others are validated.
+
+    Returns:
+        Tuple of (GeoJSON dict without the marker, the feature hash if it's already known)
+
+    Raises:
+        ValueError: If the feature is invalid or its geometry type isn't supported
+    """
+    if is_validated(feature):
+        geojson = {
+            'type': feature.get('type', 'Feature'),
+            'geometry': feature['geometry'],
+            'properties': dict(feature['properties']),
+        }
+        return geojson, feature[VALIDATED_KEY]
+
+    feature_class = get_feature_class((feature.get('geometry') or {}).get('type'))
+    if feature_class is None:
+        raise ValueError(f"Unsupported geometry type: {(feature.get('geometry') or {}).get('type')}")
+    feature_instance = feature_class(**{key: value for key, value in feature.items() if key != VALIDATED_KEY})
+    feature_instance.properties.tags = feature_instance.properties.tags or []
+    return feature_instance.model_dump(mode='json'), None
+
 
 def geojson_to_geofeature(geojson: dict) -> Tuple[List[GeoFeatureSupported], ImportLog]:
     result = []
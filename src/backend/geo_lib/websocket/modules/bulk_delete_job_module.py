@@ -2,6 +2,8 @@
 Bulk delete job WebSocket module.
 """
 
+from channels.db import database_sync_to_async
+
 from geo_lib.websocket.base_module import BaseWebSocketModule
 from geo_lib.processing.jobs import bulk_delete_job
 from geo_lib.logging.console import get_websocket_logger
@@ -46,7 +48,7 @@ class BulkDeleteJobModule(BaseWebSocketModule):
                 return
 
             # Start the bulk delete job
-            job_id = bulk_delete_job.start_bulk_delete_job(
+            job_id = await database_sync_to_async(bulk_delete_job.start_bulk_delete_job)(
                 item_ids=item_ids,
                 user_id=self.user.id
             )
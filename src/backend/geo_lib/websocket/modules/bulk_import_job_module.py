@@ -2,6 +2,8 @@
 Bulk import job WebSocket module.
 """
 
+from channels.db import database_sync_to_async
+
 from geo_lib.websocket.base_module import BaseWebSocketModule
 from geo_lib.processing.jobs import bulk_import_job
 from geo_lib.logging.console import get_websocket_logger
@@ -47,7 +49,7 @@ class BulkImportJobModule(BaseWebSocketModule):
                 return
 
             # Start the bulk import job
-            job_id = bulk_import_job.start_bulk_import_job(
+            job_id = await database_sync_to_async(bulk_import_job.start_bulk_import_job)(
                 item_ids=item_ids,
                 user_id=self.user.id,
                 import_custom_icons=import_custom_icons
@@ -0,0 +1,96 @@
+"""
+Bulk retag job WebSocket module.
+"""
+
+from channels.db import database_sync_to_async
+
+from geo_lib.websocket.base_module import BaseWebSocketModule
+from geo_lib.processing.jobs import bulk_retag_job
+from geo_lib.logging.console import get_websocket_logger
+
+logger = get_websocket_logger()
+
+
+class BulkRetagJobModule(BaseWebSocketModule):
+    """WebSocket module for bulk tag regeneration."""
+
+    @property
+    def module_name(self) -> str:
+        return "bulk_retag_job"
+
+    async def handle_message(self, message_type: str, data: dict) -> None:
+        """Handle incoming messages for bulk retag job module."""
+        if message_type == 'refresh':
+            await self.send_initial_state()
+        elif message_type == 'start_bulk_retag':
+            await self.handle_start_bulk_retag(data)
+        elif message_type == 'cancel_bulk_retag':
+            await self.handle_cancel_bulk_retag(data)
+        else:
+            logger.warning(f"Unknown message type for bulk_retag_job module: {message_type}")
+
+    async def handle_start_bulk_retag(self, data: dict) -> None:
+        """Handle start_bulk_retag message, with a selector or the ID of a job to resume."""
+        try:
+            selector = data.get('selector')
+            resume_job_id = data.get('resume_job_id')
+
+            if not selector and not resume_job_id:
+                await self.send_to_client('error', {'message': 'No selector provided'})
+                return
+
+            job_id = await database_sync_to_async(bulk_retag_job.start_bulk_retag_job)(
+                user_id=self.user.id,
+                selector=selector,
+                resume_job_id=resume_job_id
+            )
+
+            if job_id:
+                await self.send_to_client('job_started', {'job_id': job_id})
+            else:
+                await self.send_to_client('error', {'message': 'Failed to start tag regeneration, check the selector'})
+
+        except Exception as e:
+            logger.error(f"Error handling start_bulk_retag: {str(e)}")
+            await self.send_to_client('error', {'message': f'Error starting tag regeneration: {str(e)}'})
+
+    async def handle_cancel_bulk_retag(self, data: dict) -> None:
+        """Handle cancel_bulk_retag message."""
+        try:
+            job_id = data.get('job_id')
+            cancelled = await database_sync_to_async(self._cancel_job)(job_id)
+            if cancelled:
+                await self.send_to_client('cancelled', {'job_id': job_id})
+            else:
+                await self.send_to_client('error', {'message': 'Job not found or already finished'})
+        except Exception as e:
+            logger.error(f"Error handling cancel_bulk_retag: {str(e)}")
+            await self.send_to_client('error', {'message': f'Error cancelling tag regeneration: {str(e)}'})
+
+    def _cancel_job(self, job_id: str) -> bool:
+        job = bulk_retag_job.status_tracker.get_job(job_id) if job_id else None
+        if not job or job.user_id != self.user.id:
+            return False
+        return bulk_retag_job.cancel_job(job_id)
+
+    async def send_initial_state(self) -> None:
+        """Send initial state for bulk retag job module."""
+        # Progress of running jobs is pushed as it happens, like the bulk import job
+        await self.send_to_client('initial_state', {})
+
+    # Bulk retag job event handlers
+    async def started(self, event):
+        """Handle bulk_retag_job_started event."""
+        await self.send_to_client('started', event['data'])
+
+    async def status_updated(self, event):
+        """Handle bulk_retag_job_status_updated event."""
+        await self.send_to_client('status_updated', event['data'])
+
+    async def completed(self, event):
+        """Handle bulk_retag_job_completed event."""
+        await self.send_to_client('completed', event['data'])
+
+    async def failed(self, event):
+        """Handle bulk_retag_job_failed event."""
+        await self.send_to_client('failed', event['data'])
@@ -0,0 +1,56 @@
+"""
+Geocode job WebSocket module.
+"""
+
+from channels.db import database_sync_to_async
+
+from api.models import ImportQueue
+from geo_lib.websocket.base_module import BaseWebSocketModule
+from geo_lib.logging.console import get_websocket_logger
+
+logger = get_websocket_logger()
+
+
+class GeocodeJobModule(BaseWebSocketModule):
+    """WebSocket module for background geocoding progress."""
+
+    @property
+    def module_name(self) -> str:
+        return "geocode_job"
+
+    async def handle_message(self, message_type: str, data: dict) -> None:
+        """Handle incoming messages for geocode job module."""
+        if message_type == 'refresh':
+            await self.send_initial_state()
+        else:
+            logger.warning(f"Unknown message type for geocode_job module: {message_type}")
+
+    async def send_initial_state(self) -> None:
+        """Send the import queue items still waiting for location tags."""
+        try:
+            pending_ids = await self.get_pending_item_ids()
+            await self.send_to_client('initial_state', {'pending_item_ids': pending_ids})
+        except Exception as e:
+            logger.error(f"Error sending geocode job state to user {self.user.id}: {str(e)}")
+            await self.send_to_client('error', {'message': 'Failed to load geocoding state'})
+
+    @database_sync_to_async
+    def get_pending_item_ids(self):
+        return list(ImportQueue.objects.filter(user=self.user, geocoding_pending=True).values_list('id', flat=True))
+
+    # Geocode job event handlers
+    async def started(self, event):
+        """Handle geocode_job_started event."""
+        await self.send_to_client('started', event['data'])
+
+    async def status_updated(self, event):
+        """Handle geocode_job_status_updated event."""
+        await self.send_to_client('status_updated', event['data'])
+
+    async def completed(self, event):
+        """Handle geocode_job_completed event."""
+        await self.send_to_client('completed', event['data'])
+
+    async def failed(self, event):
+        """Handle geocode_job_failed event."""
+        await self.send_to_client('failed', event['data'])
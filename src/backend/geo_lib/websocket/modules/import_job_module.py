@@ -0,0 +1,45 @@
+"""
+Import job WebSocket module.
+"""
+
+from geo_lib.websocket.base_module import BaseWebSocketModule
+from geo_lib.logging.console import get_websocket_logger
+
+logger = get_websocket_logger()
+
+
+class ImportJobModule(BaseWebSocketModule):
+    """WebSocket module for the progress of imports to the feature store."""
+
+    @property
+    def module_name(self) -> str:
+        return "import_job"
+
+    async def handle_message(self, message_type: str, data: dict) -> None:
+        """Handle incoming messages for import job module."""
+        if message_type == 'refresh':
+            await self.send_initial_state()
+        else:
+            logger.warning(f"Unknown message type for import_job module: {message_type}")
+
+    async def send_initial_state(self) -> None:
+        """Send initial state for import job module."""
+        # Imports are started over HTTP and followed through the events, there's no state to send
+        await self.send_to_client('initial_state', {})
+
+    # Import job event handlers
+    async def started(self, event):
+        """Handle import_job_started event."""
+        await self.send_to_client('started', event['data'])
+
+    async def status_updated(self, event):
+        """Handle import_job_status_updated event."""
+        await self.send_to_client('status_updated', event['data'])
+
+    async def completed(self, event):
+        """Handle import_job_completed event."""
+        await self.send_to_client('completed', event['data'])
+
+    async def failed(self, event):
+        """Handle import_job_failed event."""
+        await self.send_to_client('failed', event['data'])
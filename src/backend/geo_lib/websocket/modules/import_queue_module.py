@@ -6,6 +6,7 @@ import json
 
 from channels.db import database_sync_to_async
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
 
 from api.models import ImportQueue
 from geo_lib.processing.status_tracker import status_tracker
@@ -41,17 +42,44 @@ class ImportQueueModule(BaseWebSocketModule):
             logger.error(f"Error sending initial state to user {self.user.id}: {str(e)}")
             await self.send_to_client('error', {'message': 'Failed to load import queue data'})
 
-    @database_sync_to_async
-    def get_import_queue_data(self):
-        """Get current import queue data for the user."""
-        # Get user items from database (exclude replacement uploads)
-        user_items = ImportQueue.objects.filter(
+    def _queue_items(self):
+        """The user's items in the import queue (exclude replacement uploads)."""
+        return ImportQueue.objects.filter(
             user=self.user,
             imported=False,
             replacement__isnull=True
-        ).order_by('-timestamp').values(
-            'id', 'geofeatures', 'original_filename', 'geojson_hash',
-            'log_id', 'timestamp', 'imported', 'unparsable'
+        )
+
+    @database_sync_to_async
+    def get_import_queue_data(self):
+        """Get current import queue data for the user."""
+        return self._summarize_items(self._queue_items())
+
+    @database_sync_to_async
+    def get_import_queue_item_data(self, item_id: int):
+        """
+        Get the queue data of an item, and of the items with the same file hash since their
+        duplicate status depends on it. Empty if the item isn't in the queue anymore.
+        """
+        queue_items = self._queue_items()
+        item = queue_items.filter(id=item_id).values('geojson_hash').first()
+        if item is None:
+            return []
+        if item['geojson_hash']:
+            queue_items = queue_items.filter(Q(id=item_id) | Q(geojson_hash=item['geojson_hash']))
+        else:
+            queue_items = queue_items.filter(id=item_id)
+        return self._summarize_items(queue_items)
+
+    def _summarize_items(self, queue_items):
+        """
+        Build the queue data of items. Duplicate status is computed among the given items,
+        so they have to include every queued item with the same file hash.
+        """
+        # feature_count is kept on the item when its features are staged, the features aren't read
+        user_items = queue_items.order_by('-timestamp').values(
+            'id', 'feature_count', 'original_filename', 'geojson_hash',
+            'log_id', 'timestamp', 'imported', 'unparsable', 'geocoding_pending'
         )
 
         data = json.loads(json.dumps(list(user_items), cls=DjangoJSONEncoder))
@@ -90,12 +118,12 @@ class ImportQueueModule(BaseWebSocketModule):
 
         # Process each item
         for i, item in enumerate(data):
-            count = len(item['geofeatures'])
+            count = item['feature_count']
 
             # Check if this item is currently being processed
             item['processing'] = item['id'] in active_job_ids
 
-            # Also consider items with empty geofeatures as processing if they were created recently
+            # Also consider items without features as processing if they were created recently
             if not item['processing'] and count == 0 and not item.get('unparsable'):
                 from django.utils import timezone
                 from datetime import timedelta
@@ -110,8 +138,8 @@ class ImportQueueModule(BaseWebSocketModule):
                 if time_since_creation < timedelta(seconds=10):
                     item['processing'] = True
 
-            # Check if there's an error in the geofeatures or if marked as unparsable
-            if item.get('unparsable') or (count == 1 and item['geofeatures'] and isinstance(item['geofeatures'][0], dict) and 'error' in item['geofeatures'][0]):
+            # Check if the file was marked as unparsable
+            if item.get('unparsable'):
                 item['feature_count'] = 0
                 item['processing_failed'] = True
             elif count == 0 and item['processing']:
@@ -139,7 +167,6 @@ class ImportQueueModule(BaseWebSocketModule):
                     item['duplicate_status'] = 'duplicate_imported'
 
             # Remove keys from response as they're not needed by frontend
-            del item['geofeatures']
             del item['log_id']
             del item['geojson_hash']
             del item['unparsable']
@@ -148,8 +175,9 @@ class ImportQueueModule(BaseWebSocketModule):
 
     # WebSocket event handlers for channel layer events
     async def item_added(self, event):
-        """Handle item_added event."""
-        await self.send_to_client('item_added', event['data'])
+        """Handle item_added event - send the new item, the client adds it to the queue."""
+        items = await self.get_import_queue_item_data(event['data']['id'])
+        await self.send_to_client('item_added', {**event['data'], 'items': items})
 
     async def item_deleted(self, event):
         """Handle item_deleted event."""
@@ -164,6 +192,6 @@ class ImportQueueModule(BaseWebSocketModule):
         await self.send_to_client('item_imported', event['data'])
 
     async def status_updated(self, event):
-        """Handle status_updated event - refresh queue to update duplicate status."""
-        # Refresh the queue data to ensure duplicate status is up to date
-        await self.send_initial_state()
+        """Handle status_updated event - send the changed items instead of the whole queue."""
+        items = await self.get_import_queue_item_data(event['data']['id'])
+        await self.send_to_client('status_updated', {**event['data'], 'items': items})
@@ -3,7 +3,6 @@ Upload status WebSocket module.
 Handles real-time status updates for a specific import item.
 """
 
-import json
 from typing import Dict, Any, Optional
 
 from django.conf import settings
@@ -105,14 +104,14 @@ class UploadStatusModule(BaseWebSocketModule):
 
             if not self.import_item.imported and not self.import_item.unparsable:
                 # Check if currently being processed
-                user_jobs = status_tracker.get_user_jobs(self.user.id)
+                user_jobs = await sync_to_async(status_tracker.get_user_jobs)(self.user.id)
                 active_job_ids = {job.import_queue_id for job in user_jobs if job.status.value == 'processing' and job.import_queue_id}
 
                 if self.import_item.id in active_job_ids:
                     is_processing = True
                     for job in user_jobs:
                         if job.import_queue_id == self.import_item.id and job.status.value == 'processing':
-                            job_details = status_tracker.get_job_status(job.job_id)
+                            job_details = await sync_to_async(status_tracker.get_job_status)(job.job_id)
                             break
 
             # Get paginated features (default page 1, size 50)
@@ -168,8 +167,8 @@ class UploadStatusModule(BaseWebSocketModule):
         await self.send_to_client('status_updated', data)
 
     async def handle_logs_added(self, data: Dict[str, Any]) -> None:
-        """Handle new log entries."""
-        await self.send_to_client('log_added', data)
+        """Handle a batch of new log entries."""
+        await self.send_to_client('logs_added', data)
 
     async def handle_item_completed(self, data: Dict[str, Any]) -> None:
         """Handle item completion."""
@@ -183,100 +182,6 @@ class UploadStatusModule(BaseWebSocketModule):
         """Handle item deletion - notify client and close connection."""
         await self.send_to_client('item_deleted', data)
 
-    def _get_feature_bounding_box_center(self, feature: Dict[str, Any]) -> Optional[tuple]:
-        """
-        Calculate the bounding box center (lat, lon) for a feature.
-        
-        Args:
-            feature: GeoJSON feature dictionary
-            
-        Returns:
-            Tuple of (lat, lon) center coordinates, or None if feature has no valid geometry
-        """
-        geometry = feature.get('geometry', {})
-        if not geometry:
-            return None
-        
-        geom_type = geometry.get('type', '').lower()
-        coordinates = geometry.get('coordinates')
-        
-        if not coordinates:
-            return None
-        
-        # Collect all coordinate points from the geometry
-        all_points = []
-        
-        try:
-            if geom_type == 'point':
-                # Point: [lon, lat] or [lon, lat, elevation]
-                if isinstance(coordinates, list) and len(coordinates) >= 2:
-                    all_points.append(coordinates)
-            
-            elif geom_type == 'multipoint':
-                # MultiPoint: [[lon, lat], [lon, lat], ...]
-                if isinstance(coordinates, list):
-                    for point in coordinates:
-                        if isinstance(point, list) and len(point) >= 2:
-                            all_points.append(point)
-            
-            elif geom_type == 'linestring':
-                # LineString: [[lon, lat], [lon, lat], ...]
-                if isinstance(coordinates, list):
-                    for point in coordinates:
-                        if isinstance(point, list) and len(point) >= 2:
-                            all_points.append(point)
-            
-            elif geom_type == 'multilinestring':
-                # MultiLineString: [[[lon, lat], ...], [[lon, lat], ...], ...]
-                if isinstance(coordinates, list):
-                    for linestring in coordinates:
-                        if isinstance(linestring, list):
-                            for point in linestring:
-                                if isinstance(point, list) and len(point) >= 2:
-                                    all_points.append(point)
-            
-            elif geom_type == 'polygon':
-                # Polygon: [[[lon, lat], ...], [[lon, lat], ...], ...] (exterior ring + holes)
-                if isinstance(coordinates, list):
-                    for ring in coordinates:
-                        if isinstance(ring, list):
-                            for point in ring:
-                                if isinstance(point, list) and len(point) >= 2:
-                                    all_points.append(point)
-            
-            elif geom_type == 'multipolygon':
-                # MultiPolygon: [[[[lon, lat], ...], ...], [[[lon, lat], ...], ...], ...]
-                if isinstance(coordinates, list):
-                    for polygon in coordinates:
-                        if isinstance(polygon, list):
-                            for ring in polygon:
-                                if isinstance(ring, list):
-                                    for point in ring:
-                                        if isinstance(point, list) and len(point) >= 2:
-                                            all_points.append(point)
-            
-            # Calculate bounding box from all points
-            if not all_points:
-                return None
-            
-            # Extract lons and lats (GeoJSON uses [lon, lat] format)
-            lons = [point[0] for point in all_points if isinstance(point[0], (int, float))]
-            lats = [point[1] for point in all_points if isinstance(point[1], (int, float))]
-            
-            if not lons or not lats:
-                return None
-            
-            # Calculate center
-            center_lon = (min(lons) + max(lons)) / 2.0
-            center_lat = (min(lats) + max(lats)) / 2.0
-            
-            return (center_lat, center_lon)
-        
-        except (TypeError, IndexError, ValueError) as e:
-            # Handle any errors in coordinate extraction gracefully
-            logger.debug(f"Error calculating bounding box center for feature: {str(e)}")
-            return None
-
     async def _get_paginated_features(self, page: int, page_size: int) -> Dict[str, Any]:
         """Get paginated features for the import item."""
         if self.import_item.imported:
@@ -311,96 +216,17 @@ class UploadStatusModule(BaseWebSocketModule):
         # Force page_size to 50
         page_size = 50
 
-        # Sort features spatially before pagination
-        # Create list of (feature, original_index, sort_key) tuples
-        features_with_indices = []
-        for original_idx, feature in enumerate(self.import_item.geofeatures):
-            center = self._get_feature_bounding_box_center(feature)
-            if center is not None:
-                # Sort by (-lat, lon) to get north-to-south, west-to-east ordering
-                sort_key = (-center[0], center[1])
-            else:
-                # Features without valid geometry go to the end (high sort key)
-                sort_key = (float('inf'), float('inf'))
-            features_with_indices.append((feature, original_idx, sort_key))
-        
-        # Sort by spatial center
-        features_with_indices.sort(key=lambda x: x[2])
-        
-        # Extract sorted features and create mapping from original index to new index
-        sorted_features = [item[0] for item in features_with_indices]
-        original_to_new_index = {item[1]: new_idx for new_idx, item in enumerate(features_with_indices)}
-
-        # Calculate pagination
-        total_features = len(sorted_features)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-
-        # Get paginated features from sorted list
-        paginated_features = sorted_features[start_idx:end_idx]
-
-        # Get duplicate information for current page
-        duplicates_optimized = []
-        duplicate_indices = []
-
-        # Import normalization function for coordinate comparison
-        from api.views.import_item import _normalize_coordinates
-        
-        # Build a map of normalized coordinates to original indices
-        # This allows us to mark ALL features with matching coordinates as duplicates
-        coords_to_original_indices = {}
-        for original_idx, feature in enumerate(self.import_item.geofeatures):
-            feature_geom = feature.get('geometry', {})
-            feature_coords = feature_geom.get('coordinates')
-            feature_type = feature_geom.get('type', '').lower()
-            
-            if feature_coords:
-                normalized_coords = _normalize_coordinates(feature_coords)
-                coords_key = (feature_type, json.dumps(normalized_coords, sort_keys=True))
-                if coords_key not in coords_to_original_indices:
-                    coords_to_original_indices[coords_key] = []
-                coords_to_original_indices[coords_key].append(original_idx)
-        
-        # Now process each duplicate_info and mark all features with matching coordinates as duplicates
-        # Convert original indices to new sorted indices
-        for dup_info in (self.import_item.duplicate_features if self.import_item.duplicate_features else []):
-            dup_feature = dup_info.get('feature')
-            if dup_feature:
-                dup_geom = dup_feature.get('geometry', {})
-                dup_coords = dup_geom.get('coordinates')
-                dup_type = dup_geom.get('type', '').lower()
-                
-                if dup_coords:
-                    # Normalize duplicate feature coordinates for comparison
-                    normalized_dup_coords = _normalize_coordinates(dup_coords)
-                    coords_key = (dup_type, json.dumps(normalized_dup_coords, sort_keys=True))
-                    
-                    # Mark ALL features with matching coordinates as duplicates
-                    if coords_key in coords_to_original_indices:
-                        for original_idx in coords_to_original_indices[coords_key]:
-                            # Convert original index to new sorted index
-                            if original_idx in original_to_new_index:
-                                new_idx = original_to_new_index[original_idx]
-                                if new_idx not in duplicate_indices:
-                                    duplicate_indices.append(new_idx)
-                                
-                                # Only include duplicate info if it's in the current page
-                                if start_idx <= new_idx < end_idx:
-                                    existing_features_optimized = []
-                                    for existing in dup_info.get('existing_features', []):
-                                        existing_features_optimized.append({
-                                            'id': existing.get('id'),
-                                            'name': existing.get('name'),
-                                            'type': existing.get('type'),
-                                            'timestamp': existing.get('timestamp')
-                                        })
-                                    duplicates_optimized.append({
-                                        'existing_features': existing_features_optimized,
-                                        'page_index': new_idx - start_idx,
-                                    })
+        # The review order and duplicate positions are precomputed when the features are staged,
+        # so only the rows of the requested page are loaded
+        from asgiref.sync import sync_to_async
+        from geo_lib.processing.import_staging import get_review_page
+
+        review_page = await sync_to_async(get_review_page)(self.import_item.id, page, page_size)
+        total_features = review_page['total']
+        end_idx = page * page_size
 
         return {
-            'data': paginated_features,
+            'data': review_page['features'],
             'pagination': {
                 'page': page,
                 'page_size': page_size,
@@ -408,9 +234,9 @@ class UploadStatusModule(BaseWebSocketModule):
                 'total_pages': (total_features + page_size - 1) // page_size,
                 'has_next': end_idx < total_features,
                 'has_previous': page > 1,
-                'duplicate_indices': duplicate_indices
+                'duplicate_indices': review_page['duplicate_indices']
             },
-            'duplicates': duplicates_optimized
+            'duplicates': review_page['duplicates']
         }
 
     async def _get_logs(self, after_id: Optional[int] = None) -> list:
@@ -5,6 +5,11 @@ python manage.py makemigrations api --no-input
 python manage.py makemigrations users --no-input
 python manage.py migrate --no-input
 
+# Background jobs (uploads, deletes, bulk imports) are run by separate worker processes
+python manage.py run_workers &
+WORKERS_PID=$!
+trap 'kill $WORKERS_PID' EXIT
+
 ./manage.py runserver
 
 # Heplful Reminders
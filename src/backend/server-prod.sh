@@ -15,6 +15,7 @@ PORT="8000"
 
 # Note: Daphne is single-process. For multiple workers, run multiple instances
 # or use a process manager like supervisord/systemd.
+# Background jobs are processed separately by worker-prod.sh, run it alongside this script.
 # --access-log /dev/null disables Daphne's access logging (we use our own unified format)
 exec daphne \
     --bind "$HOST" \
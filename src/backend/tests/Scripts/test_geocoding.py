@@ -4,9 +4,12 @@ Test script for reverse geocoding functionality.
 Takes coordinates (latitude, longitude) and returns location tags.
 
 Usage:
-    python test_geocoding.py <latitude> <longitude>
+    python test_geocoding.py <latitude> <longitude> [--mock]
     python test_geocoding.py 39.7392 -104.9903  # Denver
     python test_geocoding.py 39.1591360 -105.2915346  # Pike National Forest
+
+With --mock, the lookups go to the local mock geocoding server (tests/geocoding_fixtures.json)
+instead of the public Overpass/Nominatim servers, no network access needed.
 """
 
 import sys
@@ -21,7 +24,15 @@ sys.path.insert(0, backend_dir)
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'website.settings')
 django.setup()
 
-from geo_lib.geolocation.reverse_geocode import get_reverse_geocoding_service
+from geo_lib.geolocation.geocode_cache import MemoryGeocodeCache
+from geo_lib.geolocation.mock_geocoding_server import MockGeocodingServer, load_fixtures
+from geo_lib.geolocation.reverse_geocode import (
+    ReverseGeocodingService,
+    get_reverse_geocoding_service,
+    override_reverse_geocoding_service,
+)
+
+FIXTURES_PATH = os.path.join(backend_dir, 'tests', 'geocoding_fixtures.json')
 
 
 def test_geocoding(latitude: float, longitude: float):
@@ -98,18 +109,21 @@ def test_geocoding(latitude: float, longitude: float):
 
 def main():
     """Main entry point."""
-    if len(sys.argv) != 3:
-        print("Usage: python test_geocoding.py <latitude> <longitude>")
+    args = [arg for arg in sys.argv[1:] if arg != '--mock']
+    use_mock = len(args) != len(sys.argv) - 1
+    if len(args) != 2:
+        print("Usage: python test_geocoding.py <latitude> <longitude> [--mock]")
         print("\nExamples:")
         print("  python test_geocoding.py 39.7392 -104.9903  # Denver, CO")
         print("  python test_geocoding.py 39.1591360 -105.2915346  # Pike National Forest")
         print("  python test_geocoding.py 40.7128 -74.0060  # New York City")
         print("  python test_geocoding.py 37.7749 -122.4194  # San Francisco (coastal)")
+        print("  python test_geocoding.py 39.7392 -104.9903 --mock  # Denver, from the mock server")
         sys.exit(1)
     
     try:
-        latitude = float(sys.argv[1])
-        longitude = float(sys.argv[2])
+        latitude = float(args[0])
+        longitude = float(args[1])
     except ValueError:
         print("Error: Latitude and longitude must be valid numbers")
         sys.exit(1)
@@ -123,7 +137,13 @@ def main():
         print("Error: Longitude must be between -180 and 180")
         sys.exit(1)
     
-    test_geocoding(latitude, longitude)
+    if use_mock:
+        with MockGeocodingServer(load_fixtures(FIXTURES_PATH)) as server:
+            service = ReverseGeocodingService(server.overpass_url, server.nominatim_url, cache=MemoryGeocodeCache())
+            with override_reverse_geocoding_service(service):
+                test_geocoding(latitude, longitude)
+    else:
+        test_geocoding(latitude, longitude)
 
 
 if __name__ == '__main__':
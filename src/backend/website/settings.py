@@ -314,6 +314,20 @@ ENABLE_MIME_TYPE_VALIDATION = config.get_bool('validation.enable_mime_type_valid
 # indicating how many features were limited.
 MAX_FEATURES_PER_REQUEST = config.get_int('api.max_features_per_request', -1)
 
+# Zoom-aware geometry simplification for bounding box queries
+# Lines and polygons are simplified to a fraction of a pixel at the requested zoom level,
+# and coordinates are trimmed to the precision visible at that zoom.
+GEOMETRY_SIMPLIFY_ENABLED = config.get_bool('api.geometry_simplify_enabled', True)
+
+# Zoom levels above this return full resolution geometries
+GEOMETRY_SIMPLIFY_MAX_ZOOM = config.get_int('api.geometry_simplify_max_zoom', 16)
+
+# Simplification tolerance in pixels at the requested zoom level
+GEOMETRY_SIMPLIFY_TOLERANCE_PIXELS = config.get_float('api.geometry_simplify_tolerance_pixels', 0.5)
+
+# Number of features fetched from the database and written per chunk when streaming GeoJSON responses
+FEATURE_STREAM_CHUNK_SIZE = config.get_int('api.feature_stream_chunk_size', 500)
+
 # Tile Proxy Cache Configuration
 # Directory where proxied tiles will be cached on disk
 TILE_CACHE_DIR = config.get_with_env_override('tiles.cache_dir', 'TILE_CACHE_DIR', '/tmp/geovault-tiles')
@@ -366,6 +380,10 @@ NOMINATIM_API_URL = config.get_with_env_override('geocoding.nominatim_api_url',
 # Enable or disable reverse geocoding (disabled by default)
 REVERSE_GEOCODING_ENABLED = config.get_bool_with_env_override('geocoding.enabled', 'REVERSE_GEOCODING_ENABLED', False)
 
+# Where reverse geocoding answers come from: 'online' (Overpass/Nominatim) or 'local'
+# (boundary tables loaded with `manage.py load_geocoding_boundaries`)
+GEOCODING_BACKEND = config.get_str('geocoding.backend', 'online')
+
 # Distance thresholds for proximity tags (in miles)
 CITY_PROXIMITY_MILES = config.get_float('geocoding.city_proximity_miles', 5.0)
 LAKE_PROXIMITY_MILES = config.get_float('geocoding.lake_proximity_miles', 1.0)
@@ -374,17 +392,69 @@ LAKE_PROXIMITY_MILES = config.get_float('geocoding.lake_proximity_miles', 1.0)
 OVERPASS_TIMEOUT_SECONDS = config.get_int('geocoding.overpass_timeout_seconds', 10)
 OVERPASS_REQUEST_TIMEOUT_SECONDS = config.get_int('geocoding.overpass_request_timeout_seconds', 15)
 
+# Maximum number of points geocoded by one merged Overpass request
+OVERPASS_BATCH_SIZE = config.get_int('geocoding.overpass_batch_size', 20)
+
+# Reverse geocoding results are cached in the database per grid cell (coordinates rounded down to
+# this many decimal places, 3 is roughly 110 m) and reused until they are older than the TTL
+GEOCODING_CACHE_ENABLED = config.get_bool('geocoding.cache_enabled', True)
+GEOCODING_CACHE_PRECISION = config.get_int('geocoding.cache_precision', 3)
+GEOCODING_CACHE_TTL_DAYS = config.get_int('geocoding.cache_ttl_days', 30)
+
+# Country/state/county lookups are cached on a coarser grid (2 is roughly 1.1 km)
+GEOCODING_ADMIN_CACHE_PRECISION = config.get_int('geocoding.admin_cache_precision', 2)
+
+# During an import, representative points are snapped to a grid of this many decimal places
+# and each cell is geocoded once, its location tags are shared by every feature in it
+GEOCODING_GRID_PRECISION = config.get_int('geocoding.grid_precision', 3)
+
+# Geocoding HTTP client: requests per second allowed per endpoint (0 disables the limit; the public
+# Nominatim server allows 1), requests in flight at once and retries of failed requests
+NOMINATIM_REQUESTS_PER_SECOND = config.get_float('geocoding.nominatim_requests_per_second', 1.0)
+OVERPASS_REQUESTS_PER_SECOND = config.get_float('geocoding.overpass_requests_per_second', 2.0)
+GEOCODING_MAX_CONCURRENCY = config.get_int('geocoding.max_concurrency', 4)
+GEOCODING_MAX_RETRIES = config.get_int('geocoding.max_retries', 3)
+GEOCODING_RETRY_BACKOFF_SECONDS = config.get_float('geocoding.retry_backoff_seconds', 1.0)
+# The request rates are totals, each process that geocodes gets 1/GEOCODING_CLIENT_PROCESSES of them
+# (0 = the web server plus the job workers, see JOB_WORKER_PROCESSES)
+GEOCODING_CLIENT_PROCESSES = config.get_int('geocoding.client_processes', 0)
+
+# Number of features read ahead during an import whose points are geocoded together
+GEOCODING_PREFETCH_FEATURES = config.get_int('geocoding.prefetch_features', 500)
+
+# Finish upload jobs without location tags and add them with a background geocode job,
+# so files can be reviewed before geocoding is done
+GEOCODING_DEFERRED = config.get_bool('geocoding.deferred', False)
+
 # Import Processing Configuration
 # Number of threads to use for parallel feature processing during import
 IMPORT_PROCESSING_THREADS = config.get_int('processing.import_threads', 10)
 
+# Without geocoding, feature processing is CPU bound and 'auto' spreads it over a pool of worker
+# processes, sent IMPORT_PROCESS_CHUNK_SIZE features at a time. 'thread' always uses threads.
+# Processes defaults to the number of CPU cores (0)
+IMPORT_PROCESSING_EXECUTOR = config.get_str('processing.executor', 'auto')
+IMPORT_PROCESSING_PROCESSES = config.get_int('processing.import_processes', 0)
+IMPORT_PROCESS_CHUNK_SIZE = config.get_int('processing.import_process_chunk_size', 100)
+
 # Processing timeout settings
 PROCESSING_TIMEOUT_BASE_SECONDS = config.get_int('processing.timeout_base_seconds', 30)
 PROCESSING_TIMEOUT_PER_MB_SECONDS = config.get_int('processing.timeout_per_mb_seconds', 2)
 
-# Duplicate detection settings
-DUPLICATE_DETECTION_BATCH_SIZE = config.get_int('processing.duplicate_detection_batch_size', 100)
-DUPLICATE_DETECTION_BATCH_THRESHOLD = config.get_int('processing.duplicate_detection_batch_threshold', 1000)
+# Persistent Node.js togeojson worker pool (set enabled to false to spawn a node process per file)
+TOGEOJSON_POOL_ENABLED = config.get_bool('processing.togeojson_pool_enabled', True)
+TOGEOJSON_POOL_SIZE = config.get_int('processing.togeojson_pool_size', 2)
+TOGEOJSON_WORKER_MAX_MEMORY_MB = config.get_int('processing.togeojson_worker_max_memory_mb', 512)
+TOGEOJSON_WORKER_MAX_REQUESTS = config.get_int('processing.togeojson_worker_max_requests', 500)
+TOGEOJSON_HEALTH_CHECK_INTERVAL_SECONDS = config.get_int('processing.togeojson_health_check_interval_seconds', 60)
+
+# Engine used to parse uploads: 'togeojson' (Node.js) or 'lxml' (streaming, bounded memory)
+IMPORT_PARSER_ENGINE = config.get_str('processing.parser_engine', 'togeojson')
+
+# Import logs are buffered and written in batches once this many messages are waiting
+# or this many seconds have passed since the last write
+IMPORT_LOG_FLUSH_SIZE = config.get_int('processing.import_log_flush_size', 50)
+IMPORT_LOG_FLUSH_INTERVAL_SECONDS = config.get_float('processing.import_log_flush_interval_seconds', 1.0)
 
 # Bulk database operations
 BULK_CREATE_BATCH_SIZE = config.get_int('processing.bulk_create_batch_size', 1000)
@@ -393,6 +463,15 @@ BULK_CREATE_BATCH_SIZE = config.get_int('processing.bulk_create_batch_size', 100
 JOB_CLEANUP_INTERVAL_SECONDS = config.get_int('processing.job_cleanup_interval_seconds', 3600)
 MAX_JOB_AGE_SECONDS = config.get_int('processing.max_job_age_seconds', 7200)
 
+# Job queue: 'database' runs jobs in `manage.py run_workers` processes from a durable Postgres queue,
+# 'thread' runs them as threads inside the web process (jobs are lost on restart)
+JOB_QUEUE_BACKEND = config.get_str('processing.job_queue_backend', 'database')
+JOB_WORKER_PROCESSES = config.get_int('processing.job_worker_processes', 2)
+JOB_WORKER_POLL_INTERVAL_SECONDS = config.get_float('processing.job_worker_poll_interval_seconds', 1.0)
+JOB_HEARTBEAT_INTERVAL_SECONDS = config.get_int('processing.job_heartbeat_interval_seconds', 15)
+JOB_STALE_AFTER_SECONDS = config.get_int('processing.job_stale_after_seconds', 120)
+JOB_MAX_ATTEMPTS = config.get_int('processing.job_max_attempts', 3)
+
 # API Configuration
 TAG_MAX_LENGTH = config.get_int('api.tag_max_length', 255)
 
@@ -404,6 +483,12 @@ BBOX_LARGE_EXTENT_LON_THRESHOLD = 200
 BBOX_LARGE_EXTENT_LAT_THRESHOLD = 150
 BBOX_SUSPICIOUS_RESULT_MIN_COUNT = 10
 
+# Vector Tile Configuration (hardcoded - not user configurable)
+MVT_TILE_EXTENT = 4096
+MVT_TILE_BUFFER = 64
+MVT_LAYER_NAME = 'features'
+MVT_MAX_ZOOM = 22
+
 # Logging configuration with activity tags
 LOGGING = {
     'version': 1,
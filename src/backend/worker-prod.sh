@@ -0,0 +1,13 @@
+#!/bin/bash
+# Production background job worker startup script for GeoVault
+# Runs queued uploads, deletes and bulk imports. Run alongside server-prod.sh.
+
+set -e  # Exit on error
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd "$SCRIPT_DIR"
+
+source "$SCRIPT_DIR"/venv/bin/activate
+
+# The number of worker processes defaults to processing.job_worker_processes in config.yaml
+exec python manage.py run_workers "$@"
@@ -28,8 +28,7 @@ export class ImportQueueModule extends BaseModule {
         // Handle new item added
         this.subscribe('item_added', (data) => {
             console.log('Import queue item added:', data);
-            // Request refresh to get updated data
-            this.requestRefresh();
+            this.applyItems(data.items);
         });
 
         // Handle item deleted
@@ -53,33 +52,31 @@ export class ImportQueueModule extends BaseModule {
             });
         });
 
-        // Handle status updates (processing -> completed)
+        // Handle status updates (processing -> completed). The server sends the current
+        // data of the item and of the items whose duplicate status depends on it.
         this.subscribe('status_updated', (data) => {
             console.log('Import queue status updated:', data);
-            let updates = {
-                processing: data.status === 'processing',
-                processing_failed: data.status === 'failed'
-            };
-
-            // Handle completed status - need to get the actual feature count from the server
-            if (data.status === 'completed') {
-                updates.processing = false;
-                updates.processing_failed = false;
-                // Request a refresh of import queue to get the updated item with correct feature count
-                this.requestRefresh();
-                return;
-            }
+            this.applyItems(data.items);
+        });
+    }
 
-            // For processing status, set feature_count to -1 to indicate processing
-            if (data.status === 'processing') {
-                updates.feature_count = -1;
+    /**
+     * Add or update import queue items from a server delta
+     * @param {Array} items - Items as sent in the initial state
+     */
+    applyItems(items) {
+        if (!items) {
+            // Event without item data, fall back to a full refresh
+            this.requestRefresh();
+            return;
+        }
+        const queue = this.store.state.importQueue;
+        items.forEach(item => {
+            if (queue.some(existing => existing.id === item.id)) {
+                this.store.dispatch('updateImportQueueItem', {id: item.id, updates: item});
+            } else {
+                this.store.dispatch('addImportQueueItem', item);
             }
-
-            // Update the specific item in the store using id
-            this.store.dispatch('updateImportQueueItem', {
-                id: data.id,
-                updates: updates
-            });
         });
     }
 